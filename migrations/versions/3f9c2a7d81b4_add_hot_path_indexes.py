@@ -0,0 +1,55 @@
+"""Add composite indexes for schedule slot and attendance date lookups
+
+Revision ID: 3f9c2a7d81b4
+Revises:
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9c2a7d81b4'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    # Conflict checks, occupancy loads and timetables filter on
+    # (teacher | classroom | section, day_of_week, time_period_id, is_active)
+    ('schedule_assignments', 'ix_schedule_assignments_teacher_slot',
+     ['teacher_id', 'day_of_week', 'time_period_id', 'is_active']),
+    ('schedule_assignments', 'ix_schedule_assignments_classroom_slot',
+     ['classroom_id', 'day_of_week', 'time_period_id', 'is_active']),
+    ('schedule_assignments', 'ix_schedule_assignments_section_slot',
+     ['section_id', 'day_of_week', 'time_period_id', 'is_active']),
+    # Per-student lookups use the existing unique (student_id, attendance_date) key;
+    # this one serves date range scans across students
+    ('daily_attendance', 'ix_daily_attendance_date_present',
+     ['attendance_date', 'present', 'student_id']),
+]
+
+
+def _existing_indexes(table):
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(table):
+        return None
+    return {index['name'] for index in inspector.get_indexes(table)}
+
+
+def upgrade():
+    for table, name, columns in INDEXES:
+        existing = _existing_indexes(table)
+        # Tenant databases created from the models already have them
+        if existing is None or name in existing:
+            continue
+        op.create_index(name, table, columns)
+
+
+def downgrade():
+    for table, name, _ in reversed(INDEXES):
+        existing = _existing_indexes(table)
+        if existing and name in existing:
+            op.drop_index(name, table_name=table)
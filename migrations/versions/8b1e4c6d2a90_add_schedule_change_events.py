@@ -0,0 +1,52 @@
+"""Add append-only schedule change log
+
+Revision ID: 8b1e4c6d2a90
+Revises: 3f9c2a7d81b4
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b1e4c6d2a90'
+down_revision = '3f9c2a7d81b4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Tenant databases created from the models already have it
+    if sa.inspect(op.get_bind()).has_table('schedule_change_events'):
+        return
+
+    op.create_table(
+        'schedule_change_events',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('assignment_id', sa.Integer(), nullable=False),
+        sa.Column('change_type', sa.String(length=20), nullable=False),
+        sa.Column('changed_fields', sa.Text()),
+        sa.Column('schedule_id', sa.Integer()),
+        sa.Column('teacher_id', sa.Integer()),
+        sa.Column('subject_id', sa.Integer()),
+        sa.Column('section_id', sa.Integer()),
+        sa.Column('classroom_id', sa.Integer()),
+        sa.Column('time_period_id', sa.Integer()),
+        sa.Column('day_of_week', sa.String(length=10)),
+        sa.Column('teacher_name', sa.String(length=255)),
+        sa.Column('subject_name', sa.String(length=200)),
+        sa.Column('section_name', sa.String(length=50)),
+        sa.Column('classroom_name', sa.String(length=100)),
+        sa.Column('time_period', sa.String(length=50)),
+        sa.Column('changed_by', sa.String(length=100)),
+        sa.Column('changed_at', sa.DateTime(), nullable=False),
+    )
+    op.create_index('ix_schedule_change_events_section', 'schedule_change_events', ['section_id', 'id'])
+    op.create_index('ix_schedule_change_events_teacher', 'schedule_change_events', ['teacher_id', 'id'])
+    op.create_index('ix_schedule_change_events_changed_at', 'schedule_change_events', ['changed_at'])
+
+
+def downgrade():
+    if sa.inspect(op.get_bind()).has_table('schedule_change_events'):
+        op.drop_table('schedule_change_events')
@@ -0,0 +1,47 @@
+"""Add copy-on-write schedule versions
+
+Revision ID: c5d7e9f1a3b2
+Revises: 8b1e4c6d2a90
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5d7e9f1a3b2'
+down_revision = '8b1e4c6d2a90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    # Tenant databases created from the models already have them
+    if 'parent_id' not in {column['name'] for column in inspector.get_columns('schedules')}:
+        op.add_column('schedules', sa.Column('parent_id', sa.Integer(), sa.ForeignKey('schedules.id')))
+        op.create_index('ix_schedules_parent_id', 'schedules', ['parent_id'])
+
+    if not inspector.has_table('schedule_assignment_removals'):
+        op.create_table(
+            'schedule_assignment_removals',
+            sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column('schedule_id', sa.Integer(), sa.ForeignKey('schedules.id'), nullable=False),
+            sa.Column('assignment_id', sa.Integer(), sa.ForeignKey('schedule_assignments.id'), nullable=False),
+            sa.UniqueConstraint('schedule_id', 'assignment_id', name='uq_schedule_assignment_removal'),
+        )
+        op.create_index('ix_schedule_assignment_removals_schedule_id',
+                        'schedule_assignment_removals', ['schedule_id'])
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    if inspector.has_table('schedule_assignment_removals'):
+        op.drop_table('schedule_assignment_removals')
+
+    if 'parent_id' in {column['name'] for column in inspector.get_columns('schedules')}:
+        op.drop_index('ix_schedules_parent_id', table_name='schedules')
+        op.drop_column('schedules', 'parent_id')
@@ -3,7 +3,7 @@ Schedule Optimization API Endpoints
 Venezuelan K12 Educational Institution Scheduling
 """
 
-from flask import Blueprint, request, jsonify, session
+from flask import Blueprint, request, jsonify, session, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from src.models.master import Tenant
 from src.models.tenant import (
@@ -26,6 +26,25 @@ from src.scheduling.constraint_solver import (
     ConstraintType,
     ConstraintPriority
 )
+from src.scheduling.optimization_runs import (
+    OptimizationCancelled,
+    OptimizationQueueFull,
+    RunStatus,
+    get_run_scheduler
+)
+from src.scheduling.projections import (
+    DEFAULT_PAGE_SIZE,
+    GROUP_COLUMNS,
+    day_index,
+    get_assignment_page,
+    get_schedule_with_statistics,
+    parse_cursor
+)
+from src.scheduling.schedule_diff import diff_schedules
+from src.scheduling.schedule_versions import (
+    activate_schedule_version, save_schedule_version, schedule_criterion
+)
+from src.scheduling.neighborhood_repair import NeighborhoodRepairer, load_repair_inputs
 from src.core.app import db
 from functools import wraps
 import logging
@@ -67,7 +86,8 @@ def get_optimization_config():
                         'generations': 500,
                         'mutation_rate': 0.02,
                         'crossover_rate': 0.8,
-                        'elitism_rate': 0.1
+                        'elitism_rate': 0.1,
+                        'warm_start_ratio': 0.3
                     }
                 },
                 {
@@ -111,13 +131,38 @@ def get_optimization_config():
 @jwt_required()
 @tenant_required
 def start_optimization():
-    """Start schedule optimization process"""
+    """
+    Start schedule optimization process
+
+    Runs are admitted through the shared run scheduler, which caps concurrent
+    optimizations globally and per tenant. The returned run_id can be used
+    with the cancel endpoint while the run is queued or executing.
+
+    Set "warm_start": true to seed the GA population and the CSP with the
+    active schedule instead of starting from scratch.
+    """
+    tenant_id = session.get('tenant_id')
+    data = request.json or {}
+    algorithm = data.get('algorithm', 'genetic')
+
+    # Wait for optimizer capacity
+    scheduler = get_run_scheduler(current_app.config)
     try:
-        tenant_id = session.get('tenant_id')
-        db_session = db.session
-        data = request.json
+        run = scheduler.submit(tenant_id, algorithm, requested_by=get_jwt_identity())
+    except OptimizationQueueFull as e:
+        return jsonify({'success': False, 'error': str(e)}), 429
 
-        algorithm = data.get('algorithm', 'genetic')
+    if not scheduler.wait_for_slot(run, current_app.config.get('OPTIMIZER_QUEUE_TIMEOUT_SECONDS')):
+        status_code = 503 if run.token.reason == 'queue_timeout' else 409
+        return jsonify({
+            'success': False,
+            'run_id': run.run_id,
+            'status': run.status.value,
+            'error': run.message
+        }), status_code
+
+    try:
+        db_session = db.session
         parameters = data.get('parameters', {})
         constraints = data.get('constraints', {})
 
@@ -165,32 +210,42 @@ def start_optimization():
                     'period_id': pref.time_period_id
                 })
 
+        # Optional warm start from the active schedule
+        initial_schedule = None
+        if data.get('warm_start'):
+            initial_schedule = load_active_schedule_slots(db_session, tenant_id)
+
         result = None
         if algorithm == 'genetic':
             result = run_genetic_algorithm(
                 teachers_data, subjects_data, sections_data,
                 classrooms_data, periods_data, preferences_dict,
-                constraints, parameters
+                constraints, parameters, cancel_token=run.token,
+                initial_schedule=initial_schedule
             )
         elif algorithm == 'constraint':
             result = run_constraint_solver(
                 teachers_data, subjects_data, sections_data,
                 classrooms_data, periods_data, preferences_dict,
-                constraints, parameters
+                constraints, parameters, cancel_token=run.token,
+                initial_schedule=initial_schedule
             )
         elif algorithm == 'hybrid':
             result = run_hybrid_algorithm(
                 teachers_data, subjects_data, sections_data,
                 classrooms_data, periods_data, preferences_dict,
-                constraints, parameters
+                constraints, parameters, cancel_token=run.token,
+                initial_schedule=initial_schedule
             )
 
         if result:
             # Save optimization result
             optimization_id = save_optimization_result(tenant_id, result, algorithm)
+            scheduler.finish(run, RunStatus.COMPLETED)
 
             return jsonify({
                 'success': True,
+                'run_id': run.run_id,
                 'optimization_id': optimization_id,
                 'algorithm': algorithm,
                 'fitness_score': result.get('fitness_score', 0),
@@ -198,17 +253,89 @@ def start_optimization():
                 'schedule_count': len(result.get('schedule', []))
             }), 200
         else:
+            scheduler.finish(run, RunStatus.FAILED, 'Optimization failed')
             return jsonify({
                 'success': False,
+                'run_id': run.run_id,
                 'error': 'Optimization failed'
             }), 500
 
+    except OptimizationCancelled as e:
+        logger.info(f"Optimization run {run.run_id} cancelled: {e}")
+        scheduler.finish(run, RunStatus.CANCELLED, str(e))
+        return jsonify({
+            'success': False,
+            'run_id': run.run_id,
+            'status': RunStatus.CANCELLED.value,
+            'error': f'Optimization cancelled ({e})'
+        }), 409
+
     except Exception as e:
         logger.error(f"Error starting optimization: {str(e)}")
+        scheduler.finish(run, RunStatus.FAILED, str(e))
+        return jsonify({'error': str(e)}), 500
+
+@schedule_optimizer_bp.route('/api/schedule/optimize/runs', methods=['GET'])
+@jwt_required()
+@tenant_required
+def list_optimization_runs():
+    """List recent optimization runs for the current tenant"""
+    try:
+        tenant_id = session.get('tenant_id')
+        scheduler = get_run_scheduler(current_app.config)
+
+        return jsonify({
+            'runs': [run.to_dict() for run in scheduler.list_runs(tenant_id)],
+            'capacity': scheduler.stats()
+        }), 200
+
+    except Exception as e:
+        logger.error(f"Error listing optimization runs: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@schedule_optimizer_bp.route('/api/schedule/optimize/runs/<run_id>', methods=['GET'])
+@jwt_required()
+@tenant_required
+def get_optimization_run(run_id):
+    """Get the status of a single optimization run"""
+    tenant_id = session.get('tenant_id')
+    run = get_run_scheduler(current_app.config).get_run(run_id, tenant_id)
+
+    if not run:
+        return jsonify({'error': 'Optimization run not found'}), 404
+
+    return jsonify(run.to_dict()), 200
+
+@schedule_optimizer_bp.route('/api/schedule/optimize/runs/<run_id>/cancel', methods=['POST'])
+@jwt_required()
+@tenant_required
+def cancel_optimization_run(run_id):
+    """
+    Cancel a queued or running optimization
+
+    Queued runs are dropped immediately; running runs stop at the next
+    generation or search node and the start request returns 409.
+    """
+    try:
+        tenant_id = session.get('tenant_id')
+        run = get_run_scheduler(current_app.config).cancel(run_id, tenant_id)
+
+        if not run:
+            return jsonify({'error': 'Optimization run not found'}), 404
+
+        return jsonify({
+            'success': True,
+            'message': 'Cancellation requested',
+            'run': run.to_dict()
+        }), 200
+
+    except Exception as e:
+        logger.error(f"Error cancelling optimization run: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
 def run_genetic_algorithm(teachers, subjects, sections, classrooms,
-                         time_periods, preferences, constraints, parameters):
+                         time_periods, preferences, constraints, parameters,
+                         cancel_token=None, initial_schedule=None):
     """Run genetic algorithm optimization"""
     try:
         # Initialize GA
@@ -230,8 +357,15 @@ def run_genetic_algorithm(teachers, subjects, sections, classrooms,
             ga.crossover_rate = parameters.get('crossover_rate', ga.crossover_rate)
             ga.elitism_rate = parameters.get('elitism_rate', ga.elitism_rate)
 
+        # Warm start from the active schedule
+        if initial_schedule:
+            ga.set_warm_start(
+                list(initial_schedule.values()),
+                ratio=(parameters or {}).get('warm_start_ratio')
+            )
+
         # Run evolution
-        best_chromosome = ga.evolve()
+        best_chromosome = ga.evolve(cancel_token=cancel_token)
 
         # Convert to schedule
         schedule = ga.chromosome_to_schedule(best_chromosome)
@@ -242,12 +376,15 @@ def run_genetic_algorithm(teachers, subjects, sections, classrooms,
             'violations': []
         }
 
+    except OptimizationCancelled:
+        raise
     except Exception as e:
         logger.error(f"Genetic algorithm error: {str(e)}")
         return None
 
 def run_constraint_solver(teachers, subjects, sections, classrooms,
-                         time_periods, preferences, constraints, parameters):
+                         time_periods, preferences, constraints, parameters,
+                         cancel_token=None, initial_schedule=None):
     """Run constraint solver optimization"""
     try:
         # Initialize solver
@@ -308,12 +445,20 @@ def run_constraint_solver(teachers, subjects, sections, classrooms,
                 weekly_hours=subject.get('weekly_hours', 4)
             ))
 
+        # Hours already covered by the warm-start schedule
+        initial_schedule = dict(initial_schedule or {})
+        hours_seeded = {}
+        for slot in initial_schedule.values():
+            key = (slot['section_id'], slot['subject_id'])
+            hours_seeded[key] = hours_seeded.get(key, 0) + 1
+
         # Create assignments needed
         assignments_needed = []
         for section in sections:
             for subject_data in section.get('subjects', []):
                 subject_id = subject_data['id']
                 weekly_hours = subject_data.get('weekly_hours', 4)
+                weekly_hours = max(0, weekly_hours - hours_seeded.get((section['id'], subject_id), 0))
 
                 # Find qualified teacher
                 qualified_teachers = [t for t in teachers
@@ -329,12 +474,14 @@ def run_constraint_solver(teachers, subjects, sections, classrooms,
                         })
 
         # Solve CSP
-        schedule, success, violations = solver.solve_csp(assignments_needed)
+        schedule, success, violations = solver.solve_csp(
+            assignments_needed, initial_schedule=initial_schedule, cancel_token=cancel_token
+        )
 
         if success:
             # Optimize further
             iterations = parameters.get('iterations', 100)
-            optimized_schedule = solver.optimize_schedule(schedule, iterations)
+            optimized_schedule = solver.optimize_schedule(schedule, iterations, cancel_token=cancel_token)
 
             # Convert to list format
             schedule_list = []
@@ -371,18 +518,22 @@ def run_constraint_solver(teachers, subjects, sections, classrooms,
                 'violations': violations
             }
 
+    except OptimizationCancelled:
+        raise
     except Exception as e:
         logger.error(f"Constraint solver error: {str(e)}")
         return None
 
 def run_hybrid_algorithm(teachers, subjects, sections, classrooms,
-                        time_periods, preferences, constraints, parameters):
+                        time_periods, preferences, constraints, parameters,
+                        cancel_token=None, initial_schedule=None):
     """Run hybrid optimization (GA + Constraint Solver)"""
     try:
         # First run genetic algorithm
         ga_result = run_genetic_algorithm(
             teachers, subjects, sections, classrooms,
-            time_periods, preferences, constraints, parameters
+            time_periods, preferences, constraints, parameters,
+            cancel_token=cancel_token, initial_schedule=initial_schedule
         )
 
         if not ga_result:
@@ -410,7 +561,7 @@ def run_hybrid_algorithm(teachers, subjects, sections, classrooms,
             }
 
         # Optimize
-        optimized_schedule = solver.optimize_schedule(schedule_dict, 50)
+        optimized_schedule = solver.optimize_schedule(schedule_dict, 50, cancel_token=cancel_token)
 
         # Convert back to list format
         schedule_list = []
@@ -438,48 +589,227 @@ def run_hybrid_algorithm(teachers, subjects, sections, classrooms,
             'violations': solver.get_all_violations(optimized_schedule)
         }
 
+    except OptimizationCancelled:
+        raise
     except Exception as e:
         logger.error(f"Hybrid algorithm error: {str(e)}")
         return None
 
-def save_optimization_result(tenant_id, result, algorithm):
-    """Save optimization result to database"""
+@schedule_optimizer_bp.route('/api/schedule/optimize/repair', methods=['POST'])
+@jwt_required()
+@tenant_required
+def repair_schedule():
+    """
+    Repair a schedule around a small change set (large-neighborhood search)
+
+    Only lessons hit by the changes and their near neighbours are re-placed;
+    every other assignment keeps its slot, teacher and room. The result is
+    saved as a new draft schedule that can be previewed, diffed and applied.
+    If any lesson cannot be re-placed nothing is saved and the response is
+    409 with the 'unresolved' lessons.
+
+    Request JSON:
+    {
+        "base_schedule_id": 12,             (optional, defaults to active schedule)
+        "changes": [
+            {"type": "teacher", "id": 5, "days": [0, 1]},
+            {"type": "classroom", "id": 3, "time_period_ids": [2, 3]},
+            {"type": "assignment", "id": 901}
+        ],
+        "radius": 1,
+        "max_nodes": 20000
+    }
+    """
+    tenant_id = session.get('tenant_id')
+    data = request.json or {}
+
+    scheduler = get_run_scheduler(current_app.config)
+    try:
+        run = scheduler.submit(tenant_id, 'repair', requested_by=get_jwt_identity())
+    except OptimizationQueueFull as e:
+        return jsonify({'success': False, 'error': str(e)}), 429
+
+    if not scheduler.wait_for_slot(run, current_app.config.get('OPTIMIZER_QUEUE_TIMEOUT_SECONDS')):
+        status_code = 503 if run.token.reason == 'queue_timeout' else 409
+        return jsonify({'success': False, 'run_id': run.run_id, 'error': run.message}), status_code
+
     try:
         db_session = db.session
 
-        # Create new schedule
+        base_query = db_session.query(Schedule).filter_by(tenant_id=tenant_id)
+        if data.get('base_schedule_id'):
+            base = base_query.filter_by(id=data['base_schedule_id']).first()
+        else:
+            base = base_query.filter_by(status='active').order_by(Schedule.updated_at.desc()).first()
+
+        if not base:
+            scheduler.finish(run, RunStatus.FAILED, 'Base schedule not found')
+            return jsonify({'error': 'Base schedule not found'}), 404
+
+        repairer = NeighborhoodRepairer(
+            radius=int(data.get('radius', 1)),
+            max_nodes=int(data.get('max_nodes', 20000)),
+            cancel_token=run.token,
+            **load_repair_inputs(db_session, base.id)
+        )
+
+        try:
+            result = repairer.repair(data.get('changes', []))
+        except ValueError as e:
+            scheduler.finish(run, RunStatus.FAILED, str(e))
+            return jsonify({'error': 'Invalid change set', 'message': str(e)}), 400
+
+        if result['unresolved']:
+            # A draft without these lessons would silently drop classes
+            message = f"{len(result['unresolved'])} lessons could not be re-placed"
+            scheduler.finish(run, RunStatus.FAILED, message)
+            return jsonify({
+                'success': False,
+                'run_id': run.run_id,
+                'base_schedule_id': base.id,
+                'error': message,
+                'unresolved': result['unresolved']
+            }), 409
+
+        optimization_id = save_repaired_schedule(tenant_id, base, result, data.get('changes', []))
+        scheduler.finish(run, RunStatus.COMPLETED)
+
+        return jsonify({
+            'success': optimization_id is not None,
+            'run_id': run.run_id,
+            'optimization_id': optimization_id,
+            'base_schedule_id': base.id,
+            'algorithm': 'lns_repair',
+            'freed_count': len(result['freed']),
+            'pinned_count': result['pinned_count'],
+            'changes': result['changes']
+        }), 200 if optimization_id is not None else 500
+
+    except OptimizationCancelled as e:
+        scheduler.finish(run, RunStatus.CANCELLED, str(e))
+        return jsonify({
+            'success': False,
+            'run_id': run.run_id,
+            'status': RunStatus.CANCELLED.value,
+            'error': f'Repair cancelled ({e})'
+        }), 409
+
+    except Exception as e:
+        logger.error(f"Error repairing schedule: {str(e)}")
+        scheduler.finish(run, RunStatus.FAILED, str(e))
+        return jsonify({'error': str(e)}), 500
+
+def save_repaired_schedule(tenant_id, base, result, changes):
+    """Save a repaired copy of a schedule as a new draft (a delta against the base)"""
+    db_session = db.session
+    try:
         schedule = Schedule(
             tenant_id=tenant_id,
-            name=f"Optimized Schedule - {algorithm.title()}",
-            description=f"Generated using {algorithm} algorithm",
-            academic_year=datetime.now().year,
-            semester=1,
+            name=f"{base.name} (repaired)",
+            description=f"Neighborhood repair of schedule {base.id}",
+            academic_year=base.academic_year,
+            semester=base.semester,
             status='draft',
             created_by=get_jwt_identity(),
             meta_data=json.dumps({
-                'algorithm': algorithm,
-                'fitness_score': result['fitness_score'],
-                'violations': result['violations'],
+                'algorithm': 'lns_repair',
+                'base_schedule_id': base.id,
+                'change_set': changes,
+                'freed_assignments': len(result['freed']),
                 'generated_at': datetime.now().isoformat()
             })
         )
-        db_session.add(schedule)
+
+        save_schedule_version(db_session, schedule, [
+            dict(a, tenant_id=tenant_id, time_period_id=a['period'])
+            for a in result['assignments']
+        ], parent_id=base.id)
         db_session.commit()
 
-        # Add assignments
-        for assignment in result['schedule']:
-            sched_assignment = ScheduleAssignment(
-                schedule_id=schedule.id,
-                teacher_id=assignment['teacher']['id'],
-                subject_id=assignment['subject']['id'],
-                section_id=assignment['section']['id'],
-                classroom_id=assignment['classroom']['id'],
-                time_period_id=assignment['time_period']['id'],
-                day_of_week=assignment['day_of_week'],
-                tenant_id=tenant_id
-            )
-            db_session.add(sched_assignment)
+        return schedule.id
+
+    except Exception as e:
+        logger.error(f"Error saving repaired schedule: {str(e)}")
+        db_session.rollback()
+        return None
+
+def load_active_schedule_slots(db_session, tenant_id):
+    """
+    Load the tenant's active schedule in constraint solver format
+
+    Returns:
+        Dict keyed by (section_id, day, time_period_id), or None without an active schedule
+    """
+    active = db_session.query(Schedule.id).filter_by(
+        tenant_id=tenant_id,
+        status='active'
+    ).order_by(Schedule.updated_at.desc()).first()
+
+    if not active:
+        return None
+
+    rows = db_session.query(
+        ScheduleAssignment.teacher_id, ScheduleAssignment.subject_id,
+        ScheduleAssignment.section_id, ScheduleAssignment.classroom_id,
+        ScheduleAssignment.day_of_week, ScheduleAssignment.time_period_id
+    ).filter(
+        schedule_criterion(db_session, active.id)
+    ).all()
+
+    slots = {}
+    for row in rows:
+        day = day_index(row.day_of_week)
+        if day is None:
+            continue
+        slots[(row.section_id, day, row.time_period_id)] = {
+            'teacher_id': row.teacher_id,
+            'section_id': row.section_id,
+            'subject_id': row.subject_id,
+            'classroom_id': row.classroom_id,
+            'day': day,
+            'period': row.time_period_id
+        }
+
+    return slots
+
+def save_optimization_result(tenant_id, result, algorithm):
+    """Save optimization result to database, as a delta against the active schedule when there is one"""
+    try:
+        db_session = db.session
+
+        parent = db_session.query(Schedule.id).filter_by(
+            tenant_id=tenant_id,
+            status='active'
+        ).order_by(Schedule.updated_at.desc()).first()
+
+        # Create new schedule
+        schedule = Schedule(
+            tenant_id=tenant_id,
+            name=f"Optimized Schedule - {algorithm.title()}",
+            description=f"Generated using {algorithm} algorithm",
+            academic_year=datetime.now().year,
+            semester=1,
+            status='draft',
+            created_by=get_jwt_identity()
+        )
 
+        delta = save_schedule_version(db_session, schedule, [{
+            'tenant_id': tenant_id,
+            'teacher_id': assignment['teacher']['id'],
+            'subject_id': assignment['subject']['id'],
+            'section_id': assignment['section']['id'],
+            'classroom_id': assignment['classroom']['id'],
+            'time_period_id': assignment['time_period']['id'],
+            'day': assignment['day_of_week']
+        } for assignment in result['schedule']], parent_id=parent.id if parent else None)
+
+        schedule.meta_data = json.dumps({
+            'algorithm': algorithm,
+            'fitness_score': result['fitness_score'],
+            'violations': result['violations'],
+            'delta': delta,
+            'generated_at': datetime.now().isoformat()
+        })
         db_session.commit()
 
         return schedule.id
@@ -493,26 +823,37 @@ def save_optimization_result(tenant_id, result, algorithm):
 @jwt_required()
 @tenant_required
 def preview_optimized_schedule(optimization_id):
-    """Preview optimized schedule before applying"""
+    """
+    Preview optimized schedule before applying
+
+    Query params:
+        group_by: 'section' or 'teacher' to page whole timetables (optional)
+        after: keyset cursor returned as next_cursor by the previous page
+        limit: assignments per page, or groups per page when grouped
+    """
     try:
         tenant_id = session.get('tenant_id')
         db_session = db.session
 
-        # Get schedule
-        schedule = db_session.query(Schedule).filter_by(
-            id=optimization_id,
-            tenant_id=tenant_id
-        ).first()
+        group_by = request.args.get('group_by') or None
+        if group_by and group_by not in GROUP_COLUMNS:
+            return jsonify({'error': f"group_by must be one of: {', '.join(GROUP_COLUMNS)}"}), 400
 
-        if not schedule:
+        try:
+            after = parse_cursor(request.args.get('after'))
+            limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+        except ValueError:
+            return jsonify({'error': 'Invalid pagination parameters'}), 400
+
+        # Schedule and aggregate statistics in one query
+        loaded = get_schedule_with_statistics(db_session, optimization_id, tenant_id)
+        if not loaded:
             return jsonify({'error': 'Schedule not found'}), 404
+        schedule, statistics = loaded
 
-        # Get assignments
-        assignments = db_session.query(ScheduleAssignment).filter_by(
-            schedule_id=schedule.id
-        ).all()
+        # One joined projection query for the page
+        page = get_assignment_page(db_session, schedule.id, group_by, after, limit)
 
-        # Format for preview
         preview_data = {
             'schedule_info': {
                 'id': schedule.id,
@@ -521,25 +862,19 @@ def preview_optimized_schedule(optimization_id):
                 'status': schedule.status,
                 'metadata': json.loads(schedule.meta_data) if schedule.meta_data else {}
             },
-            'assignments': [],
-            'statistics': {
-                'total_assignments': len(assignments),
-                'teachers_involved': len(set([a.teacher_id for a in assignments])),
-                'sections_covered': len(set([a.section_id for a in assignments])),
-                'classrooms_used': len(set([a.classroom_id for a in assignments]))
+            'statistics': statistics,
+            'pagination': {
+                'group_by': group_by,
+                'limit': limit,
+                'next_cursor': page['next_cursor'],
+                'has_more': page['has_more']
             }
         }
 
-        # Add assignments
-        for assignment in assignments:
-            preview_data['assignments'].append({
-                'teacher': assignment.teacher.name if assignment.teacher else 'Unknown',
-                'subject': assignment.subject.name if assignment.subject else 'Unknown',
-                'section': assignment.section.name if assignment.section else 'Unknown',
-                'classroom': assignment.classroom.name if assignment.classroom else 'Unknown',
-                'time_period': assignment.time_period.name if assignment.time_period else 'Unknown',
-                'day': ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday'][assignment.day_of_week]
-            })
+        if group_by:
+            preview_data['groups'] = page['groups']
+        else:
+            preview_data['assignments'] = page['assignments']
 
         return jsonify(preview_data), 200
 
@@ -547,6 +882,56 @@ def preview_optimized_schedule(optimization_id):
         logger.error(f"Error previewing schedule: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@schedule_optimizer_bp.route('/api/schedule/optimize/diff/<int:optimization_id>', methods=['GET'])
+@schedule_optimizer_bp.route('/api/schedule/optimize/diff/<int:base_id>/<int:optimization_id>', methods=['GET'])
+@jwt_required()
+@tenant_required
+def diff_optimized_schedule(optimization_id, base_id=None):
+    """
+    Compare an optimized schedule against another schedule
+
+    Without base_id the comparison is against the tenant's active schedule,
+    i.e. exactly what apply would replace.
+
+    Query params:
+        summary_only: 'true' to omit the per-assignment lists
+    """
+    try:
+        tenant_id = session.get('tenant_id')
+        db_session = db.session
+
+        target = db_session.query(Schedule).filter_by(
+            id=optimization_id,
+            tenant_id=tenant_id
+        ).first()
+        if not target:
+            return jsonify({'error': 'Schedule not found'}), 404
+
+        base_query = db_session.query(Schedule).filter_by(tenant_id=tenant_id)
+        if base_id is not None:
+            base = base_query.filter_by(id=base_id).first()
+        else:
+            base = base_query.filter_by(status='active').order_by(Schedule.updated_at.desc()).first()
+
+        if not base:
+            return jsonify({'error': 'Base schedule not found'}), 404
+        if base.id == target.id:
+            return jsonify({'error': 'Cannot diff a schedule against itself'}), 400
+
+        diff = diff_schedules(db_session, base.id, target.id)
+        diff['base_schedule'] = base.to_dict()
+        diff['target_schedule'] = target.to_dict()
+
+        if request.args.get('summary_only', 'false').lower() == 'true':
+            for key in ('added', 'removed', 'moved', 'changed'):
+                diff.pop(key)
+
+        return jsonify(diff), 200
+
+    except Exception as e:
+        logger.error(f"Error diffing schedules: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
 @schedule_optimizer_bp.route('/api/schedule/optimize/apply/<int:optimization_id>', methods=['POST'])
 @jwt_required()
 @tenant_required
@@ -565,14 +950,8 @@ def apply_optimized_schedule(optimization_id):
         if not schedule:
             return jsonify({'error': 'Schedule not found'}), 404
 
-        # Deactivate current active schedules
-        db.query(Schedule).filter_by(
-            tenant_id=tenant_id,
-            status='active'
-        ).update({'status': 'archived'})
-
-        # Activate this schedule
-        schedule.status = 'active'
+        # Make its lessons live and archive the current active schedule
+        activate_schedule_version(db_session, schedule)
         db_session.commit()
 
         return jsonify({
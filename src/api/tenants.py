@@ -329,6 +329,9 @@ def upload_tenant_logo(tenant_id):
         # Update tenant record with logo information
         session = get_tenant_manager().SessionLocal()
         try:
+            # Work on a session-bound copy; the resolved tenant is a cached snapshot
+            tenant = session.merge(tenant)
+
             # Delete old logo if exists
             if tenant.logo_filename:
                 tenant_logo_storage.delete_tenant_logo(tenant.tenant_id, tenant.logo_filename)
@@ -342,6 +345,7 @@ def upload_tenant_logo(tenant_id):
             tenant.logo_uploaded_by = file_info['uploaded_by']
 
             session.commit()
+            get_tenant_manager().invalidate_tenant(tenant.tenant_id)
 
             logger.info(f"Logo uploaded for tenant {tenant.institution_name}")
 
@@ -411,6 +415,7 @@ def delete_tenant_logo(tenant_id):
             # Update tenant record
             session = get_tenant_manager().SessionLocal()
             try:
+                tenant = session.merge(tenant)
                 tenant.logo_filename = None
                 tenant.logo_original_name = None
                 tenant.logo_file_size = None
@@ -419,6 +424,7 @@ def delete_tenant_logo(tenant_id):
                 tenant.logo_uploaded_by = None
 
                 session.commit()
+                get_tenant_manager().invalidate_tenant(tenant.tenant_id)
 
                 logger.info(f"Logo deleted for tenant {tenant.institution_name}")
 
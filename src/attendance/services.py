@@ -9,7 +9,7 @@ from decimal import Decimal
 from calendar import monthrange
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
+from sqlalchemy import and_, or_
 
 from src.models.tenant import (
     Student, DailyAttendance, MonthlyAttendanceSummary,
@@ -45,7 +45,7 @@ class AttendanceService:
         existing = self.db.query(DailyAttendance).filter(
             and_(
                 DailyAttendance.student_id == student_id,
-                func.date(DailyAttendance.attendance_date) == attendance_date
+                DailyAttendance.attendance_date == attendance_date
             )
         ).first()
 
@@ -122,8 +122,8 @@ class AttendanceService:
         return self.db.query(DailyAttendance).filter(
             and_(
                 DailyAttendance.student_id == student_id,
-                func.date(DailyAttendance.attendance_date) >= start_date,
-                func.date(DailyAttendance.attendance_date) <= end_date
+                DailyAttendance.attendance_date >= start_date,
+                DailyAttendance.attendance_date <= end_date
             )
         ).order_by(DailyAttendance.attendance_date).all()
 
@@ -138,7 +138,7 @@ class AttendanceService:
             attendance = self.db.query(DailyAttendance).filter(
                 and_(
                     DailyAttendance.student_id == student.id,
-                    func.date(DailyAttendance.attendance_date) == attendance_date
+                    DailyAttendance.attendance_date == attendance_date
                 )
             ).first()
 
@@ -318,8 +318,8 @@ class MonthlyReportService:
             and_(
                 Student.grade_level == grade_level,
                 Student.academic_year == academic_year,
-                func.date(DailyAttendance.attendance_date) >= start_date,
-                func.date(DailyAttendance.attendance_date) <= end_date,
+                DailyAttendance.attendance_date >= start_date,
+                DailyAttendance.attendance_date <= end_date,
                 DailyAttendance.present == True
             )
         )
@@ -64,8 +64,34 @@ def create_app(config_name='development'):
     # Initialize multi-tenant system
     from src.tenants.manager import TenantManager
     from src.tenants.middleware import MultiTenantMiddleware
-
-    tenant_manager = TenantManager(app.config['MASTER_DATABASE_URL'])
+    from src.tenants.cache import TenantResolutionCache
+    from src.core.engine_registry import configure_engine_registry
+    from src.scheduling.occupancy import configure_occupancy_registry
+    from src.scheduling.workload import install_workload_tracking
+    from src.scheduling.change_log import install_change_log
+    from src.scheduling.schedule_versions import install_version_tracking
+    from src.scheduling.timetable_cache import configure_timetable_cache
+    from src.scheduling.realtime_broker import configure_realtime_broker
+    from src.scheduling.teacher_timelines import configure_teacher_timelines
+    from src.scheduling.simulation import configure_simulations
+    from src.scheduling.timetable_tensor import configure_timetables
+
+    configure_engine_registry(app.config)
+    configure_occupancy_registry(app.config)
+    install_workload_tracking()
+    install_change_log()
+    install_version_tracking()
+    configure_timetable_cache(app.config)
+    configure_realtime_broker(app.config)
+    configure_teacher_timelines(app.config)
+    configure_simulations(app.config)
+    configure_timetables(app.config)
+    tenant_cache = TenantResolutionCache(
+        ttl_seconds=app.config['TENANT_CACHE_TTL_SECONDS'],
+        negative_ttl_seconds=app.config['TENANT_CACHE_NEGATIVE_TTL_SECONDS'],
+        max_entries=app.config['TENANT_CACHE_MAX_ENTRIES']
+    )
+    tenant_manager = TenantManager(app.config['MASTER_DATABASE_URL'], cache=tenant_cache)
     multi_tenant_middleware = MultiTenantMiddleware(app, tenant_manager)
 
     # Store services in app context for access in blueprints
@@ -83,6 +109,10 @@ def create_app(config_name='development'):
     from src.api.schedule_optimizer import schedule_optimizer_bp
     app.register_blueprint(schedule_optimizer_bp)
 
+    # Import and register real-time schedule blueprint (live dashboards and push)
+    from src.scheduling.real_time_views import realtime_bp
+    app.register_blueprint(realtime_bp)
+
     # Import and register attendance blueprint (Phase 11)
     from src.attendance.views import attendance_bp
     app.register_blueprint(attendance_bp, url_prefix='/bischeduler/attendance')
@@ -880,36 +910,60 @@ def create_app(config_name='development'):
         except Exception as e:
             return jsonify({'error': str(e)}), 500
 
+    from src.auth.decorators import roles_required
+
     @app.route('/api/parent/student/<int:student_id>/schedule')
+    @roles_required('parent')
     def get_student_schedule(student_id):
-        """Get current schedule for a specific student"""
+        """
+        Get current schedule for a specific student
+
+        Only the student's registered parent or guardian (matched by the
+        student's parent_email) may read it.
+        """
+        from flask import jsonify, g
+        from src.models.tenant import get_tenant_session, Student, Section
+        from src.scheduling.timetables import load_timetable, day_lists
+        from src.scheduling.timetable_cache import timetable_response
+
+        db_session = None
         try:
-            # Demo schedule data
-            schedule_data = {
-                'student_info': {
-                    'name': 'María González Rodríguez',
-                    'grade': '3er año A',
-                    'section': 'A'
-                },
-                'schedule': {
-                    'lunes': [
-                        {'period': 'P1', 'time': '07:00-07:40', 'subject': 'MATEMÁTICAS', 'teacher': 'Prof. García', 'classroom': 'Aula 3'},
-                        {'period': 'P2', 'time': '07:40-08:20', 'subject': 'CIENCIAS', 'teacher': 'Prof. López', 'classroom': 'Lab Ciencias'}
-                    ],
-                    'martes': [
-                        {'period': 'P1', 'time': '07:00-07:40', 'subject': 'CASTELLANO', 'teacher': 'Prof. Morales', 'classroom': 'Aula 1'},
-                        {'period': 'P2', 'time': '07:40-08:20', 'subject': 'MATEMÁTICAS', 'teacher': 'Prof. García', 'classroom': 'Aula 3'}
-                    ]
-                }
-            }
+            db_session = get_tenant_session()
 
-            return jsonify({
-                'success': True,
-                'schedule': schedule_data
-            })
+            student = db_session.query(
+                Student.full_name, Student.grade_level, Student.section_id, Student.parent_email, Section.name
+            ).outerjoin(
+                Section, Section.id == Student.section_id
+            ).filter(Student.id == student_id, Student.is_active == True).first()
+
+            caller_email = (g.current_user.get('email') or '').strip().lower()
+            if not student or not caller_email or (student.parent_email or '').strip().lower() != caller_email:
+                # Same answer for unknown and foreign students so ids cannot be probed
+                return jsonify({'error': 'Student not found'}), 404
+
+            def render():
+                # The student's timetable is their section's timetable
+                timetable = load_timetable(db_session, 'section', student.section_id)
+
+                return {
+                    'success': True,
+                    'schedule': {
+                        'student_info': {
+                            'name': student.full_name,
+                            'grade': student.grade_level,
+                            'section': student.name
+                        },
+                        'schedule': day_lists(timetable)
+                    }
+                }, 200
+
+            return timetable_response(db_session.get_bind().url, 'parent', student_id, render)
 
         except Exception as e:
             return jsonify({'error': str(e)}), 500
+        finally:
+            if db_session is not None:
+                db_session.close()
 
     @app.route('/api/parent/student/<int:student_id>/exams')
     def get_student_exams(student_id):
@@ -1141,90 +1195,39 @@ def create_app(config_name='development'):
     def get_schedule_assignments():
         """Get schedule assignments for a specific view (section/teacher/classroom)"""
         from flask import jsonify, request
-        from src.models.tenant import get_tenant_session, ScheduleAssignment, TimePeriod
-        from sqlalchemy import and_
+        from src.models.tenant import get_tenant_session
+        from src.scheduling.timetables import TIMETABLE_VIEWS, load_timetable, keyed_cells
+        from src.scheduling.timetable_cache import timetable_response
 
+        db_session = None
         try:
             view_type = request.args.get('view_type', 'section')  # section, teacher, classroom
             target_id = request.args.get('target_id', type=int)
-            current_academic_year = '2025-2026'
 
             if not target_id:
                 return jsonify({'error': 'target_id is required'}), 400
+            if view_type not in TIMETABLE_VIEWS:
+                return jsonify({'error': f'Invalid view_type: {view_type}'}), 400
 
             db_session = get_tenant_session()
 
-            # Build query based on view type
-            query = db_session.query(ScheduleAssignment).filter(
-                and_(
-                    ScheduleAssignment.academic_year == current_academic_year,
-                    ScheduleAssignment.is_active == True
-                )
-            )
-
-            if view_type == 'section':
-                query = query.filter(ScheduleAssignment.section_id == target_id)
-            elif view_type == 'teacher':
-                query = query.filter(ScheduleAssignment.teacher_id == target_id)
-            elif view_type == 'classroom':
-                query = query.filter(ScheduleAssignment.classroom_id == target_id)
-
-            assignments = query.all()
-
-            # Get time periods for mapping (deduplicated)
-            time_periods_query = db_session.query(TimePeriod).filter(
-                and_(
-                    TimePeriod.academic_year == current_academic_year,
-                    TimePeriod.is_active == True
-                )
-            ).order_by(TimePeriod.display_order).all()
-
-            # Create mapping from all period IDs to canonical period info
-            period_mapping = {}
-            seen_periods = {}
-            for tp in time_periods_query:
-                key = f"{tp.period_name}_{tp.start_time}"
-                if key not in seen_periods:
-                    seen_periods[key] = tp
-                    canonical_period = tp
-                else:
-                    canonical_period = seen_periods[key]
-
-                period_mapping[tp.id] = canonical_period
+            def render():
+                # Joined projection; cells keyed by day and canonical period
+                timetable = load_timetable(db_session, view_type, target_id)
+                return {
+                    'success': True,
+                    'schedule_data': keyed_cells(timetable),
+                    'view_type': view_type,
+                    'target_id': target_id
+                }, 200
 
-            # Format assignments for frontend
-            schedule_data = {}
-            for assignment in assignments:
-                try:
-                    # Map to canonical period
-                    canonical_period = period_mapping.get(assignment.time_period_id)
-                    if not canonical_period:
-                        continue
-
-                    key = f"{assignment.day_of_week.value}_{canonical_period.id}"
-                    schedule_data[key] = {
-                        'id': assignment.id,
-                        'subject': assignment.subject.subject_name if assignment.subject else 'Unknown Subject',
-                        'teacher': assignment.teacher.teacher_name if assignment.teacher else 'Unknown Teacher',
-                        'classroom': assignment.classroom.name if assignment.classroom else 'Unknown Classroom',
-                        'section': assignment.section.name if assignment.section else 'Unknown Section',
-                        'assignment_type': assignment.assignment_type,
-                        'is_locked': assignment.is_locked,
-                        'conflict_status': assignment.conflict_status
-                    }
-                except Exception as e:
-                    # Skip assignments with missing relationships
-                    continue
-
-            return jsonify({
-                'success': True,
-                'schedule_data': schedule_data,
-                'view_type': view_type,
-                'target_id': target_id
-            })
+            return timetable_response(db_session.get_bind().url, f'assignments:{view_type}', target_id, render)
 
         except Exception as e:
             return jsonify({'error': f"Failed to load assignments: {str(e)}"}), 500
+        finally:
+            if db_session is not None:
+                db_session.close()
 
     @app.route('/api/schedule/assignments', methods=['POST'])
     def create_schedule_assignment():
@@ -1441,67 +1444,297 @@ def create_app(config_name='development'):
         finally:
             db_session.close()
 
+    @app.route('/api/schedule/conflicts/check-batch', methods=['POST'])
+    def check_schedule_conflicts_batch():
+        """Check many proposed assignments (a pasted or dragged block) in one request"""
+        from flask import jsonify, request
+        from src.models.tenant import get_tenant_session
+        from src.scheduling.occupancy import get_occupancy_registry
+        from src.scheduling.services import MAX_BATCH_PROPOSALS, check_proposed_assignments
+
+        db_session = None
+        try:
+            data = request.get_json() or {}
+            proposals = data.get('proposals')
+
+            if not isinstance(proposals, list) or not proposals:
+                return jsonify({'error': 'proposals must be a non-empty list'}), 400
+            if len(proposals) > MAX_BATCH_PROPOSALS:
+                return jsonify({'error': f'At most {MAX_BATCH_PROPOSALS} proposals per request'}), 400
+            if not all(isinstance(proposal, dict) for proposal in proposals):
+                return jsonify({'error': 'Each proposal must be an object'}), 400
+
+            db_session = get_tenant_session()
+
+            # One bulk occupancy load (cached between requests) serves the whole batch
+            index = get_occupancy_registry().get_index(db_session)
+            results = check_proposed_assignments(index, proposals)
+
+            return jsonify({
+                'success': True,
+                'has_conflicts': any(r.get('has_conflicts') or 'error' in r for r in results),
+                'results': results,
+                'summary': {
+                    'proposals': len(results),
+                    'with_conflicts': sum(1 for r in results if r.get('has_conflicts')),
+                    'invalid': sum(1 for r in results if 'error' in r)
+                }
+            })
+
+        except Exception as e:
+            return jsonify({'error': f"Failed to check conflicts: {str(e)}"}), 500
+        finally:
+            if db_session is not None:
+                db_session.close()
+
+    @app.route('/api/schedule/free-slots', methods=['POST'])
+    def find_free_schedule_slots():
+        """Find slots where teachers, sections and a suitable room are all free"""
+        from flask import jsonify, request
+        from src.models.tenant import get_tenant_session
+        from src.scheduling.occupancy import get_occupancy_registry
+        from src.scheduling.free_slots import find_free_slots
+
+        db_session = None
+        try:
+            data = request.get_json() or {}
+            teacher_ids = [int(i) for i in data.get('teacher_ids') or []]
+            section_ids = [int(i) for i in data.get('section_ids') or []]
+            classroom_ids = data.get('classroom_ids')
+
+            if not teacher_ids and not section_ids:
+                return jsonify({'error': 'Provide at least one of teacher_ids or section_ids'}), 400
+
+            db_session = get_tenant_session()
+            index = get_occupancy_registry().get_index(db_session)
+
+            slots = find_free_slots(
+                index,
+                teacher_ids=teacher_ids,
+                section_ids=section_ids,
+                classroom_ids=[int(i) for i in classroom_ids] if classroom_ids else None,
+                room_type=data.get('room_type'),
+                min_capacity=data.get('min_capacity'),
+                limit=data.get('limit')
+            )
+
+            return jsonify({
+                'success': True,
+                'slots': slots,
+                'total_slots': len(slots)
+            })
+
+        except (TypeError, ValueError) as e:
+            return jsonify({'error': f"Invalid free-slot request: {str(e)}"}), 400
+        except Exception as e:
+            return jsonify({'error': f"Failed to find free slots: {str(e)}"}), 500
+        finally:
+            if db_session is not None:
+                db_session.close()
+
+    @app.route('/api/schedule/assignments/<int:assignment_id>/suggestions', methods=['GET'])
+    def suggest_assignment_changes(assignment_id):
+        """Ranked valid moves, room changes, substitutions and swaps for an assignment"""
+        from flask import jsonify, request
+        from src.models.tenant import get_tenant_session, ScheduleChangeRequest
+        from src.scheduling.occupancy import get_occupancy_registry
+        from src.scheduling.suggestions import SUGGESTION_KINDS, suggest_changes, change_request_proposal
+
+        db_session = None
+        try:
+            db_session = get_tenant_session()
+
+            # Optionally rank candidates against a teacher's change request
+            proposal = None
+            change_request_id = request.args.get('change_request_id', type=int)
+            if change_request_id:
+                change_request = db_session.get(ScheduleChangeRequest, change_request_id)
+                if not change_request or change_request.assignment_id != assignment_id:
+                    return jsonify({'error': 'Change request not found for this assignment'}), 404
+                proposal = change_request_proposal(change_request)
+
+            kinds = request.args.get('kinds')
+            kinds = [kind.strip() for kind in kinds.split(',') if kind.strip()] if kinds else SUGGESTION_KINDS
+
+            index = get_occupancy_registry().get_index(db_session)
+            if index.assignment(assignment_id) is None:
+                return jsonify({'error': 'Assignment not found'}), 404
+
+            suggestions = suggest_changes(
+                index, assignment_id, proposal=proposal, kinds=kinds,
+                limit=min(request.args.get('limit', 20, type=int), 200)
+            )
+
+            return jsonify({
+                'success': True,
+                'assignment_id': assignment_id,
+                'change_request_id': change_request_id,
+                'suggestions': suggestions,
+                'total_suggestions': len(suggestions)
+            })
+
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'error': f"Failed to suggest changes: {str(e)}"}), 500
+        finally:
+            if db_session is not None:
+                db_session.close()
+
+    @app.route('/api/schedule/simulations', methods=['POST'])
+    def create_schedule_simulation():
+        """Open a what-if session over the active schedule, optionally applying a first batch"""
+        from flask import jsonify, request
+        from src.models.tenant import get_tenant_session
+        from src.scheduling.occupancy import get_occupancy_registry, tenant_key
+        from src.scheduling.simulation import get_simulations
+
+        db_session = None
+        try:
+            data = request.get_json(silent=True) or {}
+            db_session = get_tenant_session()
+            index = get_occupancy_registry().get_index(db_session)
+            simulation = get_simulations().create(tenant_key(db_session.get_bind().url), index)
+
+            response = {'success': True, 'session_id': simulation.id}
+            if data.get('changes'):
+                response['result'] = simulation.apply(data['changes'])
+            response['summary'] = simulation.summary()
+            return jsonify(response), 201
+
+        except (TypeError, ValueError) as e:
+            return jsonify({'error': f"Invalid simulation change: {str(e)}"}), 400
+        except Exception as e:
+            return jsonify({'error': f"Failed to create simulation: {str(e)}"}), 500
+        finally:
+            if db_session is not None:
+                db_session.close()
+
+    def _simulation_session(session_id):
+        """Open simulation of the current tenant, or None"""
+        from src.models.tenant import get_tenant_session
+        from src.scheduling.occupancy import tenant_key
+        from src.scheduling.simulation import get_simulations
+
+        db_session = get_tenant_session()
+        try:
+            return get_simulations().get(tenant_key(db_session.get_bind().url), session_id)
+        finally:
+            db_session.close()
+
+    @app.route('/api/schedule/simulations/<session_id>', methods=['GET'])
+    def get_schedule_simulation(session_id):
+        """Summary, net changes and conflicts of a what-if session"""
+        from flask import jsonify
+
+        try:
+            simulation = _simulation_session(session_id)
+            if simulation is None:
+                return jsonify({'error': 'Simulation not found'}), 404
+
+            return jsonify({
+                'success': True,
+                'summary': simulation.summary(),
+                'changes': simulation.changes(),
+                'conflicts': simulation.conflicts()
+            })
+
+        except Exception as e:
+            return jsonify({'error': f"Failed to get simulation: {str(e)}"}), 500
+
+    @app.route('/api/schedule/simulations/<session_id>/changes', methods=['POST'])
+    def apply_simulation_changes(session_id):
+        """Apply a batch of proposed changes and return its validation delta"""
+        from flask import jsonify, request
+
+        try:
+            data = request.get_json() or {}
+            if not data.get('changes'):
+                return jsonify({'error': 'Provide a non-empty changes list'}), 400
+
+            simulation = _simulation_session(session_id)
+            if simulation is None:
+                return jsonify({'error': 'Simulation not found'}), 404
+
+            return jsonify({'success': True, 'result': simulation.apply(data['changes'])})
+
+        except (TypeError, ValueError) as e:
+            return jsonify({'error': f"Invalid simulation change: {str(e)}"}), 400
+        except Exception as e:
+            return jsonify({'error': f"Failed to apply simulation changes: {str(e)}"}), 500
+
+    @app.route('/api/schedule/simulations/<session_id>/undo', methods=['POST'])
+    def undo_simulation_changes(session_id):
+        """Revert the last applied batch of a what-if session"""
+        from flask import jsonify
+
+        try:
+            simulation = _simulation_session(session_id)
+            if simulation is None:
+                return jsonify({'error': 'Simulation not found'}), 404
+
+            return jsonify({'success': True, 'summary': simulation.undo()})
+
+        except Exception as e:
+            return jsonify({'error': f"Failed to undo simulation changes: {str(e)}"}), 500
+
+    @app.route('/api/schedule/simulations/<session_id>', methods=['DELETE'])
+    def discard_schedule_simulation(session_id):
+        """Close a what-if session"""
+        from flask import jsonify
+        from src.models.tenant import get_tenant_session
+        from src.scheduling.occupancy import tenant_key
+        from src.scheduling.simulation import get_simulations
+
+        db_session = None
+        try:
+            db_session = get_tenant_session()
+            if not get_simulations().discard(tenant_key(db_session.get_bind().url), session_id):
+                return jsonify({'error': 'Simulation not found'}), 404
+            return jsonify({'success': True, 'message': 'Simulation discarded'})
+
+        except Exception as e:
+            return jsonify({'error': f"Failed to discard simulation: {str(e)}"}), 500
+        finally:
+            if db_session is not None:
+                db_session.close()
+
     def check_assignment_conflicts(db_session, teacher_id, classroom_id, day_of_week,
                                  time_period_id, academic_year, exclude_assignment_id=None):
-        """Helper function to check for assignment conflicts"""
-        from src.models.tenant import ScheduleAssignment, Teacher, TimePeriod, DayOfWeek
-        from sqlalchemy import and_, or_
+        """Helper function to check for assignment conflicts (served by the occupancy index)"""
+        from src.models.tenant import Teacher
+        from src.scheduling.occupancy import get_occupancy_registry
 
         conflicts = []
-
-        # Check teacher conflict
-        teacher_query = db_session.query(ScheduleAssignment).filter(
-            and_(
-                ScheduleAssignment.teacher_id == teacher_id,
-                ScheduleAssignment.day_of_week == DayOfWeek(day_of_week),
-                ScheduleAssignment.time_period_id == time_period_id,
-                ScheduleAssignment.academic_year == academic_year,
-                ScheduleAssignment.is_active == True
-            )
+        index = get_occupancy_registry().get_index(db_session)
+
+        clashes = index.find_conflicts(
+            teacher_id=teacher_id,
+            classroom_id=classroom_id,
+            day=day_of_week,
+            time_period_id=time_period_id,
+            exclude_assignment_id=exclude_assignment_id
         )
 
-        if exclude_assignment_id:
-            teacher_query = teacher_query.filter(ScheduleAssignment.id != exclude_assignment_id)
-
-        teacher_conflict = teacher_query.first()
-        if teacher_conflict:
+        # Check teacher conflict
+        if 'teacher' in clashes:
             teacher = db_session.query(Teacher).get(teacher_id)
             conflicts.append({
                 'type': 'teacher_conflict',
                 'message': f'Teacher {teacher.teacher_name if teacher else "Unknown"} is already assigned at this time',
-                'existing_assignment_id': teacher_conflict.id
+                'existing_assignment_id': clashes['teacher']
             })
 
         # Check classroom conflict
-        classroom_query = db_session.query(ScheduleAssignment).filter(
-            and_(
-                ScheduleAssignment.classroom_id == classroom_id,
-                ScheduleAssignment.day_of_week == DayOfWeek(day_of_week),
-                ScheduleAssignment.time_period_id == time_period_id,
-                ScheduleAssignment.academic_year == academic_year,
-                ScheduleAssignment.is_active == True
-            )
-        )
-
-        if exclude_assignment_id:
-            classroom_query = classroom_query.filter(ScheduleAssignment.id != exclude_assignment_id)
-
-        classroom_conflict = classroom_query.first()
-        if classroom_conflict:
+        if 'classroom' in clashes:
             conflicts.append({
                 'type': 'classroom_conflict',
                 'message': f'Classroom is already occupied at this time',
-                'existing_assignment_id': classroom_conflict.id
+                'existing_assignment_id': clashes['classroom']
             })
 
         # Check teacher workload (Venezuelan regulation: max 40 hours/week)
-        teacher_weekly_hours = db_session.query(ScheduleAssignment).join(TimePeriod).filter(
-            and_(
-                ScheduleAssignment.teacher_id == teacher_id,
-                ScheduleAssignment.academic_year == academic_year,
-                ScheduleAssignment.is_active == True
-            )
-        ).count() * 0.67  # Approximate hours per period (40 min = 0.67 hours)
+        teacher_weekly_hours = index.teacher_load(teacher_id) * 0.67  # Approximate hours per period (40 min = 0.67 hours)
 
         if teacher_weekly_hours >= 40:
             teacher = db_session.query(Teacher).get(teacher_id)
@@ -1682,7 +1915,6 @@ def create_app(config_name='development'):
             generation_type = data.get('generation_type', 'fill_gaps')
             view_type = data.get('view_type', 'section')
             target_id = data.get('target_id')
-            academic_year = data.get('academic_year', '2025-2026')
             preserve_existing = data.get('preserve_existing', True)
 
             if not target_id:
@@ -1720,166 +1952,55 @@ def create_app(config_name='development'):
 
     @app.route('/api/schedule/validate/venezuelan-k12', methods=['POST'])
     def validate_venezuelan_k12_compliance():
-        """Validate schedule against Venezuelan K12 education regulations"""
+        """
+        Validate schedule against Venezuelan K12 education regulations
+
+        Covers the tenant's active lessons (the shared timetable tensor); the
+        report is not split by academic year.
+        """
         from flask import jsonify, request
-        from src.models.tenant import get_tenant_session, ScheduleAssignment, Teacher, Section
-        from sqlalchemy import and_, func
+        from src.models.tenant import get_tenant_session
+        from src.scheduling.compliance import COMPLIANCE_RULES, compliance_report
+        from src.scheduling.timetable_tensor import get_shared_timetable
 
+        db_session = None
         try:
-            data = request.get_json()
+            data = request.get_json() or {}
             view_type = data.get('view_type', 'section')
             target_id = data.get('target_id')
-            academic_year = data.get('academic_year', '2025-2026')
 
-            if not target_id:
+            if not target_id and view_type != 'school':
                 return jsonify({'error': 'target_id is required'}), 400
 
             db_session = get_tenant_session()
-            violations = []
-
-            # Venezuelan K12 Compliance Rules
 
-            # Rule 1: Teacher workload limit (40 hours/week)
-            teacher_workloads = db_session.query(
-                ScheduleAssignment.teacher_id,
-                func.count(ScheduleAssignment.id).label('assignments_count')
-            ).filter(
-                and_(
-                    ScheduleAssignment.academic_year == academic_year,
-                    ScheduleAssignment.is_active == True
+            # All rules run in one vectorized pass over the shared timetable tensor
+            try:
+                report = compliance_report(
+                    get_shared_timetable(db_session), view_type, target_id,
+                    data.get('rules') or COMPLIANCE_RULES
                 )
-            ).group_by(ScheduleAssignment.teacher_id).all()
-
-            for teacher_id, assignments_count in teacher_workloads:
-                weekly_hours = assignments_count * 0.67  # 40 min periods = 0.67 hours
-                if weekly_hours > 40:
-                    teacher = db_session.query(Teacher).get(teacher_id)
-                    violations.append({
-                        'type': 'workload_violation',
-                        'severity': 'critical',
-                        'message': f'Profesor {teacher.teacher_name if teacher else "Unknown"} excede límite de 40 horas ({weekly_hours:.1f} horas)',
-                        'regulation': 'Resolución 058 del Ministerio de Educación',
-                        'teacher_id': teacher_id,
-                        'current_hours': weekly_hours,
-                        'max_hours': 40
-                    })
-
-            # Rule 2: Minimum break periods
-            # Venezuelan regulation requires minimum 20-minute break every 2 hours
-            all_assignments = db_session.query(ScheduleAssignment).filter(
-                and_(
-                    ScheduleAssignment.academic_year == academic_year,
-                    ScheduleAssignment.is_active == True
-                )
-            ).all() if view_type != 'section' else db_session.query(ScheduleAssignment).filter(
-                and_(
-                    ScheduleAssignment.section_id == target_id,
-                    ScheduleAssignment.academic_year == academic_year,
-                    ScheduleAssignment.is_active == True
-                )
-            ).all()
-
-            # Rule 3: Subject distribution requirements
-            # Each section should have minimum hours for core subjects
-            core_subjects_requirements = {
-                'MATEMÁTICAS': 5,  # Minimum 5 periods per week
-                'CASTELLANO Y LITERATURA': 4,
-                'CIENCIAS DE LA TIERRA': 3,
-                'INGLÉS': 3,
-                'EDUCACIÓN FÍSICA': 2
-            }
-
-            if view_type == 'section':
-                section_subjects = {}
-                for assignment in all_assignments:
-                    if assignment.subject and assignment.subject.subject_name:
-                        subject_name = assignment.subject.subject_name.upper()
-                        section_subjects[subject_name] = section_subjects.get(subject_name, 0) + 1
-
-                for subject, min_periods in core_subjects_requirements.items():
-                    current_periods = section_subjects.get(subject, 0)
-                    if current_periods < min_periods:
-                        violations.append({
-                            'type': 'subject_deficiency',
-                            'severity': 'warning',
-                            'message': f'Materia {subject} tiene {current_periods} períodos (mínimo requerido: {min_periods})',
-                            'regulation': 'Currículo Básico Nacional de Venezuela',
-                            'subject': subject,
-                            'current_periods': current_periods,
-                            'required_periods': min_periods
-                        })
-
-            # Rule 4: Bimodal schedule compliance
-            # Check that schedule respects Venezuelan bimodal structure (morning/afternoon)
-            morning_periods = [assignment for assignment in all_assignments
-                             if assignment.time_period and assignment.time_period.start_time.hour < 12]
-            afternoon_periods = [assignment for assignment in all_assignments
-                               if assignment.time_period and assignment.time_period.start_time.hour >= 13]
-
-            if len(afternoon_periods) > 0 and len(morning_periods) == 0:
-                violations.append({
-                    'type': 'bimodal_violation',
-                    'severity': 'warning',
-                    'message': 'Horario solo usa sesión vespertina. Se recomienda usar sesión matutina.',
-                    'regulation': 'Resolución 751 - Organización del Año Escolar',
-                    'morning_periods': len(morning_periods),
-                    'afternoon_periods': len(afternoon_periods)
-                })
-
-            # Rule 5: Grade-appropriate content
-            if view_type == 'section':
-                section = db_session.query(Section).get(target_id)
-                if section and section.grade_level:
-                    grade = section.grade_level
-
-                    # Check if subjects are appropriate for grade level
-                    inappropriate_subjects = []
-                    for assignment in all_assignments:
-                        if assignment.subject:
-                            subject_name = assignment.subject.subject_name.upper()
-
-                            # Example: Advanced subjects not appropriate for lower grades
-                            if grade <= 6 and any(advanced in subject_name for advanced in ['FÍSICA', 'QUÍMICA', 'BIOLOGÍA']):
-                                inappropriate_subjects.append(subject_name)
-
-                    if inappropriate_subjects:
-                        violations.append({
-                            'type': 'grade_content_mismatch',
-                            'severity': 'warning',
-                            'message': f'Materias {", ".join(set(inappropriate_subjects))} no son apropiadas para grado {grade}',
-                            'regulation': 'Diseño Curricular del Sistema Educativo Bolivariano',
-                            'grade': grade,
-                            'inappropriate_subjects': list(set(inappropriate_subjects))
-                        })
-
-            # Calculate compliance score
-            total_rules_checked = 5
-            critical_violations = len([v for v in violations if v['severity'] == 'critical'])
-            warning_violations = len([v for v in violations if v['severity'] == 'warning'])
-
-            compliance_score = max(0, 100 - (critical_violations * 20) - (warning_violations * 10))
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
 
             return jsonify({
                 'success': True,
-                'compliance_score': compliance_score,
-                'violations': violations,
-                'summary': {
-                    'total_violations': len(violations),
-                    'critical_violations': critical_violations,
-                    'warning_violations': warning_violations,
-                    'rules_checked': total_rules_checked,
-                    'is_compliant': len(violations) == 0
-                },
-                'recommendations': generate_compliance_recommendations(violations)
+                'compliance_score': report['compliance_score'],
+                'violations': report['violations'],
+                'summary': report['summary'],
+                'recommendations': generate_compliance_recommendations(report['violations'])
             })
 
         except Exception as e:
             return jsonify({'error': f"Failed to validate compliance: {str(e)}"}), 500
         finally:
-            db_session.close()
+            if db_session is not None:
+                db_session.close()
 
     def generate_compliance_recommendations(violations):
         """Generate actionable recommendations based on violations"""
+        from src.scheduling.compliance import MIN_BREAK_MINUTES
+
         recommendations = []
 
         for violation in violations:
@@ -1897,6 +2018,15 @@ def create_app(config_name='development'):
             elif violation['type'] == 'grade_content_mismatch':
                 recommendations.append(f"Revisar contenido curricular para grado {violation.get('grade', 'Unknown')}")
 
+            elif violation['type'] == 'daily_hours_violation':
+                recommendations.append(f"Reducir las horas de la sección {violation.get('section_name', 'Unknown')} el {violation.get('day', '')}")
+
+            elif violation['type'] in ('consecutive_hours_violation', 'missing_break'):
+                recommendations.append(f"Intercalar un receso de al menos {MIN_BREAK_MINUTES} minutos el {violation.get('day', '')}")
+
+            elif violation['type'] == 'break_occupied':
+                recommendations.append(f"Mover la clase fuera del receso del {violation.get('day', '')}")
+
         # Add general recommendations
         if not recommendations:
             recommendations.append("¡Excelente! El horario cumple con todas las regulaciones venezolanas K12")
@@ -1911,6 +2041,16 @@ def create_app(config_name='development'):
     def health_check():
         return {'status': 'healthy', 'platform': 'BiScheduler'}
 
+    # Tenant connection pool statistics
+    from src.auth.decorators import jwt_required, platform_admin_required
+
+    @app.route('/health/pools')
+    @jwt_required
+    @platform_admin_required
+    def pool_statistics():
+        from src.core.engine_registry import get_engine_registry
+        return get_engine_registry().stats()
+
     # Venezuelan education info endpoint
     @app.route('/info')
     def platform_info():
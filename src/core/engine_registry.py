@@ -0,0 +1,201 @@
+"""
+BiScheduler Tenant Engine Registry
+Process-wide, bounded connection pools per tenant database
+Prevents per-request engine creation from exhausting MySQL max_connections
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import sessionmaker
+
+
+logger = logging.getLogger(__name__)
+
+
+class _TenantPool:
+    """Engine and session factory for one tenant database"""
+
+    def __init__(self, engine: Engine, session_factory: sessionmaker):
+        self.engine = engine
+        self.session_factory = session_factory
+        self.created_at = time.time()
+        self.last_used = self.created_at
+        self.checkouts = 0
+
+    def checked_out(self) -> int:
+        checkedout = getattr(self.engine.pool, 'checkedout', None)
+        return checkedout() if callable(checkedout) else 0
+
+
+class TenantEngineRegistry:
+    """
+    One engine and sessionmaker per tenant database URL, shared by all requests
+
+    Each pool is bounded (pool_size + max_overflow connections). When more than
+    max_engines tenant databases are open, the least recently used pool with no
+    checked-out connections is disposed; pools unused for max_idle_seconds are
+    disposed as well.
+    """
+
+    def __init__(self,
+                 max_engines: int = 32,
+                 pool_size: int = 5,
+                 max_overflow: int = 5,
+                 pool_timeout: int = 10,
+                 pool_recycle: int = 120,
+                 max_idle_seconds: float = 900):
+        self.max_engines = max_engines
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.pool_timeout = pool_timeout
+        self.pool_recycle = pool_recycle
+        self.max_idle_seconds = max_idle_seconds
+
+        self._lock = threading.RLock()
+        self._pools: "OrderedDict[str, _TenantPool]" = OrderedDict()
+        self._created = 0
+        self._evicted = 0
+
+    def get_engine(self, db_url: str) -> Engine:
+        """Get (or create) the shared engine for a tenant database"""
+        return self._get_pool(db_url).engine
+
+    def get_sessionmaker(self, db_url: str) -> sessionmaker:
+        """Get (or create) the shared session factory for a tenant database"""
+        return self._get_pool(db_url).session_factory
+
+    def session(self, db_url: str):
+        """Open a new session on the tenant's shared pool"""
+        return self.get_sessionmaker(db_url)()
+
+    def dispose(self, db_url: str = None):
+        """Dispose one tenant pool, or all pools when no URL is given"""
+        with self._lock:
+            urls = [db_url] if db_url else list(self._pools.keys())
+            for url in urls:
+                pool = self._pools.pop(url, None)
+                if pool:
+                    pool.engine.dispose()
+
+    def stats(self) -> Dict[str, any]:
+        """Pool usage per tenant database (passwords masked)"""
+        with self._lock:
+            pools = {}
+            for url, pool in self._pools.items():
+                engine_pool = pool.engine.pool
+                pools[make_url(url).render_as_string(hide_password=True)] = {
+                    'size': self._call(engine_pool, 'size'),
+                    'checked_in': self._call(engine_pool, 'checkedin'),
+                    'checked_out': self._call(engine_pool, 'checkedout'),
+                    'overflow': self._call(engine_pool, 'overflow'),
+                    'sessions_opened': pool.checkouts,
+                    'idle_seconds': round(time.time() - pool.last_used, 1)
+                }
+
+            return {
+                'engines': len(self._pools),
+                'max_engines': self.max_engines,
+                'pool_size': self.pool_size,
+                'max_overflow': self.max_overflow,
+                'engines_created': self._created,
+                'engines_evicted': self._evicted,
+                'pools': pools
+            }
+
+    @staticmethod
+    def _call(pool, name: str):
+        method = getattr(pool, name, None)
+        return method() if callable(method) else None
+
+    def _get_pool(self, db_url: str) -> _TenantPool:
+        with self._lock:
+            pool = self._pools.get(db_url)
+            if pool is None:
+                pool = self._create_pool(db_url)
+                self._pools[db_url] = pool
+            else:
+                self._pools.move_to_end(db_url)
+
+            pool.last_used = time.time()
+            pool.checkouts += 1
+            self._evict_idle()
+            return pool
+
+    def _create_pool(self, db_url: str) -> _TenantPool:
+        if make_url(db_url).get_backend_name() == 'sqlite':
+            # SQLite uses its own single-connection pools
+            engine = create_engine(db_url)
+        else:
+            engine = create_engine(
+                db_url,
+                pool_size=self.pool_size,
+                max_overflow=self.max_overflow,
+                pool_timeout=self.pool_timeout,
+                pool_recycle=self.pool_recycle,
+                pool_pre_ping=True
+            )
+
+        session_factory = sessionmaker(bind=engine)
+
+        self._created += 1
+        logger.info(f"Created tenant engine for {make_url(db_url).render_as_string(hide_password=True)}")
+        return _TenantPool(engine, session_factory)
+
+    def _evict_idle(self):
+        """
+        Dispose pools without active connections that are idle too long or
+        least recently used beyond max_engines (caller holds the lock)
+        """
+        idle_before = time.time() - self.max_idle_seconds
+        # Never evict the most recently used (just requested) pool
+        for url in list(self._pools.keys())[:-1]:
+            pool = self._pools[url]
+            if len(self._pools) <= self.max_engines and pool.last_used > idle_before:
+                # Pools are in LRU order: the rest were used more recently
+                break
+            if pool.checked_out() == 0:
+                del self._pools[url]
+                pool.engine.dispose()
+                self._evicted += 1
+
+        if len(self._pools) > self.max_engines:
+            logger.warning(f"Tenant engine registry over capacity: {len(self._pools)} pools in use")
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def configure_engine_registry(config: Dict) -> TenantEngineRegistry:
+    """Create the process-wide registry from application config"""
+    global _registry
+
+    with _registry_lock:
+        if _registry is not None:
+            _registry.dispose()
+
+        _registry = TenantEngineRegistry(
+            max_engines=config.get('TENANT_POOL_MAX_ENGINES', 32),
+            pool_size=config.get('TENANT_POOL_SIZE', 5),
+            max_overflow=config.get('TENANT_POOL_MAX_OVERFLOW', 5),
+            pool_timeout=config.get('TENANT_POOL_TIMEOUT', 10),
+            pool_recycle=config.get('TENANT_POOL_RECYCLE', 120),
+            max_idle_seconds=config.get('TENANT_POOL_MAX_IDLE_SECONDS', 900)
+        )
+        return _registry
+
+
+def get_engine_registry() -> TenantEngineRegistry:
+    """Get the process-wide tenant engine registry (defaults if not configured)"""
+    global _registry
+
+    with _registry_lock:
+        if _registry is None:
+            _registry = TenantEngineRegistry()
+        return _registry
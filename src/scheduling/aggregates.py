@@ -0,0 +1,212 @@
+"""
+BiScheduler Dashboard Aggregates
+Teacher workload, conflict and section completion figures from grouped queries
+Projected columns only; results are materialized per schedule version
+"""
+
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import and_, case, func, select
+
+from src.models.tenant import ScheduleAssignment, ScheduleConflict, Section, Teacher
+from src.scheduling.occupancy import tenant_key
+from src.scheduling.timetable_cache import get_timetable_cache
+
+
+DEFAULT_MAX_WEEKLY_HOURS = 40
+
+# Estimated weekly slots per section (5 days x 8 periods)
+EXPECTED_SECTION_ASSIGNMENTS = 40
+
+
+def teacher_workloads(session) -> List[Dict]:
+    """
+    Weekly hours and distinct subjects of every active teacher (one grouped query)
+
+    Each active assignment represents one period per week.
+    """
+    rows = session.query(
+        Teacher.id,
+        Teacher.teacher_name,
+        Teacher.max_weekly_hours,
+        func.count(ScheduleAssignment.id).label('current_hours'),
+        func.count(func.distinct(ScheduleAssignment.subject_id)).label('subjects_count')
+    ).outerjoin(
+        ScheduleAssignment,
+        and_(ScheduleAssignment.teacher_id == Teacher.id, ScheduleAssignment.is_active == True)
+    ).filter(
+        Teacher.is_active == True
+    ).group_by(
+        Teacher.id, Teacher.teacher_name, Teacher.max_weekly_hours
+    ).order_by(Teacher.teacher_name).all()
+
+    return [{
+        'teacher_id': row.id,
+        'name': row.teacher_name,
+        'current_hours': row.current_hours,
+        'max_hours': row.max_weekly_hours or DEFAULT_MAX_WEEKLY_HOURS,
+        'subjects_count': row.subjects_count
+    } for row in rows]
+
+
+def workload_alert(workload: Dict) -> Optional[Dict]:
+    """Overload / underutilization alert for one teacher workload, if any"""
+    current_hours = workload['current_hours']
+    max_hours = workload['max_hours']
+    alert = {
+        'teacher_id': workload['teacher_id'],
+        'teacher_name': workload['name'],
+        'current_hours': current_hours,
+        'max_hours': max_hours
+    }
+
+    if current_hours > max_hours:
+        alert.update({
+            'alert_type': 'overloaded',
+            'excess_hours': current_hours - max_hours,
+            'severity': 'critical' if current_hours > max_hours * 1.2 else 'warning'
+        })
+        return alert
+
+    if current_hours < max_hours * 0.5:
+        alert.update({
+            'alert_type': 'underutilized',
+            'utilization_percentage': round((current_hours / max_hours * 100), 1),
+            'severity': 'info'
+        })
+        return alert
+
+    return None
+
+
+def workload_alerts(session) -> List[Dict]:
+    """Workload alerts for all active teachers"""
+    alerts = (workload_alert(workload) for workload in teacher_workloads(session))
+    return [alert for alert in alerts if alert]
+
+
+def workload_summary(session) -> Dict:
+    """Per-teacher utilization plus school-wide totals"""
+    teachers = []
+    total_utilization = 0
+    overloaded_count = 0
+    underutilized_count = 0
+
+    for workload in teacher_workloads(session):
+        max_hours = workload['max_hours']
+        current_hours = workload['current_hours']
+        utilization_pct = (current_hours / max_hours * 100) if max_hours > 0 else 0
+
+        is_overloaded = current_hours > max_hours
+        is_underutilized = utilization_pct < 50
+        overloaded_count += is_overloaded
+        underutilized_count += is_underutilized
+        total_utilization += utilization_pct
+
+        teachers.append({
+            'teacher_id': workload['teacher_id'],
+            'name': workload['name'],
+            'current_hours': current_hours,
+            'max_hours': max_hours,
+            'utilization_percentage': round(utilization_pct, 1),
+            'is_overloaded': is_overloaded,
+            'is_underutilized': is_underutilized,
+            'subjects_count': workload['subjects_count']
+        })
+
+    avg_utilization = total_utilization / len(teachers) if teachers else 0
+
+    return {
+        'teachers': teachers,
+        'summary': {
+            'total_teachers': len(teachers),
+            'overloaded_teachers': overloaded_count,
+            'underutilized_teachers': underutilized_count,
+            'average_utilization': round(avg_utilization, 1)
+        }
+    }
+
+
+def admin_overview(session) -> Dict:
+    """
+    Platform overview, critical conflicts, teacher alerts and section completion
+
+    Four grouped/projected queries regardless of school size.
+    """
+    total_assignments = select(func.count(ScheduleAssignment.id)).where(
+        ScheduleAssignment.is_active == True
+    ).scalar_subquery()
+
+    counts = session.query(
+        total_assignments.label('total_assignments'),
+        func.count(ScheduleConflict.id).label('total_conflicts'),
+        func.coalesce(func.sum(case((ScheduleConflict.severity == 'critical', 1), else_=0)), 0).label('critical')
+    ).select_from(ScheduleConflict).filter(ScheduleConflict.status == 'active').one()
+
+    recent_conflicts = session.query(
+        ScheduleConflict.id, ScheduleConflict.conflict_type,
+        ScheduleConflict.description, ScheduleConflict.detected_at
+    ).filter(
+        ScheduleConflict.severity == 'critical',
+        ScheduleConflict.status == 'active'
+    ).order_by(ScheduleConflict.detected_at.desc()).limit(5).all()
+
+    overloaded = [w for w in teacher_workloads(session) if w['current_hours'] > w['max_hours']]
+
+    sections = session.query(
+        Section.id, Section.name, func.count(ScheduleAssignment.id).label('assignments_count')
+    ).outerjoin(
+        ScheduleAssignment,
+        and_(ScheduleAssignment.section_id == Section.id, ScheduleAssignment.is_active == True)
+    ).filter(
+        Section.is_active == True
+    ).group_by(Section.id, Section.name).order_by(Section.id).all()
+
+    total = counts.total_assignments or 0
+    return {
+        'platform_overview': {
+            'total_assignments': total,
+            'total_conflicts': counts.total_conflicts,
+            'critical_conflicts': int(counts.critical),
+            'conflict_rate': round((counts.total_conflicts / total * 100) if total > 0 else 0, 2)
+        },
+        'critical_conflicts': [{
+            'id': conflict.id,
+            'type': conflict.conflict_type,
+            'description': conflict.description,
+            'detected_at': conflict.detected_at.isoformat() if conflict.detected_at else None
+        } for conflict in recent_conflicts],
+        'teacher_alerts': [{
+            'teacher_id': workload['teacher_id'],
+            'teacher_name': workload['name'],
+            'current_hours': workload['current_hours'],
+            'max_hours': workload['max_hours'],
+            'excess_hours': workload['current_hours'] - workload['max_hours']
+        } for workload in overloaded[:5]],
+        'schedule_completion': [{
+            'section_id': section.id,
+            'section_name': section.name,
+            'assignments_count': section.assignments_count,
+            'completion_percentage': min(100, round(
+                (section.assignments_count / EXPECTED_SECTION_ASSIGNMENTS * 100), 1
+            ))
+        } for section in sections]
+    }
+
+
+def cached_aggregate(db_url, name: str, build: Callable[[], object]):
+    """
+    Materialize an aggregate until the tenant's schedule version changes
+
+    Args:
+        db_url: Tenant database URL
+        name: Aggregate name, e.g. 'workload_summary'
+        build: Computes the aggregate (JSON-serializable)
+
+    Returns:
+        The cached or freshly built aggregate
+    """
+    payload, _, _ = get_timetable_cache().get_or_render(
+        tenant_key(db_url), f'aggregate:{name}', None, lambda: (build(), 200)
+    )
+    return payload
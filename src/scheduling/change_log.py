@@ -0,0 +1,289 @@
+"""
+BiScheduler Schedule Change Log
+Append-only log of assignment changes written in the changing transaction
+Clients sync incrementally by reading events after a sequence cursor
+"""
+
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import Session
+
+from src.models.tenant import (
+    ScheduleAssignment, ScheduleChangeEvent, Teacher, Subject, Section, Classroom, TimePeriod
+)
+from src.scheduling.occupancy import tenant_key
+
+
+logger = logging.getLogger(__name__)
+
+# Assignment columns whose changes are reported in changed_fields
+TRACKED_FIELDS = (
+    'schedule_id', 'teacher_id', 'subject_id', 'section_id', 'classroom_id',
+    'time_period_id', 'day_of_week', 'assignment_type', 'is_locked', 'notes'
+)
+
+# (event column, lookup model, name column, assignment id column)
+DISPLAY_NAMES = (
+    ('teacher_name', Teacher, Teacher.teacher_name, 'teacher_id'),
+    ('subject_name', Subject, Subject.subject_name, 'subject_id'),
+    ('section_name', Section, Section.name, 'section_id'),
+    ('classroom_name', Classroom, Classroom.name, 'classroom_id'),
+    ('time_period', TimePeriod, TimePeriod.period_name, 'time_period_id'),
+)
+
+# Newest events inspected for sequence gaps left by in-flight transactions
+GAP_WINDOW = 200
+
+# Session.info key holding this transaction's logged changes
+_PENDING_KEY = 'change_log_pending'
+
+# Seconds before a tenant database without the events table is inspected again
+MISSING_TABLE_RECHECK_SECONDS = 30
+
+_events_table = ScheduleChangeEvent.__table__
+# True once the table is found; a monotonic recheck deadline while it is missing
+_table_present: Dict[str, object] = {}
+_commit_subscribers: List[Callable[[str, List[Dict]], None]] = []
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _plain(value):
+    return value.value if hasattr(value, 'value') else value
+
+
+def _classify(session, assignment: ScheduleAssignment):
+    """
+    Classify a flushed assignment write
+
+    Returns:
+        (change_type, changed_fields) or None when nothing visible changed
+    """
+    if assignment in session.deleted:
+        return 'deleted', None
+    if assignment in session.new:
+        return ('created', None) if assignment.is_active is not False else None
+    if not session.is_modified(assignment, include_collections=False):
+        return None
+
+    attrs = inspect(assignment).attrs
+    active = attrs.is_active.history
+    if active.has_changes():
+        # Deactivation is how the API deletes; reactivation restores
+        return ('created', None) if assignment.is_active else ('deleted', None)
+    if assignment.is_active is False:
+        return None
+
+    changed = {}
+    for field in TRACKED_FIELDS:
+        history = attrs[field].history
+        if history.has_changes():
+            old = history.deleted[0] if history.deleted else None
+            changed[field] = [_plain(old), _plain(getattr(assignment, field))]
+    return ('updated', changed) if changed else None
+
+
+def _display_names(session, assignments) -> Dict[str, Dict[int, str]]:
+    """Look up display names for all touched entities, one query per kind"""
+    names = {}
+    for column, model, name_column, id_field in DISPLAY_NAMES:
+        ids = {getattr(assignment, id_field) for assignment in assignments} - {None}
+        names[column] = dict(session.execute(
+            select(model.id, name_column).where(model.id.in_(ids))
+        ).all()) if ids else {}
+    return names
+
+
+def _has_events_table(session) -> bool:
+    """
+    Whether the tenant database has the events table
+
+    A found table is remembered for the process; a missing one is inspected
+    again after MISSING_TABLE_RECHECK_SECONDS so a later migration is picked
+    up without a restart.
+    """
+    db_key = tenant_key(session.get_bind().url)
+    cached = _table_present.get(db_key)
+    if cached is True:
+        return True
+    if cached is not None and time.monotonic() < cached:
+        return False
+
+    present = inspect(session.connection()).has_table(_events_table.name)
+    if present:
+        _table_present[db_key] = True
+    else:
+        if cached is None:
+            logger.warning(f"{_events_table.name} missing in {db_key}; schedule changes are not logged")
+        _table_present[db_key] = time.monotonic() + MISSING_TABLE_RECHECK_SECONDS
+    return present
+
+
+def _keep_old_value(target, value, oldvalue, initiator):
+    return value
+
+
+def _after_flush(session, flush_context):
+    """Append one change event per assignment written in this flush"""
+    writes = []
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, ScheduleAssignment):
+            change = _classify(session, obj)
+            if change:
+                writes.append((obj, change))
+
+    if not writes:
+        return
+
+    names = _display_names(session, [assignment for assignment, _ in writes])
+    changed_by = session.info.get('changed_by')
+    now = _utcnow()
+
+    rows = []
+    for assignment, (change_type, changed_fields) in writes:
+        row = {
+            'assignment_id': assignment.id,
+            'change_type': change_type,
+            'changed_fields': json.dumps(changed_fields, default=str) if changed_fields else None,
+            'day_of_week': _plain(assignment.day_of_week),
+            'changed_by': changed_by or assignment.created_by,
+            'changed_at': now
+        }
+        for field in ('schedule_id', 'teacher_id', 'subject_id', 'section_id', 'classroom_id', 'time_period_id'):
+            row[field] = getattr(assignment, field)
+        for column, _, _, id_field in DISPLAY_NAMES:
+            row[column] = names[column].get(getattr(assignment, id_field))
+        rows.append(row)
+
+    # Handed to commit subscribers once the transaction commits
+    session.info.setdefault(_PENDING_KEY, []).extend(rows)
+
+    # Same connection and transaction as the assignment writes
+    if _has_events_table(session):
+        session.execute(_events_table.insert(), rows)
+
+
+def _after_commit(session):
+    rows = session.info.pop(_PENDING_KEY, None)
+    if not rows:
+        return
+    db_key = tenant_key(session.get_bind().url)
+    for callback in list(_commit_subscribers):
+        try:
+            callback(db_key, rows)
+        except Exception as e:
+            logger.error(f"Change log subscriber failed: {e}")
+
+
+def _after_rollback(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def subscribe_committed_changes(callback: Callable[[str, List[Dict]], None]):
+    """
+    Register a callback for committed assignment changes
+
+    Args:
+        callback: Called as callback(db_key, rows) after each commit, with
+            rows shaped like schedule_change_events rows (without id)
+    """
+    if callback not in _commit_subscribers:
+        _commit_subscribers.append(callback)
+
+
+def _settled_cursor(session, settle_seconds: float) -> Optional[int]:
+    """
+    Highest sequence id that is safe to hand out
+
+    Sequence ids are allocated at insert time, so a transaction still in
+    flight can leave a hole below events that are already visible. Events
+    above a recent hole are held back until it fills or settle_seconds pass
+    (rolled back transactions leave permanent holes).
+
+    Returns:
+        Upper bound for returned ids, or None when nothing is held back
+    """
+    if settle_seconds <= 0:
+        return None
+
+    recent = session.query(ScheduleChangeEvent.id, ScheduleChangeEvent.changed_at).order_by(
+        ScheduleChangeEvent.id.desc()
+    ).limit(GAP_WINDOW).all()
+
+    cutoff = _utcnow() - timedelta(seconds=settle_seconds)
+    previous = None
+    for event_id, changed_at in reversed(recent):
+        if previous is not None and event_id != previous + 1 and changed_at > cutoff:
+            return previous
+        previous = event_id
+    return None
+
+
+def fetch_changes(session, after: int = 0, limit: int = 50, section_id: int = None,
+                  teacher_id: int = None, settle_seconds: float = 5) -> Dict:
+    """
+    Read schedule change events after a cursor (keyset seek on the sequence id)
+
+    Args:
+        session: Database session
+        after: Last sequence id the client has seen
+        limit: Maximum number of events to return
+        section_id: Only changes for this section
+        teacher_id: Only changes for this teacher
+        settle_seconds: How long to wait for in-flight transactions to fill sequence holes
+
+    Returns:
+        Dictionary with changes, next_cursor and has_more. An empty page moves
+        the cursor past the settled events it scanned, so filtered clients do
+        not rescan unrelated events on every poll.
+    """
+    # Fix the scanned range before reading so later inserts are not skipped
+    settled = _settled_cursor(session, settle_seconds)
+    if settled is None:
+        settled = session.query(func.max(ScheduleChangeEvent.id)).scalar() or 0
+
+    query = session.query(ScheduleChangeEvent).filter(
+        ScheduleChangeEvent.id > after, ScheduleChangeEvent.id <= settled
+    )
+    if section_id is not None:
+        query = query.filter(ScheduleChangeEvent.section_id == section_id)
+    if teacher_id is not None:
+        query = query.filter(ScheduleChangeEvent.teacher_id == teacher_id)
+
+    events: List[ScheduleChangeEvent] = query.order_by(ScheduleChangeEvent.id).limit(limit + 1).all()
+    has_more = len(events) > limit
+    events = events[:limit]
+
+    return {
+        'changes': [change.to_dict() for change in events],
+        'next_cursor': events[-1].id if events else max(after, settled),
+        'has_more': has_more
+    }
+
+
+_installed = False
+_install_lock = threading.Lock()
+
+
+def install_change_log():
+    """Log assignment changes from every ORM session (idempotent)"""
+    global _installed
+
+    with _install_lock:
+        if _installed:
+            return
+        event.listen(Session, 'after_flush', _after_flush)
+        event.listen(Session, 'after_commit', _after_commit)
+        event.listen(Session, 'after_rollback', _after_rollback)
+        # Load previous values on set so updates of expired rows report them
+        for field in TRACKED_FIELDS + ('is_active',):
+            event.listen(getattr(ScheduleAssignment, field), 'set', _keep_old_value, active_history=True)
+        _installed = True
@@ -0,0 +1,351 @@
+"""
+BiScheduler Venezuelan K12 Compliance Engine
+Evaluates every regulation rule in one vectorized pass over the shared timetable tensor
+Uses real period durations and returns structured violations per teacher and section
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from src.scheduling.projections import DAYS
+from src.scheduling.timetable_tensor import EMPTY, Timetable
+
+
+COMPLIANCE_RULES = (
+    'workload', 'daily_hours', 'consecutive_hours', 'breaks',
+    'subject_quotas', 'bimodal', 'grade_content'
+)
+
+# Resolución 058: legal weekly teaching cap
+LEGAL_MAX_WEEKLY_HOURS = 40
+
+MAX_DAILY_SECTION_HOURS = 7
+
+# Minimum 20-minute rest after at most 2 hours of continuous classes
+MAX_CONTINUOUS_MINUTES = 120
+MIN_BREAK_MINUTES = 20
+
+# Minimum weekly periods per section for core subjects
+CORE_SUBJECT_PERIODS = {
+    'MATEMÁTICAS': 5,
+    'CASTELLANO Y LITERATURA': 4,
+    'CIENCIAS DE LA TIERRA': 3,
+    'INGLÉS': 3,
+    'EDUCACIÓN FÍSICA': 2
+}
+
+ADVANCED_SUBJECTS = ('FÍSICA', 'QUÍMICA', 'BIOLOGÍA')
+MAX_GRADE_FOR_BASIC_CONTENT = 6
+
+MORNING_END_MINUTES = 12 * 60
+AFTERNOON_START_MINUTES = 13 * 60
+
+CRITICAL_PENALTY = 20
+WARNING_PENALTY = 10
+
+
+def _hours(minutes) -> float:
+    return round(float(minutes) / 60, 2)
+
+
+def longest_continuous_minutes(timetable: Timetable, kind: str) -> np.ndarray:
+    """
+    Longest stretch of classes without a MIN_BREAK_MINUTES rest, per (resource, day)
+
+    Rest is any time not spent teaching: break periods, free periods and gaps
+    between periods all count. Vectorized over every resource and day; loops
+    only over the period rows of the day.
+    """
+    occupied = (getattr(timetable, f'{kind}_count') > 0) & ~timetable.period_is_break
+    size = occupied.shape[:2]
+    longest = np.zeros(size, dtype=np.int64)
+    if not timetable.period_count:
+        return longest
+
+    run = np.zeros(size, dtype=np.int64)
+    rest = np.full(size, MIN_BREAK_MINUTES, dtype=np.int64)
+    previous_end = None
+    for period in np.argsort(timetable.period_start, kind='stable'):
+        start = int(timetable.period_start[period])
+        minutes = int(timetable.period_minutes[period])
+        if previous_end is not None:
+            rest += max(0, start - previous_end)
+        previous_end = max(previous_end or 0, start + minutes)
+
+        busy = occupied[:, :, period]
+        run = np.where(busy, np.where(rest >= MIN_BREAK_MINUTES, 0, run) + minutes, run)
+        rest = np.where(busy, 0, rest + minutes)
+        np.maximum(longest, run, out=longest)
+    return longest
+
+
+class ComplianceEngine:
+    """Venezuelan K12 regulation rules over one timetable tensor"""
+
+    def __init__(self, timetable: Timetable, rules: Iterable[str] = COMPLIANCE_RULES):
+        rules = tuple(rules)
+        unknown = set(rules) - set(COMPLIANCE_RULES)
+        if unknown:
+            raise ValueError(f"Unknown compliance rules: {', '.join(sorted(unknown))}")
+        self.timetable = timetable
+        self.rules = rules
+
+    def evaluate(self) -> List[Dict]:
+        """All violations of the selected rules, in rule order"""
+        violations = []
+        for rule in self.rules:
+            violations.extend(getattr(self, f'_check_{rule}')())
+        return violations
+
+    # ------------------------------------------------------------------
+    # Rules
+    # ------------------------------------------------------------------
+
+    def _teacher(self, position: int) -> Dict:
+        axis = self.timetable.teachers
+        return {'teacher_id': axis.ids[position], 'teacher_name': axis.names[position] or 'Unknown'}
+
+    def _section(self, position: int) -> Dict:
+        axis = self.timetable.sections
+        return {'section_id': axis.ids[position], 'section_name': axis.names[position] or 'Unknown'}
+
+    def _check_workload(self) -> List[Dict]:
+        timetable = self.timetable
+        minutes = timetable.weekly_minutes('teacher')
+        limit = np.minimum(timetable.teacher_max_hours, LEGAL_MAX_WEEKLY_HOURS) * 60
+
+        violations = []
+        for position in np.flatnonzero(minutes > limit):
+            teacher = self._teacher(position)
+            legal = minutes[position] > LEGAL_MAX_WEEKLY_HOURS * 60
+            max_hours = int(limit[position] // 60)
+            violations.append({
+                'type': 'workload_violation',
+                'rule': 'workload',
+                'severity': 'critical' if legal else 'warning',
+                'message': f"Profesor {teacher['teacher_name']} excede límite de {max_hours} horas "
+                           f"({_hours(minutes[position]):.1f} horas)",
+                'regulation': 'Resolución 058 del Ministerio de Educación',
+                **teacher,
+                'current_hours': _hours(minutes[position]),
+                'max_hours': max_hours
+            })
+        return violations
+
+    def _check_daily_hours(self) -> List[Dict]:
+        minutes = self.timetable.daily_minutes('section')
+
+        violations = []
+        for position, day in np.argwhere(minutes > MAX_DAILY_SECTION_HOURS * 60):
+            section = self._section(position)
+            violations.append({
+                'type': 'daily_hours_violation',
+                'rule': 'daily_hours',
+                'severity': 'warning',
+                'message': f"Sección {section['section_name']} tiene {_hours(minutes[position, day]):.1f} horas "
+                           f"de clase el {DAYS[day].value} (máximo: {MAX_DAILY_SECTION_HOURS})",
+                'regulation': 'Resolución 751 - Organización del Año Escolar',
+                **section,
+                'day': DAYS[day].value,
+                'current_hours': _hours(minutes[position, day]),
+                'max_hours': MAX_DAILY_SECTION_HOURS
+            })
+        return violations
+
+    def _continuous(self, kind: str, rule: str, violation_type: str, subject: str) -> List[Dict]:
+        longest = longest_continuous_minutes(self.timetable, kind)
+        describe = self._teacher if kind == 'teacher' else self._section
+
+        violations = []
+        for position, day in np.argwhere(longest > MAX_CONTINUOUS_MINUTES):
+            entity = describe(position)
+            violations.append({
+                'type': violation_type,
+                'rule': rule,
+                'severity': 'warning',
+                'message': f"{subject} {entity[f'{kind}_name']} tiene {int(longest[position, day])} minutos "
+                           f"continuos el {DAYS[day].value} sin descanso de {MIN_BREAK_MINUTES} minutos",
+                'regulation': 'Resolución 751 - Organización del Año Escolar',
+                **entity,
+                'day': DAYS[day].value,
+                'continuous_minutes': int(longest[position, day]),
+                'max_continuous_minutes': MAX_CONTINUOUS_MINUTES
+            })
+        return violations
+
+    def _check_consecutive_hours(self) -> List[Dict]:
+        return self._continuous('teacher', 'consecutive_hours', 'consecutive_hours_violation', 'Profesor')
+
+    def _check_breaks(self) -> List[Dict]:
+        timetable = self.timetable
+
+        # Lessons placed on break periods
+        violations = []
+        occupied = (timetable.section_count > 0) & timetable.period_is_break
+        for position, day, period in np.argwhere(occupied):
+            section = self._section(position)
+            violations.append({
+                'type': 'break_occupied',
+                'rule': 'breaks',
+                'severity': 'critical',
+                'message': f"Sección {section['section_name']} tiene clase en el receso "
+                           f"{timetable.periods[period]['name']} del {DAYS[day].value}",
+                'regulation': 'Resolución 751 - Organización del Año Escolar',
+                **section,
+                'day': DAYS[day].value,
+                'time_period_id': timetable.periods[period]['id']
+            })
+
+        return violations + self._continuous('section', 'breaks', 'missing_break', 'Sección')
+
+    def _scheduled_sections(self) -> np.ndarray:
+        # Sections with at least one teaching lesson
+        return self.timetable.weekly_periods('section') > 0
+
+    def _check_subject_quotas(self) -> List[Dict]:
+        timetable = self.timetable
+        periods = timetable.pair_periods('section', 'subject')
+        names = np.asarray([(name or '').upper() for name in timetable.subjects.names], dtype=object)
+        scheduled = self._scheduled_sections()
+
+        violations = []
+        for subject, required in CORE_SUBJECT_PERIODS.items():
+            current = periods[:, names == subject].sum(axis=1)
+            for position in np.flatnonzero(scheduled & (current < required)):
+                violations.append({
+                    'type': 'subject_deficiency',
+                    'rule': 'subject_quotas',
+                    'severity': 'warning',
+                    'message': f'Materia {subject} tiene {int(current[position])} períodos (mínimo requerido: {required})',
+                    'regulation': 'Currículo Básico Nacional de Venezuela',
+                    **self._section(position),
+                    'subject': subject,
+                    'current_periods': int(current[position]),
+                    'required_periods': required
+                })
+        return violations
+
+    def _check_bimodal(self) -> List[Dict]:
+        timetable = self.timetable
+        mask = ~timetable.lesson_is_break & (timetable.lesson_section != EMPTY)
+        owner = timetable.lesson_section[mask]
+        starts = timetable.period_start[timetable.lesson_period[mask]] if mask.any() else np.zeros(0, dtype=np.int32)
+        size = len(timetable.sections)
+        morning = np.bincount(owner[starts < MORNING_END_MINUTES], minlength=size)
+        afternoon = np.bincount(owner[starts >= AFTERNOON_START_MINUTES], minlength=size)
+
+        violations = []
+        for position in np.flatnonzero((afternoon > 0) & (morning == 0)):
+            violations.append({
+                'type': 'bimodal_violation',
+                'rule': 'bimodal',
+                'severity': 'warning',
+                'message': 'Horario solo usa sesión vespertina. Se recomienda usar sesión matutina.',
+                'regulation': 'Resolución 751 - Organización del Año Escolar',
+                **self._section(position),
+                'morning_periods': int(morning[position]),
+                'afternoon_periods': int(afternoon[position])
+            })
+        return violations
+
+    def _check_grade_content(self) -> List[Dict]:
+        timetable = self.timetable
+        advanced = np.asarray([
+            any(name in (subject or '').upper() for name in ADVANCED_SUBJECTS)
+            for subject in timetable.subjects.names
+        ], dtype=bool)
+        if not advanced.any():
+            return []
+
+        taught = timetable.pair_periods('section', 'subject')[:, advanced] > 0
+        young = (timetable.section_grade > 0) & (timetable.section_grade <= MAX_GRADE_FOR_BASIC_CONTENT)
+        advanced_names = [name.upper() for name, flag in zip(timetable.subjects.names, advanced) if flag]
+
+        violations = []
+        for position in np.flatnonzero(young & taught.any(axis=1)):
+            grade = int(timetable.section_grade[position])
+            subjects = sorted({advanced_names[column] for column in np.flatnonzero(taught[position])})
+            violations.append({
+                'type': 'grade_content_mismatch',
+                'rule': 'grade_content',
+                'severity': 'warning',
+                'message': f'Materias {", ".join(subjects)} no son apropiadas para grado {grade}',
+                'regulation': 'Diseño Curricular del Sistema Educativo Bolivariano',
+                **self._section(position),
+                'grade': grade,
+                'inappropriate_subjects': subjects
+            })
+        return violations
+
+
+def scope_violations(timetable: Timetable, violations: List[Dict], view_type: str,
+                     target_id: Optional[int]) -> List[Dict]:
+    """
+    Violations relevant to one section or teacher view
+
+    Section views keep the section's own violations plus those of the teachers
+    with lessons in it; teacher views keep the teacher's violations plus those
+    of the sections it teaches.
+    """
+    if view_type == 'school' or target_id is None:
+        return violations
+
+    if view_type == 'section':
+        rows = timetable.rows_for('section', target_id)
+        teacher_ids = {timetable.teachers.ids[t] for t in set(timetable.lesson_teacher[rows].tolist()) if t >= 0}
+        return [
+            v for v in violations
+            if v.get('section_id') == target_id or
+            ('section_id' not in v and v.get('teacher_id') in teacher_ids)
+        ]
+
+    rows = timetable.rows_for('teacher', target_id)
+    section_ids = {timetable.sections.ids[s] for s in set(timetable.lesson_section[rows].tolist()) if s >= 0}
+    return [
+        v for v in violations
+        if v.get('teacher_id') == target_id or v.get('section_id') in section_ids
+    ]
+
+
+def compliance_report(timetable: Timetable, view_type: str = 'school', target_id: int = None,
+                      rules: Iterable[str] = COMPLIANCE_RULES) -> Dict:
+    """
+    Evaluate the compliance rules and score the result
+
+    Args:
+        timetable: Shared timetable tensor of the tenant
+        view_type: 'school', 'section' or 'teacher'
+        target_id: Section or teacher id for the scoped views
+        rules: Rules to evaluate (see COMPLIANCE_RULES)
+
+    Returns:
+        Dict with compliance_score, violations and summary
+
+    Raises:
+        ValueError: Unknown rule or view type
+    """
+    if view_type not in ('school', 'section', 'teacher'):
+        raise ValueError(f"Unsupported view_type '{view_type}'")
+
+    engine = ComplianceEngine(timetable, rules)
+    violations = scope_violations(timetable, engine.evaluate(), view_type, target_id)
+
+    critical = sum(1 for v in violations if v['severity'] == 'critical')
+    warnings = len(violations) - critical
+    by_rule = {rule: 0 for rule in engine.rules}
+    for violation in violations:
+        by_rule[violation['rule']] += 1
+
+    return {
+        'compliance_score': max(0, 100 - critical * CRITICAL_PENALTY - warnings * WARNING_PENALTY),
+        'violations': violations,
+        'summary': {
+            'total_violations': len(violations),
+            'critical_violations': critical,
+            'warning_violations': warnings,
+            'rules_checked': len(engine.rules),
+            'violations_by_rule': by_rule,
+            'is_compliant': not violations
+        }
+    }
@@ -98,6 +98,7 @@ class VenezuelanConstraintSolver:
         self.violations = []
         self.schedule_assignments = {}
         self.domain_values = {}
+        self.cancel_token = None
 
     def add_constraint(self, constraint: Constraint):
         """Add a constraint to the solver"""
@@ -315,23 +316,33 @@ class VenezuelanConstraintSolver:
         return True, all_violations
 
     def solve_csp(self, assignments_needed: List[Dict],
-                  initial_schedule: Dict = None) -> Tuple[Dict, bool, List[str]]:
+                  initial_schedule: Dict = None,
+                  cancel_token=None) -> Tuple[Dict, bool, List[str]]:
         """
         Solve the Constraint Satisfaction Problem using backtracking
 
         Args:
             assignments_needed: List of required assignments
             initial_schedule: Starting schedule state
+            cancel_token: Optional CancellationToken checked at every search node;
+                raises OptimizationCancelled when tripped
 
         Returns:
             (final_schedule, success, violations)
         """
+        self.cancel_token = cancel_token
         schedule = initial_schedule or {}
         return self._backtrack(assignments_needed, schedule, 0)
 
+    def _check_cancelled(self):
+        """Stop the search if the current run has been cancelled"""
+        if self.cancel_token is not None:
+            self.cancel_token.raise_if_cancelled()
+
     def _backtrack(self, assignments: List[Dict], schedule: Dict,
                    index: int) -> Tuple[Dict, bool, List[str]]:
         """Recursive backtracking algorithm"""
+        self._check_cancelled()
 
         # Base case: all assignments made
         if index >= len(assignments):
@@ -441,21 +452,26 @@ class VenezuelanConstraintSolver:
 
         return consecutive
 
-    def optimize_schedule(self, schedule: Dict, iterations: int = 100) -> Dict:
+    def optimize_schedule(self, schedule: Dict, iterations: int = 100,
+                          cancel_token=None) -> Dict:
         """
         Optimize an existing schedule by local search
 
         Args:
             schedule: Current schedule
             iterations: Number of optimization iterations
+            cancel_token: Optional CancellationToken checked every iteration
 
         Returns:
             Optimized schedule
         """
+        self.cancel_token = cancel_token
         best_schedule = schedule.copy()
         best_violations = len(self.get_all_violations(best_schedule))
 
         for _ in range(iterations):
+            self._check_cancelled()
+
             # Create a neighbor by swapping two assignments
             neighbor = self._create_neighbor(best_schedule)
 
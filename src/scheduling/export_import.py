@@ -14,6 +14,7 @@ from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
 from openpyxl.utils import get_column_letter
 
 from src.scheduling.services import ScheduleManager
+from src.scheduling.timetable_tensor import EMPTY, get_shared_timetable
 from src.models.tenant import DayOfWeek
 
 
@@ -40,29 +41,18 @@ class VenezuelanScheduleExporter:
         session = self.schedule_manager.SessionLocal()
 
         try:
-            from src.models.tenant import Section, TimePeriod, ScheduleAssignment
-
-            # Get section information
-            section = session.query(Section).filter_by(id=section_id).first()
-            if not section:
+            # Section grid from the shared timetable tensor
+            timetable = get_shared_timetable(session)
+            position = timetable.sections.index.get(section_id)
+            if position is None:
                 raise ValueError(f"Section {section_id} not found")
-
-            # Get time periods
-            time_periods = session.query(TimePeriod).filter_by(
-                academic_year=self.academic_year
-            ).order_by(TimePeriod.display_order).all()
-
-            # Get all assignments for section
-            assignments = session.query(ScheduleAssignment).filter_by(
-                section_id=section_id,
-                academic_year=self.academic_year,
-                is_active=True
-            ).all()
+            section_name = timetable.sections.names[position] or f"Sección {section_id}"
+            grid = timetable.section_grid[position]
 
             # Create workbook
             wb = Workbook()
             ws = wb.active
-            ws.title = f"Horario {section.name}"
+            ws.title = f"Horario {section_name}"
 
             # Venezuelan standard styles
             header_font = Font(name='Arial', size=12, bold=True)
@@ -78,7 +68,7 @@ class VenezuelanScheduleExporter:
             # Title
             ws.merge_cells('A1:G1')
             title_cell = ws['A1']
-            title_cell.value = f"HORARIO DE CLASES - {section.name.upper()}"
+            title_cell.value = f"HORARIO DE CLASES - {section_name.upper()}"
             title_cell.font = Font(name='Arial', size=14, bold=True)
             title_cell.alignment = Alignment(horizontal='center')
 
@@ -99,56 +89,29 @@ class VenezuelanScheduleExporter:
                 cell.alignment = Alignment(horizontal='center')
                 cell.border = border
 
-            # Organization assignments by day and time
-            schedule_grid = {}
-            for assignment in assignments:
-                day = assignment.day_of_week.value
-                period = assignment.time_period.period_name
-
-                if period not in schedule_grid:
-                    schedule_grid[period] = {}
-
-                schedule_grid[period][day] = {
-                    'subject': assignment.subject.subject_name,
-                    'teacher': assignment.teacher.teacher_name,
-                    'classroom': assignment.classroom.name
-                }
-
             # Fill schedule data
             row = 5
-            for period in time_periods:
-                period_name = period.period_name
-
+            for period_row, period in enumerate(timetable.periods):
                 # Time column
                 time_cell = ws.cell(row=row, column=1)
-                time_cell.value = f"{period.start_time.strftime('%H:%M')}\n{period.end_time.strftime('%H:%M')}"
+                time_cell.value = f"{period['start_time']}\n{period['end_time']}"
                 time_cell.font = cell_font
                 time_cell.alignment = Alignment(horizontal='center', vertical='center')
                 time_cell.border = border
 
-                # Day columns
-                day_mapping = {
-                    'lunes': 2, 'martes': 3, 'miercoles': 4, 'jueves': 5, 'viernes': 6
-                }
-
-                for day_spanish, col in day_mapping.items():
-                    cell = ws.cell(row=row, column=col)
-
-                    if period_name in schedule_grid and day_spanish in schedule_grid[period_name]:
-                        assignment_data = schedule_grid[period_name][day_spanish]
-
-                        if period.is_break:
-                            cell.value = "RECREO"
-                            cell.fill = PatternFill(start_color='FFFF99', end_color='FFFF99', fill_type='solid')
-                        else:
-                            # Venezuelan format: MATERIA\nPROFESOR\n(Aula X)
-                            cell.value = f"{assignment_data['subject']}\n{assignment_data['teacher']}\n({assignment_data['classroom']})"
+                # Day columns (Monday..Friday)
+                for day, lesson_row in enumerate(grid[:, period_row]):
+                    cell = ws.cell(row=row, column=day + 2)
+
+                    if period['is_break']:
+                        cell.value = "RECREO"
+                        cell.fill = PatternFill(start_color='FFFF99', end_color='FFFF99', fill_type='solid')
+                    elif lesson_row != EMPTY:
+                        lesson = timetable.lesson(lesson_row)
+                        # Venezuelan format: MATERIA\nPROFESOR\n(Aula X)
+                        cell.value = f"{lesson['subject']}\n{lesson['teacher']}\n({lesson['classroom']})"
                     else:
-                        if period.is_break:
-                            cell.value = "RECREO"
-                            cell.fill = PatternFill(start_color='FFFF99', end_color='FFFF99', fill_type='solid')
-                        else:
-                            cell.value = ""
+                        cell.value = ""
 
                     cell.font = cell_font
                     cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
@@ -184,20 +147,18 @@ class VenezuelanScheduleExporter:
         session = self.schedule_manager.SessionLocal()
 
         try:
-            from src.models.tenant import Teacher, TeacherSubject, Subject
-            from sqlalchemy import func
+            from src.models.tenant import Teacher
+
+            # Scheduled periods per (teacher, subject) and real teaching minutes in two vectorized passes
+            timetable = get_shared_timetable(session)
+            subject_periods = timetable.pair_periods('teacher', 'subject')
+            weekly_minutes = timetable.weekly_minutes('teacher')
 
-            # Get all teachers with their subjects and hours
             teachers_data = session.query(
                 Teacher.id,
                 Teacher.teacher_name,
-                Teacher.cedula,
-                Teacher.current_weekly_hours,
-                Teacher.max_weekly_hours
-            ).filter_by(
-                academic_year=self.academic_year,
-                is_active=True
-            ).order_by(Teacher.teacher_name).all()
+                Teacher.cedula
+            ).filter(Teacher.is_active == True).order_by(Teacher.teacher_name).all()
 
             # Create workbook
             wb = Workbook()
@@ -234,22 +195,17 @@ class VenezuelanScheduleExporter:
 
             # Fill teacher data
             row = 4
-            for i, (teacher_id, name, cedula, current_hours, max_hours) in enumerate(teachers_data, 1):
-                # Get subjects for this teacher
-                teacher_subjects = session.query(
-                    Subject.subject_name,
-                    TeacherSubject.weekly_hours
-                ).join(TeacherSubject).filter(
-                    TeacherSubject.teacher_id == teacher_id,
-                    TeacherSubject.academic_year == self.academic_year,
-                    TeacherSubject.is_active == True
-                ).all()
-
-                # Combine subjects
-                subjects_text = ", ".join([
-                    f"{subject_name} ({hours}h)"
-                    for subject_name, hours in teacher_subjects
-                ])
+            for i, (teacher_id, name, cedula) in enumerate(teachers_data, 1):
+                position = timetable.teachers.index.get(teacher_id)
+                subjects_text = ""
+                current_hours = 0
+                if position is not None:
+                    # Scheduled periods per subject
+                    subjects_text = ", ".join(
+                        f"{timetable.subjects.names[subject]} ({int(periods)}h)"
+                        for subject, periods in enumerate(subject_periods[position]) if periods
+                    )
+                    current_hours = round(weekly_minutes[position] / 60, 1)
 
                 # Fill row data
                 ws.cell(row=row, column=1).value = i
@@ -309,13 +265,7 @@ class VenezuelanScheduleExporter:
         session = self.schedule_manager.SessionLocal()
 
         try:
-            from src.models.tenant import ScheduleAssignment
-
-            assignments = session.query(ScheduleAssignment).filter_by(
-                section_id=section_id,
-                academic_year=self.academic_year,
-                is_active=True
-            ).all()
+            timetable = get_shared_timetable(session)
 
             output = io.StringIO()
             writer = csv.writer(output)
@@ -328,18 +278,20 @@ class VenezuelanScheduleExporter:
             ])
 
             # Data rows
-            for assignment in assignments:
+            for lesson_row in timetable.rows_for('section', section_id):
+                lesson = timetable.lesson(lesson_row)
+                start_time, _, end_time = lesson['time'].partition(' - ')
                 writer.writerow([
-                    assignment.section_id,
-                    assignment.section.name,
-                    assignment.day_of_week.value,
-                    assignment.time_period.period_name,
-                    assignment.time_period.start_time.strftime('%H:%M:%S'),
-                    assignment.time_period.end_time.strftime('%H:%M:%S'),
-                    assignment.subject.subject_name,
-                    assignment.teacher.teacher_name,
-                    assignment.classroom.name,
-                    assignment.academic_year
+                    lesson['section_id'],
+                    lesson['section'],
+                    lesson['day'],
+                    lesson['period'],
+                    f"{start_time}:00" if start_time else '',
+                    f"{end_time}:00" if end_time else '',
+                    lesson['subject'],
+                    lesson['teacher'],
+                    lesson['classroom'],
+                    self.academic_year
                 ])
 
             return output.getvalue()
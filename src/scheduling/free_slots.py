@@ -0,0 +1,119 @@
+"""
+BiScheduler Free-Slot Finder
+Common free (day, period) slots of teachers, sections and rooms by bitset intersection
+Served from the occupancy index and ranked by teacher preferences
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+from src.models.tenant import RoomType
+from src.scheduling.occupancy import DAY_KEYS, OccupancyIndex
+
+
+def _format_time(value) -> str:
+    return value.strftime('%H:%M') if value else ''
+
+
+def candidate_rooms(index: OccupancyIndex, classroom_ids: Iterable[int] = None,
+                    room_type: str = None, min_capacity: int = None) -> List[Dict]:
+    """
+    Active classrooms matching the room constraints
+
+    Raises:
+        ValueError: Unknown room type
+    """
+    if room_type is not None and room_type not in {t.value for t in RoomType}:
+        raise ValueError(f"Unknown room type '{room_type}'")
+
+    rooms = index.classrooms.values() if classroom_ids is None else [
+        index.classrooms[room_id] for room_id in classroom_ids if room_id in index.classrooms
+    ]
+    return [
+        room for room in rooms
+        if (room_type is None or room['room_type'] == room_type)
+        and (min_capacity is None or (room['capacity'] or 0) >= min_capacity)
+    ]
+
+
+def find_free_slots(index: OccupancyIndex, teacher_ids: Iterable[int] = (),
+                    section_ids: Iterable[int] = (), classroom_ids: Iterable[int] = None,
+                    room_type: str = None, min_capacity: int = None,
+                    limit: Optional[int] = None) -> List[Dict]:
+    """
+    Every weekly slot where all teachers and sections are free and a suitable room is free
+
+    Args:
+        index: Occupancy index of the tenant
+        teacher_ids: Teachers that must all be free
+        section_ids: Sections that must all be free
+        classroom_ids: Candidate rooms (default: all active rooms)
+        room_type: Required room type, e.g. 'laboratory'
+        min_capacity: Minimum room capacity
+        limit: Maximum number of slots to return
+
+    Returns:
+        Slots ranked by teacher preference score, then by day and period; each
+        lists its free rooms, preferred and best-fitting first
+    """
+    teacher_ids = list(teacher_ids)
+    rooms = candidate_rooms(index, classroom_ids, room_type, min_capacity)
+    if not rooms:
+        return []
+
+    # AND of the free masks = NOT of the OR of the busy masks
+    busy = 0
+    for teacher_id in teacher_ids:
+        busy |= index.busy_mask('teacher', teacher_id)
+    for section_id in section_ids:
+        busy |= index.busy_mask('section', section_id)
+    free = index.teaching_mask & ~busy
+
+    room_free = {room['id']: index.teaching_mask & ~index.busy_mask('classroom', room['id']) for room in rooms}
+    any_room = 0
+    for mask in room_free.values():
+        any_room |= mask
+    free &= any_room
+
+    # Preference weights per period row, day and room, summed over the teachers
+    row_score: Dict[int, float] = {}
+    day_score: Dict[str, float] = {}
+    room_score: Dict[int, float] = {}
+    for teacher_id in teacher_ids:
+        for preference_type, target, score in index.teacher_preferences.get(teacher_id, ()):
+            if preference_type == 'time_slot':
+                row = index.period_row(target)
+                if row is not None:
+                    row_score[row] = row_score.get(row, 0) + score
+            elif preference_type == 'day_of_week':
+                day_score[target] = day_score.get(target, 0) + score
+            else:
+                room_score[target] = room_score.get(target, 0) + score
+
+    slots = []
+    while free:
+        low = free & -free
+        bit = low.bit_length() - 1
+        free ^= low
+
+        day, period = index.slot_at(bit)
+        free_rooms = sorted(
+            (room for room in rooms if room_free[room['id']] & low),
+            key=lambda room: (-room_score.get(room['id'], 0), room['capacity'] or 0, room['id'])
+        )
+        score = (row_score.get(bit // len(DAY_KEYS), 0) + day_score.get(day, 0)
+                 + room_score.get(free_rooms[0]['id'], 0))
+
+        slots.append({
+            'day': day,
+            'time_period_id': period['id'],
+            'period': period['name'],
+            'time': f"{_format_time(period['start'])} - {_format_time(period['end'])}",
+            'score': round(score, 2),
+            'classrooms': free_rooms,
+            '_order': (DAY_KEYS.index(day), bit // len(DAY_KEYS))
+        })
+
+    slots.sort(key=lambda slot: (-slot['score'], slot['_order']))
+    for slot in slots:
+        del slot['_order']
+    return slots[:limit] if limit else slots
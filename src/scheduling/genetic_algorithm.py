@@ -63,24 +63,89 @@ class VenezuelanScheduleGA:
         self.weight_conflicts = 0.3    # No scheduling conflicts
         self.weight_continuity = 0.1   # Subject continuity
 
+        # Warm start from an existing schedule
+        self.seed_genes: Optional[List[Gene]] = None
+        self.warm_start_ratio = 0.3
+        self.warm_start_mutation_rate = 0.1
+
+        # Cooperative cancellation (set per evolve() call)
+        self.cancel_token = None
+
+    def set_warm_start(self, assignments: List[Dict], ratio: float = None):
+        """
+        Seed the initial population from an existing schedule
+
+        Args:
+            assignments: Slots in constraint solver format (teacher_id, subject_id,
+                section_id, classroom_id, day, period)
+            ratio: Share of the population derived from the seed (default 0.3)
+        """
+        teacher_ids = {t['id'] for t in self.teachers}
+        section_ids = {s['id'] for s in self.sections}
+        classroom_ids = {c['id'] for c in self.classrooms}
+        period_ids = {p['id'] for p in self.time_periods}
+
+        # Drop slots that reference data removed since the schedule was built
+        self.seed_genes = [
+            Gene(
+                teacher_id=a['teacher_id'],
+                subject_id=a['subject_id'],
+                section_id=a['section_id'],
+                classroom_id=a['classroom_id'],
+                time_period_id=a['period'],
+                day_of_week=a['day']
+            )
+            for a in assignments
+            if a['teacher_id'] in teacher_ids and a['section_id'] in section_ids
+            and a['classroom_id'] in classroom_ids and a['period'] in period_ids
+            and a['day'] is not None
+        ]
+        if ratio is not None:
+            self.warm_start_ratio = ratio
+
     def generate_initial_population(self) -> List[Chromosome]:
-        """Generate initial population of random valid schedules"""
+        """
+        Generate initial population of random valid schedules
+
+        With a warm start, the first chromosome is the seed schedule (completed
+        with any newly required lessons) and a further share of the population
+        are mutated variants of it; the rest stay random for diversity.
+        """
         population = []
 
-        for _ in range(self.population_size):
+        if self.seed_genes:
+            seed = self._create_random_schedule(base_genes=self.seed_genes)
+            population.append(seed)
+
+            seeded_count = max(1, int(self.population_size * self.warm_start_ratio))
+            while len(population) < min(seeded_count, self.population_size):
+                self._check_cancelled()
+                population.append(self.mutate(seed, rate=self.warm_start_mutation_rate))
+
+        while len(population) < self.population_size:
+            self._check_cancelled()
             chromosome = self._create_random_schedule()
             population.append(chromosome)
 
         return population
 
-    def _create_random_schedule(self) -> Chromosome:
-        """Create a random but valid schedule"""
-        genes = []
+    def _create_random_schedule(self, base_genes: List[Gene] = None) -> Chromosome:
+        """Create a random but valid schedule, optionally completing a partial one"""
+        genes = [copy.copy(gene) for gene in base_genes or []]
 
         # Track assignments to avoid conflicts
         teacher_slots = {}
         classroom_slots = {}
         section_slots = {}
+        hours_assigned = {}
+
+        for gene in genes:
+            slot_key = (gene.day_of_week, gene.time_period_id)
+            teacher_slots.setdefault(gene.teacher_id, set()).add(slot_key)
+            classroom_slots.setdefault(gene.classroom_id, set()).add(slot_key)
+            section_slots.setdefault(gene.section_id, set()).add(slot_key)
+            key = (gene.section_id, gene.subject_id)
+            hours_assigned[key] = hours_assigned.get(key, 0) + 1
 
         # Iterate through all required assignments
         for section in self.sections:
@@ -93,7 +158,7 @@ class VenezuelanScheduleGA:
 
                 # Assign periods for this subject
                 periods_needed = subject.get('weekly_hours', 4)
-                periods_assigned = 0
+                periods_assigned = hours_assigned.get((section['id'], subject['id']), 0)
 
                 while periods_assigned < periods_needed:
                     # Random selection
@@ -346,12 +411,13 @@ class VenezuelanScheduleGA:
 
         return Chromosome(genes=child1_genes), Chromosome(genes=child2_genes)
 
-    def mutate(self, chromosome: Chromosome) -> Chromosome:
+    def mutate(self, chromosome: Chromosome, rate: float = None) -> Chromosome:
         """Mutate a chromosome by randomly changing some genes"""
         mutated = copy.deepcopy(chromosome)
+        rate = self.mutation_rate if rate is None else rate
 
         for gene in mutated.genes:
-            if random.random() < self.mutation_rate:
+            if random.random() < rate:
                 # Randomly mutate one attribute
                 mutation_type = random.choice(['teacher', 'classroom', 'time'])
 
@@ -369,8 +435,22 @@ class VenezuelanScheduleGA:
 
         return mutated
 
-    def evolve(self, progress_callback=None) -> Chromosome:
-        """Main evolution loop"""
+    def _check_cancelled(self):
+        """Stop the search if the current run has been cancelled"""
+        if self.cancel_token is not None:
+            self.cancel_token.raise_if_cancelled()
+
+    def evolve(self, progress_callback=None, cancel_token=None) -> Chromosome:
+        """
+        Main evolution loop
+
+        Args:
+            progress_callback: Called with (generation, best_fitness) after each generation
+            cancel_token: Optional CancellationToken checked between generations
+                and offspring; raises OptimizationCancelled when tripped
+        """
+        self.cancel_token = cancel_token
+
         # Initialize population
         population = self.generate_initial_population()
 
@@ -381,6 +461,8 @@ class VenezuelanScheduleGA:
         best_chromosome = max(population, key=lambda x: x.fitness_score)
 
         for generation in range(self.generations):
+            self._check_cancelled()
+
             # Sort by fitness
             population.sort(key=lambda x: x.fitness_score, reverse=True)
 
@@ -390,6 +472,7 @@ class VenezuelanScheduleGA:
 
             # Generate offspring
             while len(new_population) < self.population_size:
+                self._check_cancelled()
                 parent1 = self.selection(population)
                 parent2 = self.selection(population)
 
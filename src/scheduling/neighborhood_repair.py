@@ -0,0 +1,387 @@
+"""
+BiScheduler Neighborhood Repair
+Large-neighborhood-search repair of an existing schedule for Venezuelan K12 platform
+Frees only the slots touched by a change set and re-solves them with everything else pinned
+"""
+
+import logging
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.models.tenant import (
+    DayOfWeek, ScheduleAssignment, Teacher, TimePeriod, Classroom, TeacherSubject
+)
+from src.scheduling.occupancy import DEFAULT_MAX_WEEKLY_HOURS
+from src.scheduling.projections import day_index
+from src.scheduling.schedule_versions import schedule_criterion
+
+
+logger = logging.getLogger(__name__)
+
+DAYS = list(DayOfWeek)
+CHANGE_TYPES = ('teacher', 'classroom', 'section', 'assignment')
+
+
+class _SearchBudgetExhausted(Exception):
+    """Internal signal that the backtracking node budget ran out"""
+
+
+def parse_change_set(changes: List[Dict], period_ids: List[int]) -> Tuple[Set[Tuple], Set[int]]:
+    """
+    Validate a change set and expand it into blocked slots
+
+    Each change is one of:
+        {'type': 'teacher'|'classroom'|'section', 'id': X,
+         'days': [0-4] (optional), 'time_period_ids': [...] (optional)}
+        {'type': 'assignment', 'id': assignment_id}
+
+    Omitted days or periods mean the entity is unavailable all week / all day.
+
+    Returns:
+        (blocked, forced) where blocked holds (type, id, day, period) tuples and
+        forced holds assignment ids that must be re-placed
+
+    Raises:
+        ValueError: If a change is malformed
+    """
+    blocked = set()
+    forced = set()
+
+    if not changes:
+        raise ValueError('Change set is empty')
+
+    for change in changes:
+        change_type = change.get('type')
+        entity_id = change.get('id')
+        if change_type not in CHANGE_TYPES:
+            raise ValueError(f"Unknown change type '{change_type}'")
+        if entity_id is None:
+            raise ValueError(f"Change of type '{change_type}' requires an id")
+
+        if change_type == 'assignment':
+            forced.add(int(entity_id))
+            continue
+
+        days = change.get('days')
+        days = range(len(DAYS)) if days is None else [int(d) for d in days]
+        periods = change.get('time_period_ids') or period_ids
+
+        for day in days:
+            if not 0 <= day < len(DAYS):
+                raise ValueError(f'Invalid day {day}; expected 0 (lunes) to 4 (viernes)')
+            for period in periods:
+                blocked.add((change_type, int(entity_id), day, int(period)))
+
+    return blocked, forced
+
+
+class NeighborhoodRepairer:
+    """
+    Repairs a schedule around a change set
+
+    Directly affected lessons plus their same-day neighbours (same section or
+    same teacher within `radius` periods) are unassigned and re-placed by a
+    budgeted backtracking search. All other lessons are pinned. Placements are
+    ranked by closeness to the original (same slot, room and teacher first),
+    so the repaired timetable stays as stable as possible. Locked lessons are
+    never moved; a locked lesson hit by the change set is reported unresolved.
+    """
+
+    def __init__(self,
+                 assignments: List[Dict],
+                 period_ids: List[int],
+                 qualified_teachers: Dict[int, List[int]],
+                 classroom_ids: List[int],
+                 teacher_max_hours: Optional[Dict[int, int]] = None,
+                 radius: int = 1,
+                 max_nodes: int = 20000,
+                 cancel_token=None):
+        """
+        Args:
+            assignments: Current lessons with id, teacher_id, subject_id,
+                section_id, classroom_id, day (0-4), period and is_locked
+            period_ids: Teachable time period ids in display order (breaks excluded)
+            qualified_teachers: subject_id -> teacher ids qualified to teach it
+            classroom_ids: Active classroom ids
+            teacher_max_hours: teacher_id -> maximum weekly periods; substitutes
+                above it are not used (DEFAULT_MAX_WEEKLY_HOURS when unknown)
+            radius: Neighbourhood size in periods on either side
+            max_nodes: Backtracking node budget before falling back to greedy
+            cancel_token: Optional CancellationToken checked during search
+        """
+        self.assignments = {a['id']: dict(a) for a in assignments}
+        self.period_ids = list(period_ids)
+        self.period_order = {p: i for i, p in enumerate(self.period_ids)}
+        self.qualified_teachers = qualified_teachers
+        self.classroom_ids = list(classroom_ids)
+        self.teacher_max_hours = teacher_max_hours or {}
+        self.radius = radius
+        self.max_nodes = max_nodes
+        self.cancel_token = cancel_token
+
+        self.blocked = set()
+        self._nodes = 0
+        self._teacher_busy = set()
+        self._section_busy = set()
+        self._room_busy = set()
+        self._teacher_load = defaultdict(int)
+
+    def repair(self, changes: List[Dict]) -> Dict[str, any]:
+        """
+        Apply a change set and re-solve the affected neighbourhood
+
+        Returns:
+            Dict with the full repaired 'assignments', 'freed' ids, 'changes'
+            (before/after per re-placed lesson), 'unresolved' lessons and
+            'pinned_count'
+        """
+        self.blocked, forced = parse_change_set(changes, self.period_ids)
+
+        affected = {a_id for a_id, a in self.assignments.items() if self._violates_block(a)}
+        affected |= {a_id for a_id in forced if a_id in self.assignments}
+        locked = [self.assignments[a_id] for a_id in sorted(affected) if self.assignments[a_id].get('is_locked')]
+        movable = affected - {l['id'] for l in locked}
+        freed = movable | self._neighbours(movable)
+
+        # Occupancy of pinned lessons
+        for a_id, lesson in self.assignments.items():
+            if a_id not in freed:
+                self._occupy(lesson['teacher_id'], lesson['section_id'], lesson['classroom_id'],
+                             lesson['day'], lesson['period'])
+
+        lessons = [self.assignments[a_id] for a_id in freed]
+        lessons.sort(key=lambda l: len(self._options(l)))
+
+        placements = {}
+        self._nodes = 0
+        try:
+            solved = self._place(lessons, 0, placements)
+        except _SearchBudgetExhausted:
+            solved = False
+
+        unresolved = [dict(lesson) for lesson in locked]
+        if not solved:
+            logger.info(f"Neighborhood repair exhausted {self._nodes} nodes; falling back to greedy placement")
+            placements.clear()
+            unresolved += self._place_greedy(lessons, placements)
+
+        changes_made = []
+        for lesson in lessons:
+            placement = placements.get(lesson['id'])
+            if not placement:
+                continue
+            before = {k: lesson[k] for k in ('teacher_id', 'classroom_id', 'day', 'period')}
+            if placement != before:
+                changes_made.append({'assignment_id': lesson['id'], 'before': before, 'after': placement})
+            lesson.update(placement)
+
+        unresolved_ids = {l['id'] for l in unresolved}
+        repaired = [a for a_id, a in self.assignments.items() if a_id not in unresolved_ids]
+
+        return {
+            'assignments': repaired,
+            'freed': sorted(freed),
+            'directly_affected': sorted(affected),
+            'changes': changes_made,
+            'unresolved': unresolved,
+            'pinned_count': len(self.assignments) - len(freed),
+            'search_nodes': self._nodes
+        }
+
+    def _violates_block(self, lesson: Dict) -> bool:
+        day, period = lesson['day'], lesson['period']
+        return (
+            ('teacher', lesson['teacher_id'], day, period) in self.blocked or
+            ('classroom', lesson['classroom_id'], day, period) in self.blocked or
+            ('section', lesson['section_id'], day, period) in self.blocked
+        )
+
+    def _neighbours(self, affected: Set[int]) -> Set[int]:
+        """Unlocked lessons near an affected one in the same section or teacher timetable"""
+        by_section_day = defaultdict(list)
+        by_teacher_day = defaultdict(list)
+        for lesson in self.assignments.values():
+            by_section_day[(lesson['section_id'], lesson['day'])].append(lesson)
+            by_teacher_day[(lesson['teacher_id'], lesson['day'])].append(lesson)
+
+        neighbours = set()
+        for a_id in affected:
+            lesson = self.assignments[a_id]
+            order = self.period_order.get(lesson['period'])
+            if order is None:
+                continue
+            nearby = by_section_day[(lesson['section_id'], lesson['day'])] + \
+                by_teacher_day[(lesson['teacher_id'], lesson['day'])]
+            for other in nearby:
+                other_order = self.period_order.get(other['period'])
+                if other_order is not None and abs(other_order - order) <= self.radius \
+                        and not other.get('is_locked'):
+                    neighbours.add(other['id'])
+
+        return neighbours - affected
+
+    def _options(self, lesson: Dict) -> List[Tuple[int, int, int, int]]:
+        """
+        Candidate (cost, teacher, day, period) placements ignoring occupancy,
+        cheapest first
+        """
+        teachers = [lesson['teacher_id']] + [
+            t for t in self.qualified_teachers.get(lesson['subject_id'], [])
+            if t != lesson['teacher_id']
+        ]
+        origin_order = self.period_order.get(lesson['period'], 0)
+
+        options = []
+        for teacher_id in teachers:
+            teacher_cost = 0 if teacher_id == lesson['teacher_id'] else 10
+            for day in range(len(DAYS)):
+                for period in self.period_ids:
+                    if ('teacher', teacher_id, day, period) in self.blocked or \
+                            ('section', lesson['section_id'], day, period) in self.blocked:
+                        continue
+                    distance = abs(self.period_order[period] - origin_order)
+                    slot_cost = distance if day == lesson['day'] else 5 + distance
+                    options.append((teacher_cost + slot_cost, teacher_id, day, period))
+
+        options.sort()
+        return options
+
+    def _free_room(self, lesson: Dict, day: int, period: int) -> Optional[int]:
+        """Original room if free, otherwise the first free active room"""
+        for room_id in [lesson['classroom_id']] + self.classroom_ids:
+            if (room_id, day, period) not in self._room_busy and \
+                    ('classroom', room_id, day, period) not in self.blocked:
+                return room_id
+        return None
+
+    def _over_hours(self, teacher_id: int) -> bool:
+        return self._teacher_load[teacher_id] + 1 > self.teacher_max_hours.get(teacher_id, DEFAULT_MAX_WEEKLY_HOURS)
+
+    def _candidates(self, lesson: Dict):
+        for _, teacher_id, day, period in self._options(lesson):
+            if (teacher_id, day, period) in self._teacher_busy or \
+                    (lesson['section_id'], day, period) in self._section_busy:
+                continue
+            # The lesson's own teacher already carried it; a substitute takes on an extra period
+            if teacher_id != lesson['teacher_id'] and self._over_hours(teacher_id):
+                continue
+            room_id = self._free_room(lesson, day, period)
+            if room_id is not None:
+                yield {'teacher_id': teacher_id, 'classroom_id': room_id, 'day': day, 'period': period}
+
+    def _place(self, lessons: List[Dict], index: int, placements: Dict[int, Dict]) -> bool:
+        """Budgeted backtracking over the freed lessons"""
+        if self.cancel_token is not None:
+            self.cancel_token.raise_if_cancelled()
+        if index >= len(lessons):
+            return True
+
+        self._nodes += 1
+        if self._nodes > self.max_nodes:
+            raise _SearchBudgetExhausted()
+
+        lesson = lessons[index]
+        for placement in self._candidates(lesson):
+            self._occupy(placement['teacher_id'], lesson['section_id'], placement['classroom_id'],
+                         placement['day'], placement['period'])
+            placements[lesson['id']] = placement
+
+            if self._place(lessons, index + 1, placements):
+                return True
+
+            del placements[lesson['id']]
+            self._release(placement['teacher_id'], lesson['section_id'], placement['classroom_id'],
+                          placement['day'], placement['period'])
+
+        return False
+
+    def _place_greedy(self, lessons: List[Dict], placements: Dict[int, Dict]) -> List[Dict]:
+        """Place each lesson at its best free option; return the ones that did not fit"""
+        # Undo whatever the aborted search still holds
+        self._teacher_busy.clear()
+        self._section_busy.clear()
+        self._room_busy.clear()
+        self._teacher_load.clear()
+        freed_ids = {l['id'] for l in lessons}
+        for a_id, lesson in self.assignments.items():
+            if a_id not in freed_ids:
+                self._occupy(lesson['teacher_id'], lesson['section_id'], lesson['classroom_id'],
+                             lesson['day'], lesson['period'])
+
+        unresolved = []
+        for lesson in lessons:
+            placement = next(self._candidates(lesson), None)
+            if placement is None:
+                unresolved.append(dict(lesson))
+                continue
+            self._occupy(placement['teacher_id'], lesson['section_id'], placement['classroom_id'],
+                         placement['day'], placement['period'])
+            placements[lesson['id']] = placement
+
+        return unresolved
+
+    def _occupy(self, teacher_id, section_id, classroom_id, day, period):
+        self._teacher_busy.add((teacher_id, day, period))
+        self._section_busy.add((section_id, day, period))
+        self._room_busy.add((classroom_id, day, period))
+        self._teacher_load[teacher_id] += 1
+
+    def _release(self, teacher_id, section_id, classroom_id, day, period):
+        self._teacher_busy.discard((teacher_id, day, period))
+        self._section_busy.discard((section_id, day, period))
+        self._room_busy.discard((classroom_id, day, period))
+        self._teacher_load[teacher_id] -= 1
+
+
+def load_repair_inputs(session, schedule_id: int) -> Dict[str, any]:
+    """
+    Load everything a repair needs with five flat queries
+
+    Returns:
+        Keyword arguments for NeighborhoodRepairer (minus tuning options)
+    """
+    rows = session.query(
+        ScheduleAssignment.id, ScheduleAssignment.teacher_id, ScheduleAssignment.subject_id,
+        ScheduleAssignment.section_id, ScheduleAssignment.classroom_id,
+        ScheduleAssignment.day_of_week, ScheduleAssignment.time_period_id,
+        ScheduleAssignment.is_locked
+    ).filter(
+        schedule_criterion(session, schedule_id)
+    ).all()
+
+    assignments = [{
+        'id': r.id,
+        'teacher_id': r.teacher_id,
+        'subject_id': r.subject_id,
+        'section_id': r.section_id,
+        'classroom_id': r.classroom_id,
+        'day': day_index(r.day_of_week),
+        'period': r.time_period_id,
+        'is_locked': bool(r.is_locked)
+    } for r in rows]
+
+    period_ids = [p.id for p in session.query(TimePeriod.id).filter(
+        TimePeriod.is_active == True,
+        TimePeriod.is_break == False
+    ).order_by(TimePeriod.display_order)]
+
+    qualified = defaultdict(list)
+    for teacher_id, subject_id in session.query(TeacherSubject.teacher_id, TeacherSubject.subject_id).filter(
+        TeacherSubject.is_active == True
+    ):
+        qualified[subject_id].append(teacher_id)
+
+    classroom_ids = [c.id for c in session.query(Classroom.id).filter(Classroom.is_active == True)]
+
+    teacher_max_hours = {
+        teacher_id: max_hours or DEFAULT_MAX_WEEKLY_HOURS
+        for teacher_id, max_hours in session.query(Teacher.id, Teacher.max_weekly_hours)
+    }
+
+    return {
+        'assignments': assignments,
+        'period_ids': period_ids,
+        'qualified_teachers': dict(qualified),
+        'classroom_ids': classroom_ids,
+        'teacher_max_hours': teacher_max_hours
+    }
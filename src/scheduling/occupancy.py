@@ -0,0 +1,489 @@
+"""
+BiScheduler Schedule Occupancy Index
+In-memory (resource, day, period) -> assignment maps per tenant and academic year
+Answers assignment conflict checks and free-slot queries without database round trips
+"""
+
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+from src.models.tenant import (
+    ScheduleAssignment, Teacher, TeacherSubject, TeacherPreference, Classroom, TimePeriod, DayOfWeek
+)
+
+
+logger = logging.getLogger(__name__)
+
+RESOURCE_KINDS = ('teacher', 'classroom', 'section')
+
+DEFAULT_MAX_WEEKLY_HOURS = 40
+
+DAY_KEYS = [day.value for day in DayOfWeek]
+DAY_COUNT = len(DAY_KEYS)
+
+# Writes to these tables change more than one assignment's slots: reload the index
+RELOAD_MODELS = (TeacherSubject, TeacherPreference, Classroom, TimePeriod)
+
+_PENDING_KEY = 'occupancy_pending'
+
+
+def day_key(day) -> str:
+    """Normalize a DayOfWeek or its value ('lunes') to the index key"""
+    return day.value if isinstance(day, DayOfWeek) else DayOfWeek(day).value
+
+
+def tenant_key(db_url) -> str:
+    """Index key for a tenant database URL (password masked)"""
+    return make_url(db_url).render_as_string(hide_password=True)
+
+
+class OccupancyIndex:
+    """
+    Occupancy of teachers, classrooms and sections for one tenant database
+
+    Slots map (kind, resource_id, day, time_period_id) to the ids of the active
+    assignments holding them - normally a single id, more when the stored
+    schedule already contains a clash. Teacher loads, qualifications and
+    maximum hours are kept alongside for the workload and subject checks.
+
+    Each resource also has a weekly occupancy bitset: bit row * 5 + day is
+    set while the resource is busy in that period row and day. Duplicate
+    period rows (same name and start) share a row; unknown periods get new
+    rows, so bits never move. See free_slots.py.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._slots: Dict[Tuple[str, int, str, int], Set[int]] = defaultdict(set)
+        self._assignments: Dict[int, Dict[str, any]] = {}
+        self._teacher_load: Dict[int, int] = defaultdict(int)
+        self.teacher_subjects: Set[Tuple[int, int]] = set()
+        self.teacher_max_hours: Dict[int, int] = {}
+        self.loaded_at = time.monotonic()
+
+        # Weekly bitsets and the metadata free-slot queries need
+        self._masks: Dict[Tuple[str, int], int] = defaultdict(int)
+        self._period_row: Dict[int, int] = {}
+        self.periods: List[Dict[str, any]] = []  # One per row
+        self.teaching_mask = 0  # Bits of non-break periods
+        self.classrooms: Dict[int, Dict[str, any]] = {}
+        self.teacher_preferences: Dict[int, List[Tuple[str, any, float]]] = defaultdict(list)
+
+    @classmethod
+    def load(cls, session) -> 'OccupancyIndex':
+        """Build the index from the active assignments of a tenant database"""
+        index = cls()
+
+        # Period rows first, so bits follow display order
+        for period in session.query(
+            TimePeriod.id, TimePeriod.period_name, TimePeriod.start_time,
+            TimePeriod.end_time, TimePeriod.is_break
+        ).filter(TimePeriod.is_active == True).order_by(TimePeriod.display_order, TimePeriod.id):
+            index.add_period(period.id, period.period_name, period.start_time,
+                             period.end_time, bool(period.is_break))
+
+        rows = session.query(
+            ScheduleAssignment.id,
+            ScheduleAssignment.teacher_id,
+            ScheduleAssignment.classroom_id,
+            ScheduleAssignment.section_id,
+            ScheduleAssignment.subject_id,
+            ScheduleAssignment.day_of_week,
+            ScheduleAssignment.time_period_id
+        ).filter(ScheduleAssignment.is_active == True).all()
+
+        for row in rows:
+            index.add(row.id, row.teacher_id, row.classroom_id, row.section_id,
+                      row.day_of_week, row.time_period_id, subject_id=row.subject_id)
+
+        index.teacher_subjects = {
+            (teacher_id, subject_id) for teacher_id, subject_id in session.query(
+                TeacherSubject.teacher_id, TeacherSubject.subject_id
+            ).filter(TeacherSubject.is_active == True)
+        }
+        index.teacher_max_hours = {
+            teacher_id: max_hours or DEFAULT_MAX_WEEKLY_HOURS
+            for teacher_id, max_hours in session.query(Teacher.id, Teacher.max_weekly_hours)
+        }
+        index.classrooms = {
+            row.id: {
+                'id': row.id,
+                'name': row.name,
+                'capacity': row.capacity,
+                'room_type': row.room_type.value if row.room_type else None
+            }
+            for row in session.query(
+                Classroom.id, Classroom.name, Classroom.capacity, Classroom.room_type
+            ).filter(Classroom.is_active == True)
+        }
+        for preference in session.query(TeacherPreference).filter(TeacherPreference.is_active == True):
+            target = {
+                'time_slot': preference.time_period_id,
+                'day_of_week': preference.day_of_week.value if preference.day_of_week else None,
+                'classroom': preference.classroom_id
+            }.get(preference.preference_type.value)
+            if target is not None:
+                index.teacher_preferences[preference.teacher_id].append(
+                    (preference.preference_type.value, target, preference.final_score)
+                )
+        return index
+
+    def add_period(self, time_period_id: int, name: str = None, start_time=None,
+                   end_time=None, is_break: bool = False) -> int:
+        """Map a time period to its bitset row (creating the row if needed)"""
+        with self._lock:
+            row = self._period_row.get(time_period_id)
+            if row is not None:
+                return row
+
+            # Duplicate period rows share the canonical row
+            for row, period in enumerate(self.periods):
+                if name is not None and (period['name'], period['start']) == (name, start_time):
+                    self._period_row[time_period_id] = row
+                    return row
+
+            row = len(self.periods)
+            self.periods.append({
+                'id': time_period_id,
+                'name': name,
+                'start': start_time,
+                'end': end_time,
+                'is_break': is_break
+            })
+            self._period_row[time_period_id] = row
+            # Periods only seen on assignments (inactive ones) are never offered as free
+            if name is not None and not is_break:
+                self.teaching_mask |= ((1 << DAY_COUNT) - 1) << (row * DAY_COUNT)
+            return row
+
+    def _bit(self, day: str, time_period_id: int) -> int:
+        return 1 << (self.add_period(time_period_id) * DAY_COUNT + DAY_KEYS.index(day))
+
+    def slot_at(self, bit: int) -> Tuple[str, Dict[str, any]]:
+        """(day, period) of a bit position"""
+        return DAY_KEYS[bit % DAY_COUNT], self.periods[bit // DAY_COUNT]
+
+    def period_row(self, time_period_id: int) -> Optional[int]:
+        return self._period_row.get(time_period_id)
+
+    def assignment(self, assignment_id: int) -> Optional[Dict[str, any]]:
+        """Indexed placement of an active assignment (copy), if any"""
+        with self._lock:
+            entry = self._assignments.get(assignment_id)
+            return dict(entry) if entry is not None else None
+
+    def assignments(self) -> List[Tuple[int, Dict[str, any]]]:
+        """Snapshot of all indexed active assignments"""
+        with self._lock:
+            return [(assignment_id, dict(entry)) for assignment_id, entry in self._assignments.items()]
+
+    def holders(self, kind: str, resource_id: int, day, time_period_id: int) -> Set[int]:
+        """Ids of the assignments holding a resource in a slot"""
+        with self._lock:
+            return set(self._slots.get((kind, resource_id, day_key(day), time_period_id), ()))
+
+    def busy_mask(self, kind: str, resource_id: int) -> int:
+        """Weekly occupancy bitset of a teacher, classroom or section"""
+        with self._lock:
+            return self._masks.get((kind, resource_id), 0)
+
+    def add(self, assignment_id: int, teacher_id: int, classroom_id: int, section_id: int,
+            day, time_period_id: int, subject_id: int = None):
+        """Record (or move) an active assignment"""
+        with self._lock:
+            self.remove(assignment_id)
+
+            entry = {
+                'teacher': teacher_id,
+                'classroom': classroom_id,
+                'section': section_id,
+                'subject': subject_id,
+                'day': day_key(day),
+                'period': time_period_id
+            }
+            self._assignments[assignment_id] = entry
+            bit = self._bit(entry['day'], time_period_id)
+            for kind in RESOURCE_KINDS:
+                self._slots[(kind, entry[kind], entry['day'], time_period_id)].add(assignment_id)
+                self._masks[(kind, entry[kind])] |= bit
+            self._teacher_load[teacher_id] += 1
+
+    def remove(self, assignment_id: int):
+        """Forget an assignment (deleted or deactivated)"""
+        with self._lock:
+            entry = self._assignments.pop(assignment_id, None)
+            if entry is None:
+                return
+
+            bit = self._bit(entry['day'], entry['period'])
+            for kind in RESOURCE_KINDS:
+                slot = (kind, entry[kind], entry['day'], entry['period'])
+                holders = self._slots.get(slot)
+                if holders is not None:
+                    holders.discard(assignment_id)
+                    if not holders:
+                        del self._slots[slot]
+                if not self._resource_busy(kind, entry[kind], entry['day'], entry['period']):
+                    self._masks[(kind, entry[kind])] &= ~bit
+            self._teacher_load[entry['teacher']] -= 1
+
+    def _resource_busy(self, kind: str, resource_id: int, day: str, time_period_id: int) -> bool:
+        # Duplicate period ids share a bit; it stays set while any of them is held
+        row = self._period_row[time_period_id]
+        return any(
+            self._slots.get((kind, resource_id, day, period_id))
+            for period_id, period_row in self._period_row.items() if period_row == row
+        )
+
+    def occupant(self, kind: str, resource_id: int, day, time_period_id: int,
+                 exclude_assignment_id: int = None) -> Optional[int]:
+        """Id of the assignment holding a resource in a slot, if any"""
+        with self._lock:
+            holders = self._slots.get((kind, resource_id, day_key(day), time_period_id))
+            if not holders:
+                return None
+            others = [a_id for a_id in holders if a_id != exclude_assignment_id]
+            return min(others) if others else None
+
+    def find_conflicts(self, teacher_id: int = None, classroom_id: int = None,
+                       section_id: int = None, day=None, time_period_id: int = None,
+                       exclude_assignment_id: int = None) -> Dict[str, int]:
+        """
+        Occupied resources for a proposed placement
+
+        Returns:
+            {kind: existing_assignment_id} for each resource already taken
+        """
+        requested = {'teacher': teacher_id, 'classroom': classroom_id, 'section': section_id}
+        clashes = {}
+        for kind, resource_id in requested.items():
+            if resource_id is None:
+                continue
+            existing = self.occupant(kind, resource_id, day, time_period_id, exclude_assignment_id)
+            if existing is not None:
+                clashes[kind] = existing
+        return clashes
+
+    def teacher_load(self, teacher_id: int, exclude_assignment_id: int = None) -> int:
+        """Number of active weekly periods assigned to a teacher"""
+        with self._lock:
+            load = self._teacher_load.get(teacher_id, 0)
+            excluded = self._assignments.get(exclude_assignment_id)
+            if excluded is not None and excluded['teacher'] == teacher_id:
+                load -= 1
+            return load
+
+    def is_qualified(self, teacher_id: int, subject_id: int) -> bool:
+        return (teacher_id, subject_id) in self.teacher_subjects
+
+    def stats(self) -> Dict[str, any]:
+        with self._lock:
+            return {
+                'assignments': len(self._assignments),
+                'slots': len(self._slots),
+                'age_seconds': round(time.monotonic() - self.loaded_at, 1)
+            }
+
+
+class _IndexLoad:
+    """An index load in progress and the commits that landed during it"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.changes: List[Dict[str, any]] = []
+        self.stale = False
+
+
+def _apply_change(index: OccupancyIndex, change: Dict[str, any]):
+    if change['is_active']:
+        index.add(change['id'], change['teacher_id'], change['classroom_id'],
+                  change['section_id'], change['day_of_week'],
+                  change['time_period_id'], subject_id=change['subject_id'])
+    else:
+        index.remove(change['id'])
+
+
+class OccupancyRegistry:
+    """
+    Process-wide occupancy indexes, one per tenant database
+
+    Indexes are loaded on first use and kept in sync from committed ORM
+    sessions. Writes made by other processes (or with raw SQL) are picked up
+    when an index is reloaded after max_age_seconds.
+
+    Loads run outside the registry lock, one at a time per tenant database:
+    other tenants are never blocked, and callers of a reloading tenant keep
+    using the expired index (or wait when there is none). Commits made while
+    a load runs are replayed onto the new index.
+    """
+
+    def __init__(self, max_age_seconds: float = 300):
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self._indexes: Dict[str, OccupancyIndex] = {}
+        self._loading: Dict[str, _IndexLoad] = {}
+        self._loads = 0
+
+    def get_index(self, session) -> OccupancyIndex:
+        """Get (loading if missing or expired) the index for a session's tenant database"""
+        key = tenant_key(session.get_bind().url)
+
+        while True:
+            with self._lock:
+                index = self._indexes.get(key)
+                if index is not None and time.monotonic() - index.loaded_at < self.max_age_seconds:
+                    return index
+
+                load = self._loading.get(key)
+                if load is None:
+                    load = self._loading[key] = _IndexLoad()
+                    break
+                if index is not None:
+                    return index
+            load.done.wait()
+
+        try:
+            index = OccupancyIndex.load(session)
+        except Exception:
+            with self._lock:
+                del self._loading[key]
+            load.done.set()
+            raise
+
+        with self._lock:
+            for change in load.changes:
+                _apply_change(index, change)
+            if not load.stale:
+                self._indexes[key] = index
+            del self._loading[key]
+            self._loads += 1
+        load.done.set()
+        return index
+
+    def apply_changes(self, db_key: str, changes: List[Dict[str, any]]):
+        """Apply committed assignment writes to a tenant's index (and any load in progress)"""
+        with self._lock:
+            index = self._indexes.get(db_key)
+            load = self._loading.get(db_key)
+            if load is not None:
+                load.changes.extend(changes)
+
+        if index is not None:
+            for change in changes:
+                _apply_change(index, change)
+
+    def invalidate(self, db_url=None):
+        """Drop the indexes of one tenant database, or all of them"""
+        with self._lock:
+            keys = list(self._indexes) + list(self._loading) if db_url is None else [tenant_key(db_url)]
+            for key in keys:
+                self._indexes.pop(key, None)
+                if key in self._loading:
+                    # Finish the running load but do not keep its result
+                    self._loading[key].stale = True
+
+    def stats(self) -> Dict[str, any]:
+        with self._lock:
+            return {
+                'indexes': len(self._indexes),
+                'loads': self._loads,
+                'max_age_seconds': self.max_age_seconds
+            }
+
+
+def _snapshot(assignment: ScheduleAssignment) -> Dict[str, any]:
+    return {
+        'id': assignment.id,
+        'is_active': assignment.is_active is not False,
+        'teacher_id': assignment.teacher_id,
+        'classroom_id': assignment.classroom_id,
+        'section_id': assignment.section_id,
+        'subject_id': assignment.subject_id,
+        'day_of_week': assignment.day_of_week,
+        'time_period_id': assignment.time_period_id
+    }
+
+
+def _limits_changed(session, teacher: Teacher) -> bool:
+    # Workload bookkeeping (current_weekly_hours) does not affect the index
+    if teacher in session.new or teacher in session.deleted:
+        return True
+    return inspect(teacher).attrs.max_weekly_hours.history.has_changes()
+
+
+def _after_flush(session, flush_context):
+    """Record assignment writes; they are applied to the index on commit"""
+    pending = None
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, RELOAD_MODELS) or (isinstance(obj, Teacher) and _limits_changed(session, obj)):
+            pending = session.info.setdefault(_PENDING_KEY, {'changes': [], 'reload': False})
+            pending['reload'] = True
+        elif isinstance(obj, ScheduleAssignment) and obj.id is not None:
+            pending = session.info.setdefault(_PENDING_KEY, {'changes': [], 'reload': False})
+            snapshot = _snapshot(obj)
+            if obj in session.deleted:
+                snapshot['is_active'] = False
+            pending['changes'].append(snapshot)
+
+    if pending is not None and 'db_key' not in pending:
+        pending['db_key'] = tenant_key(session.get_bind().url)
+
+
+def _after_commit(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+
+    registry = get_occupancy_registry()
+    if pending['reload']:
+        # Qualifications, limits, rooms, periods or preferences changed: rebuild on next use
+        registry.invalidate(pending['db_key'])
+        return
+
+    registry.apply_changes(pending['db_key'], pending['changes'])
+
+
+def _after_rollback(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def _install_listeners():
+    # Listen on every ORM session (tenant pools and Flask-SQLAlchemy alike)
+    if not event.contains(Session, 'after_flush', _after_flush):
+        event.listen(Session, 'after_flush', _after_flush)
+        event.listen(Session, 'after_commit', _after_commit)
+        event.listen(Session, 'after_rollback', _after_rollback)
+
+
+def configure_occupancy_registry(config: Dict) -> OccupancyRegistry:
+    """Create the process-wide registry from application config"""
+    global _registry
+
+    with _registry_lock:
+        _registry = OccupancyRegistry(
+            max_age_seconds=config.get('OCCUPANCY_INDEX_MAX_AGE_SECONDS', 300)
+        )
+        _install_listeners()
+        return _registry
+
+
+def get_occupancy_registry() -> OccupancyRegistry:
+    """Get the process-wide occupancy registry (defaults if not configured)"""
+    global _registry
+
+    with _registry_lock:
+        if _registry is None:
+            _registry = OccupancyRegistry()
+            _install_listeners()
+        return _registry
@@ -0,0 +1,320 @@
+"""
+BiScheduler Optimization Run Scheduler
+Cooperative cancellation and fair per-tenant concurrency limits for optimizer runs
+Keeps shared optimization capacity predictable across all schools on the platform
+"""
+
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Dict, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class OptimizationCancelled(Exception):
+    """Raised inside an optimizer when its run has been cancelled or preempted"""
+
+
+class OptimizationQueueFull(Exception):
+    """Raised when a tenant already has too many optimization runs waiting"""
+
+
+class RunStatus(Enum):
+    """Lifecycle states of an optimization run"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class CancellationToken:
+    """
+    Cooperative cancellation flag checked by the GA and CSP search loops
+    Optionally carries a deadline so overlong runs are preempted automatically
+    """
+
+    def __init__(self, deadline: Optional[float] = None):
+        self._event = threading.Event()
+        self.deadline = deadline  # time.monotonic() value
+        self.reason = None
+
+    def cancel(self, reason: str = 'cancelled'):
+        """Request cancellation of the run holding this token"""
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        """Check cancellation, tripping the token once its deadline has passed"""
+        if self._event.is_set():
+            return True
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            self.cancel('max_runtime_exceeded')
+            return True
+        return False
+
+    def raise_if_cancelled(self):
+        """Raise OptimizationCancelled if cancellation was requested"""
+        if self.is_cancelled:
+            raise OptimizationCancelled(self.reason)
+
+
+class OptimizationRun:
+    """Bookkeeping for a single optimization request"""
+
+    def __init__(self, tenant_id: str, algorithm: str, requested_by: str = None):
+        self.run_id = str(uuid.uuid4())
+        self.tenant_id = tenant_id
+        self.algorithm = algorithm
+        self.requested_by = requested_by
+        self.status = RunStatus.QUEUED
+        self.token = CancellationToken()
+        self.queued_at = datetime.now(timezone.utc)
+        self.started_at = None
+        self.finished_at = None
+        self.message = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (RunStatus.COMPLETED, RunStatus.FAILED, RunStatus.CANCELLED)
+
+    def to_dict(self) -> Dict[str, any]:
+        return {
+            'run_id': self.run_id,
+            'tenant_id': self.tenant_id,
+            'algorithm': self.algorithm,
+            'requested_by': self.requested_by,
+            'status': self.status.value,
+            'cancel_requested': self.token.is_cancelled,
+            'queued_at': self.queued_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'message': self.message
+        }
+
+
+class OptimizationRunScheduler:
+    """
+    Admission control for schedule optimizations
+    Enforces a global and a per-tenant limit on concurrent runs and grants
+    free slots round-robin across tenants, FIFO within each tenant
+    """
+
+    def __init__(self,
+                 max_concurrent_runs: int = 4,
+                 max_runs_per_tenant: int = 1,
+                 max_queued_per_tenant: int = 3,
+                 max_runtime_seconds: Optional[float] = None,
+                 history_size: int = 200):
+        self.max_concurrent_runs = max_concurrent_runs
+        self.max_runs_per_tenant = max_runs_per_tenant
+        self.max_queued_per_tenant = max_queued_per_tenant
+        self.max_runtime_seconds = max_runtime_seconds
+        self.history_size = history_size
+
+        self._condition = threading.Condition()
+        self._queues: Dict[str, deque] = {}
+        self._rotation = deque()  # Tenants in round-robin order
+        self._running: Dict[str, int] = {}
+        self._runs: "OrderedDict[str, OptimizationRun]" = OrderedDict()
+
+    def submit(self, tenant_id: str, algorithm: str, requested_by: str = None) -> OptimizationRun:
+        """
+        Queue a new optimization run for a tenant
+
+        Raises:
+            OptimizationQueueFull: If the tenant's queue is at capacity
+        """
+        with self._condition:
+            queue = self._queues.setdefault(tenant_id, deque())
+            if len(queue) >= self.max_queued_per_tenant:
+                raise OptimizationQueueFull(
+                    f'Tenant already has {len(queue)} optimization runs waiting'
+                )
+
+            run = OptimizationRun(tenant_id, algorithm, requested_by)
+            queue.append(run)
+            if tenant_id not in self._rotation:
+                self._rotation.append(tenant_id)
+
+            self._remember(run)
+            self._dispatch()
+            return run
+
+    def wait_for_slot(self, run: OptimizationRun, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the run is granted a slot, cancelled, or the timeout expires
+
+        Returns:
+            True if the run is now running and owns a slot
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+
+        with self._condition:
+            while run.status == RunStatus.QUEUED:
+                remaining = None
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._dequeue(run)
+                        run.token.cancel('queue_timeout')
+                        self._mark_finished(run, RunStatus.CANCELLED, 'Timed out waiting for optimizer capacity')
+                        return False
+                self._condition.wait(remaining)
+
+            return run.status == RunStatus.RUNNING
+
+    def finish(self, run: OptimizationRun, status: RunStatus, message: str = None):
+        """Release the run's slot and record its final status"""
+        with self._condition:
+            if run.is_finished:
+                return
+            if run.status == RunStatus.RUNNING:
+                self._running[run.tenant_id] = max(0, self._running.get(run.tenant_id, 0) - 1)
+                # The tenant that just used a slot yields to the others
+                if run.tenant_id in self._rotation:
+                    self._rotation.remove(run.tenant_id)
+                    self._rotation.append(run.tenant_id)
+            else:
+                self._dequeue(run)
+
+            self._mark_finished(run, status, message)
+            self._dispatch()
+
+    def cancel(self, run_id: str, tenant_id: str = None, reason: str = 'cancelled_by_user') -> Optional[OptimizationRun]:
+        """
+        Cancel a queued or running optimization
+
+        Queued runs are removed immediately; running runs stop cooperatively at
+        the optimizer's next cancellation check.
+        """
+        with self._condition:
+            run = self._runs.get(run_id)
+            if not run or (tenant_id is not None and run.tenant_id != tenant_id):
+                return None
+
+            if run.status == RunStatus.QUEUED:
+                self._dequeue(run)
+                run.token.cancel(reason)
+                self._mark_finished(run, RunStatus.CANCELLED, 'Cancelled before start')
+                self._dispatch()
+            elif run.status == RunStatus.RUNNING:
+                run.token.cancel(reason)
+
+            return run
+
+    def get_run(self, run_id: str, tenant_id: str = None) -> Optional[OptimizationRun]:
+        """Get a run by ID, optionally scoped to a tenant"""
+        with self._condition:
+            run = self._runs.get(run_id)
+            if run and tenant_id is not None and run.tenant_id != tenant_id:
+                return None
+            return run
+
+    def list_runs(self, tenant_id: str = None) -> List[OptimizationRun]:
+        """List known runs, newest first"""
+        with self._condition:
+            runs = [r for r in self._runs.values() if tenant_id is None or r.tenant_id == tenant_id]
+        return list(reversed(runs))
+
+    def stats(self) -> Dict[str, any]:
+        """Current capacity usage across the platform"""
+        with self._condition:
+            return {
+                'max_concurrent_runs': self.max_concurrent_runs,
+                'max_runs_per_tenant': self.max_runs_per_tenant,
+                'running': sum(self._running.values()),
+                'queued': sum(len(q) for q in self._queues.values()),
+                'running_by_tenant': {t: c for t, c in self._running.items() if c},
+                'queued_by_tenant': {t: len(q) for t, q in self._queues.items() if q}
+            }
+
+    def _dispatch(self):
+        """Grant free slots round-robin across tenants (caller holds the lock)"""
+        granted = False
+
+        while sum(self._running.values()) < self.max_concurrent_runs:
+            next_run = None
+            for _ in range(len(self._rotation)):
+                tenant_id = self._rotation[0]
+                self._rotation.rotate(-1)
+                queue = self._queues.get(tenant_id)
+                if queue and self._running.get(tenant_id, 0) < self.max_runs_per_tenant:
+                    next_run = queue.popleft()
+                    break
+
+            if next_run is None:
+                break
+
+            self._start(next_run)
+            granted = True
+
+        # Drop tenants with nothing left to schedule
+        for tenant_id in list(self._rotation):
+            if not self._queues.get(tenant_id):
+                self._rotation.remove(tenant_id)
+                self._queues.pop(tenant_id, None)
+
+        if granted:
+            self._condition.notify_all()
+
+    def _start(self, run: OptimizationRun):
+        run.status = RunStatus.RUNNING
+        run.started_at = datetime.now(timezone.utc)
+        if self.max_runtime_seconds:
+            run.token.deadline = time.monotonic() + self.max_runtime_seconds
+        self._running[run.tenant_id] = self._running.get(run.tenant_id, 0) + 1
+        logger.info(f"Optimization run {run.run_id} started for tenant {run.tenant_id} ({run.algorithm})")
+
+    def _dequeue(self, run: OptimizationRun):
+        queue = self._queues.get(run.tenant_id)
+        if queue and run in queue:
+            queue.remove(run)
+
+    def _mark_finished(self, run: OptimizationRun, status: RunStatus, message: str = None):
+        run.status = status
+        run.message = message
+        run.finished_at = datetime.now(timezone.utc)
+        self._condition.notify_all()
+
+    def _remember(self, run: OptimizationRun):
+        self._runs[run.run_id] = run
+        # Trim finished runs beyond the history window
+        while len(self._runs) > self.history_size:
+            oldest_id = next((rid for rid, r in self._runs.items() if r.is_finished), None)
+            if oldest_id is None:
+                break
+            del self._runs[oldest_id]
+
+
+_run_scheduler = None
+_run_scheduler_lock = threading.Lock()
+
+
+def get_run_scheduler(config: Dict = None) -> OptimizationRunScheduler:
+    """
+    Get the process-wide optimization run scheduler
+
+    Args:
+        config: Flask config used to size the scheduler on first access
+    """
+    global _run_scheduler
+
+    with _run_scheduler_lock:
+        if _run_scheduler is None:
+            config = config or {}
+            _run_scheduler = OptimizationRunScheduler(
+                max_concurrent_runs=config.get('OPTIMIZER_MAX_CONCURRENT_RUNS', 4),
+                max_runs_per_tenant=config.get('OPTIMIZER_MAX_RUNS_PER_TENANT', 1),
+                max_queued_per_tenant=config.get('OPTIMIZER_MAX_QUEUED_PER_TENANT', 3),
+                max_runtime_seconds=config.get('OPTIMIZER_MAX_RUNTIME_SECONDS')
+            )
+        return _run_scheduler
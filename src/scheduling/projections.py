@@ -0,0 +1,237 @@
+"""
+BiScheduler Schedule Projections
+Joined, paginated read models over schedule assignments for Venezuelan K12 platform
+Replaces per-row relationship lazy loads with single projection queries
+"""
+
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import func
+
+from src.models.tenant import (
+    DayOfWeek, Schedule, ScheduleAssignment, Teacher, Subject,
+    Section, Classroom, TimePeriod
+)
+from src.scheduling.schedule_versions import own_rows_criterion, schedule_criterion
+
+
+DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
+DAYS = list(DayOfWeek)
+
+GROUP_COLUMNS = {
+    'section': ScheduleAssignment.section_id,
+    'teacher': ScheduleAssignment.teacher_id,
+}
+
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 2000
+
+
+def day_index(day) -> Optional[int]:
+    """
+    Normalize a stored day of week to 0 (Monday) .. 4 (Friday)
+
+    Accepts DayOfWeek members, their Spanish values, or legacy integer days
+    written by the optimizer.
+    """
+    if day is None:
+        return None
+    if isinstance(day, DayOfWeek):
+        return DAYS.index(day)
+    if isinstance(day, int):
+        return day if 0 <= day < len(DAYS) else None
+    try:
+        return DAYS.index(DayOfWeek(str(day).lower()))
+    except ValueError:
+        return int(day) if str(day).isdigit() else None
+
+
+def assignment_projection(session):
+    """
+    Base projection query: one row per assignment with all display fields
+
+    Uses outer joins so assignments pointing at deleted entities still appear.
+    """
+    return session.query(
+        ScheduleAssignment.id.label('id'),
+        ScheduleAssignment.day_of_week.label('day_of_week'),
+        ScheduleAssignment.teacher_id.label('teacher_id'),
+        Teacher.teacher_name.label('teacher_name'),
+        ScheduleAssignment.subject_id.label('subject_id'),
+        Subject.subject_name.label('subject_name'),
+        ScheduleAssignment.section_id.label('section_id'),
+        Section.name.label('section_name'),
+        ScheduleAssignment.classroom_id.label('classroom_id'),
+        Classroom.name.label('classroom_name'),
+        ScheduleAssignment.time_period_id.label('time_period_id'),
+        TimePeriod.period_name.label('period_name'),
+        TimePeriod.start_time.label('start_time'),
+        TimePeriod.end_time.label('end_time'),
+        TimePeriod.display_order.label('display_order')
+    ).outerjoin(
+        Teacher, Teacher.id == ScheduleAssignment.teacher_id
+    ).outerjoin(
+        Subject, Subject.id == ScheduleAssignment.subject_id
+    ).outerjoin(
+        Section, Section.id == ScheduleAssignment.section_id
+    ).outerjoin(
+        Classroom, Classroom.id == ScheduleAssignment.classroom_id
+    ).outerjoin(
+        TimePeriod, TimePeriod.id == ScheduleAssignment.time_period_id
+    )
+
+
+def format_assignment_row(row) -> Dict[str, any]:
+    """Convert a projection row into the preview assignment format"""
+    index = day_index(row.day_of_week)
+    return {
+        'id': row.id,
+        'teacher_id': row.teacher_id,
+        'teacher': row.teacher_name or 'Unknown',
+        'subject_id': row.subject_id,
+        'subject': row.subject_name or 'Unknown',
+        'section_id': row.section_id,
+        'section': row.section_name or 'Unknown',
+        'classroom_id': row.classroom_id,
+        'classroom': row.classroom_name or 'Unknown',
+        'time_period_id': row.time_period_id,
+        'time_period': row.period_name or 'Unknown',
+        'start_time': row.start_time.strftime('%H:%M') if row.start_time else None,
+        'end_time': row.end_time.strftime('%H:%M') if row.end_time else None,
+        'day_index': index,
+        'day': DAY_NAMES[index] if index is not None else 'Unknown'
+    }
+
+
+def get_schedule_with_statistics(session, schedule_id: int,
+                                 tenant_id=None) -> Optional[Tuple[Schedule, Dict[str, int]]]:
+    """
+    Load a schedule and its assignment statistics in a single aggregate query
+
+    Delta versions (schedules with a parent) are aggregated over their
+    materialized assignment set instead.
+
+    Returns:
+        (schedule, statistics) or None if the schedule does not exist
+    """
+    query = session.query(
+        Schedule,
+        func.count(ScheduleAssignment.id),
+        func.count(func.distinct(ScheduleAssignment.teacher_id)),
+        func.count(func.distinct(ScheduleAssignment.section_id)),
+        func.count(func.distinct(ScheduleAssignment.classroom_id)),
+        func.count(func.distinct(ScheduleAssignment.subject_id))
+    ).outerjoin(
+        ScheduleAssignment, own_rows_criterion(Schedule.id, Schedule.status)
+    ).filter(Schedule.id == schedule_id)
+
+    if tenant_id is not None:
+        query = query.filter(Schedule.tenant_id == tenant_id)
+
+    row = query.group_by(Schedule.id).first()
+    if not row:
+        return None
+
+    schedule, total, teachers, sections, classrooms, subjects = row
+    if schedule.parent_id is not None:
+        total, teachers, sections, classrooms, subjects = session.query(
+            func.count(ScheduleAssignment.id),
+            func.count(func.distinct(ScheduleAssignment.teacher_id)),
+            func.count(func.distinct(ScheduleAssignment.section_id)),
+            func.count(func.distinct(ScheduleAssignment.classroom_id)),
+            func.count(func.distinct(ScheduleAssignment.subject_id))
+        ).filter(schedule_criterion(session, schedule.id)).one()
+
+    return schedule, {
+        'total_assignments': total,
+        'teachers_involved': teachers,
+        'sections_covered': sections,
+        'classrooms_used': classrooms,
+        'subjects_scheduled': subjects
+    }
+
+
+def parse_cursor(cursor: Optional[str]) -> Optional[int]:
+    """
+    Parse a keyset cursor
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if cursor in (None, ''):
+        return None
+    value = int(cursor)
+    if value < 0:
+        raise ValueError('Cursor must be a non-negative integer')
+    return value
+
+
+def get_assignment_page(session, schedule_id: int, group_by: Optional[str] = None,
+                        after: Optional[int] = None,
+                        limit: int = DEFAULT_PAGE_SIZE) -> Dict[str, any]:
+    """
+    Fetch one keyset page of a schedule's assignments in a single query
+
+    Without group_by, pages are `limit` assignments ordered by id and the cursor
+    is the last assignment id. With group_by ('section' or 'teacher'), pages are
+    `limit` whole groups ordered by group id and the cursor is the last group id,
+    so a section or teacher grid is never split across pages.
+
+    Returns:
+        Dict with 'assignments' or 'groups', plus 'next_cursor' and 'has_more'
+    """
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    criterion = schedule_criterion(session, schedule_id)
+    query = assignment_projection(session).filter(criterion)
+
+    if not group_by:
+        if after is not None:
+            query = query.filter(ScheduleAssignment.id > after)
+        rows = query.order_by(ScheduleAssignment.id).limit(limit + 1).all()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        return {
+            'assignments': [format_assignment_row(r) for r in rows],
+            'next_cursor': str(rows[-1].id) if has_more else None,
+            'has_more': has_more
+        }
+
+    if group_by not in GROUP_COLUMNS:
+        raise ValueError(f"Unsupported group_by '{group_by}'")
+
+    group_col = GROUP_COLUMNS[group_by]
+
+    # Derived table of the next limit + 1 group ids (LIMIT inside IN is not portable)
+    page_groups = session.query(group_col.label('group_id')).filter(criterion)
+    if after is not None:
+        page_groups = page_groups.filter(group_col > after)
+    page_groups = page_groups.distinct().order_by(group_col).limit(limit + 1).subquery()
+
+    rows = query.join(
+        page_groups, page_groups.c.group_id == group_col
+    ).order_by(
+        group_col, TimePeriod.display_order, ScheduleAssignment.id
+    ).all()
+
+    groups = []
+    for row in rows:
+        group_id = getattr(row, f'{group_by}_id')
+        if not groups or groups[-1]['id'] != group_id:
+            groups.append({
+                'id': group_id,
+                'name': getattr(row, f'{group_by}_name') or 'Unknown',
+                'assignments': []
+            })
+        groups[-1]['assignments'].append(format_assignment_row(row))
+
+    has_more = len(groups) > limit
+    groups = groups[:limit]
+    for group in groups:
+        group['assignments'].sort(key=lambda a: (a['day_index'] is None, a['day_index'] or 0))
+
+    return {
+        'groups': groups,
+        'next_cursor': str(groups[-1]['id']) if has_more else None,
+        'has_more': has_more
+    }
@@ -4,12 +4,15 @@ Live schedule updates and real-time conflict monitoring
 Enhanced for Venezuelan K12 requirements
 """
 
-from flask import Blueprint, request, jsonify, g
+from flask import Blueprint, Response, current_app, request, jsonify, g, stream_with_context
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Optional
 import json
+import time
 
 from src.auth.decorators import jwt_required, tenant_required, teacher_or_admin_required
+from src.scheduling.occupancy import tenant_key
+from src.scheduling.realtime_broker import EVENT_TYPES, Subscription, format_sse, get_realtime_broker
 from src.scheduling.services import ScheduleManager
 
 
@@ -105,8 +108,8 @@ def get_user_dashboard(tenant_id, user_id):
 
 def get_teacher_dashboard_data(session, schedule_manager: ScheduleManager, teacher_id: int) -> Dict:
     """Get dashboard data specific to teachers"""
-    from src.models.tenant import ScheduleAssignment, DayOfWeek
-    import datetime as dt
+    from types import SimpleNamespace
+    from src.scheduling.teacher_timelines import EMPTY_DAY, get_teacher_timelines
 
     now = datetime.now()
     today = now.strftime('%A').lower()
@@ -131,72 +134,41 @@ def get_teacher_dashboard_data(session, schedule_manager: ScheduleManager, teach
         'workload_status': {}
     }
 
-    if today_spanish:
-        try:
-            day_enum = DayOfWeek(today_spanish)
-
-            # Get today's schedule for teacher
-            today_assignments = session.query(ScheduleAssignment).filter_by(
-                teacher_id=teacher_id,
-                day_of_week=day_enum,
-                academic_year=schedule_manager.academic_year,
-                is_active=True
-            ).order_by(ScheduleAssignment.time_period_id).all()
-
-            current_time = now.time()
-            current_class = None
-            next_class = None
-
-            for assignment in today_assignments:
-                class_info = {
-                    'assignment_id': assignment.id,
-                    'subject': assignment.subject.subject_name,
-                    'section': assignment.section.name,
-                    'classroom': assignment.classroom.name,
-                    'start_time': assignment.time_period.start_time.strftime('%H:%M'),
-                    'end_time': assignment.time_period.end_time.strftime('%H:%M'),
-                    'is_current': False,
-                    'is_next': False
-                }
-
-                # Check if this is current or next class
-                if (assignment.time_period.start_time <= current_time <= assignment.time_period.end_time):
-                    current_class = class_info.copy()
-                    current_class['is_current'] = True
-                elif assignment.time_period.start_time > current_time and not next_class:
-                    next_class = class_info.copy()
-                    next_class['is_next'] = True
-
-                teacher_data['today_schedule'].append(class_info)
-
-            teacher_data['current_class'] = current_class
-            teacher_data['next_class'] = next_class
-
-            # Get teacher conflicts
-            teacher_conflicts = []
-            for assignment in today_assignments:
-                conflicts = schedule_manager._detect_assignment_conflicts(session, assignment)
-                for conflict in conflicts:
-                    conflict['assignment_id'] = assignment.id
-                    teacher_conflicts.append(conflict)
-
-            teacher_data['conflicts'] = teacher_conflicts
-
-        except ValueError:
-            # Today is not a weekday
-            teacher_data['message'] = 'No classes scheduled for today'
-
-    # Get workload status
-    teacher_result = schedule_manager.get_teacher_schedule(teacher_id)
-    if teacher_result['status'] == 'success':
-        teacher_data['workload_status'] = teacher_result['workload']
+    # Sorted day timelines, rebuilt only after schedule changes
+    timeline = get_teacher_timelines().get(
+        session, tenant_key(schedule_manager.tenant_db_url), teacher_id
+    )
+    if timeline:
+        teacher_data['workload_status'] = timeline.workload
+
+    if not today_spanish:
+        teacher_data['message'] = 'No classes scheduled for today'
+        return teacher_data
+
+    day = timeline.day(today_spanish) if timeline else EMPTY_DAY
+    teacher_data['current_class'], teacher_data['next_class'] = day.current_and_next(now.time())
+    teacher_data['today_schedule'] = [dict(class_info) for class_info in day.classes]
+
+    # Get teacher conflicts (answered from the occupancy index)
+    teacher_conflicts = []
+    for lesson in day.lessons:
+        assignment = SimpleNamespace(
+            id=lesson['id'], teacher_id=lesson['teacher_id'], subject_id=lesson['subject_id'],
+            section_id=lesson['section_id'], classroom_id=lesson['classroom_id'],
+            time_period_id=lesson['time_period_id'], day_of_week=lesson['day']
+        )
+        for conflict in schedule_manager._detect_assignment_conflicts(session, assignment):
+            conflict['assignment_id'] = lesson['id']
+            teacher_conflicts.append(conflict)
+
+    teacher_data['conflicts'] = teacher_conflicts
 
     return teacher_data
 
 
 def get_admin_dashboard_data(session, schedule_manager: ScheduleManager) -> Dict:
     """Get dashboard data for administrators"""
-    from src.models.tenant import ScheduleAssignment, ScheduleConflict, Teacher, Section
+    from src.scheduling.aggregates import admin_overview, cached_aggregate
 
     admin_data = {
         'user_type': 'admin',
@@ -207,85 +179,10 @@ def get_admin_dashboard_data(session, schedule_manager: ScheduleManager) -> Dict
     }
 
     try:
-        # Platform overview
-        total_assignments = session.query(ScheduleAssignment).filter_by(
-            academic_year=schedule_manager.academic_year,
-            is_active=True
-        ).count()
-
-        total_conflicts = session.query(ScheduleConflict).filter_by(
-            academic_year=schedule_manager.academic_year,
-            status='active'
-        ).count()
-
-        critical_conflicts = session.query(ScheduleConflict).filter_by(
-            academic_year=schedule_manager.academic_year,
-            severity='critical',
-            status='active'
-        ).count()
-
-        admin_data['platform_overview'] = {
-            'total_assignments': total_assignments,
-            'total_conflicts': total_conflicts,
-            'critical_conflicts': critical_conflicts,
-            'conflict_rate': round((total_conflicts / total_assignments * 100) if total_assignments > 0 else 0, 2)
-        }
-
-        # Recent critical conflicts
-        recent_conflicts = session.query(ScheduleConflict).filter_by(
-            academic_year=schedule_manager.academic_year,
-            severity='critical',
-            status='active'
-        ).order_by(ScheduleConflict.detected_at.desc()).limit(5).all()
-
-        admin_data['critical_conflicts'] = [{
-            'id': conflict.id,
-            'type': conflict.conflict_type,
-            'description': conflict.description,
-            'detected_at': conflict.detected_at.isoformat()
-        } for conflict in recent_conflicts]
-
-        # Teacher workload alerts
-        overloaded_teachers = session.query(Teacher).filter(
-            Teacher.current_weekly_hours > Teacher.max_weekly_hours,
-            Teacher.academic_year == schedule_manager.academic_year,
-            Teacher.is_active == True
-        ).limit(5).all()
-
-        admin_data['teacher_alerts'] = [{
-            'teacher_id': teacher.id,
-            'teacher_name': teacher.teacher_name,
-            'current_hours': teacher.current_weekly_hours,
-            'max_hours': teacher.max_weekly_hours,
-            'excess_hours': teacher.current_weekly_hours - teacher.max_weekly_hours
-        } for teacher in overloaded_teachers]
-
-        # Schedule completion by section
-        sections = session.query(Section).filter_by(
-            academic_year=schedule_manager.academic_year,
-            is_active=True
-        ).all()
-
-        completion_data = []
-        for section in sections:
-            section_assignments = session.query(ScheduleAssignment).filter_by(
-                section_id=section.id,
-                academic_year=schedule_manager.academic_year,
-                is_active=True
-            ).count()
-
-            # Estimate expected assignments (5 days × 8 periods = 40 slots)
-            expected_assignments = 40
-            completion_pct = min(100, round((section_assignments / expected_assignments * 100), 1))
-
-            completion_data.append({
-                'section_id': section.id,
-                'section_name': section.name,
-                'assignments_count': section_assignments,
-                'completion_percentage': completion_pct
-            })
-
-        admin_data['schedule_completion'] = completion_data
+        # Grouped queries, materialized until the schedule changes
+        admin_data.update(cached_aggregate(
+            schedule_manager.tenant_db_url, 'admin_overview', lambda: admin_overview(session)
+        ))
 
     except Exception as e:
         admin_data['error'] = f"Error getting admin data: {str(e)}"
@@ -405,42 +302,12 @@ def get_workload_alerts(tenant_id):
         session = schedule_manager.SessionLocal()
 
         try:
-            from src.models.tenant import Teacher, TeacherWorkload
+            from src.scheduling.aggregates import cached_aggregate, workload_alerts
 
-            # Get teachers with workload issues
-            teachers = session.query(Teacher).filter_by(
-                academic_year=schedule_manager.academic_year,
-                is_active=True
-            ).all()
-
-            alerts = []
-            for teacher in teachers:
-                current_hours = teacher.current_weekly_hours or 0
-                max_hours = teacher.max_weekly_hours or 40
-
-                # Check for overload
-                if current_hours > max_hours:
-                    alerts.append({
-                        'teacher_id': teacher.id,
-                        'teacher_name': teacher.teacher_name,
-                        'alert_type': 'overloaded',
-                        'current_hours': current_hours,
-                        'max_hours': max_hours,
-                        'excess_hours': current_hours - max_hours,
-                        'severity': 'critical' if current_hours > max_hours * 1.2 else 'warning'
-                    })
-
-                # Check for underutilization
-                elif current_hours < max_hours * 0.5:
-                    alerts.append({
-                        'teacher_id': teacher.id,
-                        'teacher_name': teacher.teacher_name,
-                        'alert_type': 'underutilized',
-                        'current_hours': current_hours,
-                        'max_hours': max_hours,
-                        'utilization_percentage': round((current_hours / max_hours * 100), 1),
-                        'severity': 'info'
-                    })
+            # One grouped query, materialized until the schedule changes
+            alerts = cached_aggregate(
+                schedule_manager.tenant_db_url, 'workload_alerts', lambda: workload_alerts(session)
+            )
 
             return jsonify({
                 'alerts': alerts,
@@ -464,24 +331,30 @@ def get_workload_alerts(tenant_id):
 @teacher_or_admin_required
 def get_recent_changes(tenant_id):
     """
-    Get recent schedule changes for real-time updates
+    Get schedule changes after a cursor for incremental sync
 
     Query parameters:
-        - since: ISO timestamp for incremental updates
-        - limit: Maximum number of changes to return (default: 50)
+        - after: Last sequence id the client has seen (default: 0)
+        - since: ISO timestamp, for clients without a cursor yet
+        - limit: Maximum number of changes to return (default: 50, max: 500)
+        - section_id / teacher_id: Only changes for this section or teacher
 
     Response:
         {
             "changes": [
                 {
+                    "sequence": 1042,
                     "assignment_id": 123,
-                    "change_type": "created",
+                    "change_type": "updated",
+                    "changed_fields": {"classroom_id": [3, 5]},
                     "teacher_name": "MARIA NIETO",
                     "subject_name": "MATEMÁTICAS",
                     "section_name": "1er año A",
-                    "changed_at": "2025-01-01T00:00:00Z"
+                    "changed_at": "2025-01-01T00:00:00"
                 }
-            ]
+            ],
+            "next_cursor": 1042,
+            "has_more": false
         }
     """
     try:
@@ -489,52 +362,50 @@ def get_recent_changes(tenant_id):
         session = schedule_manager.SessionLocal()
 
         try:
-            from src.models.tenant import ScheduleAssignment
+            from sqlalchemy import func
+            from src.models.tenant import ScheduleChangeEvent
+            from src.scheduling.change_log import fetch_changes
 
             # Get query parameters
             since = request.args.get('since')
-            limit = int(request.args.get('limit', 50))
-
-            query = session.query(ScheduleAssignment).filter_by(
-                academic_year=schedule_manager.academic_year
-            )
+            after = request.args.get('after', 0, type=int)
+            limit = min(max(request.args.get('limit', 50, type=int), 1), 500)
 
-            # Apply since filter
-            if since:
+            # Translate a timestamp into a cursor once; clients continue with next_cursor
+            if since and 'after' not in request.args:
                 try:
                     since_dt = datetime.fromisoformat(since.replace('Z', '+00:00'))
-                    query = query.filter(ScheduleAssignment.created_at > since_dt)
                 except ValueError:
                     return jsonify({
                         'error': 'Invalid since timestamp',
                         'message': 'Use ISO format: YYYY-MM-DDTHH:MM:SSZ'
                     }), 400
 
-            assignments = query.order_by(
-                ScheduleAssignment.created_at.desc()
-            ).limit(limit).all()
-
-            changes = []
-            for assignment in assignments:
-                change_type = 'deleted' if not assignment.is_active else 'created'
-
-                changes.append({
-                    'assignment_id': assignment.id,
-                    'change_type': change_type,
-                    'teacher_name': assignment.teacher.teacher_name,
-                    'subject_name': assignment.subject.subject_name,
-                    'section_name': assignment.section.name,
-                    'classroom_name': assignment.classroom.name,
-                    'day_of_week': assignment.day_of_week.value,
-                    'time_period': assignment.time_period.period_name,
-                    'changed_at': assignment.created_at.isoformat(),
-                    'changed_by': assignment.created_by
-                })
+                if since_dt.tzinfo:
+                    since_dt = since_dt.astimezone(timezone.utc).replace(tzinfo=None)
+                first_after = session.query(func.min(ScheduleChangeEvent.id)).filter(
+                    ScheduleChangeEvent.changed_at > since_dt
+                ).scalar()
+                if first_after is not None:
+                    after = first_after - 1
+                else:
+                    after = session.query(func.max(ScheduleChangeEvent.id)).scalar() or 0
+
+            feed = fetch_changes(
+                session,
+                after=after,
+                limit=limit,
+                section_id=request.args.get('section_id', type=int),
+                teacher_id=request.args.get('teacher_id', type=int)
+            )
 
             return jsonify({
-                'changes': changes,
-                'total_changes': len(changes),
+                'changes': feed['changes'],
+                'total_changes': len(feed['changes']),
+                'next_cursor': feed['next_cursor'],
+                'has_more': feed['has_more'],
                 'last_updated': datetime.now(timezone.utc).isoformat(),
+                'after': after,
                 'since': since,
                 'limit': limit
             }), 200
@@ -546,4 +417,131 @@ def get_recent_changes(tenant_id):
         return jsonify({
             'error': 'Failed to get recent changes',
             'message': str(e)
-        }), 500
\ No newline at end of file
+        }), 500
+
+def parse_subscription() -> Subscription:
+    """Build per-connection filters from query parameters"""
+    types = request.args.get('types')
+    types = frozenset(t.strip() for t in types.split(',') if t.strip()) if types else frozenset(EVENT_TYPES)
+    unknown = types - set(EVENT_TYPES)
+    if unknown:
+        raise ValueError(f"Unknown event types: {', '.join(sorted(unknown))}")
+
+    severity = request.args.get('severity')
+    return Subscription(
+        types=types,
+        severities=frozenset(s.strip() for s in severity.split(',') if s.strip()) if severity else frozenset(),
+        section_id=request.args.get('section_id', type=int),
+        teacher_id=request.args.get('teacher_id', type=int)
+    )
+
+
+def request_cursor() -> Optional[int]:
+    """Last event id seen by the client (Last-Event-ID header on SSE reconnect)"""
+    cursor = request.headers.get('Last-Event-ID') or request.args.get('after')
+    try:
+        return int(cursor) if cursor not in (None, '') else None
+    except ValueError:
+        return None
+
+
+@realtime_bp.route('/stream', methods=['GET'])
+@jwt_required
+@tenant_required('tenant_id')
+@teacher_or_admin_required
+def stream_live_events(tenant_id):
+    """
+    Stream schedule changes and conflicts as Server-Sent Events
+
+    Query parameters:
+        - types: Comma separated event types (change, conflict)
+        - severity: Comma separated conflict severities
+        - section_id / teacher_id: Only events touching this section or teacher
+        - after: Event id to resume from (or the Last-Event-ID header)
+
+    Events:
+        event: change | conflict | reset, with JSON data; comment
+        heartbeats carry the cursor so reconnects resume where they left off.
+        A reset means events were missed; reload over REST and continue.
+    """
+    try:
+        subscription = parse_subscription()
+        db_key = tenant_key(get_schedule_manager(tenant_id).tenant_db_url)
+    except ValueError as e:
+        return jsonify({
+            'error': 'Invalid stream request',
+            'message': str(e)
+        }), 400
+
+    broker = get_realtime_broker()
+    heartbeat = current_app.config.get('REALTIME_HEARTBEAT_SECONDS', 15)
+    max_seconds = current_app.config.get('REALTIME_STREAM_MAX_SECONDS', 300)
+    cursor = request_cursor()
+
+    def generate(cursor):
+        if cursor is None:
+            cursor = broker.cursor(db_key)
+        yield f"retry: 3000\nid: {cursor}\nevent: ready\ndata: {json.dumps({'cursor': cursor})}\n\n"
+
+        # Bounded connection lifetime; the client reconnects with Last-Event-ID
+        ends_at = time.monotonic() + max_seconds
+        while True:
+            remaining = ends_at - time.monotonic()
+            if remaining <= 0:
+                return
+
+            events, cursor, reset = broker.wait(db_key, cursor, subscription, min(heartbeat, remaining))
+            if reset:
+                yield f"id: {cursor}\nevent: reset\ndata: {json.dumps({'cursor': cursor})}\n\n"
+            elif events:
+                for live_event in events:
+                    yield format_sse(live_event)
+            else:
+                yield f"id: {cursor}\n: keepalive\n\n"
+
+    return Response(
+        stream_with_context(generate(cursor)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+@realtime_bp.route('/poll', methods=['GET'])
+@jwt_required
+@tenant_required('tenant_id')
+@teacher_or_admin_required
+def poll_live_events(tenant_id):
+    """
+    Long-poll fallback for clients that cannot use Server-Sent Events
+
+    Query parameters:
+        Same filters as /stream, plus:
+        - after: Cursor returned by the previous poll (omit to start now)
+        - timeout: Seconds to wait for an event (capped by configuration)
+
+    Response:
+        {
+            "events": [{"id": 12, "type": "conflict", "data": {...}}],
+            "cursor": 12,
+            "reset": false
+        }
+    """
+    try:
+        subscription = parse_subscription()
+        db_key = tenant_key(get_schedule_manager(tenant_id).tenant_db_url)
+    except ValueError as e:
+        return jsonify({
+            'error': 'Invalid poll request',
+            'message': str(e)
+        }), 400
+
+    max_wait = current_app.config.get('REALTIME_LONG_POLL_SECONDS', 25)
+    timeout = min(max(request.args.get('timeout', max_wait, type=float), 0), max_wait)
+
+    events, cursor, reset = get_realtime_broker().wait(db_key, request_cursor(), subscription, timeout)
+
+    return jsonify({
+        'events': [live_event.to_dict() for live_event in events],
+        'cursor': cursor,
+        'reset': reset
+    }), 200
@@ -0,0 +1,302 @@
+"""
+BiScheduler Live Schedule Notifications
+In-process pub/sub broker for assignment changes and conflicts
+Fed at commit time; viewers wait on their tenant channel instead of polling the database
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from src.models.tenant import ScheduleAssignment, ScheduleConflict
+from src.scheduling.change_log import install_change_log, subscribe_committed_changes
+from src.scheduling.occupancy import tenant_key
+
+
+EVENT_TYPES = ('change', 'conflict')
+
+_PENDING_KEY = 'realtime_pending_conflicts'
+
+
+@dataclass(frozen=True)
+class LiveEvent:
+    """One published notification with the keys subscriptions filter on"""
+    id: int
+    type: str
+    data: Dict
+    section_ids: FrozenSet[int] = frozenset()
+    teacher_ids: FrozenSet[int] = frozenset()
+    severity: Optional[str] = None
+
+    def to_dict(self) -> Dict:
+        return {'id': self.id, 'type': self.type, 'data': self.data}
+
+
+@dataclass
+class Subscription:
+    """Per-connection filters; empty filters match everything"""
+    types: FrozenSet[str] = frozenset(EVENT_TYPES)
+    severities: FrozenSet[str] = frozenset()
+    section_id: Optional[int] = None
+    teacher_id: Optional[int] = None
+
+    def matches(self, live_event: LiveEvent) -> bool:
+        if live_event.type not in self.types:
+            return False
+        if self.severities and live_event.type == 'conflict' and live_event.severity not in self.severities:
+            return False
+        if self.section_id is not None and self.section_id not in live_event.section_ids:
+            return False
+        if self.teacher_id is not None and self.teacher_id not in live_event.teacher_ids:
+            return False
+        return True
+
+
+@dataclass
+class _Channel:
+    condition: threading.Condition
+    events: deque
+    last_id: int = 0
+    waiters: int = 0
+
+
+class RealtimeBroker:
+    """
+    Per-tenant channels of recent schedule notifications
+
+    Each tenant database has a bounded buffer of events with consecutive
+    ids. Connections wait on the channel condition and read only the events
+    after their cursor, so the cost of a write is one wake-up per waiting
+    connection and idle viewers cost nothing. A cursor that fell out of the
+    buffer (or predates a restart) gets a reset and should resync over REST.
+    Channels are per process; each worker notifies the viewers it serves
+    about the writes it commits.
+    """
+
+    def __init__(self, buffer_size: int = 1000):
+        self.buffer_size = buffer_size
+
+        self._lock = threading.Lock()
+        self._channels: Dict[str, _Channel] = {}
+        self._published = 0
+
+    def _channel(self, db_key: str) -> _Channel:
+        with self._lock:
+            channel = self._channels.get(db_key)
+            if channel is None:
+                channel = _Channel(threading.Condition(), deque(maxlen=self.buffer_size))
+                self._channels[db_key] = channel
+            return channel
+
+    def publish(self, db_key: str, items: List[Tuple]) -> int:
+        """
+        Publish events to a tenant channel
+
+        Args:
+            db_key: Tenant database key (see occupancy.tenant_key)
+            items: (type, data, section_ids, teacher_ids, severity) tuples
+
+        Returns:
+            Id of the last published event
+        """
+        channel = self._channel(db_key)
+        with channel.condition:
+            for event_type, data, section_ids, teacher_ids, severity in items:
+                channel.last_id += 1
+                channel.events.append(LiveEvent(
+                    channel.last_id, event_type, data,
+                    frozenset(section_ids) - {None}, frozenset(teacher_ids) - {None}, severity
+                ))
+            channel.condition.notify_all()
+            last_id = channel.last_id
+
+        with self._lock:
+            self._published += len(items)
+        return last_id
+
+    def cursor(self, db_key: str) -> int:
+        """Current end of a tenant channel (where new subscribers start)"""
+        channel = self._channel(db_key)
+        with channel.condition:
+            return channel.last_id
+
+    def wait(self, db_key: str, after: Optional[int], subscription: Subscription,
+             timeout: float) -> Tuple[List[LiveEvent], int, bool]:
+        """
+        Wait for events after a cursor that match a subscription
+
+        Args:
+            db_key: Tenant database key
+            after: Last event id the connection has seen (None starts at the current end)
+            subscription: Connection filters
+            timeout: Seconds to wait for a matching event
+
+        Returns:
+            (events, cursor, reset) - cursor advances past non-matching events too;
+            reset is True when events after the given cursor are no longer buffered
+        """
+        channel = self._channel(db_key)
+        deadline = time.monotonic() + timeout
+
+        with channel.condition:
+            if after is None:
+                after = channel.last_id
+            first_id = channel.events[0].id if channel.events else channel.last_id + 1
+            if after > channel.last_id or after < first_id - 1:
+                return [], channel.last_id, True
+
+            channel.waiters += 1
+            try:
+                while True:
+                    # Ids are consecutive, so the cursor maps straight to a buffer offset
+                    first_id = channel.events[0].id if channel.events else channel.last_id + 1
+                    if after < first_id - 1:
+                        return [], channel.last_id, True
+
+                    start = after - first_id + 1
+                    matched = [e for e in islice(channel.events, start, None) if subscription.matches(e)]
+                    after = channel.last_id
+                    if matched:
+                        return matched, after, False
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return [], after, False
+                    channel.condition.wait(remaining)
+            finally:
+                channel.waiters -= 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            channels = list(self._channels.values())
+            published = self._published
+        return {
+            'tenants': len(channels),
+            'waiting_connections': sum(channel.waiters for channel in channels),
+            'buffered_events': sum(len(channel.events) for channel in channels),
+            'published': published
+        }
+
+
+def format_sse(live_event: LiveEvent) -> str:
+    """Serialize an event as a Server-Sent Events frame"""
+    return f"id: {live_event.id}\nevent: {live_event.type}\ndata: {json.dumps(live_event.data, default=str)}\n\n"
+
+
+def _change_items(rows: List[Dict]) -> List[Tuple]:
+    items = []
+    for row in rows:
+        data = dict(row)
+        changed_fields = json.loads(row['changed_fields']) if row.get('changed_fields') else None
+        data['changed_fields'] = changed_fields
+        data['changed_at'] = row['changed_at'].isoformat()
+
+        # Moves notify both the old and the new section / teacher
+        sections = {row['section_id']}
+        teachers = {row['teacher_id']}
+        if changed_fields:
+            sections.add((changed_fields.get('section_id') or [None])[0])
+            teachers.add((changed_fields.get('teacher_id') or [None])[0])
+        items.append(('change', data, sections, teachers, None))
+    return items
+
+
+def _publish_changes(db_key: str, rows: List[Dict]):
+    get_realtime_broker().publish(db_key, _change_items(rows))
+
+
+def _after_flush(session, flush_context):
+    """Snapshot conflicts created or updated in this flush"""
+    conflicts = [
+        obj for obj in list(session.new) + list(session.dirty)
+        if isinstance(obj, ScheduleConflict) and session.is_modified(obj, include_collections=False)
+    ]
+    if not conflicts:
+        return
+
+    # Sections and teachers of the conflicting assignments, for subscription filters
+    assignment_ids = {c.assignment_1_id for c in conflicts} | {c.assignment_2_id for c in conflicts}
+    assignment_ids.discard(None)
+    owners = {
+        row.id: (row.section_id, row.teacher_id)
+        for row in session.execute(
+            select(ScheduleAssignment.id, ScheduleAssignment.section_id, ScheduleAssignment.teacher_id)
+            .where(ScheduleAssignment.id.in_(assignment_ids))
+        )
+    } if assignment_ids else {}
+
+    pending = session.info.setdefault(_PENDING_KEY, {})
+    for conflict in conflicts:
+        involved = [owners[a] for a in (conflict.assignment_1_id, conflict.assignment_2_id) if a in owners]
+        pending[conflict.id] = (
+            'conflict',
+            {
+                'id': conflict.id,
+                'type': conflict.conflict_type,
+                'severity': conflict.severity,
+                'status': conflict.status,
+                'description': conflict.description,
+                'assignment_1_id': conflict.assignment_1_id,
+                'assignment_2_id': conflict.assignment_2_id,
+                'suggested_resolution': conflict.suggested_resolution,
+                'auto_resolvable': conflict.auto_resolvable,
+                'detected_at': conflict.detected_at.isoformat() if conflict.detected_at else None,
+                'published_at': datetime.now(timezone.utc).isoformat()
+            },
+            {section_id for section_id, _ in involved},
+            {teacher_id for _, teacher_id in involved},
+            conflict.severity
+        )
+
+
+def _after_commit(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        get_realtime_broker().publish(tenant_key(session.get_bind().url), list(pending.values()))
+
+
+def _after_rollback(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def _install_listeners():
+    # Feed the broker from every ORM session (tenant pools and Flask-SQLAlchemy alike)
+    install_change_log()
+    subscribe_committed_changes(_publish_changes)
+    if not event.contains(Session, 'after_flush', _after_flush):
+        event.listen(Session, 'after_flush', _after_flush)
+        event.listen(Session, 'after_commit', _after_commit)
+        event.listen(Session, 'after_rollback', _after_rollback)
+
+
+def configure_realtime_broker(config: Dict) -> RealtimeBroker:
+    """Create the process-wide broker from application config"""
+    global _broker
+
+    with _broker_lock:
+        _broker = RealtimeBroker(buffer_size=config.get('REALTIME_BUFFER_SIZE', 1000))
+        _install_listeners()
+        return _broker
+
+
+def get_realtime_broker() -> RealtimeBroker:
+    """Get the process-wide broker (defaults if not configured)"""
+    global _broker
+
+    with _broker_lock:
+        if _broker is None:
+            _broker = RealtimeBroker()
+            _install_listeners()
+        return _broker
@@ -0,0 +1,241 @@
+"""
+BiScheduler Schedule Diff Engine
+Compares two schedules slot by slot for Venezuelan K12 platform
+Lets coordinators review an optimized draft before it replaces the active schedule
+"""
+
+from collections import defaultdict
+from types import SimpleNamespace
+from typing import Dict, Iterable, List, Set, Tuple
+
+from sqlalchemy import or_
+
+from src.models.tenant import ScheduleAssignment
+from src.scheduling.projections import assignment_projection, format_assignment_row
+from src.scheduling.schedule_versions import materialized_ids, schedule_criterion, version_chain
+
+
+def _slot_key(entry: Dict) -> Tuple:
+    """(section, day, period) key identifying a timetable cell"""
+    return (entry['section_id'], entry['day_index'], entry['time_period_id'])
+
+
+def _content_key(entry: Dict) -> Tuple:
+    """What is taught in a cell"""
+    return (entry['teacher_id'], entry['subject_id'], entry['classroom_id'])
+
+
+def _identity_key(entry: Dict) -> Tuple:
+    """Who teaches what to whom, independent of when and where"""
+    return (entry['section_id'], entry['subject_id'], entry['teacher_id'])
+
+
+def _slot_view(entry: Dict) -> Dict:
+    return {
+        'day': entry['day'],
+        'day_index': entry['day_index'],
+        'time_period_id': entry['time_period_id'],
+        'time_period': entry['time_period'],
+        'classroom_id': entry['classroom_id'],
+        'classroom': entry['classroom']
+    }
+
+
+def diff_assignment_stream(rows: Iterable, base_schedule_id: int,
+                           target_schedule_id: int) -> Dict[str, any]:
+    """
+    Diff two schedules from a single stream of assignment rows
+
+    Rows from both schedules must arrive ordered by (section, day, period) so
+    every timetable cell is resolved as soon as the stream moves past it. Only
+    unmatched cells are kept in memory, hashed by (section, subject, teacher),
+    to recognise assignments that moved to another cell.
+
+    Args:
+        rows: Projection rows (see assignment_projection) carrying schedule_id
+        base_schedule_id: Schedule being replaced (usually the active one)
+        target_schedule_id: Candidate schedule (usually an optimized draft)
+
+    Returns:
+        Dict with added, removed, moved and changed entries plus a summary
+    """
+    removed_by_identity = defaultdict(list)
+    added_pending = []
+    unchanged = 0
+
+    current_key = None
+    base_cell, target_cell = [], []
+
+    def flush_cell():
+        nonlocal unchanged
+        remaining = list(target_cell)
+        for entry in base_cell:
+            match = next((t for t in remaining if _content_key(t) == _content_key(entry)), None)
+            if match is not None:
+                remaining.remove(match)
+                unchanged += 1
+            else:
+                removed_by_identity[_identity_key(entry)].append(entry)
+        added_pending.extend(remaining)
+
+    for row in rows:
+        entry = format_assignment_row(row)
+        key = _slot_key(entry)
+        if key != current_key:
+            if current_key is not None:
+                flush_cell()
+            current_key = key
+            base_cell, target_cell = [], []
+
+        if row.schedule_id == base_schedule_id:
+            base_cell.append(entry)
+        elif row.schedule_id == target_schedule_id:
+            target_cell.append(entry)
+
+    if current_key is not None:
+        flush_cell()
+
+    # Pair removals and additions of the same lesson as moves
+    moved = []
+    added_remaining = []
+    for entry in added_pending:
+        candidates = removed_by_identity.get(_identity_key(entry))
+        if candidates:
+            previous = candidates.pop(0)
+            moved.append({
+                'section_id': entry['section_id'],
+                'section': entry['section'],
+                'subject_id': entry['subject_id'],
+                'subject': entry['subject'],
+                'teacher_id': entry['teacher_id'],
+                'teacher': entry['teacher'],
+                'from': _slot_view(previous),
+                'to': _slot_view(entry),
+                'base_assignment_id': previous['id'],
+                'target_assignment_id': entry['id']
+            })
+        else:
+            added_remaining.append(entry)
+
+    removed_remaining = [e for entries in removed_by_identity.values() for e in entries]
+
+    # Whatever is left in the same cell on both sides was replaced in place
+    removed_by_slot = defaultdict(list)
+    for entry in removed_remaining:
+        removed_by_slot[_slot_key(entry)].append(entry)
+
+    changed, added = [], []
+    for entry in added_remaining:
+        candidates = removed_by_slot.get(_slot_key(entry))
+        if candidates:
+            changed.append({'before': candidates.pop(0), 'after': entry})
+        else:
+            added.append(entry)
+
+    removed = [e for entries in removed_by_slot.values() for e in entries]
+
+    return {
+        'base_schedule_id': base_schedule_id,
+        'target_schedule_id': target_schedule_id,
+        'added': added,
+        'removed': removed,
+        'moved': moved,
+        'changed': changed,
+        'summary': _summarize(added, removed, moved, changed, unchanged)
+    }
+
+
+def _summarize(added: List[Dict], removed: List[Dict], moved: List[Dict],
+               changed: List[Dict], unchanged: int) -> Dict[str, any]:
+    """Count changes and collect affected teachers and sections"""
+    teachers = {}
+    sections = {}
+
+    def touch(entry: Dict):
+        teacher = teachers.setdefault(entry['teacher_id'], {
+            'id': entry['teacher_id'], 'name': entry['teacher'], 'changes': 0
+        })
+        teacher['changes'] += 1
+        section = sections.setdefault(entry['section_id'], {
+            'id': entry['section_id'], 'name': entry['section'], 'changes': 0
+        })
+        section['changes'] += 1
+
+    for entry in added + removed + moved:
+        touch(entry)
+    for pair in changed:
+        touch(pair['after'])
+        if pair['before']['teacher_id'] != pair['after']['teacher_id']:
+            touch(pair['before'])
+
+    return {
+        'added': len(added),
+        'removed': len(removed),
+        'moved': len(moved),
+        'changed': len(changed),
+        'unchanged': unchanged,
+        'affected_teachers': sorted(teachers.values(), key=lambda t: -t['changes']),
+        'affected_sections': sorted(sections.values(), key=lambda s: -s['changes'])
+    }
+
+
+def diff_schedules(session, base_schedule_id: int, target_schedule_id: int,
+                   batch_size: int = 1000) -> Dict[str, any]:
+    """
+    Diff two stored schedules with one ordered, streamed projection query
+
+    Args:
+        session: Database session
+        base_schedule_id: Schedule being replaced
+        target_schedule_id: Candidate schedule
+        batch_size: Rows fetched per round trip while streaming
+
+    Returns:
+        Diff result (see diff_assignment_stream)
+    """
+    if len(version_chain(session, base_schedule_id)) > 1 or len(version_chain(session, target_schedule_id)) > 1:
+        return diff_assignment_stream(
+            _version_rows(session, base_schedule_id, target_schedule_id, batch_size),
+            base_schedule_id, target_schedule_id
+        )
+
+    rows = assignment_projection(session).add_columns(
+        ScheduleAssignment.schedule_id.label('schedule_id')
+    ).filter(or_(
+        schedule_criterion(session, base_schedule_id),
+        schedule_criterion(session, target_schedule_id)
+    )).order_by(
+        ScheduleAssignment.section_id,
+        ScheduleAssignment.day_of_week,
+        ScheduleAssignment.time_period_id,
+        ScheduleAssignment.schedule_id
+    ).yield_per(batch_size)
+
+    return diff_assignment_stream(rows, base_schedule_id, target_schedule_id)
+
+
+def _version_rows(session, base_schedule_id: int, target_schedule_id: int, batch_size: int):
+    """
+    Ordered projection rows of two versions that may share assignment rows
+
+    A row inherited by both versions is yielded once per side, tagged with
+    the version it is read for.
+    """
+    base_ids: Set[int] = materialized_ids(session, base_schedule_id)
+    target_ids: Set[int] = materialized_ids(session, target_schedule_id)
+
+    rows = assignment_projection(session).filter(
+        ScheduleAssignment.id.in_(sorted(base_ids | target_ids))
+    ).order_by(
+        ScheduleAssignment.section_id,
+        ScheduleAssignment.day_of_week,
+        ScheduleAssignment.time_period_id,
+        ScheduleAssignment.id
+    ).yield_per(batch_size)
+
+    for row in rows:
+        values = row._asdict()
+        if row.id in base_ids:
+            yield SimpleNamespace(**values, schedule_id=base_schedule_id)
+        if row.id in target_ids:
+            yield SimpleNamespace(**values, schedule_id=target_schedule_id)
@@ -0,0 +1,435 @@
+"""
+BiScheduler Schedule Versions
+Copy-on-write drafts stored as deltas (added rows, removed row ids) against a parent
+Materialized on demand; storage and save time follow the size of the change
+
+Only the live (status 'active') version's rows are active assignments; draft
+rows are stored inactive until their version is activated. A row shared with
+other versions is copied before it is edited in place, so editing one version
+never rewrites another.
+"""
+
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, event, inspect, literal, or_, select
+from sqlalchemy.orm import Session
+
+from src.models.tenant import DayOfWeek, Schedule, ScheduleAssignment, ScheduleAssignmentRemoval
+
+
+# Assignment columns that identify a lesson placement
+PLACEMENT_COLUMNS = ('teacher_id', 'subject_id', 'section_id', 'classroom_id', 'day', 'time_period_id')
+
+# Stored columns whose in-place change is copied away from other versions
+WRITE_COLUMNS = ('teacher_id', 'subject_id', 'section_id', 'classroom_id', 'day_of_week', 'time_period_id',
+                 'is_active', 'is_locked', 'assignment_type', 'end_date', 'notes')
+
+# Carried over unchanged to the copies
+COPY_COLUMNS = ('tenant_id', 'priority', 'effective_date', 'created_by')
+
+LIVE_STATUS = 'active'
+
+MAX_CHAIN_LENGTH = 256
+
+# Session.info key set while a version is activated (its rows change liveness, not content)
+_ACTIVATING_KEY = 'schedule_version_activating'
+
+DAYS = list(DayOfWeek)
+
+
+def _day_number(day) -> int:
+    # DayOfWeek, its value ('lunes') or 0..4
+    if isinstance(day, int):
+        return day
+    return DAYS.index(day if isinstance(day, DayOfWeek) else DayOfWeek(str(day).lower()))
+
+
+def version_chain(session, schedule_id: int) -> List[int]:
+    """
+    Ids of a schedule and its ancestors, root first (one recursive query)
+
+    Raises:
+        ValueError: Unknown schedule, or a cycle in the parent links
+    """
+    chain = select(
+        Schedule.id.label('id'), Schedule.parent_id.label('parent_id'), literal(0).label('depth')
+    ).where(Schedule.id == schedule_id).cte('version_chain', recursive=True)
+    chain = chain.union_all(
+        select(Schedule.id, Schedule.parent_id, chain.c.depth + 1).join(
+            chain, Schedule.id == chain.c.parent_id
+        ).where(chain.c.depth < MAX_CHAIN_LENGTH)
+    )
+
+    rows = session.execute(select(chain.c.id, chain.c.depth).order_by(chain.c.depth.desc())).all()
+    if not rows:
+        raise ValueError(f'Schedule {schedule_id} not found')
+    if len(rows) > MAX_CHAIN_LENGTH:
+        raise ValueError(f'Schedule {schedule_id} has a cyclic or too deep version chain')
+    return [row.id for row in rows]
+
+
+def _materialize(own: Dict[int, Set[int]], removed: Dict[int, Set[int]], chain: List[int]) -> Set[int]:
+    ids: Set[int] = set()
+    for schedule_id in chain:
+        ids |= own.get(schedule_id, set())
+        ids -= removed.get(schedule_id, set())
+    return ids
+
+
+def _kept_by_owner(status):
+    # Soft-deleted rows of the live version are gone; other versions' rows are inactive by design
+    return or_(ScheduleAssignment.is_active == True, status != LIVE_STATUS)
+
+
+def own_rows_criterion(schedule_id, status):
+    """
+    Filter selecting the rows a version stores itself and still keeps
+
+    schedule_id and status are values or columns of a joined Schedule.
+    """
+    return and_(
+        ScheduleAssignment.schedule_id == schedule_id,
+        _kept_by_owner(status),
+        ~ScheduleAssignment.id.in_(
+            select(ScheduleAssignmentRemoval.assignment_id).where(
+                ScheduleAssignmentRemoval.schedule_id == schedule_id
+            )
+        )
+    )
+
+
+def materialized_ids(session, schedule_id: int, chain: List[int] = None) -> Set[int]:
+    """
+    Assignment ids that make up a schedule version
+
+    A version is its parent's assignments plus the rows it stores itself,
+    minus the ones it removes; root versions are just their own rows. Rows
+    soft-deleted while their version was live are never part of it. Three
+    queries regardless of chain length.
+    """
+    chain = chain or version_chain(session, schedule_id)
+
+    own = defaultdict(set)
+    for assignment_id, owner_id in session.query(
+        ScheduleAssignment.id, ScheduleAssignment.schedule_id
+    ).join(Schedule, Schedule.id == ScheduleAssignment.schedule_id).filter(
+        ScheduleAssignment.schedule_id.in_(chain),
+        _kept_by_owner(Schedule.status)
+    ):
+        own[owner_id].add(assignment_id)
+
+    removed = defaultdict(set)
+    for owner_id, assignment_id in session.query(
+        ScheduleAssignmentRemoval.schedule_id, ScheduleAssignmentRemoval.assignment_id
+    ).filter(ScheduleAssignmentRemoval.schedule_id.in_(chain)):
+        removed[owner_id].add(assignment_id)
+
+    return _materialize(own, removed, chain)
+
+
+def schedule_criterion(session, schedule_id: int):
+    """
+    Filter selecting the assignments of a schedule version
+
+    Root versions keep a schedule_id predicate (and its index); delta
+    versions are materialized to an id list.
+    """
+    chain = version_chain(session, schedule_id)
+    if len(chain) == 1:
+        status = select(Schedule.status).where(Schedule.id == schedule_id).scalar_subquery()
+        return own_rows_criterion(schedule_id, status)
+    return ScheduleAssignment.id.in_(sorted(materialized_ids(session, schedule_id, chain)))
+
+
+def placement_key(entry: Dict) -> Tuple:
+    """Hashable placement of an assignment dict (day as 0..4)"""
+    return tuple(
+        _day_number(entry['day']) if column == 'day' else entry[column]
+        for column in PLACEMENT_COLUMNS
+    )
+
+
+def _parent_placements(session, parent_id: int) -> Dict[Tuple, List[int]]:
+    """Parent version's assignment ids grouped by placement"""
+    chain = version_chain(session, parent_id)
+    ids = materialized_ids(session, parent_id, chain)
+
+    placements = defaultdict(list)
+    for row in session.query(
+        ScheduleAssignment.id, ScheduleAssignment.teacher_id, ScheduleAssignment.subject_id,
+        ScheduleAssignment.section_id, ScheduleAssignment.classroom_id,
+        ScheduleAssignment.day_of_week, ScheduleAssignment.time_period_id
+    ).filter(
+        ScheduleAssignment.schedule_id.in_(chain)
+    ).order_by(ScheduleAssignment.id):
+        if row.id in ids:
+            placements[placement_key({
+                'teacher_id': row.teacher_id, 'subject_id': row.subject_id, 'section_id': row.section_id,
+                'classroom_id': row.classroom_id, 'day': row.day_of_week, 'time_period_id': row.time_period_id
+            })].append(row.id)
+    return placements
+
+
+def save_schedule_version(session, schedule: Schedule, assignments: Iterable[Dict],
+                          parent_id: Optional[int] = None) -> Dict[str, int]:
+    """
+    Store a schedule version, as a delta when it has a parent
+
+    Assignments are matched to the parent's by placement; only unmatched
+    new placements are inserted and only unmatched parent rows are recorded
+    as removed. Without a parent every assignment is inserted. Inserted rows
+    are inactive until the version is activated (activate_schedule_version).
+    Adds to the session and flushes; the caller commits.
+
+    Args:
+        session: Tenant database session
+        schedule: New (unsaved) Schedule; its parent_id is set here
+        assignments: Full assignment list of the version, as dicts with
+            PLACEMENT_COLUMNS (day as DayOfWeek, its value or 0..4) plus
+            optional tenant_id and is_locked
+        parent_id: Version to branch from
+
+    Returns:
+        {'added': n, 'removed': n, 'unchanged': n}
+    """
+    schedule.parent_id = parent_id
+    session.add(schedule)
+    session.flush()
+
+    parent = _parent_placements(session, parent_id) if parent_id is not None else {}
+    added = []
+    unchanged = 0
+
+    for entry in assignments:
+        key = placement_key(entry)
+        matches = parent.get(key)
+        if matches:
+            matches.pop(0)
+            unchanged += 1
+            continue
+        added.append(ScheduleAssignment(
+            schedule_id=schedule.id,
+            tenant_id=entry.get('tenant_id', schedule.tenant_id),
+            teacher_id=entry['teacher_id'],
+            subject_id=entry['subject_id'],
+            section_id=entry['section_id'],
+            classroom_id=entry['classroom_id'],
+            time_period_id=entry['time_period_id'],
+            day_of_week=DAYS[key[PLACEMENT_COLUMNS.index('day')]],
+            is_locked=bool(entry.get('is_locked', False)),
+            is_active=False
+        ))
+
+    removed = [
+        ScheduleAssignmentRemoval(schedule_id=schedule.id, assignment_id=assignment_id)
+        for ids in parent.values() for assignment_id in ids
+    ]
+
+    session.add_all(added)
+    session.add_all(removed)
+    session.flush()
+
+    return {'added': len(added), 'removed': len(removed), 'unchanged': unchanged}
+
+
+def activate_schedule_version(session, schedule: Schedule) -> Dict[str, int]:
+    """
+    Make a version the tenant's live schedule
+
+    The version's rows become active assignments and the rows of the
+    previously live versions it does not keep are deactivated; those versions
+    are archived. Rows are written through the ORM so occupancy, workload and
+    the change log follow. Flushes; the caller commits.
+
+    Returns:
+        {'activated': n, 'deactivated': n}
+    """
+    keep = materialized_ids(session, schedule.id)
+    previous = session.query(Schedule).filter(
+        Schedule.tenant_id == schedule.tenant_id,
+        Schedule.status == LIVE_STATUS,
+        Schedule.id != schedule.id
+    ).all()
+
+    drop: Set[int] = set()
+    for version in previous:
+        drop |= materialized_ids(session, version.id)
+        # Rows soft-deleted while live stay out of the version once archived
+        session.add_all(
+            ScheduleAssignmentRemoval(schedule_id=version.id, assignment_id=assignment_id)
+            for (assignment_id,) in session.query(ScheduleAssignment.id).filter(
+                ScheduleAssignment.schedule_id == version.id,
+                ScheduleAssignment.is_active == False,
+                ~ScheduleAssignment.id.in_(
+                    select(ScheduleAssignmentRemoval.assignment_id).where(
+                        ScheduleAssignmentRemoval.schedule_id == version.id
+                    )
+                )
+            )
+        )
+    drop -= keep
+
+    session.info[_ACTIVATING_KEY] = True
+    try:
+        deactivated = session.query(ScheduleAssignment).filter(
+            ScheduleAssignment.id.in_(sorted(drop)), ScheduleAssignment.is_active == True
+        ).all() if drop else []
+        activated = session.query(ScheduleAssignment).filter(
+            ScheduleAssignment.id.in_(sorted(keep)), ScheduleAssignment.is_active == False
+        ).all() if keep else []
+
+        for assignment in deactivated:
+            assignment.is_active = False
+        for assignment in activated:
+            assignment.is_active = True
+        for version in previous:
+            version.status = 'archived'
+        schedule.status = LIVE_STATUS
+        session.flush()
+    finally:
+        session.info.pop(_ACTIVATING_KEY, None)
+
+    return {'activated': len(activated), 'deactivated': len(deactivated)}
+
+
+def version_delta(session, schedule_id: int) -> Dict[str, List[int]]:
+    """Assignment ids a version adds and removes relative to its parent"""
+    added = [assignment_id for (assignment_id,) in session.query(ScheduleAssignment.id).filter(
+        ScheduleAssignment.schedule_id == schedule_id
+    ).order_by(ScheduleAssignment.id)]
+    removed = [assignment_id for (assignment_id,) in session.query(ScheduleAssignmentRemoval.assignment_id).filter(
+        ScheduleAssignmentRemoval.schedule_id == schedule_id
+    ).order_by(ScheduleAssignmentRemoval.assignment_id)]
+    return {'added': added, 'removed': removed}
+
+
+def _version_tree(session, schedule_id: int) -> Dict[int, Tuple[Optional[int], str]]:
+    """A version and its descendants as {id: (parent_id, status)} (one recursive query)"""
+    tree = select(
+        Schedule.id.label('id'), Schedule.parent_id.label('parent_id'),
+        Schedule.status.label('status'), literal(0).label('depth')
+    ).where(Schedule.id == schedule_id).cte('version_tree', recursive=True)
+    tree = tree.union_all(
+        select(Schedule.id, Schedule.parent_id, Schedule.status, tree.c.depth + 1).join(
+            tree, Schedule.parent_id == tree.c.id
+        ).where(tree.c.depth < MAX_CHAIN_LENGTH)
+    )
+    return {row.id: (row.parent_id, row.status) for row in session.execute(select(tree))}
+
+
+def _previous_value(assignment: ScheduleAssignment, field: str):
+    history = inspect(assignment).attrs[field].history
+    if history.has_changes():
+        return history.deleted[0] if history.deleted else None
+    return getattr(assignment, field)
+
+
+def _copy(session, assignment: ScheduleAssignment, schedule_id: int) -> ScheduleAssignment:
+    """Inactive copy of an assignment as it was before this flush"""
+    copy = ScheduleAssignment(schedule_id=schedule_id, **{
+        field: getattr(assignment, field) for field in COPY_COLUMNS
+    }, **{
+        field: _previous_value(assignment, field) for field in WRITE_COLUMNS
+    })
+    copy.is_active = False
+    session.add(copy)
+    return copy
+
+
+def _preserve_versions(session, assignment: ScheduleAssignment, owner_id: int,
+                       tree: Dict[int, Tuple[Optional[int], str]]):
+    """
+    Keep other versions' view of an assignment that is written in place
+
+    The write belongs to the live version when a live lesson is edited,
+    otherwise to the owner. When the live version only inherits the row, it
+    takes the row over and the owner keeps a copy. Versions branched from the
+    writer get their own copy of the old row.
+    """
+    children = defaultdict(list)
+    for version_id, (parent_id, _) in tree.items():
+        if version_id != owner_id:
+            children[parent_id].append(version_id)
+
+    removers = {schedule_id for (schedule_id,) in session.query(ScheduleAssignmentRemoval.schedule_id).filter(
+        ScheduleAssignmentRemoval.assignment_id == assignment.id,
+        ScheduleAssignmentRemoval.schedule_id.in_(list(tree))
+    )}
+
+    writer = owner_id
+    if _previous_value(assignment, 'is_active'):
+        writer = next((v for v, (_, status) in tree.items() if status == LIVE_STATUS), owner_id)
+
+    def subtree(version_id):
+        found = {version_id}
+        for child in children[version_id]:
+            found |= subtree(child)
+        return found
+
+    if writer != owner_id:
+        kept = _copy(session, assignment, owner_id)
+        assignment.schedule_id = writer
+        session.add(ScheduleAssignmentRemoval(schedule_id=writer, assignment=kept))
+        # Versions that left the row out leave the copy out too
+        session.add_all(ScheduleAssignmentRemoval(schedule_id=v, assignment=kept) for v in removers)
+
+    for child in children[writer]:
+        if child in removers:
+            continue
+        kept = _copy(session, assignment, child)
+        session.add(ScheduleAssignmentRemoval(schedule_id=child, assignment_id=assignment.id))
+        session.add_all(
+            ScheduleAssignmentRemoval(schedule_id=v, assignment=kept) for v in subtree(child) & removers
+        )
+
+
+def _before_flush(session, flush_context, instances):
+    """Copy assignments shared with other versions before they are changed in place"""
+    if session.info.get(_ACTIVATING_KEY):
+        return
+
+    written = {}
+    for obj in session.dirty:
+        if isinstance(obj, ScheduleAssignment) and session.is_modified(obj, include_collections=False):
+            attrs = inspect(obj).attrs
+            owner_id = _previous_value(obj, 'schedule_id')
+            if owner_id is not None and any(attrs[field].history.has_changes() for field in WRITE_COLUMNS):
+                written[obj] = owner_id
+    if not written:
+        return
+
+    with session.no_autoflush:
+        # Rows of versions nothing branched from are written as is
+        shared = {parent_id for (parent_id,) in session.query(Schedule.parent_id).filter(
+            Schedule.parent_id.in_(set(written.values()))
+        ).distinct()}
+        trees = {}
+        for assignment, owner_id in written.items():
+            if owner_id in shared:
+                if owner_id not in trees:
+                    trees[owner_id] = _version_tree(session, owner_id)
+                _preserve_versions(session, assignment, owner_id, trees[owner_id])
+
+
+def _keep_old_value(target, value, oldvalue, initiator):
+    return value
+
+
+_installed = False
+_install_lock = threading.Lock()
+
+
+def install_version_tracking():
+    """Copy shared assignments on write in every ORM session (idempotent)"""
+    global _installed
+
+    with _install_lock:
+        if _installed:
+            return
+        event.listen(Session, 'before_flush', _before_flush)
+        # Load previous values on set so copies of expired rows keep them
+        for field in WRITE_COLUMNS + ('schedule_id',):
+            event.listen(getattr(ScheduleAssignment, field), 'set', _keep_old_value, active_history=True)
+        _installed = True
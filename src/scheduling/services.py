@@ -6,12 +6,18 @@ Enhanced with conflict detection and workload validation
 
 from datetime import datetime, timezone, time
 from typing import Dict, List, Optional, Tuple, Set
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine, and_, or_
+from sqlalchemy import or_
 from enum import Enum
 
+from src.core.engine_registry import get_engine_registry
+from src.scheduling.change_log import install_change_log
+from src.scheduling.occupancy import OccupancyIndex, get_occupancy_registry
+from src.scheduling.schedule_versions import install_version_tracking
+from src.scheduling.timetables import day_grid
+from src.scheduling.timetable_tensor import get_shared_timetable
+from src.scheduling.workload import install_workload_tracking
 from src.models.tenant import (
-    ScheduleAssignment, ScheduleConflict, TimePeriod, Teacher, Subject,
+    ScheduleAssignment, ScheduleConflict, Teacher, Subject,
     Section, Classroom, TeacherSubject, TeacherWorkload, DayOfWeek
 )
 
@@ -34,6 +40,225 @@ class ConflictSeverity(Enum):
     CRITICAL = "critical"
 
 
+# Double booking conflicts by occupied resource
+BOOKING_CONFLICTS = {
+    'teacher': {
+        'type': ConflictType.TEACHER_DOUBLE_BOOKING.value,
+        'severity': ConflictSeverity.CRITICAL.value,
+        'description': 'Teacher is already assigned to another class at this time',
+        'resolution': 'Choose a different time period or teacher'
+    },
+    'classroom': {
+        'type': ConflictType.CLASSROOM_CONFLICT.value,
+        'severity': ConflictSeverity.CRITICAL.value,
+        'description': 'Classroom is already occupied at this time',
+        'resolution': 'Choose a different classroom or time period'
+    },
+    'section': {
+        'type': ConflictType.SECTION_OVERLAP.value,
+        'severity': ConflictSeverity.CRITICAL.value,
+        'description': 'Section already has a class scheduled at this time',
+        'resolution': 'Choose a different time period for this section'
+    }
+}
+
+
+def scan_assignment_conflicts(assignments, teacher_subjects: Set[Tuple[int, int]],
+                              teacher_max_hours: Dict[int, int]) -> List[Dict]:
+    """
+    Find every conflict in a set of active assignments in one pass
+
+    Assignments are bucketed by (resource, day, period); each bucket holding
+    more than one assignment yields one conflict per pair.
+
+    Args:
+        assignments: Rows with id, teacher_id, classroom_id, section_id,
+            subject_id, day_of_week and time_period_id
+        teacher_subjects: Active (teacher_id, subject_id) qualifications
+        teacher_max_hours: Maximum weekly periods per teacher
+
+    Returns:
+        List of conflict dictionaries
+    """
+    buckets = {}
+    teacher_load = {}
+    conflicts = []
+
+    for a in assignments:
+        day = a.day_of_week.value if isinstance(a.day_of_week, DayOfWeek) else a.day_of_week
+        for kind in ('teacher', 'classroom', 'section'):
+            key = (kind, getattr(a, f'{kind}_id'), day, a.time_period_id)
+            buckets.setdefault(key, []).append(a.id)
+        teacher_load[a.teacher_id] = teacher_load.get(a.teacher_id, 0) + 1
+
+        # Check teacher-subject relationship
+        if (a.teacher_id, a.subject_id) not in teacher_subjects:
+            conflicts.append({
+                'type': ConflictType.TEACHER_SUBJECT_MISMATCH.value,
+                'severity': ConflictSeverity.WARNING.value,
+                'description': 'Teacher is not assigned to teach this subject',
+                'assignment_id': a.id,
+                'teacher_id': a.teacher_id,
+                'subject_id': a.subject_id,
+                'resolution': 'Verify teacher qualifications or assign subject to teacher first'
+            })
+
+    # Double bookings, one conflict per clashing pair
+    for (kind, resource_id, day, period_id), ids in buckets.items():
+        if len(ids) < 2:
+            continue
+        for i, first_id in enumerate(ids):
+            for second_id in ids[i + 1:]:
+                conflict = dict(BOOKING_CONFLICTS[kind])
+                conflict.update({
+                    'assignment_id': first_id,
+                    'existing_assignment_id': second_id,
+                    f'{kind}_id': resource_id,
+                    'day_of_week': day,
+                    'time_period_id': period_id
+                })
+                conflicts.append(conflict)
+
+    # Workload violations, once per teacher
+    for teacher_id, hours in teacher_load.items():
+        max_hours = teacher_max_hours.get(teacher_id)
+        if max_hours is not None and hours > max_hours:
+            conflicts.append({
+                'type': ConflictType.WORKLOAD_VIOLATION.value,
+                'severity': ConflictSeverity.ERROR.value,
+                'description': f'Teacher exceeds maximum hours ({hours} > {max_hours})',
+                'teacher_id': teacher_id,
+                'resolution': 'Reduce teacher workload or increase maximum allowed hours'
+            })
+
+    return conflicts
+
+
+PROPOSAL_FIELDS = ('teacher_id', 'classroom_id', 'day_of_week', 'time_period_id')
+
+MAX_BATCH_PROPOSALS = 500
+
+
+def check_proposed_assignments(index: OccupancyIndex, proposals: List[Dict]) -> List[Dict]:
+    """
+    Check many proposed placements against the stored schedule and each other
+
+    Served entirely from the occupancy index. Assignments named in any
+    proposal's exclude_assignment_id are treated as moving, so their current
+    slots and teacher periods are free for the whole batch (drag of a block).
+
+    Args:
+        index: Occupancy index of the tenant
+        proposals: Dicts with teacher_id, classroom_id, day_of_week and
+            time_period_id, plus optional section_id, subject_id and
+            exclude_assignment_id
+
+    Returns:
+        One {'index', 'has_conflicts', 'conflicts'} per proposal, in order;
+        malformed proposals get an 'error' instead
+    """
+    results = []
+    valid = []
+    for i, data in enumerate(proposals):
+        missing = [field for field in PROPOSAL_FIELDS if not data.get(field)]
+        if missing:
+            results.append({'index': i, 'error': f"Missing required field: {', '.join(missing)}"})
+            continue
+        try:
+            day = DayOfWeek(str(data['day_of_week']).lower()).value
+        except ValueError:
+            results.append({'index': i, 'error': f"Invalid day_of_week '{data['day_of_week']}'"})
+            continue
+        results.append({'index': i, 'has_conflicts': False, 'conflicts': []})
+        valid.append((i, dict(data, day_of_week=day)))
+
+    moving = {data['exclude_assignment_id'] for _, data in valid if data.get('exclude_assignment_id')}
+    moving_load = {}
+    for assignment_id in moving:
+        entry = index.assignment(assignment_id)
+        if entry is not None:
+            moving_load[entry['teacher']] = moving_load.get(entry['teacher'], 0) + 1
+
+    # Slots and teacher periods claimed by the batch itself
+    buckets = {}
+    batch_load = {}
+    for i, data in valid:
+        for kind in ('teacher', 'classroom', 'section'):
+            if data.get(f'{kind}_id') is not None:
+                key = (kind, data[f'{kind}_id'], data['day_of_week'], data['time_period_id'])
+                buckets.setdefault(key, []).append(i)
+        batch_load[data['teacher_id']] = batch_load.get(data['teacher_id'], 0) + 1
+
+    for i, data in valid:
+        conflicts = results[i]['conflicts']
+
+        for kind in ('teacher', 'classroom', 'section'):
+            resource_id = data.get(f'{kind}_id')
+            if resource_id is None:
+                continue
+            existing = index.holders(kind, resource_id, data['day_of_week'], data['time_period_id']) - moving
+            if existing:
+                conflict = dict(BOOKING_CONFLICTS[kind])
+                conflict['existing_assignment_id'] = min(existing)
+                conflicts.append(conflict)
+            others = [j for j in buckets[(kind, resource_id, data['day_of_week'], data['time_period_id'])] if j != i]
+            if others:
+                conflict = dict(BOOKING_CONFLICTS[kind])
+                conflict['batch_indexes'] = others
+                conflicts.append(conflict)
+
+        # Check teacher-subject relationship
+        if data.get('subject_id') is not None and not index.is_qualified(data['teacher_id'], data['subject_id']):
+            conflicts.append({
+                'type': ConflictType.TEACHER_SUBJECT_MISMATCH.value,
+                'severity': ConflictSeverity.WARNING.value,
+                'description': 'Teacher is not assigned to teach this subject',
+                'resolution': 'Verify teacher qualifications or assign subject to teacher first'
+            })
+
+        # Check workload with every proposal of the batch placed (one period each)
+        teacher_id = data['teacher_id']
+        max_hours = index.teacher_max_hours.get(teacher_id)
+        if max_hours is not None:
+            projected_hours = index.teacher_load(teacher_id) - moving_load.get(teacher_id, 0) + batch_load[teacher_id]
+            if projected_hours > max_hours:
+                conflicts.append({
+                    'type': ConflictType.WORKLOAD_VIOLATION.value,
+                    'severity': ConflictSeverity.ERROR.value,
+                    'description': f'Batch would exceed teacher maximum hours ({projected_hours} > {max_hours})',
+                    'resolution': 'Reduce teacher workload or increase maximum allowed hours'
+                })
+
+        results[i]['has_conflicts'] = bool(conflicts)
+
+    return results
+
+
+class BatchOccupancy:
+    """Slots taken by earlier rows of a bulk request, before they are inserted"""
+
+    def __init__(self):
+        self._slots: Dict[Tuple[str, int, str, int], int] = {}
+        self._teacher_load: Dict[int, int] = {}
+
+    def add(self, row_index: int, assignment: ScheduleAssignment):
+        for kind in ('teacher', 'classroom', 'section'):
+            self._slots.setdefault(self._key(kind, assignment), row_index)
+        self._teacher_load[assignment.teacher_id] = self._teacher_load.get(assignment.teacher_id, 0) + 1
+
+    def occupant(self, kind: str, assignment: ScheduleAssignment) -> Optional[int]:
+        """Row index of the batch assignment holding the same slot, if any"""
+        return self._slots.get(self._key(kind, assignment))
+
+    def teacher_load(self, teacher_id: int) -> int:
+        return self._teacher_load.get(teacher_id, 0)
+
+    @staticmethod
+    def _key(kind: str, assignment: ScheduleAssignment) -> Tuple[str, int, str, int]:
+        return (kind, getattr(assignment, f'{kind}_id'), assignment.day_of_week.value,
+                assignment.time_period_id)
+
+
 class ScheduleManager:
     """
     Core schedule management for Venezuelan K12 institutions
@@ -43,8 +268,16 @@ class ScheduleManager:
     def __init__(self, tenant_db_url: str, academic_year: str = "2025-2026"):
         self.tenant_db_url = tenant_db_url
         self.academic_year = academic_year
-        self.engine = create_engine(tenant_db_url)
-        self.SessionLocal = sessionmaker(bind=self.engine)
+
+        # Teacher workload, the change log and schedule versions follow assignment writes
+        install_workload_tracking()
+        install_change_log()
+        install_version_tracking()
+
+        # Shared, bounded pool per tenant database
+        registry = get_engine_registry()
+        self.engine = registry.get_engine(tenant_db_url)
+        self.SessionLocal = registry.get_sessionmaker(tenant_db_url)
 
     def create_schedule_assignment(
         self,
@@ -122,11 +355,9 @@ class ScheduleManager:
                     )
                     session.add(conflict)
 
+            # Teacher workload is recomputed at commit (see workload.py)
             session.commit()
 
-            # Update teacher workload
-            self._update_teacher_workload(session, teacher_id)
-
             return {
                 'status': 'success',
                 'message': 'Schedule assignment created successfully',
@@ -154,137 +385,53 @@ class ScheduleManager:
         finally:
             session.close()
 
-    def _detect_assignment_conflicts(self, session, assignment: ScheduleAssignment) -> List[Dict]:
+    def _occupancy(self, session) -> OccupancyIndex:
+        """Occupancy index for this tenant and academic year"""
+        return get_occupancy_registry().get_index(session)
+
+    def _detect_assignment_conflicts(self, session, assignment: ScheduleAssignment,
+                                     batch: 'BatchOccupancy' = None) -> List[Dict]:
         """
         Detect conflicts for a schedule assignment
 
+        Answered from the in-memory occupancy index, without per-check queries
+
         Args:
             session: Database session
             assignment: Schedule assignment to check
+            batch: Not yet inserted assignments of the same bulk request
 
         Returns:
             List of conflict dictionaries
         """
+        index = self._occupancy(session)
+        exclude_id = getattr(assignment, 'id', None)  # Exclude self if updating
         conflicts = []
 
-        # Check teacher double booking
-        teacher_conflicts = self._check_teacher_conflicts(session, assignment)
-        conflicts.extend(teacher_conflicts)
-
-        # Check classroom conflicts
-        classroom_conflicts = self._check_classroom_conflicts(session, assignment)
-        conflicts.extend(classroom_conflicts)
-
-        # Check section conflicts
-        section_conflicts = self._check_section_conflicts(session, assignment)
-        conflicts.extend(section_conflicts)
+        # Check teacher, classroom and section double booking
+        clashes = index.find_conflicts(
+            teacher_id=assignment.teacher_id,
+            classroom_id=assignment.classroom_id,
+            section_id=assignment.section_id,
+            day=assignment.day_of_week,
+            time_period_id=assignment.time_period_id,
+            exclude_assignment_id=exclude_id
+        )
+
+        for kind in ('teacher', 'classroom', 'section'):
+            if kind in clashes:
+                conflict = dict(BOOKING_CONFLICTS[kind])
+                conflict['existing_assignment_id'] = clashes[kind]
+                conflicts.append(conflict)
+            elif batch is not None:
+                batch_index = batch.occupant(kind, assignment)
+                if batch_index is not None:
+                    conflict = dict(BOOKING_CONFLICTS[kind])
+                    conflict['batch_index'] = batch_index
+                    conflicts.append(conflict)
 
         # Check teacher-subject relationship
-        subject_conflicts = self._check_teacher_subject_validity(session, assignment)
-        conflicts.extend(subject_conflicts)
-
-        # Check workload violations
-        workload_conflicts = self._check_workload_violations(session, assignment)
-        conflicts.extend(workload_conflicts)
-
-        return conflicts
-
-    def _check_teacher_conflicts(self, session, assignment: ScheduleAssignment) -> List[Dict]:
-        """Check for teacher double booking conflicts"""
-        conflicts = []
-
-        # Find existing assignments for same teacher, day, and time period
-        existing = session.query(ScheduleAssignment).filter(
-            and_(
-                ScheduleAssignment.teacher_id == assignment.teacher_id,
-                ScheduleAssignment.day_of_week == assignment.day_of_week,
-                ScheduleAssignment.time_period_id == assignment.time_period_id,
-                ScheduleAssignment.academic_year == assignment.academic_year,
-                ScheduleAssignment.is_active == True,
-                ScheduleAssignment.id != getattr(assignment, 'id', 0)  # Exclude self if updating
-            )
-        ).first()
-
-        if existing:
-            conflicts.append({
-                'type': ConflictType.TEACHER_DOUBLE_BOOKING.value,
-                'severity': ConflictSeverity.CRITICAL.value,
-                'description': f'Teacher is already assigned to another class at this time',
-                'existing_assignment_id': existing.id,
-                'resolution': 'Choose a different time period or teacher'
-            })
-
-        return conflicts
-
-    def _check_classroom_conflicts(self, session, assignment: ScheduleAssignment) -> List[Dict]:
-        """Check for classroom booking conflicts"""
-        conflicts = []
-
-        # Find existing assignments for same classroom, day, and time period
-        existing = session.query(ScheduleAssignment).filter(
-            and_(
-                ScheduleAssignment.classroom_id == assignment.classroom_id,
-                ScheduleAssignment.day_of_week == assignment.day_of_week,
-                ScheduleAssignment.time_period_id == assignment.time_period_id,
-                ScheduleAssignment.academic_year == assignment.academic_year,
-                ScheduleAssignment.is_active == True,
-                ScheduleAssignment.id != getattr(assignment, 'id', 0)
-            )
-        ).first()
-
-        if existing:
-            conflicts.append({
-                'type': ConflictType.CLASSROOM_CONFLICT.value,
-                'severity': ConflictSeverity.CRITICAL.value,
-                'description': f'Classroom is already occupied at this time',
-                'existing_assignment_id': existing.id,
-                'resolution': 'Choose a different classroom or time period'
-            })
-
-        return conflicts
-
-    def _check_section_conflicts(self, session, assignment: ScheduleAssignment) -> List[Dict]:
-        """Check for section scheduling conflicts"""
-        conflicts = []
-
-        # Find existing assignments for same section, day, and time period
-        existing = session.query(ScheduleAssignment).filter(
-            and_(
-                ScheduleAssignment.section_id == assignment.section_id,
-                ScheduleAssignment.day_of_week == assignment.day_of_week,
-                ScheduleAssignment.time_period_id == assignment.time_period_id,
-                ScheduleAssignment.academic_year == assignment.academic_year,
-                ScheduleAssignment.is_active == True,
-                ScheduleAssignment.id != getattr(assignment, 'id', 0)
-            )
-        ).first()
-
-        if existing:
-            conflicts.append({
-                'type': ConflictType.SECTION_OVERLAP.value,
-                'severity': ConflictSeverity.CRITICAL.value,
-                'description': f'Section already has a class scheduled at this time',
-                'existing_assignment_id': existing.id,
-                'resolution': 'Choose a different time period for this section'
-            })
-
-        return conflicts
-
-    def _check_teacher_subject_validity(self, session, assignment: ScheduleAssignment) -> List[Dict]:
-        """Check if teacher is qualified to teach the subject"""
-        conflicts = []
-
-        # Check if teacher has relationship with subject
-        teacher_subject = session.query(TeacherSubject).filter(
-            and_(
-                TeacherSubject.teacher_id == assignment.teacher_id,
-                TeacherSubject.subject_id == assignment.subject_id,
-                TeacherSubject.academic_year == assignment.academic_year,
-                TeacherSubject.is_active == True
-            )
-        ).first()
-
-        if not teacher_subject:
+        if not index.is_qualified(assignment.teacher_id, assignment.subject_id):
             conflicts.append({
                 'type': ConflictType.TEACHER_SUBJECT_MISMATCH.value,
                 'severity': ConflictSeverity.WARNING.value,
@@ -292,85 +439,137 @@ class ScheduleManager:
                 'resolution': 'Verify teacher qualifications or assign subject to teacher first'
             })
 
-        return conflicts
+        # Check workload violations (each assignment is one period per week)
+        max_hours = index.teacher_max_hours.get(assignment.teacher_id)
+        if max_hours is not None:
+            projected_hours = index.teacher_load(assignment.teacher_id, exclude_id) + 1
+            if batch is not None:
+                projected_hours += batch.teacher_load(assignment.teacher_id)
+            if projected_hours > max_hours:
+                conflicts.append({
+                    'type': ConflictType.WORKLOAD_VIOLATION.value,
+                    'severity': ConflictSeverity.ERROR.value,
+                    'description': f'Assignment would exceed teacher maximum hours ({projected_hours} > {max_hours})',
+                    'resolution': f'Reduce teacher workload or increase maximum allowed hours'
+                })
 
-    def _check_workload_violations(self, session, assignment: ScheduleAssignment) -> List[Dict]:
-        """Check for teacher workload violations"""
-        conflicts = []
+        return conflicts
 
-        # Get teacher's current workload
-        teacher = session.query(Teacher).filter_by(id=assignment.teacher_id).first()
-        if not teacher:
-            return conflicts
-
-        # Count current weekly hours for this teacher
-        current_assignments = session.query(ScheduleAssignment).filter(
-            and_(
-                ScheduleAssignment.teacher_id == assignment.teacher_id,
-                ScheduleAssignment.academic_year == assignment.academic_year,
-                ScheduleAssignment.is_active == True
-            )
-        ).count()
+    def bulk_create_assignments(
+        self,
+        assignments: List[Dict],
+        tenant_id: int = 1,
+        created_by: str = None,
+        validate_conflicts: bool = True,
+        stop_on_conflict: bool = False,
+        chunk_size: int = 500
+    ) -> Dict[str, any]:
+        """
+        Create many schedule assignments in a single transaction
 
-        # Each assignment represents one period per week
-        projected_hours = current_assignments + 1
+        The batch is validated against existing assignments and against its own
+        earlier rows, inserted in chunks, and teacher workloads are recomputed
+        once per affected teacher when it commits.
 
-        # Check against maximum allowed hours
-        max_hours = teacher.max_weekly_hours or 40
-        if projected_hours > max_hours:
-            conflicts.append({
-                'type': ConflictType.WORKLOAD_VIOLATION.value,
-                'severity': ConflictSeverity.ERROR.value,
-                'description': f'Assignment would exceed teacher maximum hours ({projected_hours} > {max_hours})',
-                'resolution': f'Reduce teacher workload or increase maximum allowed hours'
-            })
+        Args:
+            assignments: Assignment dicts (teacher_id, subject_id, section_id,
+                classroom_id, time_period_id, day_of_week)
+            tenant_id: Numeric tenant id stored on each assignment
+            created_by: User who created the assignments
+            validate_conflicts: Whether to check for conflicts
+            stop_on_conflict: Stop at the first rejected row
+            chunk_size: Rows per INSERT flush
 
-        return conflicts
+        Returns:
+            Result dictionary with per-row outcome and conflict information
+        """
+        session = self.SessionLocal()
 
-    def _update_teacher_workload(self, session, teacher_id: int):
-        """Update teacher workload calculations"""
         try:
-            # Count total assignments for teacher
-            total_assignments = session.query(ScheduleAssignment).filter(
-                and_(
-                    ScheduleAssignment.teacher_id == teacher_id,
-                    ScheduleAssignment.academic_year == self.academic_year,
-                    ScheduleAssignment.is_active == True
-                )
-            ).count()
-
-            # Update teacher's current weekly hours
-            teacher = session.query(Teacher).filter_by(id=teacher_id).first()
-            if teacher:
-                teacher.current_weekly_hours = total_assignments
-
-            # Update or create workload record
-            workload = session.query(TeacherWorkload).filter(
-                and_(
-                    TeacherWorkload.teacher_id == teacher_id,
-                    TeacherWorkload.academic_year == self.academic_year
-                )
-            ).first()
-
-            if workload:
-                workload.calculated_hours = total_assignments
-                workload.validate_workload()
-            else:
-                workload = TeacherWorkload(
-                    teacher_id=teacher_id,
-                    academic_year=self.academic_year,
-                    total_weekly_hours=total_assignments,
-                    calculated_hours=total_assignments,
-                    max_allowed_hours=teacher.max_weekly_hours or 40
-                )
-                workload.validate_workload()
-                session.add(workload)
-
+            batch = BatchOccupancy()
+            accepted = []
+            failed = []
+            all_conflicts = []
+            effective_date = datetime.now(timezone.utc)
+
+            for i, data in enumerate(assignments):
+                try:
+                    assignment = ScheduleAssignment(
+                        tenant_id=tenant_id,
+                        teacher_id=data['teacher_id'],
+                        subject_id=data['subject_id'],
+                        section_id=data['section_id'],
+                        classroom_id=data['classroom_id'],
+                        time_period_id=data['time_period_id'],
+                        day_of_week=DayOfWeek(data['day_of_week']),
+                        created_by=created_by,
+                        effective_date=effective_date,
+                        is_active=True
+                    )
+                except (KeyError, ValueError) as e:
+                    failed.append({'index': i, 'error': f'Invalid assignment: {str(e)}'})
+                    continue
+
+                conflicts = []
+                if validate_conflicts:
+                    conflicts = self._detect_assignment_conflicts(session, assignment, batch)
+
+                if any(c['severity'] == ConflictSeverity.CRITICAL.value for c in conflicts):
+                    failed.append({
+                        'index': i,
+                        'error': 'Critical conflicts detected',
+                        'conflicts': conflicts
+                    })
+                    if stop_on_conflict:
+                        break
+                    continue
+
+                batch.add(i, assignment)
+                accepted.append((i, assignment, conflicts))
+                all_conflicts.extend(conflicts)
+
+            # Insert in chunks; ids are needed for the conflict log
+            for start in range(0, len(accepted), chunk_size):
+                chunk = accepted[start:start + chunk_size]
+                session.add_all([assignment for _, assignment, _ in chunk])
+                session.flush()
+
+                for _, assignment, conflicts in chunk:
+                    for conflict_data in conflicts:
+                        session.add(ScheduleConflict(
+                            conflict_type=conflict_data['type'],
+                            severity=conflict_data['severity'],
+                            assignment_1_id=assignment.id,
+                            description=conflict_data['description'],
+                            suggested_resolution=conflict_data.get('resolution')
+                        ))
+
+            # Commit recomputes workload once per affected teacher
             session.commit()
 
+            created = [{'index': i, 'assignment_id': assignment.id} for i, assignment, _ in accepted]
+            return {
+                'status': 'success' if created else 'error',
+                'created_assignments': len(created),
+                'failed_assignments': len(failed),
+                'assignments_created': created,
+                'assignments_failed': failed,
+                'conflicts': all_conflicts
+            }
+
         except Exception as e:
             session.rollback()
-            print(f"Error updating teacher workload: {str(e)}")
+            return {
+                'status': 'error',
+                'message': f'Bulk assignment failed: {str(e)}',
+                'created_assignments': 0,
+                'failed_assignments': len(assignments),
+                'assignments_created': [],
+                'assignments_failed': [],
+                'conflicts': []
+            }
+        finally:
+            session.close()
 
     def get_schedule_for_section(self, section_id: int, week_start: datetime = None) -> Dict[str, any]:
         """
@@ -386,32 +585,9 @@ class ScheduleManager:
         session = self.SessionLocal()
 
         try:
-            # Get all assignments for section
-            assignments = session.query(ScheduleAssignment).filter(
-                and_(
-                    ScheduleAssignment.section_id == section_id,
-                    ScheduleAssignment.academic_year == self.academic_year,
-                    ScheduleAssignment.is_active == True
-                )
-            ).all()
-
-            # Organize by day and time period
-            schedule = {}
-            for day in DayOfWeek:
-                schedule[day.value] = {}
-
-            for assignment in assignments:
-                day = assignment.day_of_week.value
-                time_period = assignment.time_period
-
-                schedule[day][time_period.period_name] = {
-                    'assignment_id': assignment.id,
-                    'subject': assignment.subject.subject_name,
-                    'teacher': assignment.teacher.teacher_name,
-                    'classroom': assignment.classroom.name,
-                    'time': f"{time_period.start_time} - {time_period.end_time}",
-                    'is_break': time_period.is_break
-                }
+            # Served from the shared timetable tensor (built once per schedule version)
+            timetable = get_shared_timetable(session).view('section', section_id)
+            schedule = day_grid(timetable, ('subject', 'teacher', 'classroom', 'time', 'is_break'))
 
             return {
                 'status': 'success',
@@ -449,44 +625,16 @@ class ScheduleManager:
                     'message': 'Teacher not found'
                 }
 
-            # Get all assignments for teacher
-            assignments = session.query(ScheduleAssignment).filter(
-                and_(
-                    ScheduleAssignment.teacher_id == teacher_id,
-                    ScheduleAssignment.academic_year == self.academic_year,
-                    ScheduleAssignment.is_active == True
-                )
-            ).all()
-
-            # Organize schedule
-            schedule = {}
-            for day in DayOfWeek:
-                schedule[day.value] = {}
-
-            subjects_taught = set()
-            total_hours = 0
-
-            for assignment in assignments:
-                day = assignment.day_of_week.value
-                time_period = assignment.time_period
-
-                schedule[day][time_period.period_name] = {
-                    'assignment_id': assignment.id,
-                    'subject': assignment.subject.subject_name,
-                    'section': assignment.section.name,
-                    'classroom': assignment.classroom.name,
-                    'time': f"{time_period.start_time} - {time_period.end_time}"
-                }
+            # Served from the shared timetable tensor (built once per schedule version)
+            timetable = get_shared_timetable(session).view('teacher', teacher_id)
+            schedule = day_grid(timetable, ('subject', 'section', 'classroom', 'time'))
 
-                subjects_taught.add(assignment.subject.subject_name)
-                total_hours += 1
+            subjects_taught = {lesson['subject'] for lesson in timetable['lessons']}
+            total_hours = len(timetable['lessons'])
 
             # Get workload information
             workload = session.query(TeacherWorkload).filter(
-                and_(
-                    TeacherWorkload.teacher_id == teacher_id,
-                    TeacherWorkload.academic_year == self.academic_year
-                )
+                TeacherWorkload.teacher_id == teacher_id
             ).first()
 
             return {
@@ -519,28 +667,36 @@ class ScheduleManager:
         """
         Detect all scheduling conflicts in the current academic year
 
+        Three queries (assignments, qualifications, teacher limits) and one
+        in-memory hash-join pass; each clashing pair is reported once
+
         Returns:
             Comprehensive conflict report
         """
         session = self.SessionLocal()
 
         try:
-            conflicts = []
-
             # Get all active assignments
-            assignments = session.query(ScheduleAssignment).filter(
-                and_(
-                    ScheduleAssignment.academic_year == self.academic_year,
-                    ScheduleAssignment.is_active == True
-                )
-            ).all()
-
-            # Check each assignment for conflicts
-            for assignment in assignments:
-                assignment_conflicts = self._detect_assignment_conflicts(session, assignment)
-                for conflict in assignment_conflicts:
-                    conflict['assignment_id'] = assignment.id
-                    conflicts.append(conflict)
+            rows = session.query(
+                ScheduleAssignment.id,
+                ScheduleAssignment.teacher_id,
+                ScheduleAssignment.classroom_id,
+                ScheduleAssignment.section_id,
+                ScheduleAssignment.subject_id,
+                ScheduleAssignment.day_of_week,
+                ScheduleAssignment.time_period_id
+            ).filter(ScheduleAssignment.is_active == True).order_by(ScheduleAssignment.id).all()
+
+            teacher_subjects = set(session.query(
+                TeacherSubject.teacher_id, TeacherSubject.subject_id
+            ).filter(TeacherSubject.is_active == True).all())
+
+            teacher_max_hours = {
+                teacher_id: max_hours or 40
+                for teacher_id, max_hours in session.query(Teacher.id, Teacher.max_weekly_hours)
+            }
+
+            conflicts = scan_assignment_conflicts(rows, teacher_subjects, teacher_max_hours)
 
             # Organize conflicts by type and severity
             conflict_summary = {}
@@ -558,6 +714,7 @@ class ScheduleManager:
             return {
                 'status': 'success',
                 'total_conflicts': len(conflicts),
+                'assignments_checked': len(rows),
                 'conflicts': conflicts,
                 'summary': conflict_summary,
                 'academic_year': self.academic_year
@@ -626,33 +783,20 @@ class ScheduleManager:
         session = self.SessionLocal()
 
         try:
-            # Get all classrooms and their assignments
-            from sqlalchemy import func
-
-            utilization = session.query(
-                Classroom.id,
-                Classroom.name,
-                Classroom.capacity,
-                func.count(ScheduleAssignment.id).label('assignments_count')
-            ).outerjoin(
-                ScheduleAssignment,
-                and_(
-                    ScheduleAssignment.classroom_id == Classroom.id,
-                    ScheduleAssignment.academic_year == self.academic_year,
-                    ScheduleAssignment.is_active == True
-                )
-            ).group_by(Classroom.id).all()
-
-            # Calculate utilization percentages
-            # Assuming 5 days × max periods per day as total possible slots
-            max_periods_per_day = session.query(func.count(TimePeriod.id)).filter(
-                TimePeriod.academic_year == self.academic_year
-            ).scalar() or 8
-
-            total_possible_slots = 5 * max_periods_per_day  # 5 days per week
+            # Assignment counts from the shared timetable tensor, room details in one query
+            timetable = get_shared_timetable(session)
+            assignments_per_room = timetable.weekly_periods('classroom')
+
+            # 5 days x teaching (non-break) periods per day
+            teaching_periods = int((~timetable.period_is_break).sum()) or 8
+            total_possible_slots = 5 * teaching_periods
 
             classroom_stats = []
-            for classroom_id, name, capacity, assignments in utilization:
+            for classroom_id, name, capacity in session.query(
+                Classroom.id, Classroom.name, Classroom.capacity
+            ).order_by(Classroom.id):
+                position = timetable.classrooms.index.get(classroom_id)
+                assignments = int(assignments_per_room[position]) if position is not None else 0
                 utilization_pct = (assignments / total_possible_slots * 100) if total_possible_slots > 0 else 0
 
                 classroom_stats.append({
@@ -0,0 +1,407 @@
+"""
+BiScheduler What-If Simulation
+Scenario sessions over an in-memory copy of the active timetable
+Proposed changes are layered copy-on-write and validated incrementally; nothing is written
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict, defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from src.scheduling.occupancy import RESOURCE_KINDS, OccupancyIndex, day_key
+from src.scheduling.suggestions import placement_score
+
+
+SIMULATION_OPS = ('move', 'add', 'remove')
+
+# Placement fields a change may set, and the index entry key they map to
+PLACEMENT_FIELDS = {
+    'teacher_id': 'teacher',
+    'classroom_id': 'classroom',
+    'section_id': 'section',
+    'subject_id': 'subject',
+    'day_of_week': 'day',
+    'time_period_id': 'period'
+}
+
+SlotKey = Tuple[str, int, str, int]
+
+
+class SimulationSession:
+    """
+    A what-if scenario over a snapshot of one tenant's active schedule
+
+    The base timetable (assignments, slot holders, teacher loads) is captured
+    once from the occupancy index and shared read-only. Proposed changes
+    live in a small overlay: changed or added assignments by id (None for
+    removed ones) plus the slots they hold. Reads combine base and overlay,
+    so applying a batch costs time proportional to the batch, and only the
+    slots and teachers it touches are re-validated.
+    """
+
+    def __init__(self, index: OccupancyIndex, session_id: str = None):
+        self.id = session_id or uuid.uuid4().hex
+        self.created_at = time.monotonic()
+        self.touched_at = self.created_at
+        self._lock = threading.Lock()
+
+        # Shared, read-only metadata
+        self.index = index
+        self._base: Dict[int, Dict] = dict(index.assignments())
+        self._base_slots: Dict[SlotKey, Set[int]] = defaultdict(set)
+        self._base_load: Dict[int, int] = defaultdict(int)
+        for assignment_id, entry in self._base.items():
+            for key in self._slot_keys(entry):
+                self._base_slots[key].add(assignment_id)
+            self._base_load[entry['teacher']] += 1
+        self._base_clashes = {key for key, holders in self._base_slots.items() if len(holders) > 1}
+
+        # Copy-on-write overlay
+        self._overlay: Dict[int, Optional[Dict]] = {}
+        self._overlay_slots: Dict[SlotKey, Set[int]] = defaultdict(set)
+        self._load_delta: Dict[int, int] = defaultdict(int)
+        self._clashes: Set[SlotKey] = set(self._base_clashes)
+        self._history: List[Tuple[List[Dict], Dict[int, Optional[Dict]]]] = []
+        self._next_id = -1
+
+    @staticmethod
+    def _slot_keys(entry: Dict) -> List[SlotKey]:
+        return [(kind, entry[kind], entry['day'], entry['period']) for kind in RESOURCE_KINDS]
+
+    def entry(self, assignment_id: int) -> Optional[Dict]:
+        """Placement of an assignment in the scenario (None if removed or unknown)"""
+        if assignment_id in self._overlay:
+            return self._overlay[assignment_id]
+        return self._base.get(assignment_id)
+
+    def holders(self, key: SlotKey) -> Set[int]:
+        """Assignments holding a slot in the scenario"""
+        base = {a_id for a_id in self._base_slots.get(key, ()) if a_id not in self._overlay}
+        return base | self._overlay_slots.get(key, set())
+
+    def teacher_load(self, teacher_id: int) -> int:
+        return self._base_load.get(teacher_id, 0) + self._load_delta.get(teacher_id, 0)
+
+    def _place(self, assignment_id: int, entry: Optional[Dict]):
+        """Point an assignment at a new placement (None removes it) in the overlay"""
+        previous = self.entry(assignment_id)
+        if previous is not None:
+            self._load_delta[previous['teacher']] -= 1
+            if assignment_id in self._overlay:
+                for key in self._slot_keys(previous):
+                    self._overlay_slots[key].discard(assignment_id)
+                    if not self._overlay_slots[key]:
+                        del self._overlay_slots[key]
+        if entry is not None:
+            self._load_delta[entry['teacher']] += 1
+
+        base = self._base.get(assignment_id)
+        if entry == base:
+            self._overlay.pop(assignment_id, None)  # Back to its base placement (or never added)
+            return
+
+        self._overlay[assignment_id] = entry
+        if entry is not None:
+            for key in self._slot_keys(entry):
+                self._overlay_slots[key].add(assignment_id)
+
+    def _restore(self, overlay: Dict[int, Optional[Dict]]) -> Set[SlotKey]:
+        """Reset the overlay to an earlier state; returns the slots that changed"""
+        touched_slots: Set[SlotKey] = set()
+        for assignment_id in set(self._overlay) | set(overlay):
+            target = overlay[assignment_id] if assignment_id in overlay else self._base.get(assignment_id)
+            for placement in (self.entry(assignment_id), target):
+                if placement is not None:
+                    touched_slots.update(self._slot_keys(placement))
+            self._place(assignment_id, target)
+        return touched_slots
+
+    def _update_clashes(self, keys: Iterable[SlotKey]):
+        for key in keys:
+            if len(self.holders(key)) > 1:
+                self._clashes.add(key)
+            else:
+                self._clashes.discard(key)
+
+    def _resolve(self, change: Dict) -> Tuple[int, Optional[Dict]]:
+        """
+        Target id and new placement of one proposed change
+
+        Raises:
+            ValueError: Unknown op, assignment, period or classroom, or missing fields
+        """
+        op = change.get('op', 'move')
+        if op not in SIMULATION_OPS:
+            raise ValueError(f"Unknown change op '{op}'")
+
+        if op == 'add':
+            missing = [field for field in PLACEMENT_FIELDS if change.get(field) is None]
+            if missing:
+                raise ValueError(f"New assignment is missing {', '.join(missing)}")
+            assignment_id, entry = self._next_id, {}
+            self._next_id -= 1
+        else:
+            assignment_id = change.get('assignment_id')
+            current = self.entry(assignment_id)
+            if current is None:
+                raise ValueError(f'Assignment {assignment_id} is not active in this scenario')
+            if op == 'remove':
+                return assignment_id, None
+            entry = dict(current)
+
+        for field, key in PLACEMENT_FIELDS.items():
+            value = change.get(field)
+            if value is None:
+                continue
+            entry[key] = day_key(value) if key == 'day' else int(value)
+
+        if self.index.period_row(entry['period']) is None:
+            raise ValueError(f"Unknown time period {entry['period']}")
+        if entry['classroom'] not in self.index.classrooms:
+            raise ValueError(f"Unknown classroom {entry['classroom']}")
+        return assignment_id, entry
+
+    def _score(self, entry: Optional[Dict]) -> float:
+        if entry is None:
+            return 0.0
+        return placement_score(self.index, entry['teacher'], entry['day'], entry['period'], entry['classroom'])
+
+    def _workload(self, teacher_id: int) -> Dict:
+        load = self.teacher_load(teacher_id)
+        max_hours = self.index.teacher_max_hours.get(teacher_id)
+        return {
+            'teacher_id': teacher_id,
+            'before': self._base_load.get(teacher_id, 0),
+            'after': load,
+            'max_hours': max_hours,
+            'overloaded': max_hours is not None and load > max_hours
+        }
+
+    def _conflict(self, key: SlotKey) -> Dict:
+        kind, resource_id, day, time_period_id = key
+        return {
+            'type': f'{kind}_conflict',
+            f'{kind}_id': resource_id,
+            'day_of_week': day,
+            'time_period_id': time_period_id,
+            'assignment_ids': sorted(self.holders(key))
+        }
+
+    def apply(self, changes: Iterable[Dict]) -> Dict:
+        """
+        Apply a batch of proposed changes and report what it changed
+
+        The batch is all-or-nothing: an invalid change leaves the scenario
+        untouched.
+
+        Args:
+            changes: {'op': 'move', 'assignment_id', <placement fields>},
+                {'op': 'add', <all placement fields>} or
+                {'op': 'remove', 'assignment_id'}
+
+        Returns:
+            Validation delta of the batch: conflicts introduced and resolved,
+            workloads of the touched teachers, unqualified placements and the
+            preference score delta, plus the scenario summary
+
+        Raises:
+            ValueError: Invalid change (see _resolve)
+        """
+        changes = list(changes)
+        with self._lock:
+            self.touched_at = time.monotonic()
+            saved_overlay, next_id = dict(self._overlay), self._next_id
+            touched_slots: Set[SlotKey] = set()
+            teachers: Set[int] = set()
+            preference_delta = 0.0
+            placed: Dict[int, Optional[Dict]] = {}
+
+            try:
+                # Sequential, so a later change may build on an earlier one in the batch
+                for change in changes:
+                    assignment_id, entry = self._resolve(change)
+                    previous = self.entry(assignment_id)
+                    for placement in (previous, entry):
+                        if placement is not None:
+                            touched_slots.update(self._slot_keys(placement))
+                            teachers.add(placement['teacher'])
+                    preference_delta += self._score(entry) - self._score(previous)
+                    self._place(assignment_id, entry)
+                    placed[assignment_id] = entry
+            except (TypeError, ValueError):
+                self._restore(saved_overlay)
+                self._next_id = next_id
+                raise
+
+            introduced, resolved_conflicts = [], []
+            for key in sorted(touched_slots, key=str):
+                clashing = len(self.holders(key)) > 1
+                if clashing and key not in self._clashes:
+                    self._clashes.add(key)
+                    introduced.append(self._conflict(key))
+                elif not clashing and key in self._clashes:
+                    self._clashes.discard(key)
+                    resolved_conflicts.append({
+                        'type': f'{key[0]}_conflict', f'{key[0]}_id': key[1],
+                        'day_of_week': key[2], 'time_period_id': key[3]
+                    })
+
+            self._history.append((changes, saved_overlay))
+
+            return {
+                'applied': len(changes),
+                'assignment_ids': list(placed),
+                'conflicts_introduced': introduced,
+                'conflicts_resolved': resolved_conflicts,
+                'workloads': [self._workload(teacher_id) for teacher_id in sorted(teachers)],
+                'unqualified': [
+                    {'assignment_id': assignment_id, 'teacher_id': entry['teacher'], 'subject_id': entry['subject']}
+                    for assignment_id, entry in placed.items()
+                    if entry is not None and not self.index.is_qualified(entry['teacher'], entry['subject'])
+                ],
+                'preference_delta': round(preference_delta, 2),
+                'summary': self._summary()
+            }
+
+    def undo(self) -> Dict:
+        """Revert the last applied batch; returns the scenario summary"""
+        with self._lock:
+            self.touched_at = time.monotonic()
+            if self._history:
+                _, saved_overlay = self._history.pop()
+                self._update_clashes(self._restore(saved_overlay))
+            return self._summary()
+
+    def _summary(self) -> Dict:
+        changed = [a_id for a_id in self._overlay if a_id in self._base]
+        added = [a_id for a_id, entry in self._overlay.items() if a_id not in self._base and entry is not None]
+
+        preference_delta = sum(
+            self._score(self._overlay[a_id]) - self._score(self._base.get(a_id))
+            for a_id in self._overlay
+        )
+        overloaded = sorted(
+            teacher_id for teacher_id, delta in self._load_delta.items()
+            if delta and self.teacher_load(teacher_id) > self.index.teacher_max_hours.get(teacher_id, float('inf'))
+        )
+
+        return {
+            'session_id': self.id,
+            'batches': len(self._history),
+            'changed_assignments': len(changed),
+            'removed_assignments': sum(1 for a_id in changed if self._overlay[a_id] is None),
+            'added_assignments': len(added),
+            'total_assignments': len(self._base) - len(self._overlay) + sum(
+                1 for entry in self._overlay.values() if entry is not None
+            ),
+            'conflicts_before': len(self._base_clashes),
+            'conflicts_after': len(self._clashes),
+            'overloaded_teachers': overloaded,
+            'preference_delta': round(preference_delta, 2)
+        }
+
+    def summary(self) -> Dict:
+        """Scenario totals against the base schedule"""
+        with self._lock:
+            self.touched_at = time.monotonic()
+            return self._summary()
+
+    def changes(self) -> List[Dict]:
+        """Net placement changes of the scenario against the base schedule"""
+        with self._lock:
+            result = []
+            for assignment_id, entry in sorted(self._overlay.items()):
+                base = self._base.get(assignment_id)
+                result.append({
+                    'assignment_id': assignment_id if assignment_id > 0 else None,
+                    'action': 'add' if base is None else 'remove' if entry is None else 'move',
+                    'from': _placement(base),
+                    'to': _placement(entry)
+                })
+            return result
+
+    def conflicts(self) -> List[Dict]:
+        """All conflicts in the scenario"""
+        with self._lock:
+            return [self._conflict(key) for key in sorted(self._clashes, key=str)]
+
+
+def _placement(entry: Optional[Dict]) -> Optional[Dict]:
+    if entry is None:
+        return None
+    return {field: entry[key] for field, key in PLACEMENT_FIELDS.items()}
+
+
+class SimulationStore:
+    """
+    Open simulation sessions keyed by (tenant database, session id)
+
+    Sessions live in process memory only and are dropped after ttl_seconds
+    without use, or oldest first beyond max_sessions.
+    """
+
+    def __init__(self, ttl_seconds: float = 1800, max_sessions: int = 200):
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+
+        self._lock = threading.Lock()
+        self._sessions: "OrderedDict[Tuple[str, str], SimulationSession]" = OrderedDict()
+
+    def _expire(self):
+        deadline = time.monotonic() - self.ttl_seconds
+        for key in [key for key, session in self._sessions.items() if session.touched_at < deadline]:
+            del self._sessions[key]
+
+    def create(self, db_key: str, index: OccupancyIndex) -> SimulationSession:
+        """Open a session over the current state of a tenant's occupancy index"""
+        session = SimulationSession(index)
+        with self._lock:
+            self._expire()
+            self._sessions[(db_key, session.id)] = session
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        return session
+
+    def get(self, db_key: str, session_id: str) -> Optional[SimulationSession]:
+        with self._lock:
+            self._expire()
+            session = self._sessions.get((db_key, session_id))
+            if session is not None:
+                self._sessions.move_to_end((db_key, session_id))
+            return session
+
+    def discard(self, db_key: str, session_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop((db_key, session_id), None) is not None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'sessions': len(self._sessions), 'max_sessions': self.max_sessions}
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def configure_simulations(config: Dict) -> SimulationStore:
+    """Create the process-wide simulation store from application config"""
+    global _store
+
+    with _store_lock:
+        _store = SimulationStore(
+            ttl_seconds=config.get('SIMULATION_TTL_SECONDS', 1800),
+            max_sessions=config.get('SIMULATION_MAX_SESSIONS', 200)
+        )
+        return _store
+
+
+def get_simulations() -> SimulationStore:
+    """Get the process-wide simulation store (defaults if not configured)"""
+    global _store
+
+    with _store_lock:
+        if _store is None:
+            _store = SimulationStore()
+        return _store
@@ -0,0 +1,210 @@
+"""
+BiScheduler Schedule Change Suggestions
+Feasible moves, room changes, substitutions and pairwise swaps for one assignment
+Validated incrementally against the occupancy index and ranked by preference and disruption
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+from src.scheduling.occupancy import DEFAULT_MAX_WEEKLY_HOURS, OccupancyIndex
+
+
+SUGGESTION_KINDS = ('move', 'room', 'substitute', 'swap')
+
+# Score lost per changed field / extra touched assignment
+DISRUPTION_WEIGHT = 1.0
+
+
+def placement_score(index: OccupancyIndex, teacher_id: int, day: str,
+                    time_period_id: int, classroom_id: int) -> float:
+    """Teacher preference score of one weekly placement (time slot, day and room preferences)"""
+    row = index.period_row(time_period_id)
+    total = 0.0
+    for preference_type, target, score in index.teacher_preferences.get(teacher_id, ()):
+        if preference_type == 'time_slot':
+            if row is not None and index.period_row(target) == row:
+                total += score
+        elif preference_type == 'day_of_week':
+            if target == day:
+                total += score
+        elif target == classroom_id:
+            total += score
+    return total
+
+
+def _entry_score(index: OccupancyIndex, entry: Dict) -> float:
+    return placement_score(index, entry['teacher'], entry['day'], entry['period'], entry['classroom'])
+
+
+def _free(index: OccupancyIndex, kind: str, resource_id: int, day: str,
+          time_period_id: int, ignore: Iterable[int]) -> bool:
+    return not (index.holders(kind, resource_id, day, time_period_id) - set(ignore))
+
+
+def _suitable_rooms(index: OccupancyIndex, current_room_id: int) -> List[Dict]:
+    """Rooms of the same type and at least the same capacity, best fit first"""
+    current = index.classrooms.get(current_room_id)
+    if current is None:
+        return []
+    return sorted((
+        room for room in index.classrooms.values()
+        if room['id'] != current_room_id
+        and room['room_type'] == current['room_type']
+        and (room['capacity'] or 0) >= (current['capacity'] or 0)
+    ), key=lambda room: ((room['capacity'] or 0), room['id']))
+
+
+def _placement(entry: Dict) -> Dict:
+    return {
+        'day_of_week': entry['day'],
+        'time_period_id': entry['period'],
+        'classroom_id': entry['classroom'],
+        'teacher_id': entry['teacher']
+    }
+
+
+def _change(assignment_id: int, before: Dict, after: Dict) -> Dict:
+    old, new = _placement(before), _placement(after)
+    return {
+        'assignment_id': assignment_id,
+        'from': {field: value for field, value in old.items() if new[field] != value},
+        'to': {field: value for field, value in new.items() if old[field] != value}
+    }
+
+
+def _matches(proposal: Dict, entry: Dict, index: OccupancyIndex) -> bool:
+    """Whether a new placement satisfies every field a change request proposed"""
+    wanted = {key: value for key, value in proposal.items() if key != 'swap_with_teacher_id' and value is not None}
+    if not wanted:
+        return False
+    if 'day_of_week' in wanted and wanted['day_of_week'] != entry['day']:
+        return False
+    if 'time_period_id' in wanted and index.period_row(wanted['time_period_id']) != index.period_row(entry['period']):
+        return False
+    if 'classroom_id' in wanted and wanted['classroom_id'] != entry['classroom']:
+        return False
+    return True
+
+
+def suggest_changes(index: OccupancyIndex, assignment_id: int, proposal: Dict = None,
+                    kinds: Iterable[str] = SUGGESTION_KINDS, limit: int = 20) -> List[Dict]:
+    """
+    Enumerate and rank valid changes for an assignment
+
+    Args:
+        index: Occupancy index of the tenant
+        assignment_id: Active assignment to change
+        proposal: Change request fields (day_of_week, time_period_id,
+            classroom_id, swap_with_teacher_id); matching candidates rank first
+        kinds: Candidate kinds to enumerate (see SUGGESTION_KINDS)
+        limit: Maximum number of suggestions
+
+    Returns:
+        Suggestions with the changes per touched assignment, preference delta,
+        disruption and score, best first
+
+    Raises:
+        ValueError: Unknown kind, or the assignment is not active
+    """
+    kinds = set(kinds)
+    unknown = kinds - set(SUGGESTION_KINDS)
+    if unknown:
+        raise ValueError(f"Unknown suggestion kinds: {', '.join(sorted(unknown))}")
+
+    current = index.assignment(assignment_id)
+    if current is None:
+        raise ValueError(f'Assignment {assignment_id} is not an active assignment')
+
+    proposal = proposal or {}
+    base_score = _entry_score(index, current)
+    candidates = []
+
+    def add(kind: str, changes: List[Dict], preference_delta: float, disruption: int, matches: bool):
+        candidates.append({
+            'kind': kind,
+            'changes': changes,
+            'preference_delta': round(preference_delta, 2),
+            'disruption': disruption,
+            'matches_request': matches,
+            'score': round(preference_delta - DISRUPTION_WEIGHT * disruption, 2)
+        })
+
+    rooms = _suitable_rooms(index, current['classroom'])
+
+    if 'move' in kinds:
+        # Slots where both the teacher and the section are free (own slot is busy by itself)
+        busy = index.busy_mask('teacher', current['teacher']) | index.busy_mask('section', current['section'])
+        free = index.teaching_mask & ~busy
+        while free:
+            low = free & -free
+            bit = low.bit_length() - 1
+            free ^= low
+
+            day, period = index.slot_at(bit)
+            for room_id in [current['classroom']] + [room['id'] for room in rooms]:
+                if not index.busy_mask('classroom', room_id) & low:
+                    moved = dict(current, day=day, period=period['id'], classroom=room_id)
+                    add('move', [_change(assignment_id, current, moved)],
+                        _entry_score(index, moved) - base_score,
+                        1 if room_id == current['classroom'] else 2,
+                        _matches(proposal, moved, index))
+                    break
+
+    if 'room' in kinds:
+        for room in rooms:
+            if _free(index, 'classroom', room['id'], current['day'], current['period'], ()):
+                moved = dict(current, classroom=room['id'])
+                add('room', [_change(assignment_id, current, moved)],
+                    _entry_score(index, moved) - base_score, 1, _matches(proposal, moved, index))
+
+    if 'substitute' in kinds:
+        for teacher_id, subject_id in index.teacher_subjects:
+            if subject_id != current['subject'] or teacher_id == current['teacher']:
+                continue
+            if index.teacher_load(teacher_id) + 1 > index.teacher_max_hours.get(teacher_id, DEFAULT_MAX_WEEKLY_HOURS):
+                continue
+            if not _free(index, 'teacher', teacher_id, current['day'], current['period'], ()):
+                continue
+            moved = dict(current, teacher=teacher_id)
+            add('substitute', [_change(assignment_id, current, moved)],
+                _entry_score(index, moved) - base_score, 1, False)
+
+    if 'swap' in kinds:
+        swap_teacher = proposal.get('swap_with_teacher_id')
+        for other_id, other in index.assignments():
+            if other_id == assignment_id or (other['day'], other['period']) == (current['day'], current['period']):
+                continue
+            if swap_teacher is not None:
+                if other['teacher'] != swap_teacher:
+                    continue
+            elif other['section'] != current['section']:
+                continue
+
+            # Exchange time slots; each lesson keeps its teacher, section and room
+            moved = dict(current, day=other['day'], period=other['period'])
+            other_moved = dict(other, day=current['day'], period=current['period'])
+            ignore = (assignment_id, other_id)
+            if not all(
+                _free(index, kind, placed[kind], placed['day'], placed['period'], ignore)
+                for placed in (moved, other_moved) for kind in ('teacher', 'classroom', 'section')
+            ):
+                continue
+
+            delta = (_entry_score(index, moved) - base_score
+                     + _entry_score(index, other_moved) - _entry_score(index, other))
+            add('swap', [_change(assignment_id, current, moved), _change(other_id, other, other_moved)],
+                delta, 3, swap_teacher is not None or _matches(proposal, moved, index))
+
+    candidates.sort(key=lambda c: (not c['matches_request'], -c['score'], c['disruption']))
+    return candidates[:limit] if limit else candidates
+
+
+def change_request_proposal(change_request) -> Dict[str, Optional[int]]:
+    """Proposal fields of a ScheduleChangeRequest"""
+    day = change_request.proposed_day_of_week
+    return {
+        'day_of_week': day.value if day is not None else None,
+        'time_period_id': change_request.proposed_time_period_id,
+        'classroom_id': change_request.proposed_classroom_id,
+        'swap_with_teacher_id': change_request.swap_with_teacher_id
+    }
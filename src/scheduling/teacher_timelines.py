@@ -0,0 +1,213 @@
+"""
+BiScheduler Teacher Day Timelines
+Per-teacher, per-day lessons sorted by start time for current/next-class lookups
+Cached per schedule version; a dashboard hit is a bisect instead of a query
+"""
+
+import threading
+import time as clock
+from bisect import bisect_right
+from collections import OrderedDict
+from datetime import time
+from typing import Dict, List, Optional, Tuple
+
+from src.models.tenant import Teacher, TeacherWorkload
+from src.scheduling.timetable_cache import get_timetable_cache
+from src.scheduling.timetables import load_timetable
+
+
+class TeacherDayTimeline:
+    """One teacher's lessons of one day, sorted by (start, end)"""
+
+    __slots__ = ('starts', 'ends', 'lessons', 'classes')
+
+    def __init__(self, entries: List[Tuple[time, time, Dict]]):
+        entries = sorted(entries, key=lambda entry: (entry[0], entry[1]))
+        self.starts = [start for start, _, _ in entries]
+        self.ends = [end for _, end, _ in entries]
+        self.lessons = [lesson for _, _, lesson in entries]
+        # Dashboard summaries, built once per schedule version
+        self.classes = [{
+            'assignment_id': lesson['id'],
+            'subject': lesson['subject'],
+            'section': lesson['section'],
+            'classroom': lesson['classroom'],
+            'start_time': start.strftime('%H:%M'),
+            'end_time': end.strftime('%H:%M'),
+            'is_current': False,
+            'is_next': False
+        } for start, end, lesson in entries]
+
+    def current_and_next(self, at: time) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """
+        Class in progress and next class at a time of day
+
+        Args:
+            at: Time of day
+
+        Returns:
+            (current_class, next_class) summaries, None when there is none
+        """
+        index = bisect_right(self.starts, at)
+
+        current_class = None
+        if index and self.ends[index - 1] >= at:
+            current_class = dict(self.classes[index - 1], is_current=True)
+
+        next_class = dict(self.classes[index], is_next=True) if index < len(self.classes) else None
+        return current_class, next_class
+
+
+EMPTY_DAY = TeacherDayTimeline([])
+
+
+class TeacherTimeline:
+    """A teacher's week of day timelines plus workload summary"""
+
+    __slots__ = ('teacher_id', 'days', 'workload')
+
+    def __init__(self, teacher_id: int, days: Dict[str, TeacherDayTimeline], workload: Dict):
+        self.teacher_id = teacher_id
+        self.days = days
+        self.workload = workload
+
+    def day(self, day: str) -> TeacherDayTimeline:
+        return self.days.get(day, EMPTY_DAY)
+
+
+def _parse_times(lesson: Dict) -> Tuple[time, time]:
+    start, _, end = lesson['time'].partition(' - ')
+    return time.fromisoformat(start), time.fromisoformat(end)
+
+
+def load_teacher_timeline(session, teacher_id: int) -> Optional[TeacherTimeline]:
+    """
+    Build a teacher's day timelines from the joined timetable projection
+
+    Args:
+        session: Tenant database session
+        teacher_id: Teacher ID
+
+    Returns:
+        TeacherTimeline, or None if the teacher does not exist
+    """
+    teacher = session.query(Teacher.id, Teacher.max_weekly_hours).filter(Teacher.id == teacher_id).first()
+    if not teacher:
+        return None
+
+    timetable = load_timetable(session, 'teacher', teacher_id)
+    by_day: Dict[str, List[Tuple[time, time, Dict]]] = {}
+    for lesson in timetable['lessons']:
+        if lesson['time'] == ' - ':
+            continue  # Period without times
+        start, end = _parse_times(lesson)
+        by_day.setdefault(lesson['day'], []).append((start, end, lesson))
+
+    workload = session.query(TeacherWorkload.is_valid, TeacherWorkload.overtime_hours).filter(
+        TeacherWorkload.teacher_id == teacher_id
+    ).first()
+
+    return TeacherTimeline(
+        teacher_id,
+        {day: TeacherDayTimeline(entries) for day, entries in by_day.items()},
+        {
+            'current_hours': len(timetable['lessons']),
+            'max_hours': teacher.max_weekly_hours,
+            'subjects_taught': sorted({lesson['subject'] for lesson in timetable['lessons']}),
+            'is_valid': workload.is_valid if workload else True,
+            'overtime_hours': workload.overtime_hours if workload else 0
+        }
+    )
+
+
+class TeacherTimelineCache:
+    """
+    Teacher timelines keyed by (tenant database, teacher)
+
+    Entries are tied to the tenant's schedule version in the timetable cache,
+    so any committed schedule change rebuilds them on next access; they also
+    expire after ttl_seconds to pick up other workers' writes.
+    """
+
+    def __init__(self, ttl_seconds: float = 300, max_entries: int = 2048):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, int], Tuple[int, float, Optional[TeacherTimeline]]]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, session, db_key: str, teacher_id: int) -> Optional[TeacherTimeline]:
+        """
+        Get a teacher's timeline, building it on miss
+
+        Args:
+            session: Tenant database session (only used on miss)
+            db_key: Tenant database key (see occupancy.tenant_key)
+            teacher_id: Teacher ID
+
+        Returns:
+            TeacherTimeline, or None if the teacher does not exist
+        """
+        key = (db_key, teacher_id)
+        version = get_timetable_cache().version(db_key)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version and clock.monotonic() < entry[1]:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[2]
+            self._misses += 1
+
+        timeline = load_teacher_timeline(session, teacher_id)
+
+        with self._lock:
+            # Do not store a build that raced with a write
+            if get_timetable_cache().version(db_key) == version:
+                self._entries[key] = (version, clock.monotonic() + self.ttl_seconds, timeline)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+        return timeline
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self._hits,
+                'misses': self._misses
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def configure_teacher_timelines(config: Dict) -> TeacherTimelineCache:
+    """Create the process-wide timeline cache from application config"""
+    global _cache
+
+    with _cache_lock:
+        _cache = TeacherTimelineCache(
+            ttl_seconds=config.get('TIMETABLE_CACHE_TTL_SECONDS', 300),
+            max_entries=config.get('TIMETABLE_CACHE_MAX_ENTRIES', 2048)
+        )
+        return _cache
+
+
+def get_teacher_timelines() -> TeacherTimelineCache:
+    """Get the process-wide timeline cache (defaults if not configured)"""
+    global _cache
+
+    with _cache_lock:
+        if _cache is None:
+            _cache = TeacherTimelineCache()
+        return _cache
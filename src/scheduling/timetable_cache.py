@@ -0,0 +1,206 @@
+"""
+BiScheduler Timetable Read Cache
+Versioned cache of rendered timetables with ETag / If-None-Match support
+Repeat timetable views are served without database queries
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple
+
+from flask import current_app, jsonify, request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from src.models.tenant import (
+    ScheduleAssignment, ScheduleConflict, TimePeriod, Teacher, TeacherWorkload, Subject,
+    Section, Classroom, Student
+)
+from src.scheduling.occupancy import tenant_key
+
+
+# Writes to these tables change what a rendered timetable or dashboard aggregate shows
+TIMETABLE_MODELS = (
+    ScheduleAssignment, ScheduleConflict, TimePeriod, Teacher, TeacherWorkload, Subject,
+    Section, Classroom, Student
+)
+
+_DIRTY_KEY = 'timetable_dirty'
+
+
+class TimetableCache:
+    """
+    Rendered timetables keyed by (tenant database, view, id)
+
+    Each tenant database has a schedule version counter, bumped whenever a
+    session that wrote timetable data commits. Entries rendered under an
+    older version are re-rendered on next access. Versions are per process,
+    so entries also expire after ttl_seconds to pick up other workers' writes;
+    ETags hash the rendered content, so an unchanged re-render keeps its ETag.
+    """
+
+    def __init__(self, ttl_seconds: float = 300, max_entries: int = 2048):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._versions: Dict[str, int] = {}
+        self._entries: "OrderedDict[Tuple[str, str, Any], Tuple[int, float, Any, str]]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def version(self, db_key: str) -> int:
+        with self._lock:
+            return self._versions.get(db_key, 0)
+
+    def bump(self, db_key: str) -> int:
+        """Invalidate every timetable of a tenant database"""
+        with self._lock:
+            self._versions[db_key] = self._versions.get(db_key, 0) + 1
+            return self._versions[db_key]
+
+    def get_or_render(self, db_key: str, view: str, target_id,
+                      render: Callable[[], Tuple[Any, int]]) -> Tuple[Any, int, str]:
+        """
+        Get a rendered timetable, rendering it on miss
+
+        Args:
+            db_key: Tenant database key (see occupancy.tenant_key)
+            view: Timetable view name, e.g. 'section'
+            target_id: Id of the viewed entity
+            render: Returns (payload, status_code); only 200 responses are cached
+
+        Returns:
+            (payload, status_code, etag) - etag is None for uncached errors
+        """
+        key = (db_key, view, target_id)
+
+        with self._lock:
+            version = self._versions.get(db_key, 0)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version and time.monotonic() < entry[1]:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[2], 200, entry[3]
+            self._misses += 1
+
+        payload, status = render()
+        if status != 200:
+            return payload, status, None
+
+        etag = hashlib.sha1(
+            json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+        ).hexdigest()
+
+        with self._lock:
+            # Do not store a render that raced with a write
+            if self._versions.get(db_key, 0) == version:
+                self._entries[key] = (version, time.monotonic() + self.ttl_seconds, payload, etag)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+        return payload, status, etag
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'tenants': len(self._versions),
+                'hits': self._hits,
+                'misses': self._misses
+            }
+
+
+def timetable_response(db_url, view: str, target_id, render: Callable[[], Tuple[Any, int]]):
+    """
+    Serve a timetable through the cache with ETag / If-None-Match handling
+
+    Args:
+        db_url: Tenant database URL
+        view: Timetable view name
+        target_id: Id of the viewed entity
+        render: Returns (payload, status_code)
+
+    Returns:
+        Flask response (304 when the client copy is current)
+    """
+    payload, status, etag = get_timetable_cache().get_or_render(
+        tenant_key(db_url), view, target_id, render
+    )
+
+    if etag is None:
+        return jsonify(payload), status
+
+    if request.if_none_match.contains(etag):
+        response = current_app.response_class(status=304)
+    else:
+        response = jsonify(payload)
+        response.status_code = status
+
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def _after_flush(session, flush_context):
+    if session.info.get(_DIRTY_KEY):
+        return
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, TIMETABLE_MODELS):
+            session.info[_DIRTY_KEY] = tenant_key(session.get_bind().url)
+            return
+
+
+def _after_commit(session):
+    db_key = session.info.pop(_DIRTY_KEY, None)
+    if db_key:
+        get_timetable_cache().bump(db_key)
+
+
+def _after_rollback(session):
+    session.info.pop(_DIRTY_KEY, None)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def _install_listeners():
+    # Bump versions from every ORM session (tenant pools and Flask-SQLAlchemy alike)
+    if not event.contains(Session, 'after_flush', _after_flush):
+        event.listen(Session, 'after_flush', _after_flush)
+        event.listen(Session, 'after_commit', _after_commit)
+        event.listen(Session, 'after_rollback', _after_rollback)
+
+
+def configure_timetable_cache(config: Dict) -> TimetableCache:
+    """Create the process-wide cache from application config"""
+    global _cache
+
+    with _cache_lock:
+        _cache = TimetableCache(
+            ttl_seconds=config.get('TIMETABLE_CACHE_TTL_SECONDS', 300),
+            max_entries=config.get('TIMETABLE_CACHE_MAX_ENTRIES', 2048)
+        )
+        _install_listeners()
+        return _cache
+
+
+def get_timetable_cache() -> TimetableCache:
+    """Get the process-wide timetable cache (defaults if not configured)"""
+    global _cache
+
+    with _cache_lock:
+        if _cache is None:
+            _cache = TimetableCache()
+            _install_listeners()
+        return _cache
@@ -0,0 +1,451 @@
+"""
+BiScheduler Shared Timetable Tensor
+Dense (resource, day, period) arrays of the active schedule with id <-> index maps
+Built once per schedule version and shared read-only by services, exports and validation
+"""
+
+import threading
+import time as clock
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.models.tenant import (
+    Classroom, ScheduleAssignment, Section, Subject, Teacher, TimePeriod
+)
+from src.scheduling.occupancy import tenant_key
+from src.scheduling.projections import DAYS, assignment_projection, day_index
+from src.scheduling.timetable_cache import get_timetable_cache
+
+
+DAY_COUNT = len(DAYS)
+
+EMPTY = -1
+
+# Entity axes with a lesson column; grids exist for the resource axes
+AXES = ('teacher', 'section', 'classroom', 'subject')
+GRID_AXES = ('teacher', 'section', 'classroom')
+
+DEFAULT_MAX_WEEKLY_HOURS = 40
+
+
+def _format_time(value) -> str:
+    return value.strftime('%H:%M') if value else ''
+
+
+def _minutes_between(start, end) -> int:
+    if not start or not end:
+        return 0
+    return int((datetime.combine(datetime.min, end) - datetime.combine(datetime.min, start)).total_seconds() // 60)
+
+
+def _frozen(array: np.ndarray) -> np.ndarray:
+    array.flags.writeable = False
+    return array
+
+
+class _Axis:
+    """Dense index of one entity kind: ids, names and id -> index map"""
+
+    __slots__ = ('ids', 'names', 'index')
+
+    def __init__(self):
+        self.ids: List[int] = []
+        self.names: List[str] = []
+        self.index: Dict[int, int] = {}
+
+    def add(self, entity_id, name) -> int:
+        if entity_id is None:
+            return EMPTY
+        position = self.index.get(entity_id)
+        if position is None:
+            position = len(self.ids)
+            self.index[entity_id] = position
+            self.ids.append(entity_id)
+            self.names.append(name)
+        elif name and not self.names[position]:
+            self.names[position] = name
+        return position
+
+    def __len__(self):
+        return len(self.ids)
+
+
+class Timetable:
+    """
+    Read-only tensor view of one tenant's active schedule
+
+    Lessons are stored column-wise (one array per field, row i = lesson i,
+    ordered by assignment id). Grids map (resource index, day, period row)
+    to the lesson row holding the cell, EMPTY when free; when the stored
+    schedule already contains a clash the lowest assignment id wins the cell
+    and the matching *_count grid says how many lessons share it. Period rows
+    are the canonical periods (duplicate rows with the same name and start
+    share one), in display order.
+
+    Build it with Timetable.load and share it; every array is frozen.
+    """
+
+    def __init__(self):
+        self.teachers = _Axis()
+        self.sections = _Axis()
+        self.classrooms = _Axis()
+        self.subjects = _Axis()
+
+        self.periods: List[Dict] = []
+        self.period_row: Dict[int, int] = {}
+
+        self.built_at = clock.monotonic()
+
+    @property
+    def period_count(self) -> int:
+        return len(self.periods)
+
+    def axis(self, kind: str) -> _Axis:
+        if kind not in AXES:
+            raise ValueError(f"Unsupported timetable axis '{kind}'")
+        return getattr(self, f'{kind}s')
+
+    @classmethod
+    def load(cls, session) -> 'Timetable':
+        """
+        Build the tensor from the tenant database
+
+        Four queries regardless of school size: periods, teachers, sections
+        and one joined projection of the active lessons.
+        """
+        timetable = cls()
+
+        # Canonical period rows, in display order
+        period_rows = {}
+        for period in session.query(
+            TimePeriod.id, TimePeriod.period_name, TimePeriod.start_time,
+            TimePeriod.end_time, TimePeriod.is_break
+        ).filter(TimePeriod.is_active == True).order_by(TimePeriod.display_order, TimePeriod.id):
+            key = (period.period_name, period.start_time)
+            if key not in period_rows:
+                period_rows[key] = timetable._add_period(
+                    period.id, period.period_name, period.start_time, period.end_time, bool(period.is_break)
+                )
+            timetable.period_row[period.id] = period_rows[key]
+
+        # Active teachers and sections have a row even without lessons
+        max_hours = {}
+        for teacher in session.query(Teacher.id, Teacher.teacher_name, Teacher.max_weekly_hours).filter(
+            Teacher.is_active == True
+        ).order_by(Teacher.id):
+            timetable.teachers.add(teacher.id, teacher.teacher_name)
+            max_hours[teacher.id] = teacher.max_weekly_hours
+        grade_levels = {}
+        for section in session.query(Section.id, Section.name, Section.grade_level).filter(
+            Section.is_active == True
+        ).order_by(Section.id):
+            timetable.sections.add(section.id, section.name)
+            grade_levels[section.id] = section.grade_level
+
+        rows = assignment_projection(session).add_columns(
+            Subject.short_name.label('subject_short'),
+            Classroom.room_type.label('room_type'),
+            ScheduleAssignment.assignment_type.label('assignment_type'),
+            ScheduleAssignment.is_locked.label('is_locked'),
+            ScheduleAssignment.conflict_status.label('conflict_status')
+        ).filter(ScheduleAssignment.is_active == True).order_by(ScheduleAssignment.id).all()
+
+        columns = {name: [] for name in ('id', 'teacher', 'section', 'classroom', 'subject', 'day', 'period')}
+        timetable.lesson_meta = []
+        for row in rows:
+            day = day_index(row.day_of_week)
+            if day is None:
+                continue
+
+            period = timetable.period_row.get(row.time_period_id)
+            if period is None:
+                # Inactive period still referenced by a lesson
+                period = timetable._add_period(
+                    row.time_period_id, row.period_name, row.start_time, row.end_time, False
+                )
+                timetable.period_row[row.time_period_id] = period
+
+            columns['id'].append(row.id)
+            columns['teacher'].append(timetable.teachers.add(row.teacher_id, row.teacher_name))
+            columns['section'].append(timetable.sections.add(row.section_id, row.section_name))
+            columns['classroom'].append(timetable.classrooms.add(row.classroom_id, row.classroom_name))
+            columns['subject'].append(timetable.subjects.add(row.subject_id, row.subject_name))
+            columns['day'].append(day)
+            columns['period'].append(period)
+            timetable.lesson_meta.append({
+                'time_period_id': row.time_period_id,
+                'subject_short': row.subject_short,
+                'room_type': row.room_type.value if row.room_type else None,
+                'assignment_type': row.assignment_type,
+                'is_locked': bool(row.is_locked),
+                'conflict_status': row.conflict_status
+            })
+
+        timetable._freeze(columns, max_hours, grade_levels)
+        return timetable
+
+    def _add_period(self, time_period_id: int, name, start, end, is_break: bool) -> int:
+        self.periods.append({
+            'id': time_period_id,
+            'name': name or 'Unknown',
+            'start_time': _format_time(start),
+            'end_time': _format_time(end),
+            'is_break': is_break,
+            'start_minutes': start.hour * 60 + start.minute if start else 0,
+            'minutes': _minutes_between(start, end)
+        })
+        return len(self.periods) - 1
+
+    def _freeze(self, columns: Dict[str, List[int]], max_hours: Dict[int, Optional[int]],
+                grade_levels: Dict[int, Optional[int]]):
+        self.lesson_ids = _frozen(np.asarray(columns['id'], dtype=np.int64))
+        self.lesson_day = _frozen(np.asarray(columns['day'], dtype=np.int16))
+        self.lesson_period = _frozen(np.asarray(columns['period'], dtype=np.int16))
+        for kind in AXES:
+            setattr(self, f'lesson_{kind}', _frozen(np.asarray(columns[kind], dtype=np.int32)))
+        self.lesson_row = {lesson_id: row for row, lesson_id in enumerate(columns['id'])}
+
+        self.period_minutes = _frozen(np.asarray([p['minutes'] for p in self.periods], dtype=np.int32))
+        self.period_start = _frozen(np.asarray([p['start_minutes'] for p in self.periods], dtype=np.int32))
+        self.period_is_break = _frozen(np.asarray([p['is_break'] for p in self.periods], dtype=bool))
+        self.lesson_minutes = _frozen(self.period_minutes[self.lesson_period] if len(self.lesson_ids)
+                                      else np.zeros(0, dtype=np.int32))
+        self.lesson_is_break = _frozen(self.period_is_break[self.lesson_period] if len(self.lesson_ids)
+                                       else np.zeros(0, dtype=bool))
+
+        self.teacher_max_hours = _frozen(np.asarray([
+            max_hours.get(teacher_id) or DEFAULT_MAX_WEEKLY_HOURS for teacher_id in self.teachers.ids
+        ], dtype=np.int32))
+        self.section_grade = _frozen(np.asarray([
+            grade_levels.get(section_id) or 0 for section_id in self.sections.ids
+        ], dtype=np.int16))
+
+        # Lessons are in id order; writing them in reverse leaves the lowest id in each cell
+        reverse = np.arange(len(self.lesson_ids) - 1, -1, -1)
+        for kind in GRID_AXES:
+            size = len(self.axis(kind))
+            grid = np.full((size, DAY_COUNT, self.period_count), EMPTY, dtype=np.int32)
+            count = np.zeros((size, DAY_COUNT, self.period_count), dtype=np.int16)
+            owner = getattr(self, f'lesson_{kind}')
+            placed = reverse[owner[reverse] != EMPTY]
+            grid[owner[placed], self.lesson_day[placed], self.lesson_period[placed]] = placed
+            np.add.at(count, (owner[placed], self.lesson_day[placed], self.lesson_period[placed]), 1)
+            setattr(self, f'{kind}_grid', _frozen(grid))
+            setattr(self, f'{kind}_count', _frozen(count))
+
+    # ------------------------------------------------------------------
+    # Vectorized aggregates
+    # ------------------------------------------------------------------
+
+    def _owned(self, kind: str) -> Tuple[np.ndarray, np.ndarray]:
+        # Lesson column of an axis, and the mask of its teaching lessons with an owner
+        self.axis(kind)
+        owner = getattr(self, f'lesson_{kind}')
+        return owner, ~self.lesson_is_break & (owner != EMPTY)
+
+    def weekly_periods(self, kind: str) -> np.ndarray:
+        """Teaching periods per teacher / section / classroom / subject (aligned with the axis ids)"""
+        owner, mask = self._owned(kind)
+        return np.bincount(owner[mask], minlength=len(self.axis(kind)))
+
+    def weekly_minutes(self, kind: str) -> np.ndarray:
+        """Teaching minutes per teacher / section / classroom / subject, from real period durations"""
+        owner, mask = self._owned(kind)
+        return np.bincount(owner[mask], weights=self.lesson_minutes[mask],
+                           minlength=len(self.axis(kind))).astype(np.int64)
+
+    def daily_minutes(self, kind: str) -> np.ndarray:
+        """Teaching minutes per (resource, day)"""
+        owner, mask = self._owned(kind)
+        flat = owner[mask].astype(np.int64) * DAY_COUNT + self.lesson_day[mask]
+        return np.bincount(flat, weights=self.lesson_minutes[mask],
+                           minlength=len(self.axis(kind)) * DAY_COUNT).reshape(-1, DAY_COUNT).astype(np.int64)
+
+    def pair_periods(self, kind: str, other: str) -> np.ndarray:
+        """Teaching periods per (kind, other) pair, e.g. ('section', 'subject')"""
+        owner, mask = self._owned(kind)
+        paired = self._owned(other)[0]
+        mask &= paired != EMPTY
+        width = len(self.axis(other))
+        flat = owner[mask].astype(np.int64) * width + paired[mask]
+        return np.bincount(flat, minlength=len(self.axis(kind)) * width).reshape(len(self.axis(kind)), width)
+
+    def clashes(self, kind: str) -> List[Dict]:
+        """Cells of a teacher, section or classroom held by more than one lesson"""
+        if kind not in GRID_AXES:
+            raise ValueError(f"Unsupported clash axis '{kind}'")
+        axis = self.axis(kind)
+        owner = getattr(self, f'lesson_{kind}')
+        result = []
+        for position, day, period in np.argwhere(getattr(self, f'{kind}_count') > 1):
+            rows = np.flatnonzero((owner == position) & (self.lesson_day == day) & (self.lesson_period == period))
+            result.append({
+                f'{kind}_id': axis.ids[position],
+                'day': DAYS[day].value,
+                'time_period_id': self.periods[period]['id'],
+                'assignment_ids': self.lesson_ids[rows].tolist()
+            })
+        return result
+
+    # ------------------------------------------------------------------
+    # Per-resource views
+    # ------------------------------------------------------------------
+
+    def rows_for(self, kind: str, entity_id: int) -> np.ndarray:
+        """Lesson rows of one resource ordered by day, period and id"""
+        position = self.axis(kind).index.get(entity_id)
+        if position is None:
+            return np.zeros(0, dtype=np.int64)
+        rows = np.flatnonzero(getattr(self, f'lesson_{kind}') == position)
+        return rows[np.lexsort((rows, self.lesson_period[rows], self.lesson_day[rows]))]
+
+    def lesson(self, row: int) -> Dict:
+        """One lesson in the load_timetable lesson format (plus the extra display fields)"""
+        period = self.periods[self.lesson_period[row]]
+        meta = self.lesson_meta[row]
+
+        def name(kind: str, default: str) -> str:
+            position = getattr(self, f'lesson_{kind}')[row]
+            if position == EMPTY:
+                return default
+            return self.axis(kind).names[position] or default
+
+        def entity_id(kind: str):
+            position = getattr(self, f'lesson_{kind}')[row]
+            return self.axis(kind).ids[position] if position != EMPTY else None
+
+        lesson = {
+            'id': int(self.lesson_ids[row]),
+            'day': DAYS[self.lesson_day[row]].value,
+            'time_period_id': meta['time_period_id'],
+            'period_id': period['id'],
+            'period': period['name'],
+            'time': f"{period['start_time']} - {period['end_time']}",
+            'is_break': period['is_break'],
+            'subject_id': entity_id('subject'),
+            'subject': name('subject', 'Unknown Subject'),
+            'teacher_id': entity_id('teacher'),
+            'teacher': name('teacher', 'Unknown Teacher'),
+            'section_id': entity_id('section'),
+            'section': name('section', 'Unknown Section'),
+            'classroom_id': entity_id('classroom'),
+            'classroom': name('classroom', 'Unknown Classroom'),
+            'minutes': period['minutes']
+        }
+        lesson.update(meta)
+        return lesson
+
+    def view(self, kind: str, entity_id: int) -> Dict:
+        """
+        Timetable of one section, teacher or classroom in the load_timetable format
+
+        The result can be rendered with timetables.day_grid, keyed_cells or day_lists.
+        """
+        if kind not in GRID_AXES:
+            raise ValueError(f"Unsupported timetable view '{kind}'")
+        return {
+            'view': kind,
+            'target_id': entity_id,
+            'periods': [{key: period[key] for key in ('id', 'name', 'start_time', 'end_time', 'is_break')}
+                        for period in self.periods],
+            'lessons': [self.lesson(row) for row in self.rows_for(kind, entity_id)]
+        }
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'lessons': len(self.lesson_ids),
+            'teachers': len(self.teachers),
+            'sections': len(self.sections),
+            'classrooms': len(self.classrooms),
+            'periods': self.period_count,
+            'grid_bytes': sum(
+                getattr(self, f'{kind}_{name}').nbytes for kind in GRID_AXES for name in ('grid', 'count')
+            )
+        }
+
+
+class TimetableStore:
+    """
+    Shared Timetables keyed by tenant database
+
+    Entries are tied to the tenant's schedule version in the timetable cache,
+    so any committed schedule change rebuilds them on next access; they also
+    expire after ttl_seconds to pick up other workers' writes.
+    """
+
+    def __init__(self, ttl_seconds: float = 300, max_entries: int = 64):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[int, float, Timetable]]" = OrderedDict()
+        self._builds = 0
+
+    def get(self, session, db_key: str = None) -> Timetable:
+        """
+        Get the tenant's shared timetable, building it on miss
+
+        Args:
+            session: Tenant database session (only queried on miss)
+            db_key: Tenant database key (default: from the session bind)
+        """
+        db_key = db_key or tenant_key(session.get_bind().url)
+        version = get_timetable_cache().version(db_key)
+
+        with self._lock:
+            entry = self._entries.get(db_key)
+            if entry is not None and entry[0] == version and clock.monotonic() < entry[1]:
+                self._entries.move_to_end(db_key)
+                return entry[2]
+
+        timetable = Timetable.load(session)
+
+        with self._lock:
+            self._builds += 1
+            # Do not store a build that raced with a write
+            if get_timetable_cache().version(db_key) == version:
+                self._entries[db_key] = (version, clock.monotonic() + self.ttl_seconds, timetable)
+                self._entries.move_to_end(db_key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+        return timetable
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'tenants': len(self._entries), 'builds': self._builds}
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def configure_timetables(config: Dict) -> TimetableStore:
+    """Create the process-wide timetable store from application config"""
+    global _store
+
+    with _store_lock:
+        _store = TimetableStore(ttl_seconds=config.get('TIMETABLE_CACHE_TTL_SECONDS', 300))
+        return _store
+
+
+def get_timetables() -> TimetableStore:
+    """Get the process-wide timetable store (defaults if not configured)"""
+    global _store
+
+    with _store_lock:
+        if _store is None:
+            _store = TimetableStore()
+        return _store
+
+
+def get_shared_timetable(session) -> Timetable:
+    """Shared timetable of a session's tenant database"""
+    return get_timetables().get(session)
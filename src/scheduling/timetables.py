@@ -0,0 +1,153 @@
+"""
+BiScheduler Timetable Read Layer
+Section, teacher and classroom timetables from one joined projection query
+Shared by the scheduling API, the schedule management UI and the parent portal
+"""
+
+from typing import Dict, Iterable, List
+
+from src.models.tenant import ScheduleAssignment, TimePeriod
+from src.scheduling.projections import DAYS, assignment_projection, day_index
+
+
+TIMETABLE_VIEWS = {
+    'section': ScheduleAssignment.section_id,
+    'teacher': ScheduleAssignment.teacher_id,
+    'classroom': ScheduleAssignment.classroom_id,
+}
+
+
+def _format_time(value) -> str:
+    return value.strftime('%H:%M') if value else ''
+
+
+def load_timetable(session, view: str, target_id: int) -> Dict[str, any]:
+    """
+    Fetch the active weekly timetable of a section, teacher or classroom
+
+    Two queries regardless of size: the active time periods and one joined
+    projection of the lessons. The result only holds plain values, so it can
+    be cached and rendered into any of the grid formats below.
+
+    Args:
+        session: Tenant database session
+        view: 'section', 'teacher' or 'classroom'
+        target_id: Id of the section, teacher or classroom
+
+    Returns:
+        Dict with 'view', 'target_id', 'periods' and 'lessons'
+    """
+    if view not in TIMETABLE_VIEWS:
+        raise ValueError(f"Unsupported timetable view '{view}'")
+
+    periods = session.query(
+        TimePeriod.id, TimePeriod.period_name, TimePeriod.start_time,
+        TimePeriod.end_time, TimePeriod.is_break, TimePeriod.display_order
+    ).filter(TimePeriod.is_active == True).order_by(TimePeriod.display_order, TimePeriod.id).all()
+
+    # Duplicate period rows (same name and start) share one canonical period
+    canonical = {}
+    seen = {}
+    period_list = []
+    for period in periods:
+        key = (period.period_name, period.start_time)
+        if key not in seen:
+            seen[key] = period.id
+            period_list.append({
+                'id': period.id,
+                'name': period.period_name,
+                'start_time': _format_time(period.start_time),
+                'end_time': _format_time(period.end_time),
+                'is_break': bool(period.is_break)
+            })
+        canonical[period.id] = seen[key]
+
+    rows = assignment_projection(session).add_columns(
+        TimePeriod.is_break.label('is_break'),
+        ScheduleAssignment.assignment_type.label('assignment_type'),
+        ScheduleAssignment.is_locked.label('is_locked'),
+        ScheduleAssignment.conflict_status.label('conflict_status')
+    ).filter(
+        TIMETABLE_VIEWS[view] == target_id,
+        ScheduleAssignment.is_active == True
+    ).order_by(TimePeriod.display_order, ScheduleAssignment.id).all()
+
+    lessons = []
+    for row in rows:
+        index = day_index(row.day_of_week)
+        if index is None:
+            continue
+        lessons.append({
+            'id': row.id,
+            'day': DAYS[index].value,
+            'time_period_id': row.time_period_id,
+            'period_id': canonical.get(row.time_period_id, row.time_period_id),
+            'period': row.period_name or 'Unknown',
+            'time': f"{_format_time(row.start_time)} - {_format_time(row.end_time)}",
+            'is_break': bool(row.is_break),
+            'subject_id': row.subject_id,
+            'subject': row.subject_name or 'Unknown Subject',
+            'teacher_id': row.teacher_id,
+            'teacher': row.teacher_name or 'Unknown Teacher',
+            'section_id': row.section_id,
+            'section': row.section_name or 'Unknown Section',
+            'classroom_id': row.classroom_id,
+            'classroom': row.classroom_name or 'Unknown Classroom',
+            'assignment_type': row.assignment_type,
+            'is_locked': bool(row.is_locked),
+            'conflict_status': row.conflict_status
+        })
+
+    return {
+        'view': view,
+        'target_id': target_id,
+        'periods': period_list,
+        'lessons': lessons
+    }
+
+
+def day_grid(timetable: Dict, fields: Iterable[str]) -> Dict[str, Dict[str, Dict]]:
+    """
+    Render {day: {period_name: cell}} as used by the scheduling API
+
+    Args:
+        timetable: Result of load_timetable
+        fields: Lesson fields to copy into each cell
+    """
+    grid = {day.value: {} for day in DAYS}
+    for lesson in timetable['lessons']:
+        cell = {'assignment_id': lesson['id']}
+        cell.update({field: lesson[field] for field in fields})
+        grid[lesson['day']][lesson['period']] = cell
+    return grid
+
+
+def keyed_cells(timetable: Dict) -> Dict[str, Dict]:
+    """Render {'<day>_<canonical period id>': cell} as used by the schedule management UI"""
+    cells = {}
+    for lesson in timetable['lessons']:
+        cells[f"{lesson['day']}_{lesson['period_id']}"] = {
+            'id': lesson['id'],
+            'subject': lesson['subject'],
+            'teacher': lesson['teacher'],
+            'classroom': lesson['classroom'],
+            'section': lesson['section'],
+            'assignment_type': lesson['assignment_type'],
+            'is_locked': lesson['is_locked'],
+            'conflict_status': lesson['conflict_status']
+        }
+    return cells
+
+
+def day_lists(timetable: Dict) -> Dict[str, List[Dict]]:
+    """Render {day: [lesson, ...]} in period order as used by the parent portal"""
+    days = {day.value: [] for day in DAYS}
+    for lesson in timetable['lessons']:
+        days[lesson['day']].append({
+            'period': lesson['period'],
+            'time': lesson['time'],
+            'subject': lesson['subject'],
+            'teacher': lesson['teacher'],
+            'classroom': lesson['classroom']
+        })
+    return days
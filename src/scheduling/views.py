@@ -4,7 +4,7 @@ RESTful endpoints for Venezuelan K12 schedule management
 Enhanced with conflict detection and workload validation
 """
 
-from flask import Blueprint, request, jsonify, g
+from flask import Blueprint, request, jsonify, g, current_app
 from werkzeug.exceptions import BadRequest, NotFound, Forbidden
 from datetime import datetime, timezone
 import json
@@ -14,6 +14,7 @@ from src.auth.decorators import (
     teacher_or_admin_required, permissions_required, audit_action
 )
 from src.scheduling.services import ScheduleManager
+from src.scheduling.timetable_cache import timetable_response
 from src.scheduling.export_import import VenezuelanScheduleExporter, VenezuelanScheduleImporter, create_schedule_template_excel
 from src.models.tenant import DayOfWeek
 
@@ -234,12 +235,11 @@ def delete_assignment(tenant_id, assignment_id):
             # Soft delete by marking as inactive
             assignment.is_active = False
             assignment.updated_at = datetime.now(timezone.utc)
+            session.info['changed_by'] = g.current_user.get('email')
 
+            # Commit also recomputes the teacher's workload
             session.commit()
 
-            # Update teacher workload
-            schedule_manager._update_teacher_workload(session, assignment.teacher_id)
-
             return jsonify({
                 'status': 'success',
                 'message': 'Assignment deleted successfully'
@@ -295,12 +295,13 @@ def get_section_schedule(tenant_id, section_id):
                     'message': 'Use ISO format: YYYY-MM-DD'
                 }), 400
 
-        result = schedule_manager.get_schedule_for_section(section_id, week_start)
+        def render():
+            result = schedule_manager.get_schedule_for_section(section_id, week_start)
+            return result, 404 if result['status'] == 'error' else 200
 
-        if result['status'] == 'error':
-            return jsonify(result), 404
-
-        return jsonify(result), 200
+        # Versioned cache; repeat views are answered with 304 or from memory
+        cache_key = f"{section_id}:{week_start.date().isoformat() if week_start else ''}"
+        return timetable_response(schedule_manager.tenant_db_url, 'section', cache_key, render)
 
     except Exception as e:
         return jsonify({
@@ -345,12 +346,13 @@ def get_teacher_schedule(tenant_id, teacher_id):
     """
     try:
         schedule_manager = get_schedule_manager(tenant_id)
-        result = schedule_manager.get_teacher_schedule(teacher_id)
 
-        if result['status'] == 'error':
-            return jsonify(result), 404
+        def render():
+            result = schedule_manager.get_teacher_schedule(teacher_id)
+            return result, 404 if result['status'] == 'error' else 200
 
-        return jsonify(result), 200
+        # Versioned cache; repeat views are answered with 304 or from memory
+        return timetable_response(schedule_manager.tenant_db_url, 'teacher', teacher_id, render)
 
     except Exception as e:
         return jsonify({
@@ -522,74 +524,16 @@ def get_workload_summary(tenant_id):
         session = schedule_manager.SessionLocal()
 
         try:
-            from src.models.tenant import Teacher, TeacherWorkload
-            from sqlalchemy import func
-
-            # Get all teachers with their workload data
-            teachers_data = session.query(
-                Teacher.id,
-                Teacher.teacher_name,
-                Teacher.max_weekly_hours,
-                Teacher.current_weekly_hours,
-                func.count(TeacherWorkload.id).label('has_workload')
-            ).outerjoin(
-                TeacherWorkload,
-                Teacher.id == TeacherWorkload.teacher_id
-            ).filter(
-                Teacher.academic_year == schedule_manager.academic_year
-            ).group_by(Teacher.id).all()
-
-            teachers = []
-            total_utilization = 0
-            overloaded_count = 0
-            underutilized_count = 0
-
-            for teacher_id, name, max_hours, current_hours, has_workload in teachers_data:
-                max_hours = max_hours or 40
-                current_hours = current_hours or 0
-                utilization_pct = (current_hours / max_hours * 100) if max_hours > 0 else 0
-
-                is_overloaded = current_hours > max_hours
-                is_underutilized = utilization_pct < 50
-
-                if is_overloaded:
-                    overloaded_count += 1
-                if is_underutilized:
-                    underutilized_count += 1
-
-                # Count distinct subjects for this teacher
-                from src.models.tenant import ScheduleAssignment
-                subjects_count = session.query(
-                    func.count(func.distinct(ScheduleAssignment.subject_id))
-                ).filter(
-                    ScheduleAssignment.teacher_id == teacher_id,
-                    ScheduleAssignment.academic_year == schedule_manager.academic_year,
-                    ScheduleAssignment.is_active == True
-                ).scalar() or 0
-
-                teachers.append({
-                    'teacher_id': teacher_id,
-                    'name': name,
-                    'current_hours': current_hours,
-                    'max_hours': max_hours,
-                    'utilization_percentage': round(utilization_pct, 1),
-                    'is_overloaded': is_overloaded,
-                    'is_underutilized': is_underutilized,
-                    'subjects_count': subjects_count
-                })
-
-                total_utilization += utilization_pct
-
-            avg_utilization = total_utilization / len(teachers) if teachers else 0
+            from src.scheduling.aggregates import cached_aggregate, workload_summary
+
+            # One grouped query, materialized until the schedule changes
+            summary = cached_aggregate(
+                schedule_manager.tenant_db_url, 'workload_summary', lambda: workload_summary(session)
+            )
 
             return jsonify({
-                'teachers': teachers,
-                'summary': {
-                    'total_teachers': len(teachers),
-                    'overloaded_teachers': overloaded_count,
-                    'underutilized_teachers': underutilized_count,
-                    'average_utilization': round(avg_utilization, 1)
-                },
+                'teachers': summary['teachers'],
+                'summary': summary['summary'],
                 'academic_year': schedule_manager.academic_year
             }), 200
 
@@ -650,58 +594,18 @@ def bulk_assign(tenant_id):
         stop_on_conflict = data.get('stop_on_conflict', False)
 
         schedule_manager = get_schedule_manager(tenant_id)
+        tenant = current_app.tenant_manager.get_tenant_by_id(tenant_id)
 
-        created_assignments = []
-        failed_assignments = []
-        all_conflicts = []
-
-        for i, assignment_data in enumerate(assignments):
-            try:
-                # Validate day of week
-                day_of_week = DayOfWeek(assignment_data['day_of_week'])
-
-                result = schedule_manager.create_schedule_assignment(
-                    teacher_id=assignment_data['teacher_id'],
-                    subject_id=assignment_data['subject_id'],
-                    section_id=assignment_data['section_id'],
-                    classroom_id=assignment_data['classroom_id'],
-                    time_period_id=assignment_data['time_period_id'],
-                    day_of_week=day_of_week,
-                    created_by=g.current_user.get('email'),
-                    validate_conflicts=validate_conflicts
-                )
-
-                if result['status'] == 'success':
-                    created_assignments.append({
-                        'index': i,
-                        'assignment_id': result['assignment']['id']
-                    })
-                    if result['conflicts']:
-                        all_conflicts.extend(result['conflicts'])
-                else:
-                    failed_assignments.append({
-                        'index': i,
-                        'error': result['message'],
-                        'conflicts': result.get('conflicts', [])
-                    })
-
-                    if stop_on_conflict and result.get('conflicts'):
-                        break
-
-            except Exception as e:
-                failed_assignments.append({
-                    'index': i,
-                    'error': str(e)
-                })
+        # Single transaction, validated as a whole and inserted in chunks
+        result = schedule_manager.bulk_create_assignments(
+            assignments,
+            tenant_id=tenant.id,
+            created_by=g.current_user.get('email'),
+            validate_conflicts=validate_conflicts,
+            stop_on_conflict=stop_on_conflict
+        )
 
-        return jsonify({
-            'status': 'success' if created_assignments else 'error',
-            'created_assignments': len(created_assignments),
-            'failed_assignments': len(failed_assignments),
-            'assignments_created': created_assignments,
-            'assignments_failed': failed_assignments,
-            'conflicts': all_conflicts
-        }), 200 if created_assignments else 400
+        return jsonify(result), 200 if result['created_assignments'] else 400
 
     except Exception as e:
         return jsonify({
@@ -0,0 +1,112 @@
+"""
+BiScheduler Teacher Workload Maintenance
+Write-behind recomputation of teacher weekly hours from schedule assignments
+Coalesces assignment writes into one grouped recompute per commit
+"""
+
+import logging
+import threading
+from typing import Iterable
+
+from sqlalchemy import event, func, inspect
+from sqlalchemy.orm import Session
+
+from src.models.tenant import ScheduleAssignment, Teacher, TeacherWorkload
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WEEKLY_HOURS = 40
+
+_DIRTY_KEY = 'workload_dirty_teachers'
+
+
+def recompute_teacher_workloads(session, teacher_ids: Iterable[int]):
+    """
+    Recompute workload for several teachers with grouped queries (no commit)
+
+    Args:
+        session: Database session
+        teacher_ids: Teachers whose assignments changed
+    """
+    teacher_ids = {teacher_id for teacher_id in teacher_ids if teacher_id is not None}
+    if not teacher_ids:
+        return
+
+    # Each active assignment represents one period per week
+    counts = dict(session.query(
+        ScheduleAssignment.teacher_id, func.count(ScheduleAssignment.id)
+    ).filter(
+        ScheduleAssignment.teacher_id.in_(teacher_ids),
+        ScheduleAssignment.is_active == True
+    ).group_by(ScheduleAssignment.teacher_id).all())
+
+    teachers = {
+        teacher.id: teacher
+        for teacher in session.query(Teacher).filter(Teacher.id.in_(teacher_ids))
+    }
+    workloads = {
+        workload.teacher_id: workload
+        for workload in session.query(TeacherWorkload).filter(TeacherWorkload.teacher_id.in_(teacher_ids))
+    }
+
+    for teacher_id, teacher in teachers.items():
+        total_assignments = counts.get(teacher_id, 0)
+        teacher.current_weekly_hours = total_assignments
+
+        workload = workloads.get(teacher_id)
+        if workload is None:
+            workload = TeacherWorkload(
+                teacher_id=teacher_id,
+                total_weekly_hours=total_assignments,
+                max_allowed_hours=teacher.max_weekly_hours or DEFAULT_MAX_WEEKLY_HOURS
+            )
+            session.add(workload)
+        workload.calculated_hours = total_assignments
+        workload.validate_workload()
+
+
+def _affected_teachers(assignment: ScheduleAssignment):
+    """Current and previous teacher of a written assignment"""
+    teachers = {assignment.teacher_id}
+    history = inspect(assignment).attrs.teacher_id.history
+    teachers.update(history.deleted or ())
+    return teachers
+
+
+def _after_flush(session, flush_context):
+    """Mark teachers whose assignments were inserted, updated or deleted"""
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, ScheduleAssignment):
+            session.info.setdefault(_DIRTY_KEY, set()).update(_affected_teachers(obj))
+
+
+def _before_commit(session):
+    """Recompute all dirty teachers once, inside the committing transaction"""
+    # Flush pending assignment writes so they are marked and counted
+    session.flush()
+
+    teacher_ids = session.info.pop(_DIRTY_KEY, None)
+    if teacher_ids:
+        recompute_teacher_workloads(session, teacher_ids)
+
+
+def _after_rollback(session):
+    session.info.pop(_DIRTY_KEY, None)
+
+
+_installed = False
+_install_lock = threading.Lock()
+
+
+def install_workload_tracking():
+    """Keep teacher workload in sync for every ORM session (idempotent)"""
+    global _installed
+
+    with _install_lock:
+        if _installed:
+            return
+        event.listen(Session, 'after_flush', _after_flush)
+        event.listen(Session, 'before_commit', _before_commit)
+        event.listen(Session, 'after_rollback', _after_rollback)
+        _installed = True
@@ -18,9 +18,9 @@ from werkzeug.datastructures import FileStorage
 from werkzeug.utils import secure_filename
 
 from sqlalchemy.orm import Session
+from src.scheduling.timetable_tensor import EMPTY, get_shared_timetable
 from src.models.tenant import (
-    Teacher, Student, Classroom, Subject, Section,
-    TimePeriod, ScheduleAssignment, AcademicPeriod
+    Teacher, Student, Classroom, Subject, Section, AcademicPeriod
 )
 
 logger = logging.getLogger(__name__)
@@ -447,13 +447,8 @@ class ExcelIntegrationService:
             if not academic_period:
                 raise ExcelValidationError("No active academic period found")
 
-            # Get all schedule assignments
-            assignments = self.db_session.query(ScheduleAssignment).filter(
-                ScheduleAssignment.academic_period_id == academic_period.id
-            ).all()
-
-            # Get time periods
-            time_periods = self.db_session.query(TimePeriod).order_by(TimePeriod.start_time).all()
+            # Whole-school grid from the shared timetable tensor
+            timetable = get_shared_timetable(self.db_session)
 
             # Create workbook
             wb = Workbook()
@@ -469,23 +464,19 @@ class ExcelIntegrationService:
             for col, day in enumerate(days, start=3):
                 ws.cell(row=1, column=col, value=day)
 
-            # Time periods and schedule data
+            # Time periods and schedule data: one line per section with a class in the slot
             row = 2
-            for period in time_periods:
-                ws.cell(row=row, column=1, value=f"Período {period.period_number}")
-                ws.cell(row=row, column=2, value=f"{period.start_time.strftime('%H:%M')} - {period.end_time.strftime('%H:%M')}")
-
-                for col, day in enumerate(days, start=3):
-                    # Find assignment for this time/day
-                    day_enum = self._get_day_enum(day)
-                    assignment = next((a for a in assignments
-                                     if a.time_period_id == period.id and a.day_of_week == day_enum), None)
-
-                    if assignment:
-                        cell_value = f"{assignment.subject.subject_name}\n{assignment.teacher.teacher_name}\n{assignment.classroom.classroom_name}"
-                        ws.cell(row=row, column=col, value=cell_value)
-                    else:
-                        ws.cell(row=row, column=col, value="")
+            for period_row, period in enumerate(timetable.periods):
+                ws.cell(row=row, column=1, value=f"Período {period['name']}")
+                ws.cell(row=row, column=2, value=f"{period['start_time']} - {period['end_time']}")
+
+                for day in range(len(days)):
+                    lesson_rows = timetable.section_grid[:, day, period_row]
+                    lines = []
+                    for lesson_row in lesson_rows[lesson_rows != EMPTY]:
+                        lesson = timetable.lesson(lesson_row)
+                        lines.append(f"{lesson['section']}: {lesson['subject']} - {lesson['teacher']} ({lesson['classroom']})")
+                    ws.cell(row=row, column=day + 3, value="\n".join(lines))
 
                 row += 1
 
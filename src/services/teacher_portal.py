@@ -19,6 +19,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, func, desc
 import json
 
+from ..scheduling.timetable_tensor import EMPTY, get_shared_timetable
 from ..models.tenant import (
     Teacher, TeacherPreference, TeacherAvailability, ScheduleChangeRequest,
     TeacherDashboardStats, ScheduleAssignment, TimePeriod, Subject, Classroom,
@@ -191,58 +192,41 @@ class TeacherPortalService:
         if not teacher:
             return {'error': 'Teacher not found'}
 
-        # Get all time periods for the day structure
-        time_periods = self.db.query(TimePeriod).filter(
-            and_(
-                TimePeriod.academic_year == self.current_academic_year,
-                TimePeriod.is_active == True
-            )
-        ).order_by(TimePeriod.display_order).all()
-
-        # Get teacher's assignments
-        assignments = self.db.query(ScheduleAssignment).filter(
-            and_(
-                ScheduleAssignment.teacher_id == teacher_id,
-                ScheduleAssignment.academic_year == self.current_academic_year,
-                ScheduleAssignment.is_active == True
-            )
-        ).all()
+        # Teacher grid from the shared timetable tensor (built once per schedule version)
+        timetable = get_shared_timetable(self.db)
+        position = timetable.teachers.index.get(teacher_id)
+        days = [day.value for day in DayOfWeek]
 
         # Build schedule grid (time periods x days)
         schedule_grid = {}
-        days = ['lunes', 'martes', 'miercoles', 'jueves', 'viernes']
-
-        for period in time_periods:
-            schedule_grid[period.id] = {
+        for period_row, period in enumerate(timetable.periods):
+            schedule_grid[period['id']] = {
                 'period_info': {
-                    'name': period.period_name,
-                    'start_time': period.start_time.strftime('%H:%M'),
-                    'end_time': period.end_time.strftime('%H:%M'),
-                    'is_break': period.is_break,
-                    'duration': period.duration_minutes
+                    'name': period['name'],
+                    'start_time': period['start_time'],
+                    'end_time': period['end_time'],
+                    'is_break': period['is_break'],
+                    'duration': period['minutes']
                 },
-                'assignments': {}
+                'assignments': {day: None for day in days}
             }
 
-            for day in days:
-                schedule_grid[period.id]['assignments'][day] = None
-
-        # Fill in assignments
-        for assignment in assignments:
-            period_id = assignment.time_period_id
-            day = assignment.day_of_week.value
-
-            if period_id in schedule_grid:
-                schedule_grid[period_id]['assignments'][day] = {
-                    'id': assignment.id,
-                    'subject': assignment.subject.subject_name,
-                    'subject_short': assignment.subject.short_name,
-                    'section': assignment.section.name,
-                    'classroom': assignment.classroom.name,
-                    'classroom_type': assignment.classroom.room_type.value,
-                    'assignment_type': assignment.assignment_type,
-                    'is_locked': assignment.is_locked,
-                    'conflict_status': assignment.conflict_status
+            if position is None:
+                continue
+            for day, lesson_row in enumerate(timetable.teacher_grid[position, :, period_row]):
+                if lesson_row == EMPTY:
+                    continue
+                lesson = timetable.lesson(lesson_row)
+                schedule_grid[period['id']]['assignments'][days[day]] = {
+                    'id': lesson['id'],
+                    'subject': lesson['subject'],
+                    'subject_short': lesson['subject_short'],
+                    'section': lesson['section'],
+                    'classroom': lesson['classroom'],
+                    'classroom_type': lesson['room_type'],
+                    'assignment_type': lesson['assignment_type'],
+                    'is_locked': lesson['is_locked'],
+                    'conflict_status': lesson['conflict_status']
                 }
 
         return {
@@ -252,32 +236,30 @@ class TeacherPortalService:
                 'specialization': teacher.area_specialization
             },
             'schedule_grid': schedule_grid,
-            'summary': self._calculate_schedule_summary(assignments),
+            'summary': self._calculate_schedule_summary(timetable, teacher_id),
             'week_offset': week_offset
         }
 
-    def _calculate_schedule_summary(self, assignments: List[ScheduleAssignment]) -> Dict:
-        """Calculate summary statistics for teacher's schedule"""
-        total_hours = 0
-        subjects = set()
-        sections = set()
-        classrooms = set()
-        daily_hours = {day.value: 0 for day in DayOfWeek}
+    def _calculate_schedule_summary(self, timetable, teacher_id: int) -> Dict:
+        """Calculate summary statistics for teacher's schedule from the timetable tensor"""
+        position = timetable.teachers.index.get(teacher_id)
+        daily_minutes = timetable.daily_minutes('teacher')[position] if position is not None else [0] * len(DayOfWeek)
 
-        for assignment in assignments:
-            if not assignment.time_period.is_break:
-                total_hours += assignment.time_period.duration_minutes / 60
-                subjects.add(assignment.subject.subject_name)
-                sections.add(assignment.section.name)
-                classrooms.add(assignment.classroom.name)
-                daily_hours[assignment.day_of_week.value] += assignment.time_period.duration_minutes / 60
+        # Teaching (non-break) lessons only
+        lessons = [timetable.lesson(row) for row in timetable.rows_for('teacher', teacher_id)]
+        lessons = [lesson for lesson in lessons if not lesson['is_break']]
+        subjects = {lesson['subject'] for lesson in lessons}
+        sections = {lesson['section'] for lesson in lessons}
+        classrooms = {lesson['classroom'] for lesson in lessons}
 
         return {
-            'total_weekly_hours': round(total_hours, 1),
+            'total_weekly_hours': round(sum(daily_minutes) / 60, 1),
             'total_subjects': len(subjects),
             'total_sections': len(sections),
             'total_classrooms': len(classrooms),
-            'daily_hours': daily_hours,
+            'daily_hours': {
+                day.value: round(minutes / 60, 2) for day, minutes in zip(DayOfWeek, daily_minutes)
+            },
             'subjects_list': list(subjects),
             'sections_list': list(sections)
         }
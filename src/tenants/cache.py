@@ -0,0 +1,109 @@
+"""
+BiScheduler Tenant Resolution Cache
+TTL/LRU cache of resolved tenants for the multi-tenant middleware
+Removes master database round trips from tenant resolution on every request
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class TenantResolutionCache:
+    """
+    Thread-safe TTL/LRU cache keyed by (kind, value), e.g. ('host', 'ueipab.bischeduler.com'),
+    ('id', tenant_id) or ('code', 'UEIPAB001')
+
+    Unknown keys are cached as negative entries with a shorter TTL, so bogus hosts
+    do not hit the master database on every request. Cached tenants are detached,
+    shared snapshots and must be treated as read-only. Invalidation is
+    per-process; the TTL bounds staleness across workers.
+    """
+
+    KINDS = ('id', 'host', 'code')
+
+    def __init__(self, ttl_seconds: float = 60, negative_ttl_seconds: float = 10,
+                 max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+        self._hits = 0
+        self._negative_hits = 0
+        self._misses = 0
+
+    def get(self, kind: str, key: str) -> Tuple[bool, Optional[Any]]:
+        """
+        Look up a cached resolution
+
+        Returns:
+            (found, tenant) - found is True for both positive and negative hits
+        """
+        cache_key = (kind, self._normalize(key))
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None:
+                self._misses += 1
+                return False, None
+
+            expires_at, tenant = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[cache_key]
+                self._misses += 1
+                return False, None
+
+            self._entries.move_to_end(cache_key)
+            if tenant is None:
+                self._negative_hits += 1
+            else:
+                self._hits += 1
+            return True, tenant
+
+    def set(self, kind: str, key: str, tenant: Optional[Any]):
+        """Cache a resolution; None records a negative entry"""
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown cache key kind '{kind}'")
+
+        ttl = self.ttl_seconds if tenant is not None else self.negative_ttl_seconds
+        cache_key = (kind, self._normalize(key))
+        with self._lock:
+            self._entries[cache_key] = (time.monotonic() + ttl, tenant)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_tenant(self, tenant_id: str):
+        """
+        Drop every entry resolving to a tenant, plus all negative entries
+        (a created or renamed tenant may now match a previously unknown key)
+        """
+        with self._lock:
+            stale = [
+                cache_key for cache_key, (_, tenant) in self._entries.items()
+                if tenant is None or getattr(tenant, 'tenant_id', None) == tenant_id
+                or cache_key == ('id', self._normalize(tenant_id))
+            ]
+            for cache_key in stale:
+                del self._entries[cache_key]
+
+    def clear(self):
+        """Drop all cached resolutions"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self._hits,
+                'negative_hits': self._negative_hits,
+                'misses': self._misses
+            }
+
+    @staticmethod
+    def _normalize(key: str) -> str:
+        return str(key).strip().lower()
@@ -13,6 +13,7 @@ from sqlalchemy.exc import SQLAlchemyError
 
 from src.models.master import Tenant, TenantInvitation, TenantStatus, InstitutionType
 from src.core.app import db
+from src.tenants.cache import TenantResolutionCache
 
 
 logger = logging.getLogger(__name__)
@@ -24,10 +25,18 @@ class TenantManager:
     Implements schema-per-tenant isolation for complete data privacy
     """
 
-    def __init__(self, master_db_url: str):
+    def __init__(self, master_db_url: str, cache: Optional[TenantResolutionCache] = None):
         self.master_db_url = master_db_url
         self.engine = create_engine(master_db_url)
         self.SessionLocal = sessionmaker(bind=self.engine)
+        self.cache = cache or TenantResolutionCache()
+
+    def invalidate_tenant(self, tenant_id: str):
+        """
+        Drop cached resolutions for a tenant
+        Call after any change to a tenant record
+        """
+        self.cache.invalidate_tenant(tenant_id)
 
     def create_tenant(
         self,
@@ -75,6 +84,7 @@ class TenantManager:
 
             session.add(tenant)
             session.commit()
+            self.invalidate_tenant(tenant_id)
 
             # Create isolated database schema
             self._create_tenant_schema(schema_name)
@@ -114,6 +124,7 @@ class TenantManager:
             tenant.status = TenantStatus.ACTIVE
             tenant.activated_at = datetime.now(timezone.utc)
             session.commit()
+            self.invalidate_tenant(tenant_id)
 
             logger.info(f"Activated tenant: {tenant.institution_name} ({tenant_id})")
             return True
@@ -226,28 +237,55 @@ class TenantManager:
             session.close()
 
     def get_tenant_by_id(self, tenant_id: str) -> Optional[Tenant]:
-        """Get tenant by ID"""
+        """Get tenant by ID (cached)"""
+        found, tenant = self.cache.get('id', tenant_id)
+        if found:
+            return tenant
+
+        session = self.SessionLocal()
+        try:
+            tenant = session.query(Tenant).filter_by(tenant_id=tenant_id).first()
+        finally:
+            session.close()
+
+        self.cache.set('id', tenant_id, tenant)
+        return tenant
+
+    def get_tenant_by_code(self, institution_code: str) -> Optional[Tenant]:
+        """Get tenant by institution code (cached)"""
+        found, tenant = self.cache.get('code', institution_code)
+        if found:
+            return tenant
+
         session = self.SessionLocal()
         try:
-            return session.query(Tenant).filter_by(tenant_id=tenant_id).first()
+            tenant = session.query(Tenant).filter_by(institution_code=institution_code).first()
         finally:
             session.close()
 
+        self.cache.set('code', institution_code, tenant)
+        return tenant
+
     def get_tenant_by_domain(self, domain: str) -> Optional[Tenant]:
-        """Get tenant by domain/subdomain"""
+        """Get tenant by domain/subdomain (cached, including unknown hosts)"""
+        found, tenant = self.cache.get('host', domain)
+        if found:
+            return tenant
+
         session = self.SessionLocal()
         try:
             # First try exact domain match by website_url
             tenant = session.query(Tenant).filter_by(website_url=domain).first()
-            if tenant:
-                return tenant
+        finally:
+            session.close()
 
+        if not tenant:
             # Fallback: Extract tenant identifier from domain
             # e.g., ueipab.bischeduler.com -> ueipab
-            tenant_code = domain.split('.')[0]
-            return session.query(Tenant).filter_by(institution_code=tenant_code).first()
-        finally:
-            session.close()
+            tenant = self.get_tenant_by_code(domain.split('.')[0])
+
+        self.cache.set('host', domain, tenant)
+        return tenant
 
     def list_active_tenants(self) -> List[Tenant]:
         """List all active tenants"""
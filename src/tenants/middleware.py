@@ -39,6 +39,9 @@ class MultiTenantMiddleware:
         2. Header (X-Tenant-ID)
         3. Query parameter (?tenant=ueipab)
         4. API path (/api/tenants/ueipab/...)
+
+        All lookups go through the TenantManager resolution cache, so known
+        and unknown hosts/ids are served without master database queries.
         """
         # Skip tenant resolution for certain endpoints
         if self._should_skip_tenant_resolution():
@@ -0,0 +1,102 @@
+"""
+Shared fixtures for BiScheduler unit tests.
+In-memory tenant databases seeded from one small Venezuelan K12 catalog.
+"""
+
+from datetime import time
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from src.models.tenant import Base, Classroom, Section, Subject, Teacher, TimePeriod
+
+
+# Standard catalog rows by id; tests pick ids and override fields where their seeds differ
+CATALOG = {
+    'teachers': (Teacher, {
+        1: {'teacher_name': 'MARIA NIETO'},
+        2: {'teacher_name': 'JOSE PEREZ'},
+        3: {'teacher_name': 'ANA RUIZ'},
+    }),
+    'subjects': (Subject, {
+        1: {'subject_name': 'MATEMÁTICAS'},
+        2: {'subject_name': 'FÍSICA'},
+    }),
+    'sections': (Section, {
+        1: {'name': '1er año A', 'grade_level': 1},
+        2: {'name': '1er año B', 'grade_level': 1},
+    }),
+    'classrooms': (Classroom, {
+        1: {'name': 'Aula 1'},
+        2: {'name': 'Aula 2'},
+    }),
+    'periods': (TimePeriod, {
+        1: {'period_name': 'P1', 'start_time': time(7, 0), 'end_time': time(7, 40), 'display_order': 1},
+        2: {'period_name': 'P2', 'start_time': time(7, 40), 'end_time': time(8, 20), 'display_order': 2},
+        3: {'period_name': 'P3', 'start_time': time(8, 20), 'end_time': time(9, 0), 'display_order': 3},
+    }),
+}
+
+
+def catalog_rows(kind, spec):
+    """
+    Model instances for catalog ids
+
+    Each item is a catalog id, or a dict with an 'id' whose fields override
+    (or, for ids outside the catalog, fully describe) the row.
+    """
+    model, rows = CATALOG[kind]
+    built = []
+    for item in spec:
+        fields = {'id': item} if isinstance(item, int) else dict(item)
+        built.append(model(**{**rows.get(fields['id'], {}), **fields}))
+    return built
+
+
+@pytest.fixture
+def make_session():
+    """
+    Factory for seeded tenant database sessions
+
+    make_session(teachers=(1,), subjects=(1,), sections=(1,), classrooms=(1,),
+    periods=(1,), rows=(), url='sqlite://') creates the schema, commits the
+    catalog rows, then adds and commits `rows` (assignments, preferences...).
+    Pass () to leave a catalog table empty. Sessions and engines are closed
+    at teardown.
+    """
+    opened = []
+
+    def make(teachers=(1,), subjects=(1,), sections=(1,), classrooms=(1,), periods=(1,),
+             rows=(), url='sqlite://'):
+        engine = create_engine(url)
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        opened.append((session, engine))
+
+        for kind, spec in (('teachers', teachers), ('subjects', subjects), ('sections', sections),
+                           ('classrooms', classrooms), ('periods', periods)):
+            session.add_all(catalog_rows(kind, spec))
+        session.commit()
+
+        if rows:
+            session.add_all(list(rows))
+            session.commit()
+        return session
+
+    yield make
+
+    for session, engine in opened:
+        session.close()
+        engine.dispose()
+
+
+@pytest.fixture
+def count_queries():
+    """Start recording the SQL statements a session's engine executes"""
+    def start(session):
+        statements = []
+        event.listen(session.get_bind(), 'before_cursor_execute',
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+        return statements
+    return start
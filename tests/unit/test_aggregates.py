@@ -0,0 +1,91 @@
+"""
+Unit tests for the dashboard aggregate query layer.
+Tests grouped workload figures, admin overview and per-version materialization.
+"""
+
+import pytest
+
+from src.models.tenant import ScheduleAssignment, ScheduleConflict, DayOfWeek
+from src.scheduling.aggregates import (
+    admin_overview, cached_aggregate, workload_alerts, workload_summary
+)
+
+
+@pytest.fixture
+def session(make_session):
+    # MARIA: 5 hours over 2 subjects (overloaded); JOSE: 1 hour (underutilized); ANA: 3 of 4
+    lessons = [(1, 1 + n % 2, day) for n, day in enumerate(DayOfWeek)]
+    lessons += [(2, 1, DayOfWeek.LUNES)] + [(3, 1, day) for day in list(DayOfWeek)[:3]]
+
+    return make_session(
+        teachers=[{'id': 1, 'max_weekly_hours': 4}, {'id': 2, 'max_weekly_hours': 10},
+                  {'id': 3, 'max_weekly_hours': 4}],
+        subjects=(1, 2),
+        sections=(1, 2),
+        rows=[
+            ScheduleAssignment(tenant_id=1, teacher_id=teacher, subject_id=subject, section_id=1,
+                               classroom_id=1, time_period_id=1, day_of_week=day)
+            for teacher, subject, day in lessons
+        ] + [
+            ScheduleConflict(conflict_type='teacher_double_booking', severity='critical', description='Doble'),
+            ScheduleConflict(conflict_type='workload_violation', severity='error', description='Carga'),
+        ]
+    )
+
+
+class TestWorkloadAggregates:
+    """Test grouped teacher workload figures."""
+
+    @pytest.mark.unit
+    def test_alerts_in_one_query(self, session, count_queries):
+        statements = count_queries(session)
+        alerts = {alert['teacher_id']: alert for alert in workload_alerts(session)}
+
+        assert len(statements) == 1
+        assert alerts[1]['alert_type'] == 'overloaded' and alerts[1]['severity'] == 'critical'
+        assert alerts[2]['alert_type'] == 'underutilized' and alerts[2]['utilization_percentage'] == 10.0
+        assert 3 not in alerts
+
+    @pytest.mark.unit
+    def test_summary_counts_distinct_subjects(self, session):
+        summary = workload_summary(session)
+        teachers = {teacher['teacher_id']: teacher for teacher in summary['teachers']}
+
+        assert teachers[1]['subjects_count'] == 2 and teachers[1]['current_hours'] == 5
+        assert summary['summary']['overloaded_teachers'] == 1
+        assert summary['summary']['underutilized_teachers'] == 1
+
+
+class TestAdminOverview:
+    """Test the admin dashboard aggregates."""
+
+    @pytest.mark.unit
+    def test_overview_figures(self, session, count_queries):
+        statements = count_queries(session)
+        overview = admin_overview(session)
+
+        assert len(statements) == 4
+        assert overview['platform_overview'] == {
+            'total_assignments': 9, 'total_conflicts': 2, 'critical_conflicts': 1, 'conflict_rate': 22.22
+        }
+        assert [c['type'] for c in overview['critical_conflicts']] == ['teacher_double_booking']
+        assert [t['teacher_id'] for t in overview['teacher_alerts']] == [1]
+        assert [s['assignments_count'] for s in overview['schedule_completion']] == [9, 0]
+
+    @pytest.mark.unit
+    def test_materialized_until_schedule_changes(self, session):
+        url = session.get_bind().url
+        builds = []
+
+        def build():
+            builds.append(1)
+            return workload_summary(session)
+
+        cached_aggregate(url, 'workload_summary', build)
+        cached_aggregate(url, 'workload_summary', build)
+        assert len(builds) == 1
+
+        session.query(ScheduleConflict).filter_by(severity='error').one().status = 'resolved'
+        session.commit()
+        cached_aggregate(url, 'workload_summary', build)
+        assert len(builds) == 2
@@ -0,0 +1,89 @@
+"""
+Unit tests for transactional bulk assignment creation.
+Tests batch validation, chunked inserts and workload recompute.
+"""
+
+import pytest
+
+from src.core.engine_registry import get_engine_registry
+from src.models.tenant import Teacher, TeacherSubject, TeacherWorkload, ScheduleAssignment
+from src.scheduling.services import ScheduleManager
+
+
+@pytest.fixture
+def manager(tmp_path, make_session):
+    db_url = f"sqlite:///{tmp_path / 'tenant.db'}"
+    make_session(
+        teachers=[
+            {'id': 10, 'teacher_name': 'MARIA NIETO', 'max_weekly_hours': 3},
+            {'id': 11, 'teacher_name': 'JOSE PEREZ', 'max_weekly_hours': 40},
+        ],
+        subjects=(), sections=(), classrooms=(), periods=(),
+        rows=[
+            TeacherSubject(teacher_id=10, subject_id=5, weekly_hours=3),
+            TeacherSubject(teacher_id=11, subject_id=5, weekly_hours=3),
+        ],
+        url=db_url
+    ).close()
+
+    manager = ScheduleManager(db_url)
+    yield manager
+    get_engine_registry().dispose(db_url)
+
+
+def lesson(teacher_id, section_id, classroom_id, period, day='lunes'):
+    return {
+        'teacher_id': teacher_id, 'subject_id': 5, 'section_id': section_id,
+        'classroom_id': classroom_id, 'time_period_id': period, 'day_of_week': day
+    }
+
+
+class TestBulkCreateAssignments:
+    """Test the batched bulk-assign path."""
+
+    @pytest.mark.unit
+    def test_rejects_clash_within_batch(self, manager):
+        result = manager.bulk_create_assignments([
+            lesson(10, 1, 1, 1),
+            lesson(11, 1, 2, 1),  # Same section, same slot
+            lesson(11, 2, 2, 2),
+        ], chunk_size=1)
+
+        assert result['created_assignments'] == 2
+        assert result['assignments_failed'][0]['index'] == 1
+        assert result['assignments_failed'][0]['conflicts'][0]['batch_index'] == 0
+
+    @pytest.mark.unit
+    def test_rejects_clash_with_existing_data(self, manager):
+        manager.bulk_create_assignments([lesson(10, 1, 1, 1)])
+        result = manager.bulk_create_assignments([lesson(11, 2, 1, 1), lesson(11, 2, 2, 2)])
+
+        assert result['created_assignments'] == 1
+        assert result['assignments_failed'][0]['conflicts'][0]['type'] == 'classroom_conflict'
+
+    @pytest.mark.unit
+    def test_stop_on_conflict_and_bad_rows(self, manager):
+        result = manager.bulk_create_assignments([
+            lesson(10, 1, 1, 1, day='sabado'),
+            lesson(10, 1, 1, 1),
+            lesson(10, 1, 1, 1),
+            lesson(10, 2, 2, 2),
+        ], stop_on_conflict=True)
+
+        assert result['created_assignments'] == 1
+        assert [f['index'] for f in result['assignments_failed']] == [0, 2]
+
+    @pytest.mark.unit
+    def test_workload_recomputed_once_per_teacher(self, manager):
+        result = manager.bulk_create_assignments([lesson(10, s, s, s) for s in (1, 2, 3, 4)])
+
+        # Fourth lesson exceeds the teacher's 3 weekly periods (non-critical)
+        assert result['created_assignments'] == 4
+        assert any(c['type'] == 'workload_violation' for c in result['conflicts'])
+
+        session = manager.SessionLocal()
+        assert session.query(ScheduleAssignment).count() == 4
+        assert session.get(Teacher, 10).current_weekly_hours == 4
+        workload = session.query(TeacherWorkload).filter_by(teacher_id=10).one()
+        assert (workload.calculated_hours, workload.overtime_hours, workload.is_valid) == (4, 1, False)
+        session.close()
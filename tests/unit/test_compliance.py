@@ -0,0 +1,114 @@
+"""
+Unit tests for the Venezuelan K12 compliance engine.
+Tests each rule over a small timetable tensor and scoped reports.
+"""
+
+from datetime import time
+
+import pytest
+
+from src.models.tenant import ScheduleAssignment, DayOfWeek
+from src.scheduling.compliance import (
+    ComplianceEngine, compliance_report, longest_continuous_minutes
+)
+from src.scheduling.timetable_tensor import Timetable
+
+
+PERIODS = [
+    # 45-minute periods, a 20-minute recess after P3
+    (1, 'P1', time(7, 0), time(7, 45), False),
+    (2, 'P2', time(7, 45), time(8, 30), False),
+    (3, 'P3', time(8, 30), time(9, 15), False),
+    (4, 'REC', time(9, 15), time(9, 35), True),
+    (5, 'P4', time(9, 35), time(10, 20), False),
+    (6, 'P5', time(13, 0), time(13, 45), False),
+]
+
+
+@pytest.fixture
+def session(make_session):
+    lessons = [
+        # Section 1, Monday: P1-P3 in a row (135 minutes) before the recess
+        (1, 1, 1, 1, 1, DayOfWeek.LUNES),
+        (1, 1, 1, 1, 2, DayOfWeek.LUNES),
+        (1, 2, 1, 1, 3, DayOfWeek.LUNES),
+        # Lesson during the recess
+        (2, 1, 1, 1, 4, DayOfWeek.MARTES),
+        # Section 2 only has an afternoon lesson
+        (2, 2, 2, 2, 6, DayOfWeek.LUNES),
+    ]
+    return make_session(
+        teachers=[{'id': 1, 'max_weekly_hours': 2}, 2],
+        subjects=(1, 2),
+        sections=[1, {'id': 2, 'name': '5to año A', 'grade_level': 11}],
+        classrooms=(1, 2),
+        periods=[
+            {'id': pid, 'period_name': name, 'start_time': start, 'end_time': end,
+             'display_order': pid, 'is_break': is_break}
+            for pid, name, start, end, is_break in PERIODS
+        ],
+        rows=[
+            ScheduleAssignment(tenant_id=1, teacher_id=t, subject_id=s, section_id=sec, classroom_id=c,
+                               time_period_id=p, day_of_week=d)
+            for t, s, sec, c, p, d in lessons
+        ]
+    )
+
+
+def types_of(violations):
+    return sorted({v['type'] for v in violations})
+
+
+class TestComplianceEngine:
+    """Test the vectorized rules."""
+
+    @pytest.mark.unit
+    @pytest.mark.venezuelan
+    def test_rules_use_real_durations(self, session):
+        timetable = Timetable.load(session)
+        violations = ComplianceEngine(timetable).evaluate()
+
+        workload = [v for v in violations if v['rule'] == 'workload']
+        # 3 x 45 minutes = 2.25 hours over the teacher's 2-hour cap (below the legal 40)
+        assert [(v['teacher_id'], v['current_hours'], v['severity']) for v in workload] == [(1, 2.25, 'warning')]
+
+        longest = longest_continuous_minutes(timetable, 'section')
+        assert longest[timetable.sections.index[1], 0] == 135
+
+        breaks = [v for v in violations if v['rule'] == 'breaks']
+        assert types_of(breaks) == ['break_occupied', 'missing_break']
+        assert {v['section_id'] for v in breaks} == {1}
+
+        assert [v['section_id'] for v in violations if v['rule'] == 'bimodal'] == [2]
+        assert [v['section_id'] for v in violations if v['rule'] == 'grade_content'] == [1]
+
+        quotas = [v for v in violations if v['rule'] == 'subject_quotas' and v['subject'] == 'MATEMÁTICAS']
+        assert {(v['section_id'], v['current_periods']) for v in quotas} == {(1, 2), (2, 0)}
+
+    @pytest.mark.unit
+    @pytest.mark.venezuelan
+    def test_scoped_report(self, session):
+        timetable = Timetable.load(session)
+
+        report = compliance_report(timetable, 'section', 2, rules=('bimodal', 'breaks', 'workload'))
+        assert types_of(report['violations']) == ['bimodal_violation']
+        assert report['summary']['violations_by_rule'] == {'bimodal': 1, 'breaks': 0, 'workload': 0}
+        assert report['compliance_score'] == 90
+
+        report = compliance_report(timetable, 'teacher', 2, rules=('bimodal', 'workload'))
+        assert [v.get('section_id') for v in report['violations']] == [2]
+
+        with pytest.raises(ValueError):
+            compliance_report(timetable, rules=('unknown',))
+
+    @pytest.mark.unit
+    @pytest.mark.venezuelan
+    def test_section_view_keeps_teachers_teaching_it(self, session):
+        timetable = Timetable.load(session)
+
+        # Teacher 1 is over its cap and only teaches section 1
+        report = compliance_report(timetable, 'section', 1, rules=('workload',))
+        assert [v['teacher_id'] for v in report['violations']] == [1]
+
+        report = compliance_report(timetable, 'section', 2, rules=('workload',))
+        assert report['violations'] == []
@@ -0,0 +1,117 @@
+"""
+Unit tests for the full-schedule conflict scan.
+Tests pairwise double booking, qualification and workload reporting,
+and batch checks of proposed placements.
+"""
+
+from collections import namedtuple
+
+import pytest
+
+from src.models.tenant import DayOfWeek
+from src.scheduling.occupancy import OccupancyIndex
+from src.scheduling.services import check_proposed_assignments, scan_assignment_conflicts
+
+
+Row = namedtuple('Row', 'id teacher_id classroom_id section_id subject_id day_of_week time_period_id')
+
+
+def row(a_id, teacher_id, classroom_id, section_id, period, day=DayOfWeek.LUNES, subject_id=5):
+    return Row(a_id, teacher_id, classroom_id, section_id, subject_id, day, period)
+
+
+class TestConflictScan:
+    """Test hash-join conflict detection."""
+
+    @pytest.mark.unit
+    def test_each_pair_reported_once(self):
+        rows = [row(1, 10, 20, 30, 1), row(2, 10, 21, 31, 1), row(3, 11, 22, 32, 1)]
+        conflicts = scan_assignment_conflicts(rows, {(10, 5), (11, 5)}, {})
+
+        assert len(conflicts) == 1
+        assert conflicts[0]['type'] == 'teacher_double_booking'
+        assert (conflicts[0]['assignment_id'], conflicts[0]['existing_assignment_id']) == (1, 2)
+
+    @pytest.mark.unit
+    def test_three_way_clash_yields_three_pairs(self):
+        rows = [row(i, 10 + i, 20, 30 + i, 1) for i in (1, 2, 3)]
+        conflicts = scan_assignment_conflicts(rows, {(11, 5), (12, 5), (13, 5)}, {})
+
+        pairs = {(c['assignment_id'], c['existing_assignment_id']) for c in conflicts}
+        assert pairs == {(1, 2), (1, 3), (2, 3)}
+        assert all(c['type'] == 'classroom_conflict' for c in conflicts)
+
+    @pytest.mark.unit
+    def test_different_day_is_not_a_clash(self):
+        rows = [row(1, 10, 20, 30, 1), row(2, 10, 20, 30, 1, day=DayOfWeek.MARTES)]
+        assert scan_assignment_conflicts(rows, {(10, 5)}, {}) == []
+
+    @pytest.mark.unit
+    def test_mismatch_and_workload_once_per_teacher(self):
+        rows = [row(1, 10, 20, 30, 1), row(2, 10, 20, 30, 2), row(3, 10, 20, 30, 3)]
+        conflicts = scan_assignment_conflicts(rows, set(), {10: 2})
+
+        types = [c['type'] for c in conflicts]
+        assert types.count('teacher_subject_mismatch') == 3
+        assert types.count('workload_violation') == 1
+
+
+def proposal(teacher_id, classroom_id, period, day='lunes', **extra):
+    return dict(teacher_id=teacher_id, classroom_id=classroom_id, day_of_week=day,
+                time_period_id=period, **extra)
+
+
+@pytest.fixture
+def index():
+    index = OccupancyIndex()
+    index.add(1, 10, 20, 30, DayOfWeek.LUNES, 1, subject_id=5)
+    index.add(2, 11, 21, 31, DayOfWeek.LUNES, 2, subject_id=5)
+    index.teacher_subjects = {(10, 5), (11, 5)}
+    index.teacher_max_hours = {10: 3, 11: 40}
+    return index
+
+
+class TestBatchProposals:
+    """Test checking a block of proposals against the index and each other."""
+
+    @pytest.mark.unit
+    def test_clashes_with_stored_schedule_and_batch(self, index):
+        results = check_proposed_assignments(index, [
+            proposal(10, 22, 1),                    # teacher 10 already teaches Monday P1
+            proposal(12, 23, 3, section_id=32),
+            proposal(13, 23, 3, section_id=32),     # same room and section as the previous one
+            proposal(14, 24, 4, day='MARTES'),
+        ])
+
+        assert [r['has_conflicts'] for r in results] == [True, True, True, False]
+        assert results[0]['conflicts'][0]['existing_assignment_id'] == 1
+        assert {c['type'] for c in results[1]['conflicts']} == {'classroom_conflict', 'section_overlap'}
+        assert all(c['batch_indexes'] == [2] for c in results[1]['conflicts'])
+
+    @pytest.mark.unit
+    def test_moving_block_frees_its_own_slots(self, index):
+        # Swap the two stored lessons' rooms within one batch
+        results = check_proposed_assignments(index, [
+            proposal(10, 21, 1, exclude_assignment_id=1, section_id=30),
+            proposal(11, 20, 2, exclude_assignment_id=2, section_id=31),
+        ])
+        assert not any(r['has_conflicts'] for r in results)
+
+    @pytest.mark.unit
+    def test_workload_counts_the_whole_batch(self, index):
+        results = check_proposed_assignments(index, [
+            proposal(10, 20, 2, subject_id=5), proposal(10, 20, 3, subject_id=5), proposal(10, 20, 4, subject_id=6)
+        ])
+
+        for result in results:
+            assert 'workload_violation' in {c['type'] for c in result['conflicts']}
+        assert results[2]['conflicts'][0]['type'] == 'teacher_subject_mismatch'
+
+    @pytest.mark.unit
+    def test_malformed_proposals_get_an_error(self, index):
+        results = check_proposed_assignments(index, [
+            {'teacher_id': 10}, proposal(10, 20, 2, day='domingo'), proposal(11, 25, 3)
+        ])
+        assert 'Missing required field' in results[0]['error']
+        assert 'Invalid day_of_week' in results[1]['error']
+        assert results[2] == {'index': 2, 'has_conflicts': False, 'conflicts': []}
@@ -0,0 +1,94 @@
+"""
+Unit tests for the free-slot finder.
+Tests bitset intersection, room constraints, preference ranking and index sync.
+"""
+
+from datetime import time
+
+import pytest
+
+from src.models.tenant import (
+    ScheduleAssignment, TeacherPreference, DayOfWeek, RoomType, PreferenceType, PreferenceLevel
+)
+from src.scheduling.free_slots import find_free_slots
+from src.scheduling.occupancy import OccupancyIndex
+
+
+@pytest.fixture
+def session(make_session):
+    return make_session(
+        teachers=(1, 2),
+        classrooms=[
+            {'id': 1, 'capacity': 35},
+            {'id': 2, 'name': 'Laboratorio', 'capacity': 20, 'room_type': RoomType.LABORATORY},
+        ],
+        periods=[
+            1,
+            {'id': 2, 'period_name': 'REC1', 'start_time': time(7, 40), 'end_time': time(8, 0),
+             'display_order': 2, 'is_break': True},
+            {'id': 3, 'period_name': 'P2', 'start_time': time(8, 0), 'end_time': time(8, 40), 'display_order': 3},
+        ]
+    )
+
+
+def assign(session, teacher_id, day, period, classroom_id=1, section_id=1):
+    session.add(ScheduleAssignment(tenant_id=1, teacher_id=teacher_id, subject_id=1, section_id=section_id,
+                                   classroom_id=classroom_id, time_period_id=period, day_of_week=day))
+
+
+class TestFreeSlots:
+    """Test common free slot queries."""
+
+    @pytest.mark.unit
+    def test_intersection_skips_busy_and_break_slots(self, session):
+        assign(session, 1, DayOfWeek.LUNES, 1)
+        assign(session, 2, DayOfWeek.LUNES, 3, section_id=2)
+        session.commit()
+        index = OccupancyIndex.load(session)
+
+        slots = find_free_slots(index, teacher_ids=[1, 2], section_ids=[1])
+        taken = {(slot['day'], slot['period']) for slot in slots}
+
+        assert len(slots) == 2 * 5 - 2
+        assert ('lunes', 'P1') not in taken and ('lunes', 'P2') not in taken
+        assert all(slot['period'] != 'REC1' for slot in slots)
+
+    @pytest.mark.unit
+    def test_room_constraints(self, session):
+        assign(session, 2, DayOfWeek.MARTES, 1, classroom_id=2, section_id=2)
+        session.commit()
+        index = OccupancyIndex.load(session)
+
+        slots = find_free_slots(index, teacher_ids=[1], room_type='laboratory')
+        assert ('martes', 'P1') not in {(slot['day'], slot['period']) for slot in slots}
+        assert all([room['id'] for room in slot['classrooms']] == [2] for slot in slots)
+
+        assert find_free_slots(index, teacher_ids=[1], min_capacity=40) == []
+        with pytest.raises(ValueError):
+            find_free_slots(index, teacher_ids=[1], room_type='pool')
+
+    @pytest.mark.unit
+    def test_ranked_by_teacher_preferences(self, session):
+        session.add_all([
+            TeacherPreference(teacher_id=1, preference_type=PreferenceType.DAY_OF_WEEK,
+                              preference_level=PreferenceLevel.PREFER, day_of_week=DayOfWeek.JUEVES),
+            TeacherPreference(teacher_id=1, preference_type=PreferenceType.TIME_SLOT,
+                              preference_level=PreferenceLevel.AVOID, time_period_id=1),
+        ])
+        session.commit()
+        index = OccupancyIndex.load(session)
+
+        slots = find_free_slots(index, teacher_ids=[1], limit=3)
+        assert (slots[0]['day'], slots[0]['period']) == ('jueves', 'P2')
+        assert slots[0]['score'] == 3.0
+        assert find_free_slots(index, teacher_ids=[1])[-1]['score'] == -4.0
+
+    @pytest.mark.unit
+    def test_bitsets_follow_index_updates(self, session):
+        index = OccupancyIndex.load(session)
+        index.add(99, 1, 1, 1, DayOfWeek.VIERNES, 3)
+        assert ('viernes', 'P2') not in {(s['day'], s['period']) for s in find_free_slots(index, teacher_ids=[1])}
+
+        index.remove(99)
+        assert index.busy_mask('teacher', 1) == 0
+        assert index.busy_mask('classroom', 1) == 0
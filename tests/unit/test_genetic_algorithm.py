@@ -0,0 +1,58 @@
+"""
+Unit tests for the schedule genetic algorithm.
+Tests warm-start seeding of the initial population.
+"""
+
+import pytest
+
+from src.scheduling.genetic_algorithm import VenezuelanScheduleGA
+
+
+def build_ga():
+    teachers = [{'id': 1, 'qualified_subjects': [10]}, {'id': 2, 'qualified_subjects': [10]}]
+    subjects = [{'id': 10}]
+    sections = [{'id': 100, 'subjects': [{'id': 10, 'weekly_hours': 3}]}]
+    classrooms = [{'id': 5}]
+    time_periods = [{'id': p} for p in range(1, 7)]
+    ga = VenezuelanScheduleGA(teachers, subjects, sections, classrooms, time_periods, {}, {})
+    ga.population_size = 10
+    return ga
+
+
+def slot(teacher_id, day, period, section_id=100, subject_id=10, classroom_id=5):
+    return {'teacher_id': teacher_id, 'section_id': section_id, 'subject_id': subject_id,
+            'classroom_id': classroom_id, 'day': day, 'period': period}
+
+
+class TestWarmStart:
+    """Test seeding the GA from an existing schedule."""
+
+    @pytest.mark.unit
+    def test_seed_is_first_chromosome_and_completed(self):
+        ga = build_ga()
+        ga.set_warm_start([slot(1, 0, 1), slot(1, 2, 3)], ratio=0.5)
+
+        population = ga.generate_initial_population()
+        seed = population[0]
+
+        assert len(population) == 10
+        placed = [(g.day_of_week, g.time_period_id) for g in seed.genes]
+        assert placed[:2] == [(0, 1), (2, 3)]
+        # Third weekly hour was added to the seed
+        assert len(seed.genes) == 3
+
+    @pytest.mark.unit
+    def test_stale_slots_are_dropped(self):
+        ga = build_ga()
+        ga.set_warm_start([slot(1, 0, 1), slot(99, 1, 1), slot(1, 1, 42)])
+
+        assert len(ga.seed_genes) == 1
+
+    @pytest.mark.unit
+    def test_evolve_with_warm_start(self):
+        ga = build_ga()
+        ga.generations = 3
+        ga.set_warm_start([slot(1, 0, 1), slot(2, 1, 2), slot(1, 3, 4)])
+
+        best = ga.evolve()
+        assert best.genes
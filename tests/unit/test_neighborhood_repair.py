@@ -0,0 +1,168 @@
+"""
+Unit tests for neighborhood schedule repair.
+Tests change set parsing, pinning and re-placement.
+"""
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from src.core.app import create_app
+from src.core.config import DevelopmentConfig
+from src.models.tenant import DayOfWeek, Schedule, ScheduleAssignment
+from src.scheduling.neighborhood_repair import NeighborhoodRepairer, parse_change_set
+
+
+PERIODS = [1, 2, 3, 4]
+
+
+def lesson(a_id, teacher_id, section_id, day, period, subject_id=100, classroom_id=1, locked=False):
+    return {
+        'id': a_id, 'teacher_id': teacher_id, 'subject_id': subject_id,
+        'section_id': section_id, 'classroom_id': classroom_id,
+        'day': day, 'period': period, 'is_locked': locked
+    }
+
+
+def build(assignments, qualified=None, radius=1, max_hours=None):
+    return NeighborhoodRepairer(
+        assignments=assignments,
+        period_ids=PERIODS,
+        qualified_teachers=qualified or {},
+        classroom_ids=[1, 2, 3],
+        teacher_max_hours=max_hours,
+        radius=radius
+    )
+
+
+class TestChangeSet:
+    """Test change set validation."""
+
+    @pytest.mark.unit
+    def test_expands_whole_day(self):
+        blocked, forced = parse_change_set([{'type': 'teacher', 'id': 7, 'days': [2]}], PERIODS)
+        assert blocked == {('teacher', 7, 2, p) for p in PERIODS}
+        assert forced == set()
+
+    @pytest.mark.unit
+    def test_rejects_unknown_type(self):
+        with pytest.raises(ValueError):
+            parse_change_set([{'type': 'student', 'id': 1}], PERIODS)
+
+    @pytest.mark.unit
+    def test_rejects_empty(self):
+        with pytest.raises(ValueError):
+            parse_change_set([], PERIODS)
+
+
+class TestNeighborhoodRepairer:
+    """Test local re-optimization."""
+
+    @pytest.mark.unit
+    def test_unaffected_lessons_stay_pinned(self):
+        assignments = [
+            lesson(1, 10, 1, 0, 1),
+            lesson(2, 11, 1, 0, 2),
+            lesson(3, 12, 2, 3, 4),
+        ]
+        result = build(assignments).repair([{'type': 'teacher', 'id': 10, 'days': [0], 'time_period_ids': [1]}])
+
+        assert result['directly_affected'] == [1]
+        assert 3 not in result['freed']
+        by_id = {a['id']: a for a in result['assignments']}
+        assert (by_id[3]['day'], by_id[3]['period']) == (3, 4)
+        assert (by_id[1]['day'], by_id[1]['period']) != (0, 1)
+        assert not result['unresolved']
+
+    @pytest.mark.unit
+    def test_prefers_nearby_slot_same_teacher(self):
+        assignments = [lesson(1, 10, 1, 0, 1)]
+        result = build(assignments).repair([{'type': 'classroom', 'id': 1, 'days': [0], 'time_period_ids': [1]}])
+
+        # Room change in the same slot is the cheapest repair
+        moved = result['changes'][0]['after']
+        assert (moved['teacher_id'], moved['day'], moved['period']) == (10, 0, 1)
+        assert moved['classroom_id'] == 2
+
+    @pytest.mark.unit
+    def test_substitute_teacher_when_unavailable_all_week(self):
+        assignments = [lesson(1, 10, 1, 0, 1, subject_id=100)]
+        result = build(assignments, qualified={100: [10, 20]}).repair([{'type': 'teacher', 'id': 10}])
+
+        assert result['changes'][0]['after']['teacher_id'] == 20
+
+    @pytest.mark.unit
+    def test_substitute_over_maximum_hours_not_used(self):
+        # Teacher 20 already teaches periods 2-4 on Monday and may teach 3
+        assignments = [lesson(1, 10, 1, 0, 1, subject_id=100)] + [
+            lesson(a_id, 20, 2, 0, period, subject_id=100) for a_id, period in ((2, 2), (3, 3), (4, 4))
+        ]
+        repairer = build(assignments, qualified={100: [10, 20, 30]}, max_hours={20: 3, 30: 3})
+        result = repairer.repair([{'type': 'teacher', 'id': 10}])
+
+        assert result['changes'][0]['after']['teacher_id'] == 30
+
+    @pytest.mark.unit
+    def test_locked_lesson_is_not_moved(self):
+        assignments = [lesson(1, 10, 1, 0, 1, locked=True), lesson(2, 11, 1, 0, 2)]
+        result = build(assignments).repair([{'type': 'teacher', 'id': 10, 'days': [0], 'time_period_ids': [1]}])
+
+        assert [a['id'] for a in result['unresolved']] == [1]
+        assert result['freed'] == [] and result['changes'] == []
+        assert [a['id'] for a in result['assignments']] == [2]
+
+    @pytest.mark.unit
+    def test_unresolvable_lesson_reported(self):
+        assignments = [lesson(1, 10, 1, 0, 1)]
+        result = build(assignments).repair([{'type': 'teacher', 'id': 10}])
+
+        assert [a['id'] for a in result['unresolved']] == [1]
+        assert result['assignments'] == []
+
+    @pytest.mark.unit
+    def test_no_double_booking_after_repair(self):
+        assignments = [lesson(i, 10 + i, 1, 0, p) for i, p in enumerate(PERIODS, start=1)]
+        assignments.append(lesson(9, 30, 2, 0, 2, classroom_id=2))
+        result = build(assignments, radius=2).repair([{'type': 'section', 'id': 1, 'days': [0], 'time_period_ids': [2]}])
+
+        slots = [(a['section_id'], a['day'], a['period']) for a in result['assignments']]
+        rooms = [(a['classroom_id'], a['day'], a['period']) for a in result['assignments']]
+        assert len(slots) == len(set(slots))
+        assert len(rooms) == len(set(rooms))
+        assert all(not (a['section_id'] == 1 and a['day'] == 0 and a['period'] == 2) for a in result['assignments'])
+
+
+class TestRepairEndpoint:
+    """Test the repair API."""
+
+    @pytest.fixture
+    def client(self, make_session, tmp_path, monkeypatch):
+        url = f"sqlite:///{tmp_path / 'tenant.db'}"
+        tenant_db = make_session(url=url, rows=[
+            Schedule(id=1, tenant_id=1, name='Horario activo', academic_year=2025, semester=1, status='active'),
+            ScheduleAssignment(tenant_id=1, schedule_id=1, teacher_id=1, subject_id=1, section_id=1,
+                               classroom_id=1, time_period_id=1, day_of_week=DayOfWeek.LUNES),
+        ])
+        monkeypatch.setattr(DevelopmentConfig, 'SQLALCHEMY_DATABASE_URI', url)
+
+        # The testing config's SQLite engine options are rejected by SQLAlchemy
+        app = create_app('development')
+        app.config['TESTING'] = True
+        client = app.test_client()
+        client.tenant_db = tenant_db
+        with app.app_context():
+            client.token = create_access_token(identity='1')
+        with client.session_transaction() as flask_session:
+            flask_session['tenant_id'] = 1
+        return client
+
+    @pytest.mark.unit
+    def test_unresolved_lessons_are_not_saved(self, client):
+        response = client.post('/api/schedule/optimize/repair', json={
+            'changes': [{'type': 'teacher', 'id': 1}]
+        }, headers={'Authorization': f'Bearer {client.token}'})
+
+        assert response.status_code == 409
+        body = response.get_json()
+        assert body['base_schedule_id'] == 1
+        assert [lesson['teacher_id'] for lesson in body['unresolved']] == [1]
+        assert client.tenant_db.query(Schedule).count() == 1
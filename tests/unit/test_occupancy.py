@@ -0,0 +1,146 @@
+"""
+Unit tests for the schedule occupancy index.
+Tests slot lookups, moves, sync from committed sessions and per-tenant loads.
+"""
+
+import threading
+
+import pytest
+
+from src.models.tenant import ScheduleAssignment, TeacherSubject, DayOfWeek
+from src.scheduling.occupancy import OccupancyIndex, OccupancyRegistry, get_occupancy_registry, tenant_key
+
+
+class TestOccupancyIndex:
+    """Test in-memory slot bookkeeping."""
+
+    @pytest.mark.unit
+    def test_finds_each_occupied_resource(self):
+        index = OccupancyIndex()
+        index.add(1, teacher_id=10, classroom_id=20, section_id=30, day=DayOfWeek.LUNES, time_period_id=1)
+
+        clashes = index.find_conflicts(teacher_id=10, classroom_id=21, section_id=30,
+                                       day='lunes', time_period_id=1)
+        assert clashes == {'teacher': 1, 'section': 1}
+        assert index.find_conflicts(teacher_id=10, day='martes', time_period_id=1) == {}
+
+    @pytest.mark.unit
+    def test_exclude_self_and_move(self):
+        index = OccupancyIndex()
+        index.add(1, 10, 20, 30, 'lunes', 1)
+
+        assert index.find_conflicts(teacher_id=10, day='lunes', time_period_id=1,
+                                    exclude_assignment_id=1) == {}
+
+        index.add(1, 10, 20, 30, 'martes', 2)
+        assert index.occupant('teacher', 10, 'lunes', 1) is None
+        assert index.occupant('classroom', 20, 'martes', 2) == 1
+        assert index.teacher_load(10) == 1
+
+    @pytest.mark.unit
+    def test_remove_keeps_other_holders(self):
+        index = OccupancyIndex()
+        index.add(1, 10, 20, 30, 'lunes', 1)
+        index.add(2, 10, 21, 31, 'lunes', 1)  # Existing clash in stored data
+
+        index.remove(1)
+        assert index.occupant('teacher', 10, 'lunes', 1) == 2
+        assert index.teacher_load(10) == 1
+
+
+class TestOccupancySync:
+    """Test index updates from committed ORM writes."""
+
+    @pytest.mark.unit
+    def test_commit_updates_and_rollback_discards(self, make_session):
+        session = make_session(
+            teachers=[{'id': 10, 'teacher_name': 'MARIA NIETO', 'max_weekly_hours': 2}],
+            subjects=(), sections=(), classrooms=(), periods=(),
+            rows=[TeacherSubject(teacher_id=10, subject_id=5, weekly_hours=2, is_active=True)]
+        )
+
+        registry = get_occupancy_registry()
+        registry.invalidate(session.get_bind().url)
+        index = registry.get_index(session)
+        assert index.is_qualified(10, 5)
+        assert index.teacher_max_hours[10] == 2
+
+        assignment = ScheduleAssignment(
+            tenant_id=1, teacher_id=10, subject_id=5, section_id=30, classroom_id=20,
+            time_period_id=1, day_of_week=DayOfWeek.LUNES
+        )
+        session.add(assignment)
+        session.commit()
+        assert index.occupant('section', 30, 'lunes', 1) == assignment.id
+
+        assignment.day_of_week = DayOfWeek.MARTES
+        session.flush()
+        session.rollback()
+        assert index.occupant('section', 30, 'lunes', 1) == assignment.id
+
+        assignment.is_active = False
+        session.commit()
+        assert index.occupant('section', 30, 'lunes', 1) is None
+        assert index.teacher_load(10) == 0
+
+        registry.invalidate(session.get_bind().url)
+
+    @pytest.mark.unit
+    def test_reload_after_max_age(self, make_session):
+        session = make_session(teachers=(), subjects=(), sections=(), classrooms=(), periods=())
+
+        registry = OccupancyRegistry(max_age_seconds=0)
+        first = registry.get_index(session)
+        assert registry.get_index(session) is not first
+        assert registry.stats()['loads'] == 2
+
+    @pytest.mark.unit
+    def test_slow_load_does_not_block_other_tenants(self, make_session, tmp_path, monkeypatch):
+        slow = make_session(url=f"sqlite:///{tmp_path / 'slow.db'}")
+        fast = make_session(url=f"sqlite:///{tmp_path / 'fast.db'}")
+        registry = OccupancyRegistry()
+
+        started, release = threading.Event(), threading.Event()
+        load = OccupancyIndex.load.__func__
+
+        def blocking_load(cls, session):
+            if session is slow:
+                started.set()
+                assert release.wait(5)
+            return load(cls, session)
+
+        monkeypatch.setattr(OccupancyIndex, 'load', classmethod(blocking_load))
+        slow_worker = threading.Thread(target=registry.get_index, args=(slow,))
+        slow_worker.start()
+        try:
+            assert started.wait(5)
+            loaded = []
+            fast_worker = threading.Thread(target=lambda: loaded.append(registry.get_index(fast)))
+            fast_worker.start()
+            fast_worker.join(2)
+            # Served while the slow tenant is still loading
+            assert loaded and not release.is_set()
+        finally:
+            release.set()
+            slow_worker.join(5)
+        assert registry.stats()['loads'] == 2
+
+    @pytest.mark.unit
+    def test_commit_during_load_is_replayed(self, make_session, monkeypatch):
+        session = make_session()
+        registry = OccupancyRegistry()
+        load = OccupancyIndex.load.__func__
+
+        def load_then_commit(cls, session):
+            index = load(cls, session)
+            # A commit lands after the load read the assignments
+            registry.apply_changes(tenant_key(session.get_bind().url), [{
+                'id': 7, 'is_active': True, 'teacher_id': 1, 'classroom_id': 1, 'section_id': 1,
+                'subject_id': 1, 'day_of_week': 'lunes', 'time_period_id': 1
+            }])
+            return index
+
+        monkeypatch.setattr(OccupancyIndex, 'load', classmethod(load_then_commit))
+        index = registry.get_index(session)
+        assert index.occupant('teacher', 1, 'lunes', 1) == 7
+        assert registry.get_index(session) is index
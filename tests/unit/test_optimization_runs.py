@@ -0,0 +1,136 @@
+"""
+Unit tests for optimization run scheduling.
+Tests cancellation tokens, concurrency limits and fair queuing.
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.scheduling.optimization_runs import (
+    CancellationToken, OptimizationCancelled, OptimizationQueueFull,
+    OptimizationRunScheduler, RunStatus
+)
+from src.scheduling.constraint_solver import VenezuelanConstraintSolver
+from src.scheduling.genetic_algorithm import VenezuelanScheduleGA
+
+
+class TestCancellationToken:
+    """Test cooperative cancellation."""
+
+    @pytest.mark.unit
+    def test_cancel_raises(self):
+        token = CancellationToken()
+        token.raise_if_cancelled()
+
+        token.cancel('cancelled_by_user')
+        with pytest.raises(OptimizationCancelled):
+            token.raise_if_cancelled()
+        assert token.reason == 'cancelled_by_user'
+
+    @pytest.mark.unit
+    def test_deadline_preempts(self):
+        token = CancellationToken(deadline=time.monotonic() - 1)
+        assert token.is_cancelled
+        assert token.reason == 'max_runtime_exceeded'
+
+    @pytest.mark.unit
+    def test_genetic_algorithm_stops_on_cancel(self):
+        ga = VenezuelanScheduleGA([], [], [], [], [], {}, {})
+        token = CancellationToken()
+        token.cancel()
+
+        with pytest.raises(OptimizationCancelled):
+            ga.evolve(cancel_token=token)
+
+    @pytest.mark.unit
+    def test_constraint_solver_stops_on_cancel(self):
+        solver = VenezuelanConstraintSolver()
+        token = CancellationToken()
+        token.cancel()
+
+        assignments = [{'teacher_id': 1, 'section_id': 1, 'subject_id': 1, 'classroom_id': 1}]
+        with pytest.raises(OptimizationCancelled):
+            solver.solve_csp(assignments, cancel_token=token)
+
+
+class TestOptimizationRunScheduler:
+    """Test admission control and fairness."""
+
+    @pytest.mark.unit
+    def test_per_tenant_limit(self):
+        scheduler = OptimizationRunScheduler(max_concurrent_runs=4, max_runs_per_tenant=1)
+
+        first = scheduler.submit('school_a', 'genetic')
+        second = scheduler.submit('school_a', 'genetic')
+
+        assert first.status == RunStatus.RUNNING
+        assert second.status == RunStatus.QUEUED
+
+        scheduler.finish(first, RunStatus.COMPLETED)
+        assert second.status == RunStatus.RUNNING
+
+    @pytest.mark.unit
+    def test_round_robin_across_tenants(self):
+        scheduler = OptimizationRunScheduler(max_concurrent_runs=1, max_runs_per_tenant=1)
+
+        blocker = scheduler.submit('school_a', 'genetic')
+        a2 = scheduler.submit('school_a', 'genetic')
+        a3 = scheduler.submit('school_a', 'genetic')
+        b1 = scheduler.submit('school_b', 'genetic')
+
+        scheduler.finish(blocker, RunStatus.COMPLETED)
+        # school_b gets the next slot even though school_a queued first
+        assert b1.status == RunStatus.RUNNING
+        assert a2.status == RunStatus.QUEUED
+
+        scheduler.finish(b1, RunStatus.COMPLETED)
+        assert a2.status == RunStatus.RUNNING
+        assert a3.status == RunStatus.QUEUED
+
+    @pytest.mark.unit
+    def test_queue_full(self):
+        scheduler = OptimizationRunScheduler(max_concurrent_runs=1, max_queued_per_tenant=1)
+        scheduler.submit('school_a', 'genetic')
+        scheduler.submit('school_a', 'genetic')
+
+        with pytest.raises(OptimizationQueueFull):
+            scheduler.submit('school_a', 'genetic')
+
+    @pytest.mark.unit
+    def test_cancel_queued_run(self):
+        scheduler = OptimizationRunScheduler(max_concurrent_runs=1)
+        scheduler.submit('school_a', 'genetic')
+        queued = scheduler.submit('school_a', 'genetic')
+
+        scheduler.cancel(queued.run_id, 'school_a')
+        assert queued.status == RunStatus.CANCELLED
+        assert scheduler.wait_for_slot(queued, timeout=0.1) is False
+
+    @pytest.mark.unit
+    def test_cancel_is_tenant_scoped(self):
+        scheduler = OptimizationRunScheduler()
+        run = scheduler.submit('school_a', 'genetic')
+
+        assert scheduler.cancel(run.run_id, 'school_b') is None
+        assert not run.token.is_cancelled
+
+    @pytest.mark.unit
+    def test_wait_for_slot_unblocks(self):
+        scheduler = OptimizationRunScheduler(max_concurrent_runs=1)
+        running = scheduler.submit('school_a', 'genetic')
+        waiting = scheduler.submit('school_b', 'genetic')
+
+        threading.Timer(0.05, scheduler.finish, args=(running, RunStatus.COMPLETED)).start()
+        assert scheduler.wait_for_slot(waiting, timeout=2) is True
+
+    @pytest.mark.unit
+    def test_wait_for_slot_times_out(self):
+        scheduler = OptimizationRunScheduler(max_concurrent_runs=1)
+        scheduler.submit('school_a', 'genetic')
+        waiting = scheduler.submit('school_b', 'genetic')
+
+        assert scheduler.wait_for_slot(waiting, timeout=0.05) is False
+        assert waiting.token.reason == 'queue_timeout'
+        assert scheduler.stats()['queued'] == 0
@@ -0,0 +1,65 @@
+"""
+Unit tests for the parent portal student schedule endpoint.
+Tests that only the student's own parent can read the schedule.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import jwt
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from src.core.app import create_app
+from src.models import tenant
+from src.models.tenant import DayOfWeek, ScheduleAssignment, Student
+
+
+@pytest.fixture
+def client(make_session, tmp_path, monkeypatch):
+    session = make_session(url=f"sqlite:///{tmp_path / 'tenant.db'}", rows=[
+        Student(id=1, first_name='Ana', last_name='Nieto', full_name='Ana Nieto', gender='F',
+                grade_level=1, section_id=1, parent_email='Representante@ueipab.edu.ve'),
+        ScheduleAssignment(tenant_id=1, teacher_id=1, subject_id=1, section_id=1, classroom_id=1,
+                           time_period_id=1, day_of_week=DayOfWeek.LUNES),
+    ])
+    monkeypatch.setattr(tenant, 'get_tenant_session', sessionmaker(bind=session.get_bind()))
+
+    # The testing config's SQLite engine options are rejected by SQLAlchemy; no master database is used here
+    app = create_app('development')
+    app.config['TESTING'] = True
+    return app.test_client()
+
+
+def auth(client, email, role='parent'):
+    config = client.application.config
+    token = jwt.encode({
+        'user_id': 1, 'email': email, 'role': role, 'iss': config['JWT_ISSUER'],
+        'exp': datetime.now(timezone.utc) + timedelta(minutes=5)
+    }, config['JWT_SECRET_KEY'], algorithm=config['JWT_ALGORITHM'])
+    return {'Authorization': f'Bearer {token}'}
+
+
+class TestParentStudentSchedule:
+    """Test access to a student's schedule."""
+
+    @pytest.mark.unit
+    def test_own_parent_is_allowed(self, client):
+        response = client.get('/api/parent/student/1/schedule', headers=auth(client, 'representante@ueipab.edu.ve'))
+
+        assert response.status_code == 200
+        schedule = response.get_json()['schedule']
+        assert schedule['student_info'] == {'name': 'Ana Nieto', 'grade': 1, 'section': '1er año A'}
+
+    @pytest.mark.unit
+    def test_other_parent_is_refused(self, client):
+        response = client.get('/api/parent/student/1/schedule', headers=auth(client, 'otro@ueipab.edu.ve'))
+        assert response.status_code == 404
+        assert 'schedule' not in response.get_json()
+
+    @pytest.mark.unit
+    def test_requires_parent_login(self, client):
+        assert client.get('/api/parent/student/1/schedule').status_code == 401
+
+        response = client.get('/api/parent/student/1/schedule',
+                              headers=auth(client, 'representante@ueipab.edu.ve', role='teacher'))
+        assert response.status_code == 403
@@ -0,0 +1,143 @@
+"""
+Unit tests for schedule projections.
+Tests keyset pages, grouped pages, aggregate statistics and cursor parsing.
+"""
+
+import pytest
+
+from src.models.tenant import DayOfWeek, Schedule, ScheduleAssignment
+from src.scheduling.projections import (
+    get_assignment_page, get_schedule_with_statistics, parse_cursor
+)
+
+
+LESSONS = [
+    # teacher, subject, section, classroom, period, day
+    (1, 1, 1, 1, 1, DayOfWeek.MARTES),
+    (1, 1, 1, 1, 2, DayOfWeek.LUNES),
+    (2, 2, 2, 2, 1, DayOfWeek.LUNES),
+    (3, 2, 2, 2, 3, DayOfWeek.MIERCOLES),
+    (2, 1, 1, 1, 3, DayOfWeek.LUNES),
+]
+
+
+@pytest.fixture
+def session(make_session):
+    schedule = Schedule(id=1, tenant_id=1, name='Horario 2025', academic_year=2025, semester=1)
+    other = Schedule(id=2, tenant_id=1, name='Otro horario', academic_year=2025, semester=2)
+    return make_session(
+        teachers=(1, 2, 3), subjects=(1, 2), sections=(1, 2), classrooms=(1, 2), periods=(1, 2, 3),
+        rows=[schedule, other] + [
+            ScheduleAssignment(tenant_id=1, schedule_id=1, teacher_id=t, subject_id=s, section_id=sec,
+                               classroom_id=c, time_period_id=p, day_of_week=d)
+            for t, s, sec, c, p, d in LESSONS
+        ] + [
+            ScheduleAssignment(tenant_id=1, schedule_id=2, teacher_id=1, subject_id=1, section_id=1,
+                               classroom_id=1, time_period_id=1, day_of_week=DayOfWeek.VIERNES)
+        ]
+    )
+
+
+def walk(session, **kwargs):
+    """Follow next_cursor until the last page"""
+    pages, after = [], None
+    while True:
+        page = get_assignment_page(session, 1, after=after, **kwargs)
+        pages.append(page)
+        if not page['has_more']:
+            return pages
+        after = parse_cursor(page['next_cursor'])
+
+
+class TestAssignmentPages:
+    """Test keyset pagination over one schedule."""
+
+    @pytest.mark.unit
+    def test_pages_cross_boundaries(self, session):
+        pages = walk(session, limit=2)
+
+        assert [len(page['assignments']) for page in pages] == [2, 2, 1]
+        assert [page['has_more'] for page in pages] == [True, True, False]
+        for page in pages[:-1]:
+            assert page['next_cursor'] == str(page['assignments'][-1]['id'])
+        assert pages[-1]['next_cursor'] is None
+
+        ids = [a['id'] for page in pages for a in page['assignments']]
+        assert ids == sorted(ids) and len(set(ids)) == len(LESSONS)
+
+        first = pages[0]['assignments'][0]
+        assert (first['teacher'], first['section'], first['day'], first['start_time']) == \
+            ('MARIA NIETO', '1er año A', 'Tuesday', '07:00')
+
+    @pytest.mark.unit
+    def test_single_page_has_no_cursor(self, session):
+        page = get_assignment_page(session, 1, limit=len(LESSONS))
+        assert len(page['assignments']) == len(LESSONS)
+        assert page['next_cursor'] is None and page['has_more'] is False
+
+    @pytest.mark.unit
+    def test_grouped_by_section(self, session):
+        pages = walk(session, group_by='section', limit=1)
+
+        assert [[group['id'] for group in page['groups']] for page in pages] == [[1], [2]]
+        assert pages[0]['next_cursor'] == '1' and pages[-1]['next_cursor'] is None
+
+        section = pages[0]['groups'][0]
+        assert section['name'] == '1er año A'
+        # Whole section on one page, ordered by day
+        assert [(a['day_index'], a['time_period_id']) for a in section['assignments']] == [(0, 2), (0, 3), (1, 1)]
+
+    @pytest.mark.unit
+    def test_grouped_by_teacher(self, session):
+        pages = walk(session, group_by='teacher', limit=2)
+
+        assert [[group['id'] for group in page['groups']] for page in pages] == [[1, 2], [3]]
+        assert [page['has_more'] for page in pages] == [True, False]
+        assert pages[0]['next_cursor'] == '2'
+        assert [len(group['assignments']) for group in pages[0]['groups']] == [2, 2]
+        assert pages[1]['groups'][0]['name'] == 'ANA RUIZ'
+
+    @pytest.mark.unit
+    def test_unknown_grouping(self, session):
+        with pytest.raises(ValueError):
+            get_assignment_page(session, 1, group_by='classroom')
+
+
+class TestScheduleStatistics:
+    """Test the aggregate statistics query."""
+
+    @pytest.mark.unit
+    def test_statistics(self, session):
+        schedule, statistics = get_schedule_with_statistics(session, 1)
+        assert schedule.name == 'Horario 2025'
+        assert statistics == {
+            'total_assignments': 5,
+            'teachers_involved': 3,
+            'sections_covered': 2,
+            'classrooms_used': 2,
+            'subjects_scheduled': 2
+        }
+
+        _, statistics = get_schedule_with_statistics(session, 2)
+        assert statistics['total_assignments'] == 1
+
+    @pytest.mark.unit
+    def test_missing_schedule(self, session):
+        assert get_schedule_with_statistics(session, 99) is None
+        assert get_schedule_with_statistics(session, 1, tenant_id=2) is None
+
+
+class TestCursors:
+    """Test cursor parsing."""
+
+    @pytest.mark.unit
+    def test_parse_cursor(self):
+        assert parse_cursor(None) is None
+        assert parse_cursor('') is None
+        assert parse_cursor('42') == 42
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('cursor', ['abc', '-1', '1.5', '0x10'])
+    def test_malformed_cursor(self, cursor):
+        with pytest.raises(ValueError):
+            parse_cursor(cursor)
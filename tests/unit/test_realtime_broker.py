@@ -0,0 +1,83 @@
+"""
+Unit tests for the live schedule notification broker.
+Tests cursor reads, subscription filters, wake-ups and commit-time feeding.
+"""
+
+import threading
+
+import pytest
+
+from src.models.tenant import ScheduleAssignment, ScheduleConflict, DayOfWeek
+from src.scheduling.occupancy import tenant_key
+from src.scheduling.realtime_broker import RealtimeBroker, Subscription, get_realtime_broker
+
+
+def conflict(severity, section_id=1, teacher_id=1):
+    return ('conflict', {'severity': severity}, {section_id}, {teacher_id}, severity)
+
+
+class TestRealtimeBroker:
+    """Test channel reads and filters."""
+
+    @pytest.mark.unit
+    def test_filters_advance_cursor_past_other_events(self):
+        broker = RealtimeBroker()
+        broker.publish('db', [conflict('warning'), conflict('error', section_id=2), conflict('error')])
+
+        events, cursor, reset = broker.wait('db', 0, Subscription(severities=frozenset({'error'}), section_id=1), 0)
+        assert [e.id for e in events] == [3] and cursor == 3 and not reset
+
+        events, cursor, _ = broker.wait('db', 0, Subscription(types=frozenset({'change'})), 0)
+        assert events == [] and cursor == 3
+
+    @pytest.mark.unit
+    def test_reset_when_cursor_left_the_buffer(self):
+        broker = RealtimeBroker(buffer_size=2)
+        broker.publish('db', [conflict('info')] * 3)
+
+        assert broker.wait('db', 0, Subscription(), 0) == ([], 3, True)
+        assert broker.wait('db', 9, Subscription(), 0) == ([], 3, True)  # From before a restart
+        assert [e.id for e in broker.wait('db', 1, Subscription(), 0)[0]] == [2, 3]
+
+    @pytest.mark.unit
+    def test_waiting_connection_wakes_on_publish(self):
+        broker = RealtimeBroker()
+        results = []
+        waiter = threading.Thread(target=lambda: results.append(broker.wait('db', None, Subscription(), 5)))
+        waiter.start()
+        while not broker.stats()['waiting_connections']:
+            pass
+
+        broker.publish('db', [conflict('critical')])
+        waiter.join(1)
+        assert [e.data for e in results[0][0]] == [{'severity': 'critical'}]
+
+
+class TestBrokerFeed:
+    """Test events published from committed sessions."""
+
+    @pytest.mark.unit
+    def test_commit_publishes_changes_and_conflicts(self, make_session):
+        broker = get_realtime_broker()
+        session = make_session()
+        db_key = tenant_key(session.get_bind().url)
+        start = broker.cursor(db_key)
+
+        assignment = ScheduleAssignment(tenant_id=1, teacher_id=1, subject_id=1, section_id=1,
+                                        classroom_id=1, time_period_id=1, day_of_week=DayOfWeek.LUNES)
+        session.add(assignment)
+        session.flush()
+        session.add(ScheduleConflict(conflict_type='teacher_overload', severity='warning',
+                                     assignment_1_id=assignment.id, description='Sobrecarga'))
+        session.commit()
+
+        events, _, _ = broker.wait(db_key, start, Subscription(teacher_id=1), 0)
+        assert [e.type for e in events] == ['change', 'conflict']
+        assert events[0].data['teacher_name'] == 'MARIA NIETO'
+        assert events[1].section_ids == {1}
+
+        # Rolled back writes are never published
+        session.add(ScheduleConflict(conflict_type='x', severity='error', description='x'))
+        session.flush()
+        session.rollback()
+        assert broker.cursor(db_key) == start + 2
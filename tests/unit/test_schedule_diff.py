@@ -0,0 +1,139 @@
+"""
+Unit tests for the schedule diff engine.
+Tests added, removed, moved and changed detection.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.models.tenant import DayOfWeek, Schedule, ScheduleAssignment
+from src.scheduling.schedule_diff import diff_assignment_stream, diff_schedules
+from src.scheduling.schedule_versions import save_schedule_version
+
+
+BASE, TARGET = 1, 2
+_next_id = iter(range(1, 10000))
+
+
+def make_row(schedule_id, section_id, day, period, teacher_id, subject_id, classroom_id=1):
+    return SimpleNamespace(
+        id=next(_next_id), schedule_id=schedule_id,
+        day_of_week=list(DayOfWeek)[day],
+        section_id=section_id, section_name=f'Section {section_id}',
+        teacher_id=teacher_id, teacher_name=f'Teacher {teacher_id}',
+        subject_id=subject_id, subject_name=f'Subject {subject_id}',
+        classroom_id=classroom_id, classroom_name=f'Aula {classroom_id}',
+        time_period_id=period, period_name=f'P{period}',
+        start_time=None, end_time=None, display_order=period
+    )
+
+
+def ordered(rows):
+    return sorted(rows, key=lambda r: (r.section_id, r.day_of_week.value, r.time_period_id, r.schedule_id))
+
+
+class TestScheduleDiff:
+    """Test slot-level schedule comparison."""
+
+    @pytest.mark.unit
+    def test_identical_schedules(self):
+        rows = ordered([
+            make_row(BASE, 1, 0, 1, 10, 100),
+            make_row(TARGET, 1, 0, 1, 10, 100),
+        ])
+        diff = diff_assignment_stream(rows, BASE, TARGET)
+
+        assert diff['summary']['unchanged'] == 1
+        assert not diff['added'] and not diff['removed'] and not diff['moved'] and not diff['changed']
+        assert diff['summary']['affected_teachers'] == []
+
+    @pytest.mark.unit
+    def test_moved_assignment(self):
+        rows = ordered([
+            make_row(BASE, 1, 0, 1, 10, 100),
+            make_row(TARGET, 1, 2, 3, 10, 100),
+        ])
+        diff = diff_assignment_stream(rows, BASE, TARGET)
+
+        assert len(diff['moved']) == 1
+        move = diff['moved'][0]
+        assert move['from']['day'] == 'Monday' and move['to']['day'] == 'Wednesday'
+        assert move['to']['time_period_id'] == 3
+        assert not diff['added'] and not diff['removed']
+
+    @pytest.mark.unit
+    def test_added_removed_and_changed(self):
+        rows = ordered([
+            # Cell replaced in place by another teacher
+            make_row(BASE, 1, 1, 2, 10, 100),
+            make_row(TARGET, 1, 1, 2, 11, 101),
+            # Lesson dropped
+            make_row(BASE, 2, 0, 1, 12, 102),
+            # Lesson added
+            make_row(TARGET, 3, 4, 5, 13, 103),
+        ])
+        diff = diff_assignment_stream(rows, BASE, TARGET)
+        summary = diff['summary']
+
+        assert summary['changed'] == 1
+        assert diff['changed'][0]['before']['teacher_id'] == 10
+        assert diff['changed'][0]['after']['teacher_id'] == 11
+        assert [e['section_id'] for e in diff['removed']] == [2]
+        assert [e['section_id'] for e in diff['added']] == [3]
+
+        teacher_ids = {t['id'] for t in summary['affected_teachers']}
+        assert teacher_ids == {10, 11, 12, 13}
+        assert {s['id'] for s in summary['affected_sections']} == {1, 2, 3}
+
+    @pytest.mark.unit
+    def test_room_change_is_move(self):
+        rows = ordered([
+            make_row(BASE, 1, 0, 1, 10, 100, classroom_id=1),
+            make_row(TARGET, 1, 0, 1, 10, 100, classroom_id=2),
+        ])
+        diff = diff_assignment_stream(rows, BASE, TARGET)
+
+        assert diff['summary']['moved'] == 1
+        assert diff['moved'][0]['from']['classroom_id'] == 1
+        assert diff['moved'][0]['to']['classroom_id'] == 2
+
+
+class TestStoredScheduleDiff:
+    """Test diffs read from the database."""
+
+    @staticmethod
+    def stored(schedule_id, period, is_active=True):
+        return ScheduleAssignment(tenant_id=1, schedule_id=schedule_id, teacher_id=1, subject_id=1, section_id=1,
+                                  classroom_id=1, time_period_id=period, day_of_week=DayOfWeek.LUNES,
+                                  is_active=is_active)
+
+    @pytest.fixture
+    def session(self, make_session):
+        return make_session(periods=(1, 2), rows=[
+            Schedule(id=BASE, tenant_id=1, name='Horario activo', academic_year=2025, semester=1, status='active'),
+            Schedule(id=TARGET, tenant_id=1, name='Candidato', academic_year=2025, semester=1),
+            self.stored(BASE, 1),
+            # Soft-deleted lesson left behind in the base schedule
+            self.stored(BASE, 2, is_active=False),
+            self.stored(TARGET, 1),
+        ])
+
+    @pytest.mark.unit
+    def test_soft_deleted_rows_are_ignored(self, session):
+        diff = diff_schedules(session, BASE, TARGET)
+
+        assert diff['summary']['unchanged'] == 1
+        assert not diff['added'] and not diff['removed'] and not diff['moved'] and not diff['changed']
+
+    @pytest.mark.unit
+    def test_soft_deleted_rows_are_ignored_across_versions(self, session):
+        draft = Schedule(tenant_id=1, name='Borrador', academic_year=2025, semester=1)
+        save_schedule_version(session, draft, [{
+            'teacher_id': 1, 'subject_id': 1, 'section_id': 1, 'classroom_id': 1, 'day': 0, 'time_period_id': 1
+        }], parent_id=BASE)
+        session.commit()
+
+        diff = diff_schedules(session, BASE, draft.id)
+        assert diff['summary']['unchanged'] == 1
+        assert not diff['removed']
@@ -0,0 +1,234 @@
+"""
+Unit tests for copy-on-write schedule versions.
+Tests version chains, delta saves, materialization and diffs against the parent.
+"""
+
+import pytest
+
+from src.models.tenant import DayOfWeek, Schedule, ScheduleAssignment, ScheduleAssignmentRemoval
+from src.scheduling.occupancy import OccupancyIndex
+from src.scheduling.projections import get_assignment_page, get_schedule_with_statistics
+from src.scheduling.schedule_diff import diff_schedules
+from src.scheduling.schedule_versions import (
+    activate_schedule_version, install_version_tracking, materialized_ids, save_schedule_version,
+    version_chain, version_delta
+)
+
+
+def lesson(teacher_id, section_id, day, period, subject_id=1, classroom_id=1):
+    return {
+        'teacher_id': teacher_id, 'subject_id': subject_id, 'section_id': section_id,
+        'classroom_id': classroom_id, 'day': day, 'time_period_id': period
+    }
+
+
+BASE_LESSONS = [lesson(1, 1, day, period) for day in range(5) for period in (1, 2)] + [
+    lesson(2, 2, day, period, subject_id=2, classroom_id=2) for day in range(5) for period in (1, 2)
+]
+
+
+@pytest.fixture
+def session(make_session):
+    install_version_tracking()
+    return make_session(teachers=(1, 2), subjects=(1, 2), sections=(1, 2), classrooms=(1, 2), periods=(1, 2, 3))
+
+
+def new_schedule(name):
+    return Schedule(tenant_id=1, name=name, academic_year=2025, semester=1)
+
+
+@pytest.fixture
+def base(session):
+    schedule = new_schedule('Horario activo')
+    save_schedule_version(session, schedule, BASE_LESSONS)
+    session.commit()
+    return schedule
+
+
+class TestScheduleVersions:
+    """Test delta storage and materialization."""
+
+    @pytest.mark.unit
+    def test_root_version_stores_every_assignment(self, session, base):
+        assert version_chain(session, base.id) == [base.id]
+        assert len(materialized_ids(session, base.id)) == len(BASE_LESSONS)
+
+    @pytest.mark.unit
+    def test_draft_stores_only_the_change(self, session, base):
+        # Move one lesson of teacher 1 from Monday P1 to Monday P3
+        lessons = [l for l in BASE_LESSONS if l != lesson(1, 1, 0, 1)] + [lesson(1, 1, 0, 3)]
+        draft = new_schedule('Borrador')
+        delta = save_schedule_version(session, draft, lessons, parent_id=base.id)
+        session.commit()
+
+        assert delta == {'added': 1, 'removed': 1, 'unchanged': len(BASE_LESSONS) - 1}
+        assert session.query(ScheduleAssignment).filter_by(schedule_id=draft.id).count() == 1
+        assert session.query(ScheduleAssignmentRemoval).filter_by(schedule_id=draft.id).count() == 1
+        assert version_chain(session, draft.id) == [base.id, draft.id]
+
+        ids = materialized_ids(session, draft.id)
+        assert len(ids) == len(BASE_LESSONS)
+        assert set(version_delta(session, draft.id)['added']) <= ids
+        assert not set(version_delta(session, draft.id)['removed']) & ids
+
+        # Branch of a branch: drop one more lesson
+        branch = new_schedule('Rama')
+        save_schedule_version(session, branch, lessons[1:], parent_id=draft.id)
+        session.commit()
+        assert version_chain(session, branch.id) == [base.id, draft.id, branch.id]
+        assert len(materialized_ids(session, branch.id)) == len(BASE_LESSONS) - 1
+
+    @pytest.mark.unit
+    def test_readers_see_the_materialized_version(self, session, base):
+        lessons = [l for l in BASE_LESSONS if l['teacher_id'] == 1]
+        draft = new_schedule('Sólo 1er año A')
+        save_schedule_version(session, draft, lessons, parent_id=base.id)
+        session.commit()
+
+        _, statistics = get_schedule_with_statistics(session, draft.id)
+        assert statistics['total_assignments'] == len(lessons)
+        assert statistics['teachers_involved'] == 1
+
+        page = get_assignment_page(session, draft.id, group_by='teacher')
+        assert [group['id'] for group in page['groups']] == [1]
+
+        page = get_assignment_page(session, base.id, limit=100)
+        assert len(page['assignments']) == len(BASE_LESSONS)
+
+    @pytest.mark.unit
+    def test_diff_against_parent(self, session, base):
+        lessons = [l for l in BASE_LESSONS if l != lesson(1, 1, 0, 1)] + [lesson(1, 1, 0, 3)]
+        draft = new_schedule('Borrador')
+        save_schedule_version(session, draft, lessons, parent_id=base.id)
+        session.commit()
+
+        result = diff_schedules(session, base.id, draft.id)
+        assert result['summary']['unchanged'] == len(BASE_LESSONS) - 1
+        assert len(result['moved']) == 1
+        assert not result['added'] and not result['removed']
+
+    @pytest.mark.unit
+    def test_soft_deleted_rows_are_not_inherited(self, session, base):
+        activate_schedule_version(session, base)
+        session.commit()
+        deleted = session.query(ScheduleAssignment).filter_by(
+            schedule_id=base.id, section_id=1, time_period_id=1
+        ).order_by(ScheduleAssignment.id).first()
+        deleted.is_active = False
+        session.commit()
+        assert deleted.id not in materialized_ids(session, base.id)
+
+        # Re-adding the deleted placement inserts a new row instead of matching the inactive one
+        draft = new_schedule('Borrador')
+        delta = save_schedule_version(session, draft, BASE_LESSONS, parent_id=base.id)
+        session.commit()
+
+        assert delta == {'added': 1, 'removed': 0, 'unchanged': len(BASE_LESSONS) - 1}
+        ids = materialized_ids(session, draft.id)
+        assert len(ids) == len(BASE_LESSONS) and deleted.id not in ids
+
+
+def live_rows(session):
+    return session.query(ScheduleAssignment).filter_by(is_active=True).count()
+
+
+def placements(session, schedule_id):
+    return sorted(
+        (row.teacher_id, row.section_id, row.day_of_week.value, row.time_period_id)
+        for row in session.query(ScheduleAssignment).filter(
+            ScheduleAssignment.id.in_(materialized_ids(session, schedule_id))
+        )
+    )
+
+
+class TestLiveVersion:
+    """Test that only the active version's rows are live lessons."""
+
+    @pytest.fixture
+    def active(self, session, base):
+        activate_schedule_version(session, base)
+        session.commit()
+        return base
+
+    @pytest.fixture
+    def draft(self, session, active):
+        # Move teacher 1's Monday P1 lesson to P3
+        lessons = [l for l in BASE_LESSONS if l != lesson(1, 1, 0, 1)] + [lesson(1, 1, 0, 3)]
+        schedule = new_schedule('Borrador')
+        save_schedule_version(session, schedule, lessons, parent_id=active.id)
+        session.commit()
+        return schedule
+
+    @pytest.mark.unit
+    def test_draft_rows_are_not_live(self, session, active, draft):
+        assert live_rows(session) == len(BASE_LESSONS)
+
+        index = OccupancyIndex.load(session)
+        assert index.teacher_load(1) == 10
+        assert index.occupant('teacher', 1, DayOfWeek.LUNES, 3) is None
+        assert index.occupant('teacher', 1, DayOfWeek.LUNES, 1) is not None
+
+    @pytest.mark.unit
+    def test_activation_replaces_the_live_lessons(self, session, active, draft):
+        moved = session.query(ScheduleAssignment).filter_by(
+            schedule_id=active.id, teacher_id=1, day_of_week=DayOfWeek.LUNES, time_period_id=1
+        ).one()
+
+        assert activate_schedule_version(session, draft) == {'activated': 1, 'deactivated': 1}
+        session.commit()
+
+        assert (active.status, draft.status) == ('archived', 'active')
+        assert moved.is_active is False
+        live = {row.id for row in session.query(ScheduleAssignment.id).filter_by(is_active=True)}
+        assert live == materialized_ids(session, draft.id)
+
+        # The archived version still materializes as it was
+        assert len(materialized_ids(session, active.id)) == len(BASE_LESSONS)
+        assert moved.id in materialized_ids(session, active.id)
+
+    @pytest.mark.unit
+    def test_live_edit_leaves_drafts_unchanged(self, session, active, draft):
+        before = placements(session, draft.id)
+        edited = session.query(ScheduleAssignment).filter_by(
+            schedule_id=active.id, teacher_id=2, day_of_week=DayOfWeek.MARTES, time_period_id=2
+        ).one()
+        deleted = session.query(ScheduleAssignment).filter_by(
+            schedule_id=active.id, teacher_id=2, day_of_week=DayOfWeek.MARTES, time_period_id=1
+        ).one()
+
+        edited.time_period_id = 3
+        deleted.is_active = False
+        session.commit()
+
+        assert placements(session, draft.id) == before
+        assert (2, 2, 'martes', 3) in placements(session, active.id)
+        assert (2, 2, 'martes', 1) not in placements(session, active.id)
+        assert live_rows(session) == len(BASE_LESSONS) - 1
+
+    @pytest.mark.unit
+    def test_edit_of_inherited_live_row_leaves_parent_unchanged(self, session, active, draft):
+        activate_schedule_version(session, draft)
+        session.commit()
+        before = placements(session, active.id)
+
+        edited = session.query(ScheduleAssignment).filter_by(
+            schedule_id=active.id, teacher_id=2, day_of_week=DayOfWeek.MARTES, time_period_id=2
+        ).one()
+        edited.time_period_id = 3
+        session.commit()
+
+        assert placements(session, active.id) == before
+        assert edited.schedule_id == draft.id and edited.is_active
+        assert (2, 2, 'martes', 3) in placements(session, draft.id)
+        assert live_rows(session) == len(BASE_LESSONS)
+
+    @pytest.mark.unit
+    def test_soft_deleted_live_rows_are_not_counted(self, session, active):
+        deleted = session.query(ScheduleAssignment).filter_by(schedule_id=active.id).first()
+        deleted.is_active = False
+        session.commit()
+
+        _, statistics = get_schedule_with_statistics(session, active.id)
+        assert statistics['total_assignments'] == len(BASE_LESSONS) - 1
+        page = get_assignment_page(session, active.id, limit=100)
+        assert len(page['assignments']) == len(BASE_LESSONS) - 1
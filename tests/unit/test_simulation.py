@@ -0,0 +1,92 @@
+"""
+Unit tests for what-if simulation sessions.
+Tests copy-on-write changes, validation deltas and undo.
+"""
+
+import pytest
+
+from src.models.tenant import ScheduleAssignment, TeacherSubject, DayOfWeek
+from src.scheduling.occupancy import OccupancyIndex
+from src.scheduling.simulation import SimulationSession, SimulationStore
+
+
+@pytest.fixture
+def index(make_session):
+    session = make_session(
+        teachers=[{'id': 1, 'max_weekly_hours': 2}, {'id': 2, 'max_weekly_hours': 10}],
+        sections=(1, 2),
+        classrooms=[{'id': 1, 'capacity': 35}, {'id': 2, 'capacity': 35}],
+        periods=(1, 2),
+        rows=[
+            TeacherSubject(teacher_id=1, subject_id=1, weekly_hours=4),
+            ScheduleAssignment(id=1, tenant_id=1, teacher_id=1, subject_id=1, section_id=1, classroom_id=1,
+                               time_period_id=1, day_of_week=DayOfWeek.LUNES),
+            ScheduleAssignment(id=2, tenant_id=1, teacher_id=2, subject_id=1, section_id=2, classroom_id=2,
+                               time_period_id=2, day_of_week=DayOfWeek.LUNES),
+        ]
+    )
+    return OccupancyIndex.load(session)
+
+
+class TestSimulationSession:
+    """Test scenario deltas over the occupancy snapshot."""
+
+    @pytest.mark.unit
+    def test_move_reports_conflicts_and_leaves_index_untouched(self, index):
+        simulation = SimulationSession(index)
+        result = simulation.apply([{'assignment_id': 2, 'time_period_id': 1, 'classroom_id': 1}])
+
+        assert [c['type'] for c in result['conflicts_introduced']] == ['classroom_conflict']
+        assert result['conflicts_introduced'][0]['assignment_ids'] == [1, 2]
+        assert result['unqualified'] == [{'assignment_id': 2, 'teacher_id': 2, 'subject_id': 1}]
+        assert result['summary']['conflicts_after'] == 1
+
+        # Copy-on-write: the shared index still has the committed placement
+        assert index.assignment(2)['period'] == 2
+
+        # Moving back resolves the clash and empties the overlay
+        result = simulation.apply([{'assignment_id': 2, 'time_period_id': 2, 'classroom_id': 2}])
+        assert len(result['conflicts_resolved']) == 1
+        assert simulation.changes() == []
+
+    @pytest.mark.unit
+    def test_add_tracks_workload_and_undo_restores(self, index):
+        simulation = SimulationSession(index)
+        result = simulation.apply([
+            {'op': 'add', 'teacher_id': 1, 'subject_id': 1, 'section_id': 2, 'classroom_id': 2,
+             'day_of_week': 'martes', 'time_period_id': 1},
+            {'op': 'add', 'teacher_id': 1, 'subject_id': 1, 'section_id': 2, 'classroom_id': 2,
+             'day_of_week': 'martes', 'time_period_id': 2},
+        ])
+
+        assert result['workloads'] == [{'teacher_id': 1, 'before': 1, 'after': 3, 'max_hours': 2, 'overloaded': True}]
+        assert result['summary']['added_assignments'] == 2
+        assert result['summary']['overloaded_teachers'] == [1]
+        assert [change['action'] for change in simulation.changes()] == ['add', 'add']
+
+        summary = simulation.undo()
+        assert summary['added_assignments'] == 0 and summary['overloaded_teachers'] == []
+        assert simulation.teacher_load(1) == 1
+
+    @pytest.mark.unit
+    def test_invalid_batch_is_rejected_whole(self, index):
+        simulation = SimulationSession(index)
+        with pytest.raises(ValueError):
+            simulation.apply([{'op': 'remove', 'assignment_id': 1}, {'assignment_id': 99, 'time_period_id': 1}])
+
+        assert simulation.entry(1) is not None
+        assert simulation.summary()['batches'] == 0
+
+
+class TestSimulationStore:
+    """Test session lookup per tenant."""
+
+    @pytest.mark.unit
+    def test_sessions_are_scoped_to_tenant(self, index):
+        store = SimulationStore()
+        simulation = store.create('sqlite:///a', index)
+
+        assert store.get('sqlite:///a', simulation.id) is simulation
+        assert store.get('sqlite:///b', simulation.id) is None
+        assert store.discard('sqlite:///a', simulation.id)
+        assert store.get('sqlite:///a', simulation.id) is None
@@ -0,0 +1,87 @@
+"""
+Unit tests for the schedule change suggestion engine.
+Tests move, room, substitute and swap enumeration and ranking.
+"""
+
+import pytest
+
+from src.models.tenant import (
+    ScheduleAssignment, TeacherSubject, TeacherPreference, DayOfWeek, PreferenceType, PreferenceLevel
+)
+from src.scheduling.occupancy import OccupancyIndex
+from src.scheduling.suggestions import suggest_changes
+
+
+@pytest.fixture
+def index(make_session):
+    session = make_session(
+        teachers=[{'id': 1, 'max_weekly_hours': 10}, {'id': 2, 'max_weekly_hours': 10},
+                  {'id': 3, 'max_weekly_hours': 1}],
+        subjects=(1, 2),
+        classrooms=[{'id': 1, 'capacity': 35}, {'id': 2, 'capacity': 35}],
+        periods=(1, 2),
+        rows=[
+            TeacherSubject(teacher_id=1, subject_id=1, weekly_hours=4),
+            TeacherSubject(teacher_id=2, subject_id=1, weekly_hours=4),
+            TeacherSubject(teacher_id=3, subject_id=1, weekly_hours=4),
+            TeacherPreference(teacher_id=1, preference_type=PreferenceType.DAY_OF_WEEK,
+                              preference_level=PreferenceLevel.PREFER, day_of_week=DayOfWeek.VIERNES),
+            # Assignment 1: MARIA teaches section 1 on Monday P1; 2: JOSE, same section, Tuesday P2
+            ScheduleAssignment(id=1, tenant_id=1, teacher_id=1, subject_id=1, section_id=1, classroom_id=1,
+                               time_period_id=1, day_of_week=DayOfWeek.LUNES),
+            ScheduleAssignment(id=2, tenant_id=1, teacher_id=2, subject_id=2, section_id=1, classroom_id=2,
+                               time_period_id=2, day_of_week=DayOfWeek.MARTES),
+            # ANA is already at her maximum
+            ScheduleAssignment(id=3, tenant_id=1, teacher_id=3, subject_id=1, section_id=2, classroom_id=1,
+                               time_period_id=2, day_of_week=DayOfWeek.JUEVES),
+        ]
+    )
+    return OccupancyIndex.load(session)
+
+
+class TestSuggestions:
+    """Test candidate enumeration and ranking."""
+
+    @pytest.mark.unit
+    def test_moves_skip_busy_slots_and_rank_by_preference(self, index):
+        moves = suggest_changes(index, 1, kinds=['move'], limit=None)
+        slots = {(m['changes'][0]['to'].get('day_of_week'), m['changes'][0]['to'].get('time_period_id')) for m in moves}
+
+        assert len(moves) == 2 * 5 - 2  # Own slot and the section's Tuesday P2
+        assert ('martes', 2) not in slots
+        assert moves[0]['changes'][0]['to']['day_of_week'] == 'viernes'
+        assert moves[0]['preference_delta'] == 3.0
+
+        # Thursday P2 keeps the section but Aula 1 is taken: the move switches rooms
+        thursday = [m for m in moves if m['changes'][0]['to'].get('day_of_week') == 'jueves'
+                    and m['changes'][0]['to'].get('time_period_id') == 2][0]
+        assert thursday['changes'][0]['to']['classroom_id'] == 2 and thursday['disruption'] == 2
+
+    @pytest.mark.unit
+    def test_substitutes_respect_qualification_and_workload(self, index):
+        substitutes = suggest_changes(index, 1, kinds=['substitute'])
+        assert [s['changes'][0]['to']['teacher_id'] for s in substitutes] == [2]
+
+    @pytest.mark.unit
+    def test_substitute_without_known_maximum_uses_default(self, index):
+        del index.teacher_max_hours[2]
+        substitutes = suggest_changes(index, 1, kinds=['substitute'])
+        assert [s['changes'][0]['to']['teacher_id'] for s in substitutes] == [2]
+
+    @pytest.mark.unit
+    def test_swap_within_section_and_requested_slot_first(self, index):
+        swaps = suggest_changes(index, 1, kinds=['swap'])
+        assert len(swaps) == 1
+        assert [change['assignment_id'] for change in swaps[0]['changes']] == [1, 2]
+        assert swaps[0]['changes'][1]['to'] == {'day_of_week': 'lunes', 'time_period_id': 1}
+
+        ranked = suggest_changes(index, 1, proposal={'day_of_week': 'miercoles', 'time_period_id': 2})
+        assert ranked[0]['matches_request']
+        assert ranked[0]['changes'][0]['to'] == {'day_of_week': 'miercoles', 'time_period_id': 2}
+
+    @pytest.mark.unit
+    def test_rejects_unknown_kind_and_inactive_assignment(self, index):
+        with pytest.raises(ValueError):
+            suggest_changes(index, 1, kinds=['teleport'])
+        with pytest.raises(ValueError):
+            suggest_changes(index, 99)
@@ -0,0 +1,73 @@
+"""
+Unit tests for precomputed teacher day timelines.
+Tests current/next lookups and invalidation on schedule changes.
+"""
+
+from datetime import time
+
+import pytest
+
+from src.models.tenant import ScheduleAssignment, DayOfWeek
+from src.scheduling.occupancy import tenant_key
+from src.scheduling.teacher_timelines import TeacherTimelineCache, load_teacher_timeline
+
+
+@pytest.fixture
+def session(make_session):
+    return make_session(
+        teachers=[{'id': 1, 'max_weekly_hours': 30}],
+        periods=[1, 2, {'id': 3, 'period_name': 'P4', 'start_time': time(9, 0), 'end_time': time(9, 40),
+                        'display_order': 4}],
+        rows=[
+            ScheduleAssignment(tenant_id=1, teacher_id=1, subject_id=1, section_id=1, classroom_id=1,
+                               time_period_id=period, day_of_week=DayOfWeek.LUNES)
+            for period in (3, 1)
+        ]
+    )
+
+
+class TestTeacherDayTimeline:
+    """Test bisect lookups of current and next class."""
+
+    @pytest.mark.unit
+    def test_current_and_next(self, session):
+        monday = load_teacher_timeline(session, 1).day('lunes')
+        assert [c['start_time'] for c in monday.classes] == ['07:00', '09:00']
+
+        current, upcoming = monday.current_and_next(time(7, 20))
+        assert current['start_time'] == '07:00' and current['is_current']
+        assert upcoming['start_time'] == '09:00' and upcoming['is_next']
+
+        # Gap between classes, then after the last one
+        assert monday.current_and_next(time(8, 0)) == (None, dict(monday.classes[1], is_next=True))
+        assert monday.current_and_next(time(12, 0)) == (None, None)
+
+    @pytest.mark.unit
+    def test_workload_and_missing_teacher(self, session):
+        timeline = load_teacher_timeline(session, 1)
+        assert timeline.workload['current_hours'] == 2
+        assert timeline.workload['max_hours'] == 30
+        assert timeline.day('martes').classes == []
+        assert load_teacher_timeline(session, 99) is None
+
+
+class TestTeacherTimelineCache:
+    """Test cache hits and schedule-change invalidation."""
+
+    @pytest.mark.unit
+    def test_hit_without_queries_until_schedule_changes(self, session, count_queries):
+        cache = TeacherTimelineCache()
+        db_key = tenant_key(session.get_bind().url)
+        statements = count_queries(session)
+
+        cache.get(session, db_key, 1)
+        built = len(statements)
+        assert cache.get(session, db_key, 1) is cache.get(session, db_key, 1)
+        assert len(statements) == built
+
+        session.add(ScheduleAssignment(tenant_id=1, teacher_id=1, subject_id=1, section_id=1, classroom_id=1,
+                                       time_period_id=2, day_of_week=DayOfWeek.LUNES))
+        session.commit()
+
+        monday = cache.get(session, db_key, 1).day('lunes')
+        assert [c['start_time'] for c in monday.classes] == ['07:00', '07:40', '09:00']
@@ -0,0 +1,64 @@
+"""
+Unit tests for the tenant resolution cache.
+Tests TTL expiry, negative caching, LRU bounds and invalidation.
+"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.tenants.cache import TenantResolutionCache
+
+
+def tenant(tenant_id):
+    return SimpleNamespace(tenant_id=tenant_id, institution_code=tenant_id.upper())
+
+
+class TestTenantResolutionCache:
+    """Test cached tenant lookups."""
+
+    @pytest.mark.unit
+    def test_hit_and_miss(self):
+        cache = TenantResolutionCache()
+        assert cache.get('host', 'ueipab.bischeduler.com') == (False, None)
+
+        school = tenant('ueipab')
+        cache.set('host', 'UEIPAB.bischeduler.com', school)
+        assert cache.get('host', 'ueipab.bischeduler.com') == (True, school)
+        assert cache.stats()['hits'] == 1
+
+    @pytest.mark.unit
+    def test_negative_entries_expire_faster(self):
+        cache = TenantResolutionCache(ttl_seconds=60, negative_ttl_seconds=0.01)
+        cache.set('host', 'unknown.example.com', None)
+
+        assert cache.get('host', 'unknown.example.com') == (True, None)
+        time.sleep(0.02)
+        assert cache.get('host', 'unknown.example.com') == (False, None)
+
+    @pytest.mark.unit
+    def test_lru_bound(self):
+        cache = TenantResolutionCache(max_entries=2)
+        cache.set('id', 'a', tenant('a'))
+        cache.set('id', 'b', tenant('b'))
+        cache.get('id', 'a')
+        cache.set('id', 'c', tenant('c'))
+
+        assert cache.get('id', 'b') == (False, None)
+        assert cache.get('id', 'a')[0] and cache.get('id', 'c')[0]
+
+    @pytest.mark.unit
+    def test_invalidate_tenant(self):
+        cache = TenantResolutionCache()
+        cache.set('id', 'a', tenant('a'))
+        cache.set('host', 'a.bischeduler.com', tenant('a'))
+        cache.set('code', 'B', tenant('b'))
+        cache.set('host', 'new.bischeduler.com', None)
+
+        cache.invalidate_tenant('a')
+
+        assert cache.get('id', 'a') == (False, None)
+        assert cache.get('host', 'a.bischeduler.com') == (False, None)
+        assert cache.get('host', 'new.bischeduler.com') == (False, None)
+        assert cache.get('code', 'B')[0]
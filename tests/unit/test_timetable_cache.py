@@ -0,0 +1,80 @@
+"""
+Unit tests for the versioned timetable cache.
+Tests version invalidation, error passthrough and ETag revalidation.
+"""
+
+import pytest
+from flask import Flask
+
+from src.models.tenant import ScheduleAssignment, DayOfWeek
+from src.scheduling.occupancy import tenant_key
+from src.scheduling.timetable_cache import TimetableCache, get_timetable_cache, timetable_response
+
+
+def counting_render(payload, status=200):
+    calls = []
+
+    def render():
+        calls.append(1)
+        return payload, status
+    return render, calls
+
+
+class TestTimetableCache:
+    """Test cache hits and invalidation."""
+
+    @pytest.mark.unit
+    def test_hit_until_version_bump(self):
+        cache = TimetableCache()
+        render, calls = counting_render({'schedule': {'lunes': {}}})
+
+        _, _, etag = cache.get_or_render('db', 'section', 1, render)
+        _, _, again = cache.get_or_render('db', 'section', 1, render)
+        assert len(calls) == 1 and etag == again
+
+        cache.bump('db')
+        _, _, after_bump = cache.get_or_render('db', 'section', 1, render)
+        assert len(calls) == 2
+        assert after_bump == etag  # Same content keeps its ETag
+
+    @pytest.mark.unit
+    def test_errors_are_not_cached(self):
+        cache = TimetableCache()
+        render, calls = counting_render({'status': 'error'}, 404)
+
+        assert cache.get_or_render('db', 'teacher', 9, render) == ({'status': 'error'}, 404, None)
+        cache.get_or_render('db', 'teacher', 9, render)
+        assert len(calls) == 2
+
+    @pytest.mark.unit
+    def test_commit_with_assignment_write_bumps_version(self, make_session):
+        session = make_session(teachers=(), subjects=(), sections=(), classrooms=(), periods=())
+        db_key = tenant_key(session.get_bind().url)
+
+        cache = get_timetable_cache()
+        before = cache.version(db_key)
+        session.add(ScheduleAssignment(tenant_id=1, teacher_id=1, subject_id=1, section_id=1,
+                                       classroom_id=1, time_period_id=1, day_of_week=DayOfWeek.LUNES))
+        session.commit()
+        assert cache.version(db_key) == before + 1
+
+
+class TestTimetableResponse:
+    """Test ETag / If-None-Match handling."""
+
+    @pytest.mark.unit
+    def test_not_modified_when_etag_matches(self):
+        app = Flask(__name__)
+        render, calls = counting_render({'section_id': 1})
+
+        with app.test_request_context('/'):
+            first = timetable_response('sqlite:///etag-test.db', 'section', 1, render)
+            assert first.status_code == 200
+            etag = first.get_etag()[0]
+
+        with app.test_request_context('/', headers={'If-None-Match': f'"{etag}"'}):
+            second = timetable_response('sqlite:///etag-test.db', 'section', 1, render)
+            assert second.status_code == 304
+            assert second.get_data() == b''
+
+        assert len(calls) == 1
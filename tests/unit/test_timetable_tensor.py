@@ -0,0 +1,102 @@
+"""
+Unit tests for the shared timetable tensor.
+Tests grids, vectorized aggregates, views and version-based rebuilds.
+"""
+
+from datetime import time
+
+import numpy as np
+import pytest
+
+from src.models.tenant import ScheduleAssignment, DayOfWeek
+from src.scheduling.occupancy import tenant_key
+from src.scheduling.timetable_cache import get_timetable_cache
+from src.scheduling.timetable_tensor import EMPTY, Timetable, TimetableStore
+from src.scheduling.timetables import day_grid, load_timetable
+
+
+@pytest.fixture
+def session(make_session):
+    return make_session(
+        teachers=[{'id': 1, 'max_weekly_hours': 30}, 2],
+        subjects=(1, 2),
+        sections=(1, 2),
+        periods=[
+            1,
+            {'id': 2, 'period_name': 'REC1', 'start_time': time(7, 40), 'end_time': time(8, 0),
+             'display_order': 2, 'is_break': True},
+            {'id': 3, 'period_name': 'P2', 'start_time': time(8, 0), 'end_time': time(8, 45), 'display_order': 3},
+        ],
+        rows=[
+            ScheduleAssignment(id=1, tenant_id=1, teacher_id=1, subject_id=1, section_id=1, classroom_id=1,
+                               time_period_id=1, day_of_week=DayOfWeek.LUNES),
+            ScheduleAssignment(id=2, tenant_id=1, teacher_id=1, subject_id=2, section_id=1, classroom_id=1,
+                               time_period_id=3, day_of_week=DayOfWeek.LUNES),
+            # Teacher 1 double-booked on Tuesday P1
+            ScheduleAssignment(id=3, tenant_id=1, teacher_id=1, subject_id=1, section_id=1, classroom_id=1,
+                               time_period_id=1, day_of_week=DayOfWeek.MARTES),
+            ScheduleAssignment(id=4, tenant_id=1, teacher_id=1, subject_id=1, section_id=2, classroom_id=1,
+                               time_period_id=1, day_of_week=DayOfWeek.MARTES),
+        ]
+    )
+
+
+class TestTimetable:
+    """Test the dense arrays and their aggregates."""
+
+    @pytest.mark.unit
+    def test_grids_and_clashes(self, session):
+        timetable = Timetable.load(session)
+        teacher = timetable.teachers.index[1]
+
+        assert timetable.teacher_grid.shape == (2, 5, 3)
+        assert timetable.lesson_ids[timetable.teacher_grid[teacher, 0, 0]] == 1
+        assert timetable.teacher_grid[teacher, 0, 1] == EMPTY
+
+        # Lowest assignment id wins a clashing cell; the count grid shows the clash
+        assert timetable.lesson_ids[timetable.teacher_grid[teacher, 1, 0]] == 3
+        assert timetable.teacher_count[teacher, 1, 0] == 2
+        assert timetable.clashes('teacher') == [
+            {'teacher_id': 1, 'day': 'martes', 'time_period_id': 1, 'assignment_ids': [3, 4]}
+        ]
+
+        with pytest.raises(ValueError):
+            timetable.teacher_grid[teacher, 0, 0] = EMPTY
+
+    @pytest.mark.unit
+    def test_aggregates_use_real_durations(self, session):
+        timetable = Timetable.load(session)
+        teacher = timetable.teachers.index[1]
+
+        assert timetable.weekly_periods('teacher').tolist() == [4, 0]
+        assert timetable.weekly_minutes('teacher')[teacher] == 40 + 45 + 40 + 40
+        assert timetable.daily_minutes('teacher')[teacher].tolist() == [85, 80, 0, 0, 0]
+
+        section = timetable.sections.index[1]
+        subject = timetable.subjects.index[2]
+        assert timetable.pair_periods('section', 'subject')[section, subject] == 1
+        np.testing.assert_array_equal(timetable.teacher_max_hours, [30, 40])
+
+    @pytest.mark.unit
+    def test_view_matches_projection_read(self, session):
+        timetable = Timetable.load(session)
+        fields = ('subject', 'teacher', 'classroom', 'time', 'is_break')
+
+        assert day_grid(timetable.view('section', 1), fields) == day_grid(load_timetable(session, 'section', 1), fields)
+        assert timetable.view('section', 99)['lessons'] == []
+
+
+class TestTimetableStore:
+    """Test sharing and rebuilds per schedule version."""
+
+    @pytest.mark.unit
+    def test_rebuilds_after_version_bump(self, session):
+        store = TimetableStore()
+        db_key = tenant_key(session.get_bind().url) + '#store-test'
+
+        first = store.get(session, db_key)
+        assert store.get(session, db_key) is first
+
+        get_timetable_cache().bump(db_key)
+        assert store.get(session, db_key) is not first
+        assert store.stats()['builds'] == 2
@@ -0,0 +1,63 @@
+"""
+Unit tests for the timetable read layer.
+Tests the joined projection and the shared grid renderers.
+"""
+
+from datetime import time
+
+import pytest
+
+from src.models.tenant import ScheduleAssignment, DayOfWeek
+from src.scheduling.timetables import load_timetable, day_grid, keyed_cells, day_lists
+
+
+@pytest.fixture
+def session(make_session):
+    return make_session(
+        periods=[
+            1,
+            # Duplicate of P1 (same name and start)
+            {'id': 2, 'period_name': 'P1', 'start_time': time(7, 0), 'end_time': time(7, 40), 'display_order': 1},
+            {'id': 3, 'period_name': 'P2', 'start_time': time(7, 40), 'end_time': time(8, 20), 'display_order': 2},
+        ],
+        rows=[
+            ScheduleAssignment(tenant_id=1, teacher_id=1, subject_id=1, section_id=1, classroom_id=1,
+                               time_period_id=period, day_of_week=day)
+            for period, day in [(3, DayOfWeek.MARTES), (2, DayOfWeek.LUNES)]
+        ] + [
+            ScheduleAssignment(tenant_id=1, teacher_id=1, subject_id=1, section_id=1, classroom_id=1,
+                               time_period_id=1, day_of_week=DayOfWeek.VIERNES, is_active=False)
+        ]
+    )
+
+
+class TestTimetables:
+    """Test timetable loading and rendering."""
+
+    @pytest.mark.unit
+    def test_loads_in_two_queries(self, session, count_queries):
+        statements = count_queries(session)
+
+        timetable = load_timetable(session, 'teacher', 1)
+
+        assert len(statements) == 2
+        assert [lesson['day'] for lesson in timetable['lessons']] == ['lunes', 'martes']
+        assert [period['name'] for period in timetable['periods']] == ['P1', 'P2']
+
+    @pytest.mark.unit
+    def test_renderers_share_one_timetable(self, session):
+        timetable = load_timetable(session, 'section', 1)
+
+        grid = day_grid(timetable, ('subject', 'teacher', 'time'))
+        assert grid['lunes']['P1']['teacher'] == 'MARIA NIETO'
+        assert grid['lunes']['P1']['time'] == '07:00 - 07:40'
+        assert grid['viernes'] == {}
+
+        # Duplicate period rows collapse onto the canonical period id
+        assert set(keyed_cells(timetable)) == {'lunes_1', 'martes_3'}
+        assert day_lists(timetable)['martes'][0]['period'] == 'P2'
+
+    @pytest.mark.unit
+    def test_rejects_unknown_view(self, session):
+        with pytest.raises(ValueError):
+            load_timetable(session, 'student', 1)
@@ -0,0 +1,74 @@
+"""
+Unit tests for write-behind teacher workload maintenance.
+Tests dirty tracking through session events and coalesced recompute.
+"""
+
+import pytest
+
+from src.models.tenant import Teacher, TeacherWorkload, ScheduleAssignment, DayOfWeek
+from src.scheduling.workload import install_workload_tracking
+
+
+@pytest.fixture
+def session(make_session):
+    install_workload_tracking()
+    return make_session(
+        teachers=[
+            {'id': 10, 'teacher_name': 'MARIA NIETO', 'max_weekly_hours': 2},
+            {'id': 11, 'teacher_name': 'JOSE PEREZ', 'max_weekly_hours': 40},
+        ],
+        subjects=(), sections=(), classrooms=(), periods=()
+    )
+
+
+def lesson(teacher_id, period):
+    return ScheduleAssignment(
+        tenant_id=1, teacher_id=teacher_id, subject_id=5, section_id=period,
+        classroom_id=period, time_period_id=period, day_of_week=DayOfWeek.LUNES
+    )
+
+
+class TestWorkloadTracking:
+    """Test workload recompute at commit time."""
+
+    @pytest.mark.unit
+    def test_insert_marks_teacher_and_recomputes_on_commit(self, session):
+        session.add_all([lesson(10, p) for p in (1, 2, 3)])
+        session.commit()
+
+        assert session.get(Teacher, 10).current_weekly_hours == 3
+        workload = session.query(TeacherWorkload).filter_by(teacher_id=10).one()
+        assert (workload.calculated_hours, workload.overtime_hours, workload.is_valid) == (3, 1, False)
+
+    @pytest.mark.unit
+    def test_reassign_and_deactivate_update_both_teachers(self, session):
+        first, second = lesson(10, 1), lesson(10, 2)
+        session.add_all([first, second])
+        session.commit()
+
+        first.teacher_id = 11
+        second.is_active = False
+        session.commit()
+
+        assert session.get(Teacher, 10).current_weekly_hours == 0
+        assert session.get(Teacher, 11).current_weekly_hours == 1
+
+    @pytest.mark.unit
+    def test_rollback_discards_dirty_teachers(self, session):
+        session.add(lesson(10, 1))
+        session.flush()
+        session.rollback()
+        session.commit()
+
+        assert session.get(Teacher, 10).current_weekly_hours == 0
+
+    @pytest.mark.unit
+    def test_bulk_insert_uses_one_grouped_count(self, session, count_queries):
+        statements = count_queries(session)
+
+        session.add_all([lesson(10 + p % 2, p) for p in range(1, 41)])
+        session.commit()
+
+        counts = [s for s in statements if 'count(' in s.lower()]
+        assert len(counts) == 1
+        assert session.get(Teacher, 11).current_weekly_hours == 20